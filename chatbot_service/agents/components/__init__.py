@@ -9,6 +9,7 @@ from .thinking import ThinkingAgent, ThinkingBlock, ThinkingResult, ReasoningTyp
 from .vision import VisionCapableMixin, MedicalImageAnalyzer, ImageInput
 from .planning import PlanningMixin, PlanStep, PlanStepStatus, ExecutionPlan
 from .managed import ManagedAgent, AgentManager, DelegationResult
+from .parallel_workers import ParallelWorkerRunner, WorkerLatencyTracker, WorkerOutcome
 
 __all__ = [
     # Thinking
@@ -32,4 +33,9 @@ __all__ = [
     "ManagedAgent",
     "AgentManager",
     "DelegationResult",
+    
+    # Parallel Workers
+    "ParallelWorkerRunner",
+    "WorkerLatencyTracker",
+    "WorkerOutcome",
 ]
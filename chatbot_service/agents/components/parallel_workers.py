@@ -0,0 +1,173 @@
+"""
+Parallel Worker Runner - Supervisor fan-out with streamed partial results
+
+Runs independent worker coroutines concurrently and yields each outcome as
+soon as it finishes, instead of gathering everything under one deadline:
+
+- Completed results are kept when the deadline expires; only the workers
+  still running are cancelled and reported as timed out.
+- Each worker gets its own timeout derived from its observed latency
+  (p95 * PARALLEL_TIMEOUT_MULTIPLIER, clamped to [PARALLEL_WORKER_MIN_TIMEOUT,
+  deadline]), so one habitually slow worker no longer holds the others.
+- Closing the stream (or cancelling the caller) cancels every pending worker.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Overall fan-out deadline in seconds
+PARALLEL_WORKER_DEADLINE = float(os.getenv("PARALLEL_WORKER_DEADLINE", "10.0"))
+# Lower bound for an adaptive per-worker timeout in seconds
+PARALLEL_WORKER_MIN_TIMEOUT = float(os.getenv("PARALLEL_WORKER_MIN_TIMEOUT", "2.0"))
+# Per-worker timeout = observed p95 latency * multiplier
+PARALLEL_TIMEOUT_MULTIPLIER = float(os.getenv("PARALLEL_TIMEOUT_MULTIPLIER", "2.0"))
+# Observations needed before a worker's timeout adapts
+PARALLEL_LATENCY_MIN_SAMPLES = int(os.getenv("PARALLEL_LATENCY_MIN_SAMPLES", "5"))
+_LATENCY_WINDOW = 100
+
+WorkerFactory = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class WorkerOutcome:
+    """Result of a single worker run."""
+    name: str
+    status: str  # "ok", "error", "timeout"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class WorkerLatencyTracker:
+    """Recent per-worker latencies used to derive adaptive timeouts."""
+
+    def __init__(
+        self,
+        multiplier: float = PARALLEL_TIMEOUT_MULTIPLIER,
+        min_timeout: float = PARALLEL_WORKER_MIN_TIMEOUT,
+        min_samples: int = PARALLEL_LATENCY_MIN_SAMPLES,
+    ):
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        """Record a run duration (timeouts are recorded at their cut-off)."""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=_LATENCY_WINDOW)
+            samples.append(seconds)
+
+    def p95(self, name: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(int(0.95 * len(samples)), len(samples) - 1)]
+
+    def timeout_for(self, name: str, deadline: float) -> float:
+        """Adaptive timeout for ``name``, never beyond the overall deadline."""
+        p95 = self.p95(name)
+        if p95 is None:
+            return deadline
+        return min(deadline, max(self.min_timeout, p95 * self.multiplier))
+
+
+class ParallelWorkerRunner:
+    """Runs worker coroutines concurrently and streams their outcomes."""
+
+    def __init__(self, latency: Optional[WorkerLatencyTracker] = None):
+        self.latency = latency or WorkerLatencyTracker()
+
+    async def stream(
+        self,
+        workers: Dict[str, WorkerFactory],
+        deadline: float = PARALLEL_WORKER_DEADLINE,
+    ) -> AsyncIterator[WorkerOutcome]:
+        """
+        Start every worker and yield outcomes in completion order.
+
+        Args:
+            workers: Worker name -> zero-argument coroutine factory
+            deadline: Overall time budget in seconds
+
+        Yields:
+            WorkerOutcome for each worker (finished, failed or timed out)
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending: Dict[asyncio.Task, str] = {}
+        due: Dict[asyncio.Task, float] = {}
+        for name, factory in workers.items():
+            task = asyncio.create_task(factory(), name=f"worker:{name}")
+            pending[task] = name
+            due[task] = start + self.latency.timeout_for(name, deadline)
+
+        try:
+            while pending:
+                wait = max(0.0, min(due.values()) - loop.time())
+                done, _ = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = pending.pop(task)
+                    due.pop(task)
+                    elapsed = loop.time() - start
+                    self.latency.observe(name, elapsed)
+                    if task.cancelled():
+                        yield WorkerOutcome(name, "error", error="cancelled", latency_ms=elapsed * 1000)
+                    elif task.exception() is not None:
+                        yield WorkerOutcome(
+                            name, "error", error=str(task.exception()), latency_ms=elapsed * 1000
+                        )
+                    else:
+                        yield WorkerOutcome(name, "ok", result=task.result(), latency_ms=elapsed * 1000)
+
+                now = loop.time()
+                for task in [t for t in pending if due[t] <= now]:
+                    name = pending.pop(task)
+                    due.pop(task)
+                    task.cancel()
+                    self.latency.observe(name, now - start)
+                    yield WorkerOutcome(
+                        name, "timeout", error="timed out", latency_ms=(now - start) * 1000
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run(
+        self,
+        workers: Dict[str, WorkerFactory],
+        deadline: float = PARALLEL_WORKER_DEADLINE,
+        on_outcome: Optional[Callable[[WorkerOutcome], Awaitable[None]]] = None,
+    ) -> List[WorkerOutcome]:
+        """Run all workers, awaiting ``on_outcome`` as each one finishes."""
+        started = time.perf_counter()
+        outcomes: List[WorkerOutcome] = []
+        async for outcome in self.stream(workers, deadline):
+            outcomes.append(outcome)
+            if on_outcome is not None:
+                await on_outcome(outcome)
+        logger.debug(
+            f"Parallel workers finished in {(time.perf_counter() - started) * 1000:.0f}ms: "
+            f"{[(o.name, o.status) for o in outcomes]}"
+        )
+        return outcomes
@@ -13,8 +13,10 @@ import operator
 import json
 import ast
 import os
-import asyncio
-from typing import TypedDict, Annotated, List, Union, Dict, Any, Optional
+import re
+import functools
+from contextvars import ContextVar
+from typing import TypedDict, Annotated, Callable, List, Union, Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
@@ -45,6 +47,8 @@ except ImportError:
 
 from core.config.app_config import get_app_config
 from core.prompts.registry import get_prompt
+from core.observability.tracing import get_tracer, traced, SpanType
+from core.services.token_stream import TokenChunker
 
 from tools.semantic_router_v2 import SemanticRouterV2, IntentCategory
 from tools.agentic_tools import (
@@ -66,6 +70,11 @@ from agents.heart_predictor import HeartDiseasePredictor
 from tools.fhir.fhir_agent_tool import get_fhir_tool
 from tools.medical_coding.auto_coder import auto_code_clinical_note
 from agents.components.workflow_automation import WorkflowRouter
+from agents.components.parallel_workers import (
+    ParallelWorkerRunner,
+    WorkerOutcome,
+    PARALLEL_WORKER_DEADLINE,
+)
 from agents.components.differential_diagnosis import generate_differential_diagnosis
 from agents.components.triage_system import triage_patient
 
@@ -74,6 +83,26 @@ logger = logging.getLogger(__name__)
 # Configuration
 MAX_SUPERVISOR_STEPS = int(os.getenv("MAX_SUPERVISOR_STEPS", "8"))
 
+# Workers that only read the user query and can run side by side
+PARALLEL_SAFE_WORKERS = (
+    "medical_analyst", "researcher", "data_analyst",
+    "drug_expert", "heart_analyst", "clinical_reasoning",
+)
+MAX_PARALLEL_WORKERS = int(os.getenv("MAX_PARALLEL_WORKERS", "3"))
+
+# Progress callback of the running execute() call (not kept in graph state,
+# which must stay serializable for the checkpointer)
+_progress_callback: ContextVar[Optional[Any]] = ContextVar("orchestrator_progress", default=None)
+
+# Token sink of the running execute() call; receives scrubbed answer chunks
+_token_callback: ContextVar[Optional[Any]] = ContextVar("orchestrator_tokens", default=None)
+
+# Custom stream events for app.astream(..., stream_mode="custom")
+try:
+    from langgraph.config import get_stream_writer
+except ImportError:  # older langgraph
+    get_stream_writer = None
+
 # PII Scrubbing - Critical Safety Feature
 try:
     from core.compliance.pii_scrubber_v2 import get_enhanced_pii_scrubber
@@ -99,8 +128,70 @@ class SupervisorResponse(BaseModel):
         default="", 
         description="Final answer if FINISH"
     )
+    workers: Optional[List[str]] = Field(
+        default=None,
+        description="Independent workers to run in parallel instead of 'next'"
+    )
 
 # --- State Definition ---
+class _FinalAnswerExtractor:
+    """Incrementally decodes "final_response" from streamed supervisor JSON.
+
+    Text is only released when the JSON routes to FINISH before the field
+    starts, so routing decisions never leak partial answers.
+    """
+
+    _FIELD = re.compile(r'"final_response"\s*:\s*"')
+    _FINISH = re.compile(r'"next"\s*:\s*"FINISH"', re.IGNORECASE)
+    _ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+    def __init__(self):
+        self.raw = ""
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text; returns newly decoded answer text."""
+        self.raw += chunk
+        if self._done:
+            return ""
+        raw = self.raw
+        if self._pos is None:
+            match = self._FIELD.search(raw)
+            if not match or not self._FINISH.search(raw, 0, match.start()):
+                return ""
+            self._pos = match.end()
+
+        out = []
+        i = self._pos
+        while i < len(raw):
+            c = raw[i]
+            if c == "\\":
+                if i + 1 >= len(raw):
+                    break  # Escape split across chunks
+                n = raw[i + 1]
+                if n == "u":
+                    if i + 6 > len(raw):
+                        break
+                    try:
+                        out.append(chr(int(raw[i + 2:i + 6], 16)))
+                    except ValueError:
+                        out.append(raw[i:i + 6])
+                    i += 6
+                    continue
+                out.append(self._ESCAPES.get(n, n))
+                i += 2
+                continue
+            if c == '"':
+                self._done = True
+                i += 1
+                break
+            out.append(c)
+            i += 1
+        self._pos = i
+        return "".join(out)
+
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     next: str
@@ -114,6 +205,7 @@ class AgentState(TypedDict):
     web_search: Optional[bool]
     deep_search: Optional[bool]
     file_ids: Optional[List[str]]
+    parallel_workers: Optional[List[str]]  # Fan-out set chosen by the supervisor
 
 # --- Orchestrator Class ---
 class LangGraphOrchestrator:
@@ -129,6 +221,9 @@ class LangGraphOrchestrator:
             interaction_checker: Drug Interaction Checker (optional if in DI)
             memori_bridge: MemoriRAGBridge (optional)
         """
+        # Parallel fan-out engine (keeps per-worker latency for adaptive timeouts)
+        self._worker_runner = ParallelWorkerRunner()
+        
         # Use DIContainer for missing dependencies
         from core.dependencies import DIContainer
         container = DIContainer.get_instance()
@@ -385,22 +480,28 @@ class LangGraphOrchestrator:
         """Build the LangGraph workflow."""
         workflow = StateGraph(AgentState)
         
+        # Every node runs inside a span named after it, which feeds the
+        # per-node latency breakdown in /admin/graph/metrics
+        def add_node(name, fn):
+            workflow.add_node(name, traced(name, SpanType.AGENT_STEP, child_only=False)(fn))
+        
         # Add Nodes
-        workflow.add_node("router", self.router_node)
-        workflow.add_node("supervisor", self.supervisor_node)
+        add_node("router", self.router_node)
+        add_node("supervisor", self.supervisor_node)
         
         # Worker Nodes
-        workflow.add_node("medical_analyst", self.medical_analyst_node)
-        workflow.add_node("researcher", self.researcher_node)
-        workflow.add_node("data_analyst", self.data_analyst_node)
-        workflow.add_node("drug_expert", self.drug_expert_node)
-        workflow.add_node("profile_manager", self.profile_manager_node)
-        workflow.add_node("heart_analyst", self.heart_analyst_node)
+        add_node("medical_analyst", self.medical_analyst_node)
+        add_node("researcher", self.researcher_node)
+        add_node("data_analyst", self.data_analyst_node)
+        add_node("drug_expert", self.drug_expert_node)
+        add_node("profile_manager", self.profile_manager_node)
+        add_node("heart_analyst", self.heart_analyst_node)
 
-        workflow.add_node("thinking_agent", self.thinking_node)
-        workflow.add_node("fhir_agent", self.fhir_query_node)
-        workflow.add_node("clinical_reasoning", self.clinical_reasoning_node)
-        workflow.add_node("medical_coding", self.medical_coding_node)
+        add_node("thinking_agent", self.thinking_node)
+        add_node("fhir_agent", self.fhir_query_node)
+        add_node("clinical_reasoning", self.clinical_reasoning_node)
+        add_node("medical_coding", self.medical_coding_node)
+        add_node("parallel_workers", self.parallel_workers_node)
         
         # Set Entry Point
         workflow.set_entry_point("router")
@@ -441,6 +542,7 @@ class LangGraphOrchestrator:
                 "fhir_agent": "fhir_agent",
                 "clinical_reasoning": "clinical_reasoning",
                 "medical_coding": "medical_coding",
+                "parallel_workers": "parallel_workers",
                 "FINISH": END
             }
         )
@@ -457,6 +559,7 @@ class LangGraphOrchestrator:
         workflow.add_edge("fhir_agent", "supervisor")
         workflow.add_edge("clinical_reasoning", "supervisor")
         workflow.add_edge("medical_coding", "supervisor")
+        workflow.add_edge("parallel_workers", "supervisor")
         
         return workflow
 
@@ -466,65 +569,114 @@ class LangGraphOrchestrator:
         self, 
         state: AgentState, 
         worker_names: List[str],
-        timeout: float = 10.0
+        timeout: float = PARALLEL_WORKER_DEADLINE
     ) -> Dict:
         """P1.1: Execute multiple independent workers in parallel.
         
         Use when query needs information from multiple workers that don't
         depend on each other (e.g., medication info + drug interaction check).
         
+        Workers run concurrently with adaptive per-worker timeouts. Each
+        result is streamed out as soon as that worker finishes (custom
+        LangGraph stream event + progress callback), and results that
+        completed before the deadline are kept even if others time out.
+        
         Args:
             state: Current agent state
             worker_names: List of worker node names to execute
             timeout: Maximum time to wait for all workers
             
         Returns:
-            Merged results from all workers
+            Merged results from the workers that finished
         """
-        import asyncio
-        
         worker_map = {
             "medical_analyst": self.medical_analyst_node,
             "researcher": self.researcher_node,
             "data_analyst": self.data_analyst_node,
             "drug_expert": self.drug_expert_node,
             "heart_analyst": self.heart_analyst_node,
+            "clinical_reasoning": self.clinical_reasoning_node,
         }
         
-        tasks = []
+        workers = {}
         for name in worker_names:
             if name in worker_map:
-                tasks.append(worker_map[name](state))
+                node = traced(name, SpanType.AGENT_STEP, child_only=False)(worker_map[name])
+                workers[name] = functools.partial(node, state)
             else:
                 logger.warning(f"P1.1: Unknown worker '{name}' - skipping")
         
-        if not tasks:
-            return {"messages": [], "citations": []}
+        merged = {"messages": [], "citations": [], "next": "FINISH"}
+        if not workers:
+            return merged
         
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=timeout
+        sections = []
+        completed = 0
+        progress = _progress_callback.get()
+        writer = None
+        if get_stream_writer is not None:
+            try:
+                writer = get_stream_writer()
+            except Exception:
+                writer = None  # Not running inside a graph
+        
+        async def on_outcome(outcome: WorkerOutcome):
+            nonlocal completed
+            completed += 1
+            if not outcome.ok:
+                logger.warning(
+                    f"P1.1: Worker {outcome.name} {outcome.status} after "
+                    f"{outcome.latency_ms:.0f}ms: {outcome.error}"
+                )
+            else:
+                result = outcome.result if isinstance(outcome.result, dict) else {}
+                contents = [str(m.content) for m in result.get("messages", [])]
+                citations = result.get("citations") or []
+                sections.append(f"[{outcome.name}]\n" + "\n".join(contents))
+                merged["citations"].extend(citations)
+                if result.get("source") and not merged.get("source"):
+                    merged["source"] = result["source"]
+                if result.get("confidence") is not None:
+                    merged["confidence"] = max(merged.get("confidence") or 0.0, result["confidence"])
+                if writer is not None:
+                    writer({
+                        "type": "worker_result",
+                        "worker": outcome.name,
+                        "messages": contents,
+                        "citations": citations,
+                        "latency_ms": round(outcome.latency_ms, 1),
+                    })
+            if progress is not None:
+                try:
+                    await progress(completed, len(workers), outcome.name, outcome.status)
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {e}")
+        
+        outcomes = await self._worker_runner.run(workers, timeout, on_outcome)
+        
+        # One combined message so the supervisor synthesizes every worker's
+        # output and the fan-out counts as a single step
+        if sections:
+            merged["messages"].append(
+                ToolMessage(content="\n\n".join(sections), tool_call_id="call_parallel")
             )
-            
-            # Merge results
-            merged = {"messages": [], "citations": [], "next": "FINISH"}
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"P1.1: Worker {worker_names[i]} failed: {result}")
-                    continue
-                if isinstance(result, dict):
-                    if "messages" in result:
-                        merged["messages"].extend(result.get("messages", []))
-                    if "citations" in result:
-                        merged["citations"].extend(result.get("citations", []))
-            
-            logger.info(f"P1.1: Parallel execution completed for {worker_names}")
-            return merged
-            
-        except asyncio.TimeoutError:
-            logger.warning(f"P1.1: Parallel workers timed out after {timeout}s")
-            return {"messages": [], "citations": [], "next": "FINISH"}
+        logger.info(
+            f"P1.1: Parallel execution completed for {worker_names}: "
+            f"{[(o.name, o.status, round(o.latency_ms)) for o in outcomes]}"
+        )
+        return merged
+
+    async def parallel_workers_node(self, state: AgentState) -> Dict:
+        """Worker: run the supervisor's fan-out set concurrently."""
+        result = await self._execute_parallel_workers(state, state.get("parallel_workers") or [])
+        result.pop("next", None)  # Edge returns to the supervisor
+        result["parallel_workers"] = None
+        if not result["messages"]:
+            result["messages"] = [ToolMessage(
+                content="None of the specialist agents returned a result in time.",
+                tool_call_id="call_parallel",
+            )]
+        return result
 
     # --- Nodes ---
     
@@ -764,8 +916,12 @@ class LangGraphOrchestrator:
         parser = JsonOutputParser(pydantic_object=SupervisorResponse)
         
         try:
-            # Invoke LLM directly with messages, then parse
-            llm_response = await self.llm.ainvoke(messages_for_llm)
+            # Invoke LLM directly with messages, then parse (token by token
+            # when the caller is streaming the answer)
+            if _token_callback.get() is not None:
+                llm_response = await self._ainvoke_streaming(messages_for_llm)
+            else:
+                llm_response = await self.llm.ainvoke(messages_for_llm)
             result = parser.parse(llm_response.content)
             
             # Log successful parsing for monitoring
@@ -789,6 +945,22 @@ class LangGraphOrchestrator:
             normalized = str(next_step).lower().strip()
             next_step = node_aliases.get(normalized, next_step)
             
+            # Fan out to independent workers on the first routing decision
+            if worker_count == 0 and isinstance(result.get("workers"), list):
+                fan_out = []
+                for worker in result["workers"]:
+                    worker = node_aliases.get(str(worker).lower().strip(), str(worker).strip())
+                    if worker in PARALLEL_SAFE_WORKERS and worker not in fan_out:
+                        fan_out.append(worker)
+                fan_out = fan_out[:MAX_PARALLEL_WORKERS]
+                if len(fan_out) >= 2:
+                    logger.info(f"Supervisor fan-out to {fan_out}")
+                    return {
+                        "next": "parallel_workers",
+                        "parallel_workers": fan_out,
+                        "source": state.get("source"),
+                    }
+            
             # Validate next_step is a known node
             valid_nodes = {"medical_analyst", "researcher", "data_analyst", "drug_expert", 
                           "profile_manager", "thinking_agent", "heart_analyst", "fhir_agent",
@@ -846,6 +1018,17 @@ class LangGraphOrchestrator:
                     "source": "llm_fallback"  # Error fallback is LLM-only
                 }
 
+    async def _ainvoke_streaming(self, messages: List[BaseMessage]) -> AIMessage:
+        """Stream the supervisor LLM, forwarding the final answer as it is generated."""
+        emit = _token_callback.get()
+        extractor = _FinalAnswerExtractor()
+        async for chunk in self.llm.astream(messages):
+            content = chunk.content if isinstance(chunk.content, str) else ""
+            answer = extractor.feed(content)
+            if answer:
+                await emit(answer)
+        return AIMessage(content=extractor.raw)
+
     async def medical_analyst_node(self, state: AgentState) -> Dict:
         """Worker: Medical Analyst (Self-RAG with Medical Prompt Builder)"""
         query = state["messages"][-1].content
@@ -1319,6 +1502,69 @@ class LangGraphOrchestrator:
 
     # --- Main Execution ---
     async def execute(
+        self, 
+        query: str, 
+        user_id: str,
+        thread_id: Optional[str] = None,
+        progress_callback: Optional[callable] = None,
+        thinking: bool = False,
+        web_search: bool = False,
+        deep_search: bool = False,
+        file_ids: Optional[List[str]] = None,
+        token_callback: Optional[callable] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the orchestrator inside a root trace span.
+
+        Node, retrieval, LLM, DB and cache spans opened while the graph runs
+        nest under this span; see core.observability.tracing for sampling.
+
+        Args:
+            token_callback: Optional async callback ``(text: str)`` receiving
+                the final answer as it is generated, in PII-scrubbed chunks
+                cut at sentence/word boundaries. The returned response stays
+                authoritative (it includes post-processing notes).
+        """
+        async with get_tracer().span(
+            "orchestrator_execute",
+            SpanType.AGENT_STEP,
+            metadata={"user_id": user_id, "thread_id": thread_id or ""},
+        ) as span:
+            emit: Optional[Callable] = None
+            if token_callback is not None:
+                chunker = TokenChunker(scrub=_pii_scrubber.scrub if _pii_scrubber else None)
+
+                async def _emit_chunks(token: str):
+                    for text, _ in chunker.feed(token):
+                        await token_callback(text)
+
+                emit = _emit_chunks
+
+            progress_token = _progress_callback.set(progress_callback)
+            tokens_token = _token_callback.set(emit)
+            try:
+                result = await self._execute(
+                    query,
+                    user_id,
+                    thread_id=thread_id,
+                    progress_callback=progress_callback,
+                    thinking=thinking,
+                    web_search=web_search,
+                    deep_search=deep_search,
+                    file_ids=file_ids,
+                )
+            finally:
+                _progress_callback.reset(progress_token)
+                _token_callback.reset(tokens_token)
+            if emit is not None:
+                for text, _ in chunker.flush():
+                    await token_callback(text)
+            span.set_attribute("intent", str(result.get("intent")))
+            span.set_attribute("source", str(result.get("metadata", {}).get("source")))
+            span.set_attribute("steps", result.get("metadata", {}).get("steps", 0))
+            return result
+
+    async def _execute(
         self, 
         query: str, 
         user_id: str,
@@ -1376,7 +1622,8 @@ class LangGraphOrchestrator:
             "thinking": thinking,
             "web_search": web_search,
             "deep_search": deep_search,
-            "file_ids": file_ids
+            "file_ids": file_ids,
+            "parallel_workers": None
         }
         
         # Configure execution with checkpointing if available
@@ -1550,25 +1797,6 @@ class LangGraphOrchestrator:
         except Exception:
             pass  # Metrics must never break execution
         
-        # Record agent execution in AgentTracer
-        try:
-            from app_lifespan import get_agent_tracer
-            tracer = get_agent_tracer()
-            if tracer:
-                from core.observability.tracing import SpanType
-                with tracer.trace_operation(
-                    f"orchestrator_execute:{intent}",
-                    operation_type=SpanType.AGENT_STEP,
-                    metadata={"user_id": user_id, "intent": intent, "source": source}
-                ) as span:
-                    span.add_event("execution_complete", {
-                        "latency_ms": round(_latency_ms, 1),
-                        "steps": len(final_state["messages"]),
-                        "source": source,
-                    })
-        except Exception:
-            pass  # Tracing must never break execution
-        
         # Emit webhook events for significant outcomes
         try:
             from core.services.webhook_service import get_webhook_service, WebhookEvent
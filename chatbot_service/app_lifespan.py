@@ -175,9 +175,14 @@ async def startup_event():
     
     # --- Observability: AgentTracer ---
     try:
-        from core.observability.tracing import AgentTracer
-        _agent_tracer = AgentTracer(backend="local", service_name="heartguard-ai")
-        logger.info("✅ AgentTracer initialized (local backend)")
+        from core.observability.tracing import init_tracer
+        # Registered as the global tracer so get_tracer() callers and the
+        # admin metrics endpoints see the same spans
+        _agent_tracer = init_tracer(backend="local", service_name="heartguard-ai")
+        logger.info(
+            f"✅ AgentTracer initialized (local backend, "
+            f"sample_rate={_agent_tracer.sample_rate})"
+        )
     except Exception as e:
         logger.warning(f"⚠️  AgentTracer not initialized: {e}")
     
@@ -551,6 +556,22 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"⚠️ AnalyzerRegistry not initialized: {e}")
     
+    # --- Knowledge graph: index the existing corpus in the background ---
+    try:
+        from rag.knowledge_graph.graph_store import get_graph_store
+        get_graph_store()
+        logger.info("✅ Graph store ready (corpus sync running in background)")
+    except Exception as e:
+        logger.warning(f"⚠️ Graph store not initialized: {e}")
+    
+    # --- BM25 keyword index: load/verify the snapshot in the background ---
+    try:
+        from rag.store.chromadb_store import start_keyword_index_sync
+        start_keyword_index_sync()
+        logger.info("✅ BM25 keyword index sync started")
+    except Exception as e:
+        logger.warning(f"⚠️ BM25 keyword index sync not started: {e}")
+    
     logger.info("🎉 Application startup complete")
 
 
@@ -574,7 +595,27 @@ async def shutdown_event():
             logger.info("✅ Database monitoring cleaned up")
     except Exception as e:
         logger.error(f"Error cleaning up database monitoring: {e}")
-    
+
+    try:
+        from rag.knowledge_graph.graph_store import stop_graph_sync
+        stop_graph_sync()
+    except Exception as e:
+        logger.error(f"Error stopping graph corpus sync: {e}")
+
+    try:
+        from rag.store.chromadb_store import stop_keyword_index_sync
+        stop_keyword_index_sync()
+    except Exception as e:
+        logger.error(f"Error stopping BM25 keyword index sync: {e}")
+
+    try:
+        # Flush buffered smartwatch vitals
+        from core.services.vitals_ingest import shutdown_vitals_buffer
+        await shutdown_vitals_buffer()
+        logger.info("✅ Vitals ingest buffer flushed")
+    except Exception as e:
+        logger.error(f"Error flushing vitals ingest buffer: {e}")
+
     try:
         # Clean up WebSocket manager (close all connections gracefully)
         if _websocket_manager:
@@ -649,6 +690,13 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error closing RedisRateLimiter: {e}")
     
+    # Flush pending trace exports
+    try:
+        if _agent_tracer:
+            _agent_tracer.shutdown()
+    except Exception as e:
+        logger.error(f"Error flushing trace exports: {e}")
+    
     _agent_tracer = None
     _service_tracker = None
     
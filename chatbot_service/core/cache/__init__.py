@@ -0,0 +1,53 @@
+"""
+Unified cache subsystem.
+
+One implementation of tiered caching shared by the database, memory and
+RAG layers:
+- MemoryTier: O(1) LRU + TTL, entry and byte bounded, tag index
+- RedisTier / AsyncRedisTier: shared tier with Redis-set tag index
+- Canonical tags (user/session/document/collection) and process-wide
+  tag invalidation
+- TieredCache / AsyncTieredCache: promotion, write-through, single-flight
+- msgpack (+lz4) serialization and one Prometheus metrics surface
+"""
+from .metrics import CacheStats
+from .serializer import CacheSerializer, estimate_size, get_serializer
+from .tiered import (
+    AsyncTieredCache,
+    TieredCache,
+    create_async_cache,
+    create_cache,
+    get_all_cache_stats,
+)
+from .tags import (
+    collection_tag,
+    document_tag,
+    document_tags,
+    invalidate_everywhere,
+    session_tag,
+    user_tag,
+)
+from .tiers import MISSING, AsyncRedisTier, CacheTier, MemoryTier, RedisTier
+
+__all__ = [
+    "MISSING",
+    "CacheTier",
+    "MemoryTier",
+    "RedisTier",
+    "AsyncRedisTier",
+    "TieredCache",
+    "AsyncTieredCache",
+    "create_cache",
+    "create_async_cache",
+    "get_all_cache_stats",
+    "user_tag",
+    "session_tag",
+    "document_tag",
+    "collection_tag",
+    "document_tags",
+    "invalidate_everywhere",
+    "CacheSerializer",
+    "CacheStats",
+    "estimate_size",
+    "get_serializer",
+]
@@ -0,0 +1,125 @@
+"""
+Cache Statistics and Prometheus Export
+
+Every cache tier keeps a ``CacheStats`` counter set and reports events to
+the shared PrometheusMetrics registry, labelled by cache name and tier, so
+hit rates of all caches are visible on a single metrics surface.
+"""
+
+import logging
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Lazy-loaded metrics singleton to avoid circular imports
+_metrics = None
+_metrics_lock = threading.Lock()
+
+_EVENT_METRICS = {
+    "hit": "cache_hits_total",
+    "miss": "cache_misses_total",
+    "set": "cache_sets_total",
+    "eviction": "cache_evictions_total",
+    "expiration": "cache_expirations_total",
+    "invalidation": "cache_invalidations_total",
+    "error": "cache_errors_total",
+}
+
+
+def _get_metrics():
+    """Lazy-load PrometheusMetrics singleton."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                try:
+                    from core.monitoring.prometheus_metrics import get_metrics
+
+                    _metrics = get_metrics()
+                except Exception as e:
+                    logger.debug(f"PrometheusMetrics unavailable for cache metrics: {e}")
+                    _metrics = False
+    return _metrics or None
+
+
+def record_cache_event(cache: str, tier: str, event: str, count: int = 1) -> None:
+    """Report a cache event (hit/miss/set/eviction/...) to Prometheus."""
+    metrics = _get_metrics()
+    metric_name = _EVENT_METRICS.get(event)
+    if metrics and metric_name and count:
+        metrics.increment_counter(
+            metric_name, float(count), labels={"cache": cache, "tier": tier}
+        )
+
+
+def record_cache_size(cache: str, tier: str, entries: int, size_bytes: int) -> None:
+    """Report current tier occupancy to Prometheus."""
+    metrics = _get_metrics()
+    if metrics:
+        labels = {"cache": cache, "tier": tier}
+        metrics.set_gauge("cache_entries", float(entries), labels=labels)
+        metrics.set_gauge("cache_size_bytes", float(size_bytes), labels=labels)
+
+
+class CacheStats:
+    """Counters for a single cache tier."""
+
+    __slots__ = (
+        "cache",
+        "tier",
+        "hits",
+        "misses",
+        "sets",
+        "evictions",
+        "expirations",
+        "invalidations",
+        "errors",
+    )
+
+    def __init__(self, cache: str, tier: str):
+        self.cache = cache
+        self.tier = tier
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def record(self, event: str, count: int = 1) -> None:
+        """Increment a counter and forward the event to Prometheus."""
+        attr = {
+            "hit": "hits",
+            "miss": "misses",
+            "set": "sets",
+            "eviction": "evictions",
+            "expiration": "expirations",
+            "invalidation": "invalidations",
+            "error": "errors",
+        }[event]
+        setattr(self, attr, getattr(self, attr) + count)
+        record_cache_event(self.cache, self.tier, event, count)
+
+    @property
+    def hit_rate(self) -> float:
+        """Hit rate in the range 0.0-1.0."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export as dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+__all__ = ["CacheStats", "record_cache_event", "record_cache_size"]
@@ -0,0 +1,281 @@
+"""
+Cache Value Serialization
+
+Binary serializer shared by all remote cache tiers.
+
+Format:
+- 1 header byte identifying codec and compression
+- msgpack payload (JSON when msgpack is not installed)
+- lz4 frame compression above a size threshold (when lz4 is installed)
+
+Payloads without a known header are decoded as plain JSON, so entries
+written by the previous per-module caches are still readable.
+
+tuple, datetime/date/time, set/frozenset, Decimal, UUID and numpy arrays
+are written as type-tagged maps and decoded back to their original type.
+"""
+
+import datetime as _dt
+import json
+import logging
+import sys
+import uuid
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import lz4.frame as lz4_frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4_frame = None
+    LZ4_AVAILABLE = False
+
+
+# Header bytes (high nibble 0x1 keeps them distinct from legacy pickle/JSON data)
+_HDR_MSGPACK = 0x10
+_HDR_MSGPACK_LZ4 = 0x11
+_HDR_JSON = 0x12
+_HDR_JSON_LZ4 = 0x13
+
+_KNOWN_HEADERS = {_HDR_MSGPACK, _HDR_MSGPACK_LZ4, _HDR_JSON, _HDR_JSON_LZ4}
+
+
+# Key marking a dict as an encoded non-native value: {_TYPE_KEY: name, "value": ...}
+_TYPE_KEY = "__cache_type__"
+
+_DECODERS = {
+    "tuple": tuple,
+    "datetime": _dt.datetime.fromisoformat,
+    "date": _dt.date.fromisoformat,
+    "time": _dt.time.fromisoformat,
+    "set": set,
+    "frozenset": frozenset,
+    "decimal": Decimal,
+    "uuid": uuid.UUID,
+}
+
+
+def _encode_default(obj: Any) -> Any:
+    """
+    Encode non-native values as type-tagged dicts that decode back to the
+    same type (see ``_decode_hook``).
+
+    msgpack packs with ``strict_types``, so tuples and subclasses of the
+    native types also arrive here; the subclasses are packed as their base
+    type. Dataclasses, pydantic models and arbitrary objects have no such
+    encoding, so they raise and the remote tiers skip the entry.
+
+    Raises:
+        TypeError: If the value has no lossless encoding
+    """
+    # Checked before the native bases: a namedtuple is a tuple subclass
+    if isinstance(obj, tuple):
+        return {_TYPE_KEY: "tuple", "value": list(obj)}
+    if isinstance(obj, str):
+        # str() would give "Cls.MEMBER" for str-mixin enums
+        return str.__str__(obj)
+    for base in (dict, list, bytes, int, float):
+        if isinstance(obj, base):
+            return base(obj)
+    # datetime before date: datetime is a date subclass
+    if isinstance(obj, _dt.datetime):
+        return {_TYPE_KEY: "datetime", "value": obj.isoformat()}
+    if isinstance(obj, _dt.date):
+        return {_TYPE_KEY: "date", "value": obj.isoformat()}
+    if isinstance(obj, _dt.time):
+        return {_TYPE_KEY: "time", "value": obj.isoformat()}
+    if isinstance(obj, frozenset):
+        return {_TYPE_KEY: "frozenset", "value": [_tag_tuples(v) for v in obj]}
+    if isinstance(obj, set):
+        return {_TYPE_KEY: "set", "value": [_tag_tuples(v) for v in obj]}
+    if isinstance(obj, Decimal):
+        return {_TYPE_KEY: "decimal", "value": str(obj)}
+    if isinstance(obj, uuid.UUID):
+        return {_TYPE_KEY: "uuid", "value": str(obj)}
+    if hasattr(obj, "tolist") and hasattr(obj, "dtype"):
+        if getattr(obj, "ndim", 0) == 0:
+            # numpy scalar: the equivalent Python number
+            return obj.item()
+        return {_TYPE_KEY: "ndarray", "dtype": str(obj.dtype), "value": obj.tolist()}
+    raise TypeError(f"Cannot serialize {type(obj).__name__} for the cache")
+
+
+def _tag_tuples(value: Any) -> Any:
+    """Tag tuples for the JSON codec, which writes them as plain arrays."""
+    if isinstance(value, tuple):
+        return {_TYPE_KEY: "tuple", "value": [_tag_tuples(v) for v in value]}
+    if isinstance(value, dict):
+        return {k: _tag_tuples(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_tag_tuples(v) for v in value]
+    return value
+
+
+def _decode_hook(obj: dict) -> Any:
+    """Rebuild values tagged by ``_encode_default``."""
+    kind = obj.get(_TYPE_KEY)
+    if kind is None:
+        return obj
+    if kind == "ndarray":
+        import numpy as np
+
+        return np.asarray(obj["value"], dtype=obj["dtype"])
+    decoder = _DECODERS.get(kind)
+    if decoder is None:
+        return obj
+    return decoder(obj["value"])
+
+
+class CacheSerializer:
+    """
+    Serialize cache values to compact bytes.
+
+    Args:
+        compression_threshold: Payloads larger than this (bytes) are lz4
+            compressed when that actually reduces their size
+        text_mode: Produce/consume plain JSON strings, for Redis clients
+            created with ``decode_responses=True``
+    """
+
+    def __init__(self, compression_threshold: int = 1024, text_mode: bool = False):
+        self.compression_threshold = compression_threshold
+        self.text_mode = text_mode
+
+    def dumps(self, value: Any) -> Union[bytes, str]:
+        """Serialize a value."""
+        if self.text_mode:
+            return json.dumps(_tag_tuples(value), default=_encode_default)
+
+        if MSGPACK_AVAILABLE:
+            payload = msgpack.packb(
+                value, default=_encode_default, use_bin_type=True, strict_types=True
+            )
+            header, lz4_header = _HDR_MSGPACK, _HDR_MSGPACK_LZ4
+        else:
+            payload = json.dumps(_tag_tuples(value), default=_encode_default).encode(
+                "utf-8"
+            )
+            header, lz4_header = _HDR_JSON, _HDR_JSON_LZ4
+
+        if LZ4_AVAILABLE and len(payload) > self.compression_threshold:
+            compressed = lz4_frame.compress(payload)
+            if len(compressed) < len(payload):
+                return bytes((lz4_header,)) + compressed
+
+        return bytes((header,)) + payload
+
+    def loads(self, data: Union[bytes, str, None]) -> Any:
+        """
+        Deserialize a value produced by :meth:`dumps`.
+
+        Raises:
+            ValueError: If the payload cannot be decoded
+        """
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return json.loads(data, object_hook=_decode_hook)
+
+        header = data[0] if data else None
+        if header not in _KNOWN_HEADERS:
+            # Legacy JSON entries written before the unified cache
+            try:
+                return json.loads(data, object_hook=_decode_hook)
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ValueError(f"Unrecognized cache payload: {e}") from e
+
+        payload = data[1:]
+        if header in (_HDR_MSGPACK_LZ4, _HDR_JSON_LZ4):
+            if not LZ4_AVAILABLE:
+                raise ValueError("lz4 payload but lz4 is not installed")
+            payload = lz4_frame.decompress(payload)
+
+        if header in (_HDR_MSGPACK, _HDR_MSGPACK_LZ4):
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("msgpack payload but msgpack is not installed")
+            return msgpack.unpackb(
+                payload, raw=False, strict_map_key=False, object_hook=_decode_hook
+            )
+        return json.loads(payload, object_hook=_decode_hook)
+
+
+_default_serializer = CacheSerializer()
+
+# estimate_size walks at most this many items per container and this deep
+_SIZE_SAMPLE = 16
+_SIZE_MAX_DEPTH = 8
+
+
+def get_serializer() -> CacheSerializer:
+    """Get the shared binary serializer."""
+    return _default_serializer
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Walks the value and sums approximate encoded sizes (string and bytes
+    lengths, 8 bytes per number), which tracks payload size far better than
+    ``sys.getsizeof`` for nested containers without serializing the value on
+    every L1 write. Large containers are sampled and extrapolated; objects
+    with no cheap estimate (e.g. live client objects) use ``sys.getsizeof``.
+    """
+    kind = type(value)
+    if kind is str or kind is bytes:
+        return len(value)
+    if kind is int or kind is float:
+        return 8
+    if value is None or kind is bool:
+        return 1
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (int, float)):
+        return 8
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        # numpy arrays and memoryviews
+        return nbytes
+    if _depth >= _SIZE_MAX_DEPTH:
+        return sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        count = len(value)
+        sample = islice(value.items(), _SIZE_SAMPLE)
+        total = sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in sample
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        count = len(value)
+        total = sum(
+            estimate_size(v, _depth + 1) for v in islice(value, _SIZE_SAMPLE)
+        )
+    else:
+        return sys.getsizeof(value)
+
+    if count > _SIZE_SAMPLE:
+        total = total * count // _SIZE_SAMPLE
+    # Container header plus one byte of framing per item
+    return total + count + 1
+
+
+__all__ = [
+    "CacheSerializer",
+    "get_serializer",
+    "estimate_size",
+    "MSGPACK_AVAILABLE",
+    "LZ4_AVAILABLE",
+]
@@ -0,0 +1,100 @@
+"""
+Cache Invalidation Tags
+
+Canonical tag names shared by every cache, so a write in one layer can
+evict dependent entries in another without knowing their keys:
+
+    cache.set(key, rows, tags=[user_tag(user_id)])
+    await invalidate_everywhere(user_tag(user_id))   # GDPR delete
+
+Tiers keep a reverse index (tag -> keys) in memory and as Redis sets, so
+invalidation touches only the affected keys instead of scanning.
+"""
+
+import logging
+from typing import Any, Iterable, List, Optional
+
+from .tiered import _maybe_await, _registry
+
+logger = logging.getLogger(__name__)
+
+
+def user_tag(user_id: Any) -> str:
+    """Tag for entries derived from a user's data."""
+    return f"user:{user_id}"
+
+
+def session_tag(session_id: Any) -> str:
+    """Tag for entries derived from a chat session."""
+    return f"session:{session_id}"
+
+
+def document_tag(document_id: Any) -> str:
+    """Tag for entries derived from a document or its chunks."""
+    return f"doc:{document_id}"
+
+
+def collection_tag(collection: Any) -> str:
+    """Tag for entries derived from a vector store collection."""
+    return f"collection:{collection}"
+
+
+def document_tags(results: Iterable[Any], collection: Any = None) -> List[str]:
+    """
+    Collect document tags for a list of retrieval results.
+
+    Understands the result shapes used by the vector stores: dicts with
+    ``metadata.doc_id`` / ``metadata.document_id`` or a top-level
+    ``doc_id`` / ``document_id``. Results without a document id cannot be
+    evicted by a document delete, so they add ``collection_tag(collection)``
+    instead (nothing when ``collection`` is None).
+    """
+    tags = set()
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        metadata = result.get("metadata") or {}
+        doc_id: Optional[Any] = (
+            metadata.get("doc_id")
+            or metadata.get("document_id")
+            or result.get("doc_id")
+            or result.get("document_id")
+        )
+        if doc_id is not None:
+            tags.add(document_tag(doc_id))
+        elif collection is not None:
+            tags.add(collection_tag(collection))
+    return sorted(tags)
+
+
+async def invalidate_everywhere(*tags: str) -> int:
+    """
+    Invalidate ``tags`` in every live cache of this process.
+
+    Shared Redis tiers are cleared for all workers; other workers' memory
+    tiers age out through their (short) L1 TTLs.
+
+    Returns:
+        Number of entries removed
+    """
+    if not tags:
+        return 0
+    count = 0
+    for cache in list(_registry):
+        try:
+            count += await _maybe_await(cache.invalidate_tags(*tags))
+        except Exception as e:
+            logger.warning(f"Tag invalidation failed for cache {cache.name}: {e}")
+    if count:
+        logger.debug(f"Invalidated {count} cache entries for tags {tags}")
+    return count
+
+
+__all__ = [
+    "user_tag",
+    "session_tag",
+    "document_tag",
+    "collection_tag",
+    "document_tags",
+    "invalidate_everywhere",
+]
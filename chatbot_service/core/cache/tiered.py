@@ -0,0 +1,503 @@
+"""
+Tiered Cache Front-ends
+
+``TieredCache`` (sync) and ``AsyncTieredCache`` chain any number of tiers:
+
+    get:  L1 -> L2 -> ... ; a hit in a lower tier is promoted upwards
+    set:  written to every tier (write-through)
+
+Both provide tag-based invalidation and single-flight ``get_or_compute``
+(concurrent misses for the same key share one computation). Every cache
+registers itself so statistics can be inspected and tuned as a whole via
+``get_all_cache_stats()``.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.observability.tracing import trace_span, SpanType
+
+from .tiers import MISSING, AsyncRedisTier, CacheTier, MemoryTier, RedisTier
+
+logger = logging.getLogger(__name__)
+
+_registry: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+async def _maybe_await(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _cancelling() -> bool:
+    """Whether the current task has a pending cancellation request (3.11+)."""
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling()) if cancelling else False
+
+
+def _tier_ttls(
+    tiers: Sequence[CacheTier],
+    ttl: Optional[int],
+    tier_ttls: Optional[Sequence[Optional[int]]],
+) -> List[Optional[int]]:
+    if tier_ttls is not None:
+        return [tier_ttls[i] if i < len(tier_ttls) else ttl for i in range(len(tiers))]
+    return [ttl] * len(tiers)
+
+
+class _Flight:
+    """An in-progress computation shared by concurrent sync callers."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """
+    Synchronous multi-tier cache.
+
+    Example:
+        cache = create_cache("db_queries", l1_max_entries=1000, l1_ttl=60, l2_ttl=300)
+        cache.set(key, rows, tags=[f"user:{user_id}"])
+        cache.invalidate_tags(f"user:{user_id}")
+    """
+
+    def __init__(self, name: str, tiers: Sequence[CacheTier]):
+        """
+        Initialize tiered cache.
+
+        Args:
+            name: Cache name (metrics label, registry key)
+            tiers: Tiers ordered fastest first
+        """
+        if not tiers:
+            raise ValueError("TieredCache requires at least one tier")
+        self.name = name
+        self.tiers: List[CacheTier] = list(tiers)
+        self._flights: Dict[str, _Flight] = {}
+        self._flight_lock = threading.Lock()
+        _registry.add(self)
+
+    @property
+    def l1(self) -> CacheTier:
+        """Fastest tier."""
+        return self.tiers[0]
+
+    @property
+    def l2(self) -> Optional[CacheTier]:
+        """Second tier, if configured."""
+        return self.tiers[1] if len(self.tiers) > 1 else None
+
+    def get_with_tier(self, key: str) -> Tuple[Any, Optional[str]]:
+        """
+        Get a value and the name of the tier that served it.
+
+        Returns:
+            (value, tier_name), or (None, None) on miss
+        """
+        with trace_span("cache_get", SpanType.CACHE) as span:
+            for index, tier in enumerate(self.tiers):
+                if hasattr(tier, "get_entry"):
+                    value, tags = tier.get_entry(key)
+                else:
+                    value, tags = tier.get(key), ()
+                if value is MISSING:
+                    continue
+                # Promote into the faster tiers with their own default TTL
+                for upper in self.tiers[:index]:
+                    upper.set(key, value, None, tags)
+                span.set_attribute("tier", tier.name)
+                return value, tier.name
+            span.set_attribute("tier", "miss")
+            return None, None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, checking tiers in order."""
+        value, tier = self.get_with_tier(key)
+        return default if tier is None else value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        tier_ttls: Optional[Sequence[Optional[int]]] = None,
+    ) -> None:
+        """
+        Store a value in every tier.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: TTL for all tiers (None uses each tier's default)
+            tags: Invalidation tags, e.g. ``user:<id>``, ``collection:<name>``
+            tier_ttls: Per-tier TTL overrides, fastest tier first
+        """
+        tags = tuple(tags)
+        for tier, tier_ttl in zip(self.tiers, _tier_ttls(self.tiers, ttl, tier_ttls)):
+            tier.set(key, value, tier_ttl, tags)
+
+    def delete(self, key: str) -> None:
+        """Delete a key from every tier."""
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying any of ``tags`` from every tier."""
+        return sum(tier.invalidate_tags(tags) for tier in self.tiers)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Delete keys starting with ``prefix`` (scans; prefer tags)."""
+        return sum(
+            tier.invalidate_prefix(prefix)
+            for tier in self.tiers
+            if hasattr(tier, "invalidate_prefix")
+        )
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Get a value or compute and cache it.
+
+        Concurrent callers missing on the same key wait for a single
+        computation instead of stampeding the backend. ``None`` results are
+        returned but not cached.
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        with self._flight_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl, tags)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flight_lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def clear(self) -> None:
+        """Clear every tier."""
+        for tier in self.tiers:
+            tier.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier statistics."""
+        return {
+            "name": self.name,
+            "tiers": {tier.name: tier.get_stats() for tier in self.tiers},
+            "inflight": len(self._flights),
+        }
+
+
+class AsyncTieredCache:
+    """
+    Asynchronous multi-tier cache.
+
+    Tiers may be synchronous (``MemoryTier``) or asynchronous
+    (``AsyncRedisTier``); results are awaited as needed.
+    """
+
+    def __init__(self, name: str, tiers: Sequence[CacheTier]):
+        if not tiers:
+            raise ValueError("AsyncTieredCache requires at least one tier")
+        self.name = name
+        self.tiers: List[CacheTier] = list(tiers)
+        self._flights: Dict[str, "asyncio.Future[Any]"] = {}
+        _registry.add(self)
+
+    @property
+    def l1(self) -> CacheTier:
+        """Fastest tier."""
+        return self.tiers[0]
+
+    @property
+    def l2(self) -> Optional[CacheTier]:
+        """Second tier, if configured."""
+        return self.tiers[1] if len(self.tiers) > 1 else None
+
+    async def connect(self) -> None:
+        """Open connections for tiers that need them."""
+        for tier in self.tiers:
+            if hasattr(tier, "connect"):
+                await _maybe_await(tier.connect())
+
+    async def get_with_tier(self, key: str) -> Tuple[Any, Optional[str]]:
+        """Get a value and the name of the tier that served it."""
+        async with trace_span("cache_get", SpanType.CACHE) as span:
+            for index, tier in enumerate(self.tiers):
+                if hasattr(tier, "get_entry"):
+                    value, tags = await _maybe_await(tier.get_entry(key))
+                else:
+                    value, tags = await _maybe_await(tier.get(key)), ()
+                if value is MISSING:
+                    continue
+                for upper in self.tiers[:index]:
+                    await _maybe_await(upper.set(key, value, None, tags))
+                span.set_attribute("tier", tier.name)
+                return value, tier.name
+            span.set_attribute("tier", "miss")
+            return None, None
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, checking tiers in order."""
+        value, tier = await self.get_with_tier(key)
+        return default if tier is None else value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        tier_ttls: Optional[Sequence[Optional[int]]] = None,
+    ) -> None:
+        """Store a value in every tier (see ``TieredCache.set``)."""
+        tags = tuple(tags)
+        for tier, tier_ttl in zip(self.tiers, _tier_ttls(self.tiers, ttl, tier_ttls)):
+            await _maybe_await(tier.set(key, value, tier_ttl, tags))
+
+    async def delete(self, key: str) -> None:
+        """Delete a key from every tier."""
+        for tier in self.tiers:
+            await _maybe_await(tier.delete(key))
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying any of ``tags`` from every tier."""
+        count = 0
+        for tier in self.tiers:
+            count += await _maybe_await(tier.invalidate_tags(tags))
+        return count
+
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Delete keys starting with ``prefix`` (scans; prefer tags)."""
+        count = 0
+        for tier in self.tiers:
+            if hasattr(tier, "invalidate_prefix"):
+                count += await _maybe_await(tier.invalidate_prefix(prefix))
+        return count
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Get a value or compute and cache it, with single-flight semantics.
+
+        ``compute`` is a zero-argument coroutine function. ``None`` results
+        are returned but not cached. If the leader is cancelled, its
+        followers retry and one of them takes over the computation.
+        """
+        while True:
+            value = await self.get(key, MISSING)
+            if value is not MISSING:
+                return value
+
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled() or _cancelling():
+                    raise
+                # The leader was cancelled, not us: retry
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            value = await compute()
+            if value is not None:
+                await self.set(key, value, ttl, tags)
+            flight.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # Mark retrieved so an unawaited follower future does not warn
+            flight.exception()
+            raise
+        finally:
+            self._flights.pop(key, None)
+
+    async def clear(self) -> None:
+        """Clear every tier."""
+        for tier in self.tiers:
+            await _maybe_await(tier.clear())
+
+    async def health_check(self) -> Dict[str, bool]:
+        """Health of every tier."""
+        health = {}
+        for tier in self.tiers:
+            check = getattr(tier, "health_check", None)
+            health[tier.name] = bool(await _maybe_await(check())) if check else True
+        return health
+
+    async def close(self) -> None:
+        """Close tier connections."""
+        for tier in self.tiers:
+            if hasattr(tier, "close"):
+                await _maybe_await(tier.close())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier statistics."""
+        return {
+            "name": self.name,
+            "tiers": {tier.name: tier.get_stats() for tier in self.tiers},
+            "inflight": len(self._flights),
+        }
+
+
+# ============================================================================
+# Factories and registry
+# ============================================================================
+
+
+def _l2_enabled(enable_l2: Optional[bool]) -> bool:
+    if enable_l2 is not None:
+        return enable_l2
+    return os.getenv("CACHE_ENABLE_L2", "true").lower() == "true"
+
+
+def create_cache(
+    name: str,
+    l1_max_entries: int = 1000,
+    l1_max_bytes: Optional[int] = None,
+    l1_ttl: Optional[int] = 60,
+    enable_l2: Optional[bool] = None,
+    redis_url: Optional[str] = None,
+    l2_ttl: int = 300,
+    key_prefix: Optional[str] = None,
+    redis_client: Any = None,
+) -> TieredCache:
+    """
+    Build a synchronous L1 (memory) + optional L2 (Redis) cache.
+
+    Args:
+        name: Cache name, also the default Redis key prefix
+        l1_max_entries: L1 entry bound
+        l1_max_bytes: L1 byte bound (None for entry bound only)
+        l1_ttl: L1 default TTL in seconds
+        enable_l2: Enable the Redis tier (default from CACHE_ENABLE_L2)
+        redis_url: Redis URL (default from REDIS_URL)
+        l2_ttl: L2 default TTL in seconds
+        key_prefix: Redis key prefix (default ``"<name>:"``)
+        redis_client: Existing sync Redis client to reuse
+    """
+    tiers: List[CacheTier] = [
+        MemoryTier(
+            max_entries=l1_max_entries,
+            max_bytes=l1_max_bytes,
+            default_ttl=l1_ttl,
+            cache_name=name,
+        )
+    ]
+    if redis_client is not None or _l2_enabled(enable_l2):
+        tiers.append(
+            RedisTier(
+                url=redis_url,
+                key_prefix=key_prefix if key_prefix is not None else f"{name}:",
+                default_ttl=l2_ttl,
+                cache_name=name,
+                client=redis_client,
+            )
+        )
+    return TieredCache(name, tiers)
+
+
+def create_async_cache(
+    name: str,
+    l1_max_entries: int = 1000,
+    l1_max_bytes: Optional[int] = None,
+    l1_ttl: Optional[int] = 60,
+    enable_l2: Optional[bool] = None,
+    redis_url: Optional[str] = None,
+    l2_ttl: int = 300,
+    key_prefix: Optional[str] = None,
+    redis_client: Any = None,
+    **redis_kwargs: Any,
+) -> AsyncTieredCache:
+    """Build an asynchronous L1 + optional L2 cache (see ``create_cache``)."""
+    tiers: List[CacheTier] = [
+        MemoryTier(
+            max_entries=l1_max_entries,
+            max_bytes=l1_max_bytes,
+            default_ttl=l1_ttl,
+            cache_name=name,
+        )
+    ]
+    if redis_client is not None or _l2_enabled(enable_l2):
+        tiers.append(
+            AsyncRedisTier(
+                url=redis_url,
+                key_prefix=key_prefix if key_prefix is not None else f"{name}:",
+                default_ttl=l2_ttl,
+                cache_name=name,
+                client=redis_client,
+                **redis_kwargs,
+            )
+        )
+    return AsyncTieredCache(name, tiers)
+
+
+def get_all_cache_stats() -> Dict[str, Any]:
+    """Statistics for every live cache, keyed by cache name."""
+    stats: Dict[str, Any] = {}
+    for cache in list(_registry):
+        entry = cache.get_stats()
+        if cache.name in stats:
+            # Several instances share a name; keep them side by side
+            existing = stats[cache.name]
+            stats[cache.name] = existing if isinstance(existing, list) else [existing]
+            stats[cache.name].append(entry)
+        else:
+            stats[cache.name] = entry
+    return stats
+
+
+__all__ = [
+    "TieredCache",
+    "AsyncTieredCache",
+    "create_cache",
+    "create_async_cache",
+    "get_all_cache_stats",
+]
@@ -0,0 +1,859 @@
+"""
+Cache Tiers
+
+Pluggable storage tiers for the unified cache:
+- MemoryTier: in-process LRU with per-entry TTL, entry and byte bounds
+- RedisTier: shared Redis tier (sync client)
+- AsyncRedisTier: shared Redis tier (redis.asyncio client)
+
+All tiers maintain a reverse tag index (tag -> keys) so that entries can be
+invalidated by user, collection or document without scanning the keyspace.
+Remote tiers store the index as Redis sets.
+"""
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .metrics import CacheStats, record_cache_size
+from .serializer import CacheSerializer, estimate_size, get_serializer
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Sentinel distinguishing "not cached" from a cached falsy value
+MISSING: Any = object()
+
+
+class CacheTier(ABC):
+    """Abstract base for a single cache tier."""
+
+    name: str = "tier"
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Get a value, returning ``MISSING`` on miss."""
+        ...
+
+    @abstractmethod
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Store a value with optional TTL (seconds) and tags."""
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> Any:
+        """Delete a key."""
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> Any:
+        """Delete every key carrying any of ``tags``. Returns count."""
+        ...
+
+    @abstractmethod
+    def clear(self) -> Any:
+        """Remove every entry owned by this tier."""
+        ...
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier statistics."""
+        ...
+
+
+# ============================================================================
+# In-memory tier
+# ============================================================================
+
+
+class _Entry:
+    """A single in-memory cache entry."""
+
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: Optional[float],
+        size: int,
+        tags: Tuple[str, ...],
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+
+
+class MemoryTier(CacheTier):
+    """
+    Thread-safe in-process LRU tier.
+
+    - O(1) get/set/delete via OrderedDict
+    - Per-entry TTL checked lazily on access; expired entries that are never
+      read again age out through the LRU end
+    - Bounded by entry count and, optionally, by estimated payload bytes
+    - Reverse tag index for O(affected keys) invalidation
+
+    Values are stored as live Python objects (no serialization on the hot path).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[int] = None,
+        cache_name: str = "cache",
+        name: str = "l1",
+        sizer: Optional[Callable[[Any], int]] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Initialize memory tier.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum estimated payload size (None for unbounded)
+            default_ttl: TTL used when ``set`` gets none (None/0 = no expiry)
+            cache_name: Owning cache name (metrics label)
+            name: Tier name (metrics label)
+            sizer: Function estimating a value's size in bytes
+            on_evict: Callback invoked with (key, value) on capacity eviction
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.name = name
+        self.stats = CacheStats(cache_name, name)
+        self._sizer = sizer or estimate_size
+        self._on_evict = on_evict
+
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    # --- internal helpers (caller holds the lock) ---
+
+    def _unlink(self, key: str) -> Optional[_Entry]:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        return entry
+
+    def _evict_for(self, incoming_size: int) -> List[Tuple[str, Any]]:
+        evicted: List[Tuple[str, Any]] = []
+        while self._data and (
+            len(self._data) >= self.max_entries
+            or (self.max_bytes is not None and self._bytes + incoming_size > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            entry = self._unlink(key)
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self.stats.record("expiration")
+            else:
+                self.stats.record("eviction")
+                evicted.append((key, entry.value))
+        return evicted
+
+    # --- public API ---
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Get value, returning ``default`` on miss or expiry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.record("miss")
+                return default
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._unlink(key)
+                self.stats.record("expiration")
+                self.stats.record("miss")
+                return default
+            self._data.move_to_end(key)
+            self.stats.record("hit")
+            return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> List[Tuple[str, Any]]:
+        """
+        Store a value.
+
+        Returns:
+            List of (key, value) pairs evicted to make room. The ``on_evict``
+            callback, if configured, has already been called for them.
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = self._sizer(value) if self.max_bytes is not None else 0
+        tags = tuple(tags)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Larger than the whole tier; caching it would flush everything
+            with self._lock:
+                self._unlink(key)
+            return []
+
+        with self._lock:
+            self._unlink(key)
+            evicted = self._evict_for(size)
+            self._data[key] = _Entry(value, expires_at, size, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            self.stats.record("set")
+
+        if self._on_evict:
+            for evicted_key, evicted_value in evicted:
+                try:
+                    self._on_evict(evicted_key, evicted_value)
+                except Exception as e:
+                    logger.warning(f"Cache eviction callback failed for {evicted_key}: {e}")
+        return evicted
+
+    def delete(self, key: str) -> bool:
+        """Delete a key. Returns True if it was present."""
+        with self._lock:
+            return self._unlink(key) is not None
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove a key and return its value."""
+        with self._lock:
+            entry = self._unlink(key)
+            return entry.value if entry is not None else default
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every entry carrying any of ``tags``."""
+        count = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tag_index.get(tag, ())):
+                    if self._unlink(key) is not None:
+                        count += 1
+        if count:
+            self.stats.record("invalidation", count)
+        return count
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Delete every key starting with ``prefix``.
+
+        Linear in the number of entries; prefer tags for hot invalidation paths.
+        """
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for key in keys:
+                self._unlink(key)
+        if keys:
+            self.stats.record("invalidation", len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self._tag_index.clear()
+            self._bytes = 0
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Snapshot of live (non-expired) entries, LRU first."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (k, e.value)
+                for k, e in self._data.items()
+                if e.expires_at is None or e.expires_at > now
+            ]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        # Membership checks must not count as hits/misses or refresh the LRU
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (
+                entry.expires_at is None or entry.expires_at > time.monotonic()
+            )
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated payload bytes (0 when the tier is not byte-bounded)."""
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tier statistics."""
+        with self._lock:
+            entries, size_bytes, tags = len(self._data), self._bytes, len(self._tag_index)
+        record_cache_size(self.stats.cache, self.name, entries, size_bytes)
+        return {
+            "tier": self.name,
+            "type": "memory",
+            "size": entries,
+            "max_size": self.max_entries,
+            "bytes": size_bytes,
+            "max_bytes": self.max_bytes,
+            "tags": tags,
+            "default_ttl": self.default_ttl,
+            **self.stats.to_dict(),
+        }
+
+
+# ============================================================================
+# Redis tiers
+# ============================================================================
+
+
+class _RedisTierBase:
+    """Key layout and serialization shared by the sync and async Redis tiers."""
+
+    def __init__(
+        self,
+        url: Optional[str],
+        key_prefix: str,
+        default_ttl: int,
+        cache_name: str,
+        name: str,
+        serializer: Optional[CacheSerializer],
+        client: Any,
+        retry_interval: float,
+    ):
+        self.url = url or REDIS_URL
+        self.key_prefix = key_prefix
+        self.default_ttl = default_ttl
+        self.name = name
+        self.stats = CacheStats(cache_name, name)
+        self.retry_interval = retry_interval
+
+        self._client = client
+        self._owns_client = client is None
+        self._available: Optional[bool] = True if client is not None else None
+        self._next_retry = 0.0
+        # Tag sets must outlive every member key; track the longest TTL used
+        self._max_ttl = default_ttl
+
+        if serializer is None:
+            decode = False
+            if client is not None:
+                pool = getattr(client, "connection_pool", None)
+                decode = bool(getattr(pool, "connection_kwargs", {}).get("decode_responses"))
+            serializer = CacheSerializer(text_mode=True) if decode else get_serializer()
+        self.serializer = serializer
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}__tag__:{tag}"
+
+    def _should_connect(self) -> bool:
+        return self._available is not False or time.monotonic() >= self._next_retry
+
+    def _mark_unavailable(self, error: Exception) -> None:
+        if self._available is not False:
+            logger.warning(f"Cache tier {self.stats.cache}/{self.name} unavailable: {error}")
+        self._available = False
+        self._next_retry = time.monotonic() + self.retry_interval
+        if self._owns_client:
+            self._client = None
+
+    def _encode(self, value: Any, tags: Tuple[str, ...]) -> Any:
+        # Tags travel with the value so promotions into L1 keep them
+        return self.serializer.dumps([value, list(tags)] if tags else [value])
+
+    def _decode(self, data: Any) -> Tuple[Any, Tuple[str, ...]]:
+        decoded = self.serializer.loads(data)
+        if isinstance(decoded, list) and 1 <= len(decoded) <= 2:
+            tags = tuple(decoded[1]) if len(decoded) == 2 else ()
+            return decoded[0], tags
+        # Legacy payload written before the unified cache
+        return decoded, ()
+
+    def _ttl(self, ttl: Optional[int]) -> int:
+        ttl = ttl or self.default_ttl
+        if ttl > self._max_ttl:
+            self._max_ttl = ttl
+        return ttl
+
+    def _base_stats(self) -> Dict[str, Any]:
+        return {
+            "tier": self.name,
+            "type": "redis",
+            "available": bool(self._available),
+            "key_prefix": self.key_prefix,
+            "default_ttl": self.default_ttl,
+            **self.stats.to_dict(),
+        }
+
+
+class RedisTier(_RedisTierBase, CacheTier):
+    """
+    Shared Redis tier using the synchronous redis-py client.
+
+    Connection failures disable the tier for ``retry_interval`` seconds
+    instead of permanently, so a Redis restart does not leave every worker
+    running L1-only until redeploy.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key_prefix: str = "cache:",
+        default_ttl: int = 300,
+        cache_name: str = "cache",
+        name: str = "l2",
+        serializer: Optional[CacheSerializer] = None,
+        client: Any = None,
+        retry_interval: float = 30.0,
+        socket_timeout: float = 1.0,
+    ):
+        super().__init__(
+            url, key_prefix, default_ttl, cache_name, name, serializer, client, retry_interval
+        )
+        self.socket_timeout = socket_timeout
+        self._connect_lock = threading.Lock()
+
+    def _get_client(self):
+        """Get or lazily create the Redis client."""
+        if self._client is not None:
+            return self._client
+        if not self._should_connect():
+            return None
+
+        with self._connect_lock:
+            if self._client is not None:
+                return self._client
+            try:
+                import redis
+
+                client = redis.from_url(
+                    self.url,
+                    decode_responses=False,
+                    socket_connect_timeout=2.0,
+                    socket_timeout=self.socket_timeout,
+                )
+                client.ping()
+                self._client = client
+                self._available = True
+                logger.info(f"✅ Cache tier {self.stats.cache}/{self.name} connected to Redis")
+            except Exception as e:
+                self._mark_unavailable(e)
+            return self._client
+
+    def get(self, key: str) -> Any:
+        value, _ = self.get_entry(key)
+        return value
+
+    def get_entry(self, key: str) -> Tuple[Any, Tuple[str, ...]]:
+        """Get (value, tags), value is ``MISSING`` on miss."""
+        client = self._get_client()
+        if client is None:
+            return MISSING, ()
+        try:
+            data = client.get(self._key(key))
+        except Exception as e:
+            self.stats.record("error")
+            self._mark_unavailable(e)
+            return MISSING, ()
+        if data is None:
+            self.stats.record("miss")
+            return MISSING, ()
+        try:
+            value, tags = self._decode(data)
+        except ValueError as e:
+            logger.debug(f"Undecodable cache entry {key}: {e}")
+            self.stats.record("miss")
+            return MISSING, ()
+        self.stats.record("hit")
+        return value, tags
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        client = self._get_client()
+        if client is None:
+            return False
+        tags = tuple(tags)
+        ttl = self._ttl(ttl)
+        try:
+            data = self._encode(value, tags)
+        except TypeError as e:
+            logger.debug(f"Cache tier {self.name} skipped {key}: {e}")
+            return False
+        try:
+            pipe = client.pipeline(transaction=False)
+            redis_key = self._key(key)
+            pipe.setex(redis_key, ttl, data)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, redis_key)
+                pipe.expire(tag_key, self._max_ttl)
+            pipe.execute()
+            self.stats.record("set")
+            return True
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} set failed for {key}: {e}")
+            return False
+
+    def delete(self, key: str) -> bool:
+        client = self._get_client()
+        if client is None:
+            return False
+        try:
+            return client.delete(self._key(key)) > 0
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} delete failed for {key}: {e}")
+            return False
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        client = self._get_client()
+        if client is None:
+            return 0
+        count = 0
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                members = client.smembers(tag_key)
+                pipe = client.pipeline(transaction=False)
+                if members:
+                    pipe.delete(*members)
+                pipe.delete(tag_key)
+                results = pipe.execute()
+                if members:
+                    count += results[0]
+        except Exception as e:
+            self.stats.record("error")
+            logger.warning(f"Cache tier {self.name} tag invalidation failed: {e}")
+        if count:
+            self.stats.record("invalidation", count)
+        return count
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Delete keys starting with ``prefix`` (SCAN based, avoid on hot paths)."""
+        client = self._get_client()
+        if client is None:
+            return 0
+        count = 0
+        try:
+            batch = []
+            for redis_key in client.scan_iter(match=f"{self._key(prefix)}*", count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    count += client.delete(*batch)
+                    batch = []
+            if batch:
+                count += client.delete(*batch)
+        except Exception as e:
+            self.stats.record("error")
+            logger.warning(f"Cache tier {self.name} prefix invalidation failed: {e}")
+        if count:
+            self.stats.record("invalidation", count)
+        return count
+
+    def get_with_ttl(self, key: str) -> Tuple[Any, int]:
+        """Get (value, remaining TTL seconds); value is ``MISSING`` on miss."""
+        client = self._get_client()
+        if client is None:
+            return MISSING, -2
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self._key(key))
+            pipe.ttl(self._key(key))
+            data, remaining = pipe.execute()
+            if data is None:
+                self.stats.record("miss")
+                return MISSING, -2
+            value, _ = self._decode(data)
+            self.stats.record("hit")
+            return value, remaining
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} get_with_ttl failed for {key}: {e}")
+            return MISSING, -2
+
+    def clear(self) -> int:
+        """Delete every key under this tier's prefix."""
+        return self.invalidate_prefix("")
+
+    def health_check(self) -> bool:
+        client = self._get_client()
+        if client is None:
+            return False
+        try:
+            return bool(client.ping())
+        except Exception as e:
+            self._mark_unavailable(e)
+            return False
+
+    def close(self) -> None:
+        if self._client is not None and self._owns_client:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._base_stats()
+
+
+class AsyncRedisTier(_RedisTierBase, CacheTier):
+    """
+    Shared Redis tier using ``redis.asyncio``.
+
+    Accepts an existing async client (``client=``) so callers that already
+    own a connection pool can reuse it.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key_prefix: str = "cache:",
+        default_ttl: int = 300,
+        cache_name: str = "cache",
+        name: str = "l2",
+        serializer: Optional[CacheSerializer] = None,
+        client: Any = None,
+        retry_interval: float = 30.0,
+        max_connections: int = 10,
+        password: Optional[str] = None,
+        db: Optional[int] = None,
+    ):
+        super().__init__(
+            url, key_prefix, default_ttl, cache_name, name, serializer, client, retry_interval
+        )
+        self.max_connections = max_connections
+        self.password = password
+        self.db = db
+
+    async def connect(self) -> bool:
+        """Connect to Redis. Returns True when the tier is usable."""
+        if self._client is not None:
+            return True
+        if not self._should_connect():
+            return False
+        try:
+            import redis.asyncio as aioredis
+
+            kwargs: Dict[str, Any] = {
+                "decode_responses": False,
+                "max_connections": self.max_connections,
+                "socket_connect_timeout": 2.0,
+            }
+            if self.password:
+                kwargs["password"] = self.password
+            if self.db is not None:
+                kwargs["db"] = self.db
+            client = aioredis.from_url(self.url, **kwargs)
+            await client.ping()
+            self._client = client
+            self._available = True
+            logger.info(f"✅ Cache tier {self.stats.cache}/{self.name} connected to Redis")
+            return True
+        except Exception as e:
+            self._mark_unavailable(e)
+            return False
+
+    async def _get_client(self):
+        if self._client is None:
+            await self.connect()
+        return self._client
+
+    async def get(self, key: str) -> Any:
+        value, _ = await self.get_entry(key)
+        return value
+
+    async def get_entry(self, key: str) -> Tuple[Any, Tuple[str, ...]]:
+        """Get (value, tags), value is ``MISSING`` on miss."""
+        client = await self._get_client()
+        if client is None:
+            return MISSING, ()
+        try:
+            data = await client.get(self._key(key))
+        except Exception as e:
+            self.stats.record("error")
+            self._mark_unavailable(e)
+            return MISSING, ()
+        if data is None:
+            self.stats.record("miss")
+            return MISSING, ()
+        try:
+            value, tags = self._decode(data)
+        except ValueError as e:
+            logger.debug(f"Undecodable cache entry {key}: {e}")
+            self.stats.record("miss")
+            return MISSING, ()
+        self.stats.record("hit")
+        return value, tags
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        client = await self._get_client()
+        if client is None:
+            return False
+        tags = tuple(tags)
+        ttl = self._ttl(ttl)
+        try:
+            data = self._encode(value, tags)
+        except TypeError as e:
+            logger.debug(f"Cache tier {self.name} skipped {key}: {e}")
+            return False
+        try:
+            pipe = client.pipeline(transaction=False)
+            redis_key = self._key(key)
+            pipe.setex(redis_key, ttl, data)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, redis_key)
+                pipe.expire(tag_key, self._max_ttl)
+            await pipe.execute()
+            self.stats.record("set")
+            return True
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} set failed for {key}: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        client = await self._get_client()
+        if client is None:
+            return False
+        try:
+            return await client.delete(self._key(key)) > 0
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} delete failed for {key}: {e}")
+            return False
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        client = await self._get_client()
+        if client is None:
+            return 0
+        count = 0
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                members = await client.smembers(tag_key)
+                pipe = client.pipeline(transaction=False)
+                if members:
+                    pipe.delete(*members)
+                pipe.delete(tag_key)
+                results = await pipe.execute()
+                if members:
+                    count += results[0]
+        except Exception as e:
+            self.stats.record("error")
+            logger.warning(f"Cache tier {self.name} tag invalidation failed: {e}")
+        if count:
+            self.stats.record("invalidation", count)
+        return count
+
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Delete keys starting with ``prefix`` (SCAN based, avoid on hot paths)."""
+        client = await self._get_client()
+        if client is None:
+            return 0
+        count = 0
+        try:
+            batch = []
+            async for redis_key in client.scan_iter(match=f"{self._key(prefix)}*", count=500):
+                batch.append(redis_key)
+                if len(batch) >= 500:
+                    count += await client.delete(*batch)
+                    batch = []
+            if batch:
+                count += await client.delete(*batch)
+        except Exception as e:
+            self.stats.record("error")
+            logger.warning(f"Cache tier {self.name} prefix invalidation failed: {e}")
+        if count:
+            self.stats.record("invalidation", count)
+        return count
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, int]:
+        """Get (value, remaining TTL seconds); value is ``MISSING`` on miss."""
+        client = await self._get_client()
+        if client is None:
+            return MISSING, -2
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self._key(key))
+            pipe.ttl(self._key(key))
+            data, remaining = await pipe.execute()
+            if data is None:
+                self.stats.record("miss")
+                return MISSING, -2
+            value, _ = self._decode(data)
+            self.stats.record("hit")
+            return value, remaining
+        except Exception as e:
+            self.stats.record("error")
+            logger.debug(f"Cache tier {self.name} get_with_ttl failed for {key}: {e}")
+            return MISSING, -2
+
+    async def clear(self) -> int:
+        """Delete every key under this tier's prefix."""
+        return await self.invalidate_prefix("")
+
+    async def health_check(self) -> bool:
+        client = await self._get_client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.ping())
+        except Exception as e:
+            self._mark_unavailable(e)
+            return False
+
+    async def close(self) -> None:
+        if self._client is not None and self._owns_client:
+            try:
+                await self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._base_stats()
+
+
+__all__ = [
+    "MISSING",
+    "CacheTier",
+    "MemoryTier",
+    "RedisTier",
+    "AsyncRedisTier",
+]
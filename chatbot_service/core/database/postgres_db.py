@@ -1,18 +1,23 @@
 """
 PostgreSQL database connection module using asyncpg.
 Supports traditional relational data storage.
-Vector search is handled by ChromaDB (see rag/chromadb_store.py).
+Vector search is handled by ChromaDB (see rag/chromadb_store.py); the
+medical_knowledge_base table uses pgvector (HNSW/IVFFlat) when available.
 """
 
 import os
+import asyncio
 import logging
 import re
 import json
-from typing import Optional, List, Dict, Any, Literal
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from contextlib import asynccontextmanager
 import numpy as np
 
 from core.config.app_config import get_app_config
+from core.observability.tracing import trace_span, SpanType
 
 # Try to import database drivers
 try:
@@ -25,12 +30,139 @@ except ImportError:
 logger = logging.getLogger(__name__)
 config = get_app_config()
 
+# Per-connection prepared statement cache (asyncpg LRU; 0 disables, e.g. behind pgbouncer)
+PG_STATEMENT_CACHE_SIZE = int(os.getenv("PG_STATEMENT_CACHE_SIZE", "256"))
+PG_STATEMENT_LIFETIME = int(os.getenv("PG_STATEMENT_LIFETIME", "600"))
+
+# Connection bound by transaction()/batch() for the current task: (db, conn, task)
+_bound_connection: ContextVar[Optional[tuple]] = ContextVar("pg_bound_connection", default=None)
+
+_PERCENT_PLACEHOLDER = re.compile(r'%s')
+_NAMED_PLACEHOLDER = re.compile(r'(?<!:):([A-Za-z_]\w*)')
+
+
+@lru_cache(maxsize=2048)
+def _translate_placeholders(query: str) -> str:
+    """Convert MySQL %s placeholders to PostgreSQL $1, $2, ... (memoized)."""
+    counter = iter(range(1, query.count('%s') + 1))
+    return _PERCENT_PLACEHOLDER.sub(lambda _: f'${next(counter)}', query)
+
+
+@lru_cache(maxsize=1024)
+def _translate_named(query: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Convert :name parameters to $N (memoized).
+
+    Repeated names share one positional parameter; ``::type`` casts are
+    left alone.
+
+    Returns:
+        (converted_query, parameter names in positional order)
+    """
+    names: List[str] = []
+
+    def _replace(match):
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f'${names.index(name) + 1}'
+
+    return _NAMED_PLACEHOLDER.sub(_replace, query), tuple(names)
+
+
+# pgvector settings for medical_knowledge_base ("auto" enables it when the extension can be created)
+PGVECTOR_MODE = os.getenv("PGVECTOR_ENABLED", "auto").lower()
+KNOWLEDGE_EMBEDDING_DIM = int(os.getenv("KNOWLEDGE_EMBEDDING_DIM", "768"))
+PGVECTOR_INDEX_TYPE = os.getenv("PGVECTOR_INDEX_TYPE", "hnsw").lower()  # hnsw | ivfflat
+PGVECTOR_EF_SEARCH = int(os.getenv("PGVECTOR_EF_SEARCH", "64"))
+PGVECTOR_IVFFLAT_LISTS = int(os.getenv("PGVECTOR_IVFFLAT_LISTS", "100"))
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """pgvector text input ('[x,y,...]'), sent as text and cast server-side."""
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+# Vitals rollup bucket widths (names double as date_trunc fields)
+VITALS_ROLLUP_RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+
+# Aggregations read the coarsest resolution that still gives this many buckets
+# per window, bounding edge error to 1/N of the window
+VITALS_ROLLUP_MIN_BUCKETS = int(os.getenv("VITALS_ROLLUP_MIN_BUCKETS", "24"))
+
+_VITALS_ROLLUP_UPSERT = """
+    INSERT INTO vitals_rollups (user_id, device_id, metric_type, resolution, bucket_start,
+                                sample_count, value_sum, value_min, value_max,
+                                last_value, last_at, unit)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+    ON CONFLICT (user_id, device_id, metric_type, resolution, bucket_start) DO UPDATE SET
+        sample_count = vitals_rollups.sample_count + EXCLUDED.sample_count,
+        value_sum = vitals_rollups.value_sum + EXCLUDED.value_sum,
+        value_min = LEAST(vitals_rollups.value_min, EXCLUDED.value_min),
+        value_max = GREATEST(vitals_rollups.value_max, EXCLUDED.value_max),
+        last_value = CASE WHEN EXCLUDED.last_at >= vitals_rollups.last_at
+                          THEN EXCLUDED.last_value ELSE vitals_rollups.last_value END,
+        last_at = GREATEST(vitals_rollups.last_at, EXCLUDED.last_at),
+        unit = COALESCE(NULLIF(EXCLUDED.unit, ''), vitals_rollups.unit)
+"""
+
+
+def choose_rollup_resolution(hours: float) -> str:
+    """Coarsest rollup resolution giving at least VITALS_ROLLUP_MIN_BUCKETS buckets for the window."""
+    window_seconds = hours * 3600
+    for resolution, width in sorted(VITALS_ROLLUP_RESOLUTIONS.items(), key=lambda item: -item[1]):
+        if width * VITALS_ROLLUP_MIN_BUCKETS <= window_seconds:
+            return resolution
+    return "minute"
+
+
+def _truncate_timestamp(ts, resolution: str):
+    if resolution == "minute":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rollup_records(rows: List[tuple]) -> List[tuple]:
+    """
+    Pre-aggregate readings into rollup upsert records.
+
+    Args:
+        rows: (device_id, user_id, metric_type, value, unit, recorded_at) tuples
+
+    Returns:
+        Records for _VITALS_ROLLUP_UPSERT, sorted by key so concurrent
+        upserts lock rows in the same order
+    """
+    buckets: Dict[tuple, list] = {}
+    for device_id, user_id, metric_type, value, unit, recorded_at in rows:
+        for resolution in VITALS_ROLLUP_RESOLUTIONS:
+            key = (user_id, device_id or "", metric_type, resolution,
+                   _truncate_timestamp(recorded_at, resolution))
+            agg = buckets.get(key)
+            if agg is None:
+                buckets[key] = [1, value, value, value, value, recorded_at, unit or ""]
+                continue
+            agg[0] += 1
+            agg[1] += value
+            agg[2] = min(agg[2], value)
+            agg[3] = max(agg[3], value)
+            if recorded_at >= agg[5]:
+                agg[4], agg[5] = value, recorded_at
+            if unit:
+                agg[6] = unit
+    return [key + tuple(agg) for key, agg in sorted(buckets.items(), key=lambda item: item[0])]
+
+
 class PostgresDatabase:
     """Database connector for PostgreSQL with vector search support."""
 
     def __init__(self):
         self.pool: Optional[object] = None
         self.initialized = False
+        self.pgvector_available = False
+        self.pgvector_iterative_scan = False
         
         # Connection settings from AppConfig
         self.host = config.database.host
@@ -55,6 +187,9 @@ class PostgresDatabase:
                 database=self.database,
                 min_size=config.database.pool_min_size if hasattr(config.database, 'pool_min_size') else 10,
                 max_size=config.database.pool_max_size if hasattr(config.database, 'pool_max_size') else 30,
+                # Parameterized queries are prepared once per connection and reused
+                statement_cache_size=PG_STATEMENT_CACHE_SIZE,
+                max_cached_statement_lifetime=PG_STATEMENT_LIFETIME,
             )
             
             logger.info(f"✓ PostgreSQL pool created at {self.host}:{self.port}")
@@ -102,58 +237,126 @@ class PostgresDatabase:
         finally:
             await self.pool.release(conn)
 
+    def _current_connection(self):
+        """Connection bound by transaction()/batch() in this task, if any."""
+        bound = _bound_connection.get()
+        if bound is not None and bound[0] is self and bound[2] is asyncio.current_task():
+            return bound[1]
+        return None
+
+    @asynccontextmanager
+    async def batch(self):
+        """
+        Run several queries on one pooled connection (no transaction).
+
+        Every execute_query()/fetch_*() call made by this task inside the
+        block reuses the connection instead of acquiring its own. Do not
+        issue concurrent queries (e.g. asyncio.gather) inside the block.
+
+        Usage:
+            async with db.batch():
+                user = await db.fetch_one(...)
+                prefs = await db.fetch_all(...)
+        """
+        conn = self._current_connection()
+        if conn is not None:
+            yield conn
+            return
+        async with self.get_connection() as conn:
+            token = _bound_connection.set((self, conn, asyncio.current_task()))
+            try:
+                yield conn
+            finally:
+                _bound_connection.reset(token)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several queries atomically on one pooled connection.
+
+        Like batch(), but wrapped in a transaction (a savepoint when nested).
+
+        Usage:
+            async with db.transaction():
+                await db.execute_query("INSERT ...", params)
+                await db.execute_query("UPDATE ...", params)
+        """
+        async with self.batch() as conn:
+            async with conn.transaction():
+                yield conn
+
     async def execute_query(
         self, 
         query: str, 
         params: tuple = None,
         operation: Literal["read", "write"] = "write",
         fetch_one: bool = False,
-        fetch_all: bool = False
+        fetch_all: bool = False,
+        as_dict: bool = True,
     ):
-        """Execute query with asyncpg."""
+        """
+        Execute query with asyncpg.
+
+        Args:
+            query: SQL with %s (or $N) placeholders
+            params: Positional parameters
+            operation: "read" or "write" (informational)
+            fetch_one: Return the first row
+            fetch_all: Return all rows
+            as_dict: Copy rows into dicts; False returns asyncpg Records
+                (read-only mappings, no per-row copy)
+        """
         if not self.pool:
             return None
             
-        # Convert %s to $1, $2, etc. for asyncpg
-        query = self._convert_placeholders(query)
-        
+        # Convert %s to $1, $2, etc. for asyncpg (memoized per query text,
+        # so the text stays stable for the statement cache)
+        query = _translate_placeholders(query)
+        args = params or ()
+
+        conn = self._current_connection()
+        if conn is not None:
+            return await self._run_query(conn, query, args, fetch_one, fetch_all, as_dict)
         async with self.pool.acquire() as conn:
+            return await self._run_query(conn, query, args, fetch_one, fetch_all, as_dict)
+
+    @staticmethod
+    async def _run_query(conn, query: str, args: tuple, fetch_one: bool, fetch_all: bool, as_dict: bool):
+        verb = query.lstrip().split(None, 1)[0].upper() if query.strip() else "QUERY"
+        async with trace_span(
+            f"db_query:{verb}",
+            SpanType.DB_QUERY,
+            {"db.system": "postgresql", "db.operation": verb, "db.statement": query[:200]},
+        ):
             if fetch_one:
-                result = await conn.fetchrow(query, *(params or ()))
-                return dict(result) if result else None
+                result = await conn.fetchrow(query, *args)
+                if result is None:
+                    return None
+                return dict(result) if as_dict else result
             elif fetch_all:
-                results = await conn.fetch(query, *(params or ()))
-                return [dict(r) for r in results]
+                results = await conn.fetch(query, *args)
+                return [dict(r) for r in results] if as_dict else results
             else:
-                return await conn.execute(query, *(params or ()))
+                return await conn.execute(query, *args)
 
     def _convert_placeholders(self, query: str) -> str:
         """Convert MySQL %s placeholders to PostgreSQL $1, $2, etc."""
-        count = 1
-        while '%s' in query:
-            query = query.replace('%s', f'${count}', 1)
-            count += 1
-        return query
+        return _translate_placeholders(query)
 
-    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
-        return await self.execute_query(query, params, operation="read", fetch_all=True) or []
+    async def fetch_all(self, query: str, params: tuple = None, as_dict: bool = True) -> List[Dict[str, Any]]:
+        return await self.execute_query(query, params, operation="read", fetch_all=True, as_dict=as_dict) or []
 
-    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict[str, Any]]:
-        return await self.execute_query(query, params, operation="read", fetch_one=True)
+    async def fetch_one(self, query: str, params: tuple = None, as_dict: bool = True) -> Optional[Dict[str, Any]]:
+        return await self.execute_query(query, params, operation="read", fetch_one=True, as_dict=as_dict)
 
     async def execute_select(self, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Execute SELECT with named parameters."""
         if params is None:
             params = {}
         
-        # Find all :param_name occurrences
-        param_names = re.findall(r':(\w+)', query)
+        # Convert :param_name to $1, $2, etc. (memoized per query text)
+        converted_query, param_names = _translate_named(query)
         param_values = tuple(params.get(name) for name in param_names)
-        
-        # Convert :param_name to $1, $2, etc.
-        converted_query = query
-        for i, name in enumerate(param_names):
-            converted_query = converted_query.replace(f':{name}', f'${i+1}')
             
         return await self.fetch_all(converted_query, param_values)
 
@@ -165,11 +368,20 @@ class PostgresDatabase:
         value: float,
         unit: str = "",
     ) -> bool:
+        if not self.pool:
+            return False
         try:
-            await self.execute_query(
-                "INSERT INTO vitals (user_id, device_id, metric_type, value, unit) VALUES (%s, %s, %s, %s, %s)",
-                (user_id, device_id, metric_type, value, unit)
-            )
+            async with self.batch() as conn:
+                async with conn.transaction():
+                    recorded_at = await conn.fetchval(
+                        """INSERT INTO vitals (user_id, device_id, metric_type, value, unit, recorded_at)
+                           VALUES ($1, $2, $3, $4, $5, (now() AT TIME ZONE 'UTC'))
+                           RETURNING recorded_at""",
+                        user_id, device_id, metric_type, value, unit
+                    )
+                    await self._upsert_vitals_rollups(
+                        conn, [(device_id, user_id, metric_type, value, unit, recorded_at)]
+                    )
             return True
         except Exception as e:
             logger.error(f"Failed to store vitals: {e}")
@@ -202,6 +414,62 @@ class PostgresDatabase:
             logger.error(f"Failed to retrieve vitals: {e}")
             return []
 
+    async def _ensure_pgvector(self, conn) -> None:
+        """
+        Add the embedding_vec column and ANN index when pgvector is available.
+
+        Existing JSONB embeddings of the configured dimension are backfilled
+        into the vector column once, and rows stored with only the vector
+        get their JSONB copy back for the application-level fallback.
+        """
+        if PGVECTOR_MODE in ("false", "0", "off"):
+            return
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            version = await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            await conn.execute(
+                f"ALTER TABLE medical_knowledge_base "
+                f"ADD COLUMN IF NOT EXISTS embedding_vec vector({KNOWLEDGE_EMBEDDING_DIM})"
+            )
+            backfilled = await conn.execute(
+                """UPDATE medical_knowledge_base
+                   SET embedding_vec = embedding::text::vector
+                   WHERE embedding_vec IS NULL
+                     AND jsonb_typeof(embedding) = 'array'
+                     AND jsonb_array_length(embedding) = $1""",
+                KNOWLEDGE_EMBEDDING_DIM
+            )
+            # pgvector's text form ([1,2,...]) is a valid JSON array
+            await conn.execute(
+                """UPDATE medical_knowledge_base
+                   SET embedding = embedding_vec::text::jsonb
+                   WHERE embedding IS NULL AND embedding_vec IS NOT NULL"""
+            )
+            if PGVECTOR_INDEX_TYPE == "ivfflat":
+                await conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_medical_knowledge_embedding_ivfflat "
+                    f"ON medical_knowledge_base USING ivfflat (embedding_vec vector_cosine_ops) "
+                    f"WITH (lists = {PGVECTOR_IVFFLAT_LISTS})"
+                )
+            else:
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_medical_knowledge_embedding_hnsw "
+                    "ON medical_knowledge_base USING hnsw (embedding_vec vector_cosine_ops)"
+                )
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_medical_knowledge_content_type "
+                "ON medical_knowledge_base (content_type)"
+            )
+            self.pgvector_available = True
+            # Iterative index scans (0.8+) keep filtered HNSW queries from under-filling LIMIT
+            major, minor = (int(part) for part in (version or "0.0").split(".")[:2])
+            self.pgvector_iterative_scan = (major, minor) >= (0, 8)
+            logger.info(f"✓ pgvector {version} enabled for medical_knowledge_base ({PGVECTOR_INDEX_TYPE}; {backfilled})")
+        except Exception as e:
+            self.pgvector_available = False
+            log = logger.error if PGVECTOR_MODE in ("true", "1", "on") else logger.info
+            log(f"pgvector not available, knowledge search uses application-level fallback: {e}")
+
     async def store_medical_knowledge(
         self,
         content: str,
@@ -210,6 +478,22 @@ class PostgresDatabase:
         metadata: Dict = None,
     ) -> bool:
         try:
+            if self.pgvector_available and len(embedding) == KNOWLEDGE_EMBEDDING_DIM:
+                # Native vector column (indexed), plus the JSONB copy so the
+                # application-level fallback still sees the row
+                await self.execute_query(
+                    "INSERT INTO medical_knowledge_base (content, content_type, embedding, embedding_vec, metadata) "
+                    "VALUES ($1, $2, $3, $4::text::vector, $5)",
+                    (
+                        content,
+                        content_type,
+                        json.dumps(embedding),
+                        _vector_literal(embedding),
+                        json.dumps(metadata or {}),
+                    )
+                )
+                return True
+
             # Store embedding as JSON string or array (vector search handled by ChromaDB), 
             # here we use JSONB for embedding as per schema
             await self.execute_query(
@@ -227,15 +511,77 @@ class PostgresDatabase:
         """
         Search for similar knowledge using vector similarity.
         
-        **SECURITY**: Application-level fallback is restricted to prevent DoS.
+        With pgvector the search runs in the database as an ANN index scan
+        (ORDER BY embedding_vec <=> query LIMIT k), optionally filtered by
+        content_type, over the whole table.
         
-        Note: Primary vector search is handled by ChromaDB (rag/chromadb_store.py).
-        This is a PostgreSQL-level fallback for the medical_knowledge_base table.
+        Without pgvector this falls back to application-level similarity
+        over at most 1000 rows (restricted to prevent DoS).
         
-        In development: Uses application-level similarity with a HARD LIMIT of 1000 rows.
-        In production: Should use ChromaDB vector store instead.
+        Args:
+            query_embedding: Query vector
+            content_type: Optional content_type filter
+            limit: Number of results
+            
+        Returns:
+            Rows with id, content, content_type, metadata and similarity (cosine)
+        """
+        if self.pgvector_available and len(query_embedding) == KNOWLEDGE_EMBEDDING_DIM:
+            try:
+                return await self._search_similar_knowledge_pgvector(query_embedding, content_type, limit)
+            except Exception as e:
+                logger.error(f"pgvector knowledge search failed, using fallback: {e}")
+        return await self._search_similar_knowledge_fallback(query_embedding, content_type, limit)
+
+    async def _search_similar_knowledge_pgvector(
+        self, query_embedding: List[float], content_type: Optional[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        params: List[Any] = [_vector_literal(query_embedding), limit]
+        where = "embedding_vec IS NOT NULL"
+        if content_type:
+            params.append(content_type)
+            where += " AND content_type = $3"
+
+        async with self.transaction() as conn:
+            if PGVECTOR_INDEX_TYPE == "ivfflat":
+                await conn.execute(f"SET LOCAL ivfflat.probes = {max(1, PGVECTOR_IVFFLAT_LISTS // 10)}")
+            else:
+                await conn.execute(f"SET LOCAL hnsw.ef_search = {max(PGVECTOR_EF_SEARCH, limit)}")
+                if content_type and self.pgvector_iterative_scan:
+                    await conn.execute("SET LOCAL hnsw.iterative_scan = relaxed_order")
+            rows = await self.fetch_all(
+                f"""SELECT id, content, content_type, metadata,
+                           embedding_vec <=> $1::text::vector AS distance
+                    FROM medical_knowledge_base
+                    WHERE {where}
+                    ORDER BY embedding_vec <=> $1::text::vector
+                    LIMIT $2""",
+                tuple(params),
+                as_dict=False
+            )
+
+        results = [
+            {
+                "id": row['id'],
+                "content": row['content'],
+                "content_type": row['content_type'],
+                "metadata": row['metadata'] if isinstance(row['metadata'], dict) else json.loads(row['metadata'] or '{}'),
+                "similarity": 1.0 - float(row['distance']),
+            }
+            for row in rows
+        ]
+        # relaxed_order scans may return near-ordered rows
+        results.sort(key=lambda x: x['similarity'], reverse=True)
+        return results
+
+    async def _search_similar_knowledge_fallback(
+        self, query_embedding: List[float], content_type: Optional[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Application-level similarity over a bounded slice of the table.
         
-        This prevents memory exhaustion from fetching entire knowledge bases into memory.
+        **SECURITY**: Restricted to a HARD LIMIT of 1000 rows to prevent
+        memory exhaustion from fetching entire knowledge bases into memory.
         """
         try:
             # Application-level similarity (fallback only; use ChromaDB for production)
@@ -591,6 +937,28 @@ class PostgresDatabase:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """,
+            # ---------- Vitals Rollups (maintained on ingest) ----------
+            """
+            CREATE TABLE IF NOT EXISTS vitals_rollups (
+                user_id VARCHAR(255) NOT NULL,
+                device_id VARCHAR(255) NOT NULL DEFAULT '',
+                metric_type VARCHAR(50) NOT NULL,
+                resolution VARCHAR(8) NOT NULL,
+                bucket_start TIMESTAMP NOT NULL,
+                sample_count BIGINT NOT NULL,
+                value_sum DOUBLE PRECISION NOT NULL,
+                value_min DOUBLE PRECISION NOT NULL,
+                value_max DOUBLE PRECISION NOT NULL,
+                last_value DOUBLE PRECISION NOT NULL,
+                last_at TIMESTAMP NOT NULL,
+                unit VARCHAR(20) DEFAULT '',
+                PRIMARY KEY (user_id, device_id, metric_type, resolution, bucket_start)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_vitals_rollups_device
+                ON vitals_rollups (device_id, metric_type, resolution, bucket_start)
+            """,
             # ---------- Consent System ----------
             """
             CREATE TABLE IF NOT EXISTS user_consents (
@@ -718,6 +1086,20 @@ class PostgresDatabase:
                 for sql in tables_sql:
                     await conn.execute(sql)
                 
+                # Backfill vitals rollups once from existing raw vitals
+                try:
+                    needs_backfill = await conn.fetchval(
+                        "SELECT NOT EXISTS (SELECT 1 FROM vitals_rollups) AND EXISTS (SELECT 1 FROM vitals)"
+                    )
+                    if needs_backfill:
+                        logger.info("Backfilling vitals_rollups from vitals")
+                        await self._rebuild_vitals_rollups(conn)
+                except Exception as e:
+                    logger.warning(f"Vitals rollup backfill failed: {e}")
+
+                # pgvector column/index for knowledge search (no-op when unavailable)
+                await self._ensure_pgvector(conn)
+
                 # Seed default user if not exists
                 await conn.execute("""
                     INSERT INTO users (user_id, name, email, date_of_birth, gender, weight_kg, height_cm)
@@ -871,38 +1253,40 @@ class PostgresDatabase:
             if shared_data and isinstance(shared_data, dict):
                 shared_data = _json.dumps(shared_data)
 
-            await self.execute_query(
-                """INSERT INTO appointments (
-                    appointment_id, user_id, provider_id, doctor_name, specialty,
-                    doctor_rating, date, time, duration_minutes, appointment_type,
-                    location, virtual_link, reason, intake_summary, shared_chart_data,
-                    insurance_provider, insurance_member_id, insurance_group_id,
-                    status, estimated_cost
-                ) VALUES (
-                    %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s
-                )""",
-                (
-                    data['appointment_id'], data['user_id'], data['provider_id'],
-                    data['doctor_name'], data.get('specialty'),
-                    data.get('doctor_rating'), data['date'], data['time'],
-                    data.get('duration_minutes', 30), data.get('appointment_type', 'in-person'),
-                    data.get('location'), data.get('virtual_link'),
-                    data.get('reason'), data.get('intake_summary'),
-                    shared_data,
-                    data.get('insurance_provider'), data.get('insurance_member_id'),
-                    data.get('insurance_group_id'),
-                    data.get('status', 'scheduled'), data.get('estimated_cost', 150.0),
+            # Insert, slot booking and read-back share one connection and commit together
+            async with self.transaction():
+                await self.execute_query(
+                    """INSERT INTO appointments (
+                        appointment_id, user_id, provider_id, doctor_name, specialty,
+                        doctor_rating, date, time, duration_minutes, appointment_type,
+                        location, virtual_link, reason, intake_summary, shared_chart_data,
+                        insurance_provider, insurance_member_id, insurance_group_id,
+                        status, estimated_cost
+                    ) VALUES (
+                        %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s, %s,
+                        %s, %s, %s,
+                        %s, %s
+                    )""",
+                    (
+                        data['appointment_id'], data['user_id'], data['provider_id'],
+                        data['doctor_name'], data.get('specialty'),
+                        data.get('doctor_rating'), data['date'], data['time'],
+                        data.get('duration_minutes', 30), data.get('appointment_type', 'in-person'),
+                        data.get('location'), data.get('virtual_link'),
+                        data.get('reason'), data.get('intake_summary'),
+                        shared_data,
+                        data.get('insurance_provider'), data.get('insurance_member_id'),
+                        data.get('insurance_group_id'),
+                        data.get('status', 'scheduled'), data.get('estimated_cost', 150.0),
+                    )
                 )
-            )
 
-            # Mark the time slot as booked
-            await self.book_slot(data['provider_id'], data['date'], data['time'])
+                # Mark the time slot as booked
+                await self.book_slot(data['provider_id'], data['date'], data['time'])
 
-            return await self.get_appointment_by_id(data['appointment_id'])
+                return await self.get_appointment_by_id(data['appointment_id'])
         except Exception as e:
             logger.error(f"Failed to create appointment: {e}")
             return None
@@ -989,20 +1373,21 @@ class PostgresDatabase:
     ) -> Optional[Dict[str, Any]]:
         """Cancel an appointment and release the time slot."""
         try:
-            appt = await self.get_appointment_by_id(appointment_id)
-            if not appt:
-                return None
+            async with self.transaction():
+                appt = await self.get_appointment_by_id(appointment_id)
+                if not appt:
+                    return None
 
-            updates = {'status': 'cancelled'}
-            if reason:
-                updates['cancellation_reason'] = reason
+                updates = {'status': 'cancelled'}
+                if reason:
+                    updates['cancellation_reason'] = reason
 
-            result = await self.update_appointment(appointment_id, updates)
+                result = await self.update_appointment(appointment_id, updates)
 
-            # Release the booked slot
-            await self.release_slot(appt['provider_id'], appt['date'], appt['time'])
+                # Release the booked slot
+                await self.release_slot(appt['provider_id'], appt['date'], appt['time'])
 
-            return result
+                return result
         except Exception as e:
             logger.error(f"Failed to cancel appointment {appointment_id}: {e}")
             return None
@@ -1101,7 +1486,8 @@ class PostgresDatabase:
                        revoked_at = CASE WHEN EXCLUDED.granted THEN NULL ELSE CURRENT_TIMESTAMP END,
                        updated_at = CURRENT_TIMESTAMP
                    RETURNING *""",
-                (user_id, consent_type, granted, description, required, granted, granted)
+                (user_id, consent_type, granted, description, required, granted, granted),
+                as_dict=False
             )
             return dict(result) if result else None
         except Exception as e:
@@ -1397,21 +1783,64 @@ class PostgresDatabase:
     async def store_device_timeseries(self, device_id: str, user_id: str,
                                        metric_type: str, value: float,
                                        unit: str = '', timestamp: str = None) -> bool:
-        """Store a single vitals data point in device_timeseries."""
+        """Store a single vitals data point in device_timeseries (and vitals/rollups)."""
+        from core.services.vitals_ingest import parse_timestamp
         try:
-            ts = timestamp or "CURRENT_TIMESTAMP"
-            await self.execute_query(
-                """INSERT INTO device_timeseries (device_id, metric_type, value, unit, recorded_at)
-                   VALUES (%s, %s, %s, %s, COALESCE(%s::TIMESTAMP, CURRENT_TIMESTAMP))""",
-                (device_id, metric_type, value, unit, timestamp)
-            )
-            # Also store in vitals table for user-centric queries
-            await self.store_vitals(user_id, device_id, metric_type, value, unit)
+            row = (device_id, user_id, metric_type, float(value), unit or '', parse_timestamp(timestamp))
+            await self.store_device_timeseries_bulk([row])
             return True
         except Exception as e:
             logger.error(f"Failed to store timeseries for device {device_id}: {e}")
             return False
 
+    async def store_device_timeseries_bulk(self, rows: List[tuple],
+                                           idempotency_key: str = None) -> int:
+        """
+        Store many vitals data points in one transaction.
+
+        Writes device_timeseries and vitals with COPY on a single pooled
+        connection, instead of two INSERTs (and two pool acquisitions) per
+        point, and folds the batch into vitals_rollups.
+
+        Args:
+            rows: (device_id, user_id, metric_type, value, unit, recorded_at)
+                tuples; recorded_at is a naive UTC datetime
+            idempotency_key: Optional batch key stored on device_timeseries rows
+
+        Returns:
+            Number of points written
+
+        Raises:
+            RuntimeError: If the pool is not initialized
+            asyncpg.PostgresError: If the copy fails (nothing is written)
+        """
+        if not rows:
+            return 0
+        if not self.pool:
+            raise RuntimeError("PostgreSQL pool not initialized. Call await initialize() first.")
+
+        async with self.batch() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    "device_timeseries",
+                    records=[
+                        (device_id, metric_type, value, unit, recorded_at, idempotency_key)
+                        for device_id, _, metric_type, value, unit, recorded_at in rows
+                    ],
+                    columns=["device_id", "metric_type", "value", "unit", "recorded_at", "idempotency_key"],
+                )
+                # Also store in vitals table for user-centric queries
+                await conn.copy_records_to_table(
+                    "vitals",
+                    records=[
+                        (user_id, device_id, metric_type, value, unit, recorded_at)
+                        for device_id, user_id, metric_type, value, unit, recorded_at in rows
+                    ],
+                    columns=["user_id", "device_id", "metric_type", "value", "unit", "recorded_at"],
+                )
+                await self._upsert_vitals_rollups(conn, rows)
+        return len(rows)
+
     async def get_device_timeseries(self, device_id: str, metric_type: str,
                                      hours: int = 24) -> List[Dict[str, Any]]:
         """Get time-series vitals for a device within a time window."""
@@ -1419,7 +1848,7 @@ class PostgresDatabase:
             return await self.fetch_all(
                 """SELECT * FROM device_timeseries
                    WHERE device_id = %s AND metric_type = %s
-                     AND recorded_at >= (CURRENT_TIMESTAMP - INTERVAL '%s hours')
+                     AND recorded_at >= (CURRENT_TIMESTAMP - make_interval(hours => %s))
                    ORDER BY recorded_at""",
                 (device_id, metric_type, hours)
             )
@@ -1427,6 +1856,95 @@ class PostgresDatabase:
             logger.error(f"Failed to get timeseries for device {device_id}: {e}")
             return []
 
+    # ========================================================================
+    # Vitals Rollups
+    # ========================================================================
+
+    async def _upsert_vitals_rollups(self, conn, rows: List[tuple]) -> None:
+        """Fold readings into minute/hour/day rollups (caller owns the transaction)."""
+        records = _rollup_records(rows)
+        if records:
+            await conn.executemany(_VITALS_ROLLUP_UPSERT, records)
+
+    async def _rebuild_vitals_rollups(self, conn) -> None:
+        async with conn.transaction():
+            await conn.execute("DELETE FROM vitals_rollups")
+            for resolution in VITALS_ROLLUP_RESOLUTIONS:
+                await conn.execute(
+                    """INSERT INTO vitals_rollups (user_id, device_id, metric_type, resolution, bucket_start,
+                                                   sample_count, value_sum, value_min, value_max,
+                                                   last_value, last_at, unit)
+                       SELECT user_id, COALESCE(device_id, ''), metric_type, $1::text,
+                              date_trunc($1::text, recorded_at),
+                              COUNT(*), SUM(value), MIN(value), MAX(value),
+                              (array_agg(value ORDER BY recorded_at DESC))[1], MAX(recorded_at),
+                              COALESCE(MAX(unit), '')
+                       FROM vitals
+                       WHERE value IS NOT NULL AND metric_type IS NOT NULL AND recorded_at IS NOT NULL
+                       GROUP BY user_id, COALESCE(device_id, ''), metric_type, date_trunc($1::text, recorded_at)""",
+                    resolution
+                )
+
+    async def rebuild_vitals_rollups(self) -> bool:
+        """Recompute vitals_rollups from the raw vitals table."""
+        if not self.pool:
+            return False
+        try:
+            async with self.batch() as conn:
+                await self._rebuild_vitals_rollups(conn)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to rebuild vitals rollups: {e}")
+            return False
+
+    async def get_vitals_aggregate(self, metric_type: str, hours: float,
+                                   device_id: str = None, user_id: str = None) -> Dict[str, Any]:
+        """
+        Aggregate a metric over a trailing window from the rollup tables.
+
+        The database aggregates the coarsest buckets that still give
+        VITALS_ROLLUP_MIN_BUCKETS buckets per window; the window start is
+        aligned down to a bucket boundary.
+
+        Args:
+            metric_type: Metric to aggregate (e.g. heart_rate)
+            hours: Window length in hours
+            device_id: Restrict to a device
+            user_id: Restrict to a user
+
+        Returns:
+            Dict with data_points, min_value, max_value, avg_value,
+            latest_value, unit and resolution (empty dict on error)
+        """
+        resolution = choose_rollup_resolution(hours)
+        filters = ["metric_type = $1", "resolution = $2"]
+        params: List[Any] = [metric_type, resolution, float(hours) * 3600]
+        if device_id is not None:
+            params.append(device_id)
+            filters.append(f"device_id = ${len(params)}")
+        if user_id is not None:
+            params.append(user_id)
+            filters.append(f"user_id = ${len(params)}")
+        where_clause = " AND ".join(filters)
+        try:
+            result = await self.fetch_one(
+                f"""SELECT COALESCE(SUM(sample_count), 0)::BIGINT AS data_points,
+                           MIN(value_min) AS min_value,
+                           MAX(value_max) AS max_value,
+                           SUM(value_sum) / NULLIF(SUM(sample_count), 0) AS avg_value,
+                           (array_agg(last_value ORDER BY last_at DESC))[1] AS latest_value,
+                           MAX(unit) AS unit
+                    FROM vitals_rollups
+                    WHERE {where_clause}
+                      AND bucket_start >= date_trunc($2::text, (now() AT TIME ZONE 'UTC') - make_interval(secs => $3))""",
+                tuple(params),
+                as_dict=False
+            )
+            return {**(result or {}), "resolution": resolution}
+        except Exception as e:
+            logger.error(f"Failed to aggregate {metric_type} vitals: {e}")
+            return {}
+
     # ========================================================================
     # Weekly Summary / Integrations Query Methods
     # ========================================================================
@@ -1434,16 +1952,21 @@ class PostgresDatabase:
     async def get_weekly_vitals_summary(self, user_id: str) -> Dict[str, Any]:
         """Get aggregated vitals for the current week."""
         try:
+            # Day rollups: at most 7 rows per metric/device instead of every raw reading
             result = await self.fetch_one(
                 """SELECT
-                       COUNT(*) FILTER (WHERE metric_type = 'heart_rate') as hr_count,
-                       AVG(value) FILTER (WHERE metric_type = 'heart_rate') as avg_heart_rate,
-                       COUNT(*) FILTER (WHERE metric_type = 'blood_pressure') as bp_count,
-                       AVG(value) FILTER (WHERE metric_type = 'steps') as avg_steps,
-                       COUNT(*) as total_readings
-                   FROM vitals
-                   WHERE user_id = %s AND recorded_at >= (CURRENT_DATE - INTERVAL '7 days')""",
-                (user_id,)
+                       COALESCE(SUM(sample_count) FILTER (WHERE metric_type = 'heart_rate'), 0)::BIGINT as hr_count,
+                       SUM(value_sum) FILTER (WHERE metric_type = 'heart_rate')
+                           / NULLIF(SUM(sample_count) FILTER (WHERE metric_type = 'heart_rate'), 0) as avg_heart_rate,
+                       COALESCE(SUM(sample_count) FILTER (WHERE metric_type = 'blood_pressure'), 0)::BIGINT as bp_count,
+                       SUM(value_sum) FILTER (WHERE metric_type = 'steps')
+                           / NULLIF(SUM(sample_count) FILTER (WHERE metric_type = 'steps'), 0) as avg_steps,
+                       COALESCE(SUM(sample_count), 0)::BIGINT as total_readings
+                   FROM vitals_rollups
+                   WHERE user_id = %s AND resolution = 'day'
+                     AND bucket_start >= ((now() AT TIME ZONE 'UTC')::date - 7)""",
+                (user_id,),
+                as_dict=False
             )
             return dict(result) if result else {}
         except Exception as e:
@@ -25,15 +25,16 @@ import json
 import logging
 import os
 import time
-from collections import OrderedDict
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Generic
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import threading
 from functools import wraps
 
+from core.cache import create_cache, session_tag, user_tag
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -89,208 +90,6 @@ def get_optimization_config() -> QueryOptimizationConfig:
 # L1/L2 CACHE SYSTEM
 # ============================================================================
 
-T = TypeVar('T')
-
-
-class CacheEntry(Generic[T]):
-    """Cache entry with TTL and metadata."""
-    
-    def __init__(self, value: T, ttl: int):
-        self.value = value
-        self.created_at = time.time()
-        self.ttl = ttl
-        self.hits = 0
-    
-    @property
-    def is_expired(self) -> bool:
-        return time.time() - self.created_at > self.ttl
-    
-    def touch(self):
-        """Record a cache hit."""
-        self.hits += 1
-
-
-class L1Cache:
-    """
-    In-memory LRU cache with TTL support.
-    
-    Features:
-    - Thread-safe access
-    - LRU eviction when max_size reached
-    - TTL-based expiration
-    - Hit rate tracking
-    """
-    
-    def __init__(self, max_size: int = 1000, default_ttl: int = 60):
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self._max_size = max_size
-        self._default_ttl = default_ttl
-        self._lock = threading.RLock()
-        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        with self._lock:
-            entry = self._cache.get(key)
-            if entry is None:
-                self._stats["misses"] += 1
-                return None
-            
-            if entry.is_expired:
-                del self._cache[key]
-                self._stats["misses"] += 1
-                return None
-            
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            entry.touch()
-            self._stats["hits"] += 1
-            return entry.value
-    
-    def set(self, key: str, value: Any, ttl: int = None) -> None:
-        """Set value in cache with optional TTL override."""
-        with self._lock:
-            # Evict oldest if at capacity
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
-                self._stats["evictions"] += 1
-            
-            self._cache[key] = CacheEntry(value, ttl or self._default_ttl)
-    
-    def delete(self, key: str) -> bool:
-        """Delete key from cache."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
-    
-    def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern (prefix match)."""
-        with self._lock:
-            keys_to_delete = [k for k in self._cache if k.startswith(pattern)]
-            for key in keys_to_delete:
-                del self._cache[key]
-            return len(keys_to_delete)
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        with self._lock:
-            total = self._stats["hits"] + self._stats["misses"]
-            hit_rate = self._stats["hits"] / total if total > 0 else 0
-            return {
-                **self._stats,
-                "size": len(self._cache),
-                "max_size": self._max_size,
-                "hit_rate": hit_rate,
-            }
-    
-    def clear(self) -> None:
-        """Clear all entries."""
-        with self._lock:
-            self._cache.clear()
-
-
-class L2Cache:
-    """
-    Redis-backed cache for distributed caching.
-    
-    Features:
-    - Shared across workers
-    - JSON serialization
-    - Automatic reconnection
-    """
-    
-    def __init__(self, redis_url: str = None, default_ttl: int = 300):
-        self._redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        self._default_ttl = default_ttl
-        self._client = None
-        self._available = None
-    
-    def _get_client(self):
-        """Get or create Redis client."""
-        if self._available is False:
-            return None
-        
-        if self._client is not None:
-            return self._client
-        
-        try:
-            import redis
-            self._client = redis.from_url(
-                self._redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-                socket_connect_timeout=2.0,
-                socket_timeout=1.0,
-            )
-            self._client.ping()
-            self._available = True
-            logger.info("✅ L2 cache (Redis) connected")
-            return self._client
-        except Exception as e:
-            logger.warning(f"⚠️ L2 cache unavailable: {e}")
-            self._available = False
-            return None
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from Redis cache."""
-        client = self._get_client()
-        if not client:
-            return None
-        
-        try:
-            value = client.get(f"dbcache:{key}")
-            if value:
-                return json.loads(value)
-        except Exception as e:
-            logger.debug(f"L2 cache get failed: {e}")
-        
-        return None
-    
-    def set(self, key: str, value: Any, ttl: int = None) -> bool:
-        """Set value in Redis cache."""
-        client = self._get_client()
-        if not client:
-            return False
-        
-        try:
-            client.setex(
-                f"dbcache:{key}",
-                ttl or self._default_ttl,
-                json.dumps(value, default=str)
-            )
-            return True
-        except Exception as e:
-            logger.debug(f"L2 cache set failed: {e}")
-            return False
-    
-    def delete(self, key: str) -> bool:
-        """Delete key from Redis cache."""
-        client = self._get_client()
-        if not client:
-            return False
-        
-        try:
-            return client.delete(f"dbcache:{key}") > 0
-        except Exception:
-            return False
-    
-    def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern."""
-        client = self._get_client()
-        if not client:
-            return 0
-        
-        try:
-            keys = client.keys(f"dbcache:{pattern}*")
-            if keys:
-                return client.delete(*keys)
-        except Exception:
-            pass
-        return 0
-
-
 class TieredCache:
     """
     Two-tier cache: L1 (in-memory) + L2 (Redis).
@@ -302,54 +101,60 @@ class TieredCache:
     - Ultra-fast reads from L1 (sub-millisecond)
     - Shared cache across workers via L2
     - Automatic promotion from L2 to L1
+    
+    Thin adapter over the unified ``core.cache`` implementation that keeps
+    the per-tier TTL signature used by the query layer.
     """
     
     def __init__(self, config: QueryOptimizationConfig = None):
         self.config = config or get_optimization_config()
-        self.l1 = L1Cache(
-            max_size=self.config.l1_cache_max_size,
-            default_ttl=self.config.l1_cache_ttl
+        self._cache = create_cache(
+            "dbcache",
+            l1_max_entries=self.config.l1_cache_max_size,
+            l1_ttl=self.config.l1_cache_ttl,
+            l2_ttl=self.config.l2_cache_ttl,
         )
-        self.l2 = L2Cache(default_ttl=self.config.l2_cache_ttl)
+    
+    @property
+    def l1(self):
+        """In-memory tier."""
+        return self._cache.l1
+    
+    @property
+    def l2(self):
+        """Redis tier, if configured."""
+        return self._cache.l2
     
     def get(self, key: str) -> Optional[Any]:
         """Get from L1, then L2, promoting to L1 on L2 hit."""
-        # Try L1 first
-        value = self.l1.get(key)
-        if value is not None:
-            return value
-        
-        # Try L2
-        value = self.l2.get(key)
-        if value is not None:
-            # Promote to L1
-            self.l1.set(key, value)
-            return value
-        
-        return None
+        return self._cache.get(key)
     
-    def set(self, key: str, value: Any, l1_ttl: int = None, l2_ttl: int = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        l1_ttl: int = None,
+        l2_ttl: int = None,
+        tags: Tuple[str, ...] = (),
+    ) -> None:
         """Set in both L1 and L2."""
-        self.l1.set(key, value, l1_ttl)
-        self.l2.set(key, value, l2_ttl)
+        self._cache.set(key, value, tags=tags, tier_ttls=[l1_ttl, l2_ttl])
     
     def delete(self, key: str) -> None:
         """Delete from both caches."""
-        self.l1.delete(key)
-        self.l2.delete(key)
+        self._cache.delete(key)
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Invalidate all entries carrying any of ``tags`` in both caches."""
+        return self._cache.invalidate_tags(*tags)
     
     def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all matching keys in both caches."""
-        count = self.l1.invalidate_pattern(pattern)
-        count += self.l2.invalidate_pattern(pattern)
-        return count
+        """Invalidate all keys starting with ``pattern`` in both caches."""
+        return self._cache.invalidate_prefix(pattern)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get combined cache statistics."""
-        return {
-            "l1": self.l1.get_stats(),
-            "l2_available": self.l2._available,
-        }
+        return self._cache.get_stats()
 
 
 # Global cache instance
@@ -821,9 +626,14 @@ class OptimizedChatHistoryQueries:
                 "created_at": row["created_at"].isoformat() if row["created_at"] else None,
             })
         
-        # Update cache
+        # Update cache; user tags let a per-user purge evict the history
         if use_cache:
-            self.cache.set(cache_key, history)
+            user_ids = sorted({row["user_id"] for row in rows if row["user_id"]})
+            self.cache.set(
+                cache_key,
+                history,
+                tags=(session_tag(session_id), *(user_tag(uid) for uid in user_ids)),
+            )
         
         return history
     
@@ -855,7 +665,7 @@ class OptimizedChatHistoryQueries:
             self.batch_manager.queue("chat_messages", data)
             
             # Invalidate cache
-            self.cache.invalidate_pattern(f"chat_history:{session_id}")
+            self.cache.invalidate_tags(session_tag(session_id), user_tag(user_id))
             return None  # ID not available with batching
         
         # Direct insert
@@ -875,7 +685,7 @@ class OptimizedChatHistoryQueries:
             )
         
         # Invalidate cache
-        self.cache.invalidate_pattern(f"chat_history:{session_id}")
+        self.cache.invalidate_tags(session_tag(session_id), user_tag(user_id))
         
         return result
     
@@ -909,7 +719,7 @@ class OptimizedChatHistoryQueries:
         sessions = [dict(row) for row in rows]
         
         # Cache for shorter TTL (sessions change frequently)
-        self.cache.set(cache_key, sessions, l1_ttl=30, l2_ttl=60)
+        self.cache.set(cache_key, sessions, l1_ttl=30, l2_ttl=60, tags=(user_tag(user_id),))
         
         return sessions
     
@@ -949,9 +759,9 @@ class OptimizedChatHistoryQueries:
             )
         
         # Invalidate affected session caches
-        session_ids = set(m["session_id"] for m in messages)
-        for session_id in session_ids:
-            self.cache.invalidate_pattern(f"chat_history:{session_id}")
+        tags = {session_tag(m["session_id"]) for m in messages}
+        tags.update(user_tag(m.get("user_id", "default")) for m in messages)
+        self.cache.invalidate_tags(*tags)
         
         logger.info(f"Bulk inserted {len(messages)} messages")
         return len(messages)
@@ -36,6 +36,7 @@ from typing import Optional, AsyncGenerator, Dict, Any
 # Import PromptRegistry for centralized prompt management
 from core.prompts.registry import get_prompt
 from core.circuit_breaker import circuit_breaker
+from core.observability.tracing import get_tracer, SpanType
 
 # LangChain components for MedGemma (OpenAI-compatible API)
 try:
@@ -264,31 +265,21 @@ class LLMGateway:
                 f"PII detected in prompt (user: {user_id}) - processing locally via MedGemma (HIPAA-compliant)"
             )
         
-        import time as _time
-        _start = _time.perf_counter()
-        
-        try:
-            raw_response = await self._execute_generation(prompt, content_type)
-        except Exception as e:
-            logger.error(f"MedGemma generation failed: {e}")
-            raise
-        
-        _latency_ms = (_time.perf_counter() - _start) * 1000
-        
-        # Record in AgentTracer for observability
-        try:
-            from app_lifespan import get_agent_tracer
-            tracer = get_agent_tracer()
-            if tracer:
-                tracer.record_llm_call(
-                    model=self.model_name,
-                    prompt=prompt[:200],
-                    response=raw_response[:200],
-                    tokens_used=len(raw_response.split()),
-                    latency_ms=_latency_ms,
-                )
-        except Exception:
-            pass  # Tracing must never break generation
+        # Traced as an LLM span (nested under the request trace when one is
+        # active). Only sizes are attached: prompts may contain PHI and kept
+        # traces can be exported off-host.
+        async with get_tracer().span(
+            f"llm_call:{self.model_name}",
+            SpanType.LLM_CALL,
+            metadata={"model": self.model_name, "content_type": content_type, "prompt_chars": len(prompt)},
+        ) as span:
+            try:
+                raw_response = await self._execute_generation(prompt, content_type)
+            except Exception as e:
+                logger.error(f"MedGemma generation failed: {e}")
+                raise
+            span.set_attribute("response_chars", len(raw_response))
+            span.set_attribute("tokens_used", len(raw_response.split()))
 
         # Apply Guardrails ✅
         return self.guardrails.process_output(
@@ -6,8 +6,12 @@ window overflow and optimize LLM generation speed.
 """
 
 import os
-from typing import Dict
+from typing import Dict, Optional
 
+from core.llm.tokenizer_service import get_tokenizer_service
+
+# Optional model whose tokenizer replaces the 4-chars heuristic (local files only)
+TOKEN_BUDGET_TOKENIZER = os.getenv("TOKEN_BUDGET_TOKENIZER", "")
 
 
 class TokenBudgetCalculator:
@@ -39,19 +43,32 @@ class TokenBudgetCalculator:
         "default": {"context": 4096, "output": 1024},
     }
     
-    def __init__(self, model_name: str = None):
-        """Initialize with optional model name override."""
+    def __init__(self, model_name: str = None, tokenizer_model: Optional[str] = None):
+        """Initialize with optional model name and tokenizer overrides.
+        
+        Token estimates use the 4 chars = 1 token heuristic unless
+        ``tokenizer_model`` (or TOKEN_BUDGET_TOKENIZER) names a tokenizer
+        that is already available locally; nothing is downloaded.
+        """
         self.model_name = model_name or os.getenv("LLAMA_LOCAL_MODEL", "medgemma-4b-it")
         self.limits = self.TOKEN_BUDGETS.get(self.model_name, self.TOKEN_BUDGETS["default"])
+        self._tokenizer = None
+        tokenizer_model = tokenizer_model or TOKEN_BUDGET_TOKENIZER
+        if tokenizer_model:
+            service = get_tokenizer_service(tokenizer_model, local_only=True)
+            if service.key != "approx":
+                self._tokenizer = service
     
     def estimate_tokens(self, text: str) -> int:
         """Fast token estimation using 4 chars = 1 token heuristic.
         
         Accuracy: ~80% for English text
-        For precise counts, use actual tokenizer.
+        Uses the configured tokenizer's cached counts when one is loaded.
         """
         if not text:
             return 0
+        if self._tokenizer is not None:
+            return self._tokenizer.count(text)
         return len(text) // 4 + 1
     
     def calculate(
@@ -0,0 +1,483 @@
+"""
+Shared Tokenizer Service - process-wide tokenizers, cached counts, packing.
+
+Token accounting used to load a tokenizer per budget manager and re-encode
+the same chunks several times per request (count, truncate, re-count after
+redistribution). This module provides:
+
+- A process-wide registry: one tokenizer (and one count cache) per
+  tokenizer family, shared by every caller that names a matching model
+- A per-text token-count LRU keyed by content digest
+- Batch encoding for cache misses (tiktoken ``encode_batch`` / HuggingFace
+  batch call)
+- Binary-search truncation and a greedy packer that fills a token budget
+  from ranked chunks using cached counts
+
+Usage:
+    service = get_tokenizer_service("gpt-4")
+    service.count("Patient presents with chest pain")
+    packed = service.pack(ranked_docs, budget=1500)
+    context = packed.text
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from core.cache import MISSING, MemoryTier
+
+logger = logging.getLogger(__name__)
+
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "20000"))
+
+# Texts up to this length are used as cache keys directly; longer ones are digested
+_INLINE_KEY_CHARS = 128
+
+# HuggingFace tokenizer per model family
+HF_MODEL_MAP = {
+    "gemma": "google/gemma-2-2b-it",
+    "llama": "meta-llama/Llama-2-7b-hf",
+    "mistral": "mistralai/Mistral-7B-v0.1",
+}
+
+
+class CharacterApproximationTokenizer:
+    """Fallback tokenizer using character count approximation."""
+
+    def __init__(self, chars_per_token: int = 4):
+        self.chars_per_token = chars_per_token
+
+    def encode(self, text: str) -> list:
+        """Approximate token count from character count."""
+        if not text:
+            return []
+        # Return list of "fake" tokens (just indices)
+        token_count = max(1, len(text) // self.chars_per_token)
+        return list(range(token_count))
+
+
+# ============================================================================
+# Tokenizer Loading
+# ============================================================================
+
+def resolve_tokenizer_key(model_name: Optional[str]) -> str:
+    """
+    Map a model name to the tokenizer it uses.
+
+    Models sharing a tokenizer map to the same key so they share one
+    tokenizer instance and one count cache.
+
+    Args:
+        model_name: Name of the model
+
+    Returns:
+        Key such as ``tiktoken:gpt-4``, ``hf:google/gemma-2-2b-it`` or ``approx``
+    """
+    if not model_name:
+        return "approx"
+
+    model_lower = model_name.lower()
+
+    if any(name in model_lower for name in ["gpt-4", "gpt-3", "gpt-3.5", "openai"]):
+        return "tiktoken:gpt-4" if "gpt-4" in model_lower else "tiktoken:gpt-3.5-turbo"
+
+    for family, hf_model_name in HF_MODEL_MAP.items():
+        if family in model_lower:
+            return f"hf:{hf_model_name}"
+
+    return "approx"
+
+
+def _load_tokenizer(key: str, local_only: bool = False) -> Any:
+    """
+    Load the tokenizer for a resolved key.
+
+    Uses:
+    - tiktoken for OpenAI models (gpt-4, gpt-3.5-turbo)
+    - HuggingFace for Gemma, LLaMA, etc.
+    - Character approximation as fallback
+
+    Args:
+        key: Resolved tokenizer key
+        local_only: Only use HuggingFace files already in the local cache
+
+    Returns:
+        Tokenizer instance with encode() method
+    """
+    backend, _, name = key.partition(":")
+
+    if backend == "tiktoken":
+        try:
+            import tiktoken
+            return tiktoken.encoding_for_model(name)
+        except ImportError:
+            logger.warning("tiktoken not available, using character approximation for OpenAI models")
+        except Exception as e:
+            logger.warning(f"Failed to load tiktoken: {e}")
+
+    elif backend == "hf":
+        try:
+            from transformers import AutoTokenizer
+            return AutoTokenizer.from_pretrained(name, local_files_only=local_only)
+        except ImportError:
+            logger.debug("transformers not available for HuggingFace tokenizers")
+        except Exception as e:
+            logger.debug(f"Failed to load HuggingFace tokenizer: {e}")
+
+    logger.debug(f"Using character approximation for tokenizer: {key}")
+    return CharacterApproximationTokenizer()
+
+
+# ============================================================================
+# Packing Result
+# ============================================================================
+
+@dataclass
+class PackResult:
+    """Chunks selected to fill a token budget."""
+    texts: List[str] = field(default_factory=list)
+    indices: List[int] = field(default_factory=list)  # Positions in the ranked input
+    tokens_used: int = 0
+    budget: int = 0
+    truncated: bool = False  # Last selected chunk was cut to fit
+    skipped: int = 0
+    separator: str = "\n\n"
+
+    @property
+    def text(self) -> str:
+        return self.separator.join(self.texts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": len(self.texts),
+            "indices": self.indices,
+            "tokens_used": self.tokens_used,
+            "budget": self.budget,
+            "truncated": self.truncated,
+            "skipped": self.skipped,
+        }
+
+
+# ============================================================================
+# Tokenizer Service
+# ============================================================================
+
+class TokenizerService:
+    """
+    Token counting, truncation and packing for one tokenizer.
+
+    Counts (and truncation results) are cached per text in an LRU keyed by
+    content digest, so a chunk is encoded at most once while it stays in
+    the cache no matter how many managers, budget passes or requests look
+    at it.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        tokenizer: Any,
+        cache_max_entries: int = TOKEN_COUNT_CACHE_SIZE,
+    ):
+        """
+        Initialize tokenizer service.
+
+        Args:
+            key: Resolved tokenizer key (see ``resolve_tokenizer_key``)
+            tokenizer: Tokenizer instance with encode()
+            cache_max_entries: Size of the token-count LRU
+        """
+        self.key = key
+        self.tokenizer = tokenizer
+        self._approx = isinstance(tokenizer, CharacterApproximationTokenizer)
+        self._counts = MemoryTier(
+            max_entries=cache_max_entries,
+            cache_name=f"token_counts:{key}",
+        )
+
+    # ------------------------------------------------------------------
+    # Raw encoding
+    # ------------------------------------------------------------------
+
+    def _approx_count(self, text: str) -> int:
+        return max(1, len(text) // self.tokenizer.chars_per_token) if text else 0
+
+    def _encode_len(self, text: str) -> int:
+        """Uncached token count."""
+        if self._approx:
+            return self._approx_count(text)
+        try:
+            return len(self.tokenizer.encode(text))
+        except Exception as e:
+            logger.warning(f"Tokenization failed: {e}, using character approximation")
+            return len(text) // 4
+
+    def _encode_len_batch(self, texts: List[str]) -> List[int]:
+        """Uncached token counts for several texts in one tokenizer call."""
+        if self._approx:
+            return [self._approx_count(text) for text in texts]
+        try:
+            if hasattr(self.tokenizer, "encode_batch"):
+                # tiktoken
+                return [len(ids) for ids in self.tokenizer.encode_batch(texts)]
+            if callable(self.tokenizer):
+                # HuggingFace (fast tokenizers encode the batch in parallel)
+                return [len(ids) for ids in self.tokenizer(texts)["input_ids"]]
+        except Exception as e:
+            logger.debug(f"Batch tokenization failed, encoding individually: {e}")
+        return [self._encode_len(text) for text in texts]
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        if len(text) <= _INLINE_KEY_CHARS:
+            return text
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+        return f"{len(text)}:{digest}"
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def count(self, text: Optional[str]) -> int:
+        """
+        Count tokens in text (cached).
+
+        Args:
+            text: Text to tokenize
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        if self._approx:
+            return self._approx_count(text)
+
+        key = self._cache_key(text)
+        cached = self._counts.get(key)
+        if cached is not MISSING:
+            return cached
+
+        n = self._encode_len(text)
+        self._counts.set(key, n)
+        return n
+
+    def count_batch(self, texts: Sequence[Optional[str]]) -> List[int]:
+        """
+        Count tokens for several texts, encoding only cache misses in one batch.
+
+        Args:
+            texts: Texts to tokenize
+
+        Returns:
+            Token counts in input order
+        """
+        counts = [0] * len(texts)
+        if self._approx:
+            return [self._approx_count(text) if text else 0 for text in texts]
+
+        misses: Dict[str, List[int]] = {}
+        miss_texts: List[str] = []
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = self._cache_key(text)
+            cached = self._counts.get(key)
+            if cached is not MISSING:
+                counts[i] = cached
+            elif key in misses:
+                misses[key].append(i)
+            else:
+                misses[key] = [i]
+                miss_texts.append(text)
+
+        if miss_texts:
+            for (key, positions), n in zip(misses.items(), self._encode_len_batch(miss_texts)):
+                self._counts.set(key, n)
+                for i in positions:
+                    counts[i] = n
+
+        return counts
+
+    # ------------------------------------------------------------------
+    # Truncation and packing
+    # ------------------------------------------------------------------
+
+    def truncate(self, text: str, max_tokens: int, suffix: str = "...") -> str:
+        """
+        Truncate text to fit within a token budget.
+
+        Binary-searches the longest prefix that fits together with ``suffix``.
+        Probes are not cached; the final result is, per (text, budget).
+
+        Args:
+            text: Text to truncate
+            max_tokens: Maximum allowed tokens
+            suffix: Truncation indicator appended when text is cut
+
+        Returns:
+            Truncated text
+        """
+        if not text:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+
+        key = f"truncate:{max_tokens}:{suffix}:{self._cache_key(text)}"
+        cached = self._counts.get(key)
+        if cached is not MISSING:
+            return cached
+
+        low, high = 0, len(text) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self._encode_len(text[:mid] + suffix) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+
+        truncated = text[:low] + suffix if low else ""
+        self._counts.set(key, truncated)
+        return truncated
+
+    def pack(
+        self,
+        chunks: Sequence[Union[str, Dict[str, Any]]],
+        budget: int,
+        separator: str = "\n\n",
+        text_key: str = "content",
+        truncate_last: bool = True,
+        min_truncated_tokens: int = 32,
+    ) -> PackResult:
+        """
+        Greedily fill a token budget from ranked chunks.
+
+        Chunks are taken in rank order; a chunk that does not fit is skipped
+        so later (shorter) chunks can still use the space. When
+        ``truncate_last`` is set, the first chunk that does not fit is cut to
+        the remaining budget instead (if at least ``min_truncated_tokens``
+        remain) and packing stops.
+
+        Totals are the sum of cached per-chunk counts plus separators, which
+        can differ from encoding the joined text by a token or so at each
+        boundary.
+
+        Args:
+            chunks: Ranked chunks (strings or dicts with ``text_key``)
+            budget: Token budget
+            separator: Joiner placed between chunks
+            text_key: Content key for dict chunks
+            truncate_last: Truncate the first overflowing chunk to fill the budget
+            min_truncated_tokens: Minimum remaining budget worth truncating into
+
+        Returns:
+            PackResult with the selected texts
+        """
+        result = PackResult(budget=budget, separator=separator)
+        texts = [
+            chunk if isinstance(chunk, str) else (chunk.get(text_key) or chunk.get("text") or "")
+            for chunk in chunks
+        ]
+        counts = self.count_batch(texts)
+        separator_tokens = self.count(separator)
+
+        for i, (text, n) in enumerate(zip(texts, counts)):
+            if not text:
+                continue
+            cost = n + (separator_tokens if result.texts else 0)
+            remaining = budget - result.tokens_used
+            if cost <= remaining:
+                result.texts.append(text)
+                result.indices.append(i)
+                result.tokens_used += cost
+                continue
+
+            if truncate_last:
+                sep = separator_tokens if result.texts else 0
+                room = remaining - sep
+                cut = self.truncate(text, room) if room >= min_truncated_tokens else ""
+                if cut:
+                    result.texts.append(cut)
+                    result.indices.append(i)
+                    result.tokens_used += sep + self.count(cut)
+                    result.truncated = True
+                result.skipped += sum(1 for t in texts[i:] if t) - (1 if cut else 0)
+                break
+            result.skipped += 1
+
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokenizer": self.key,
+            "approximate": self._approx,
+            "cached_counts": len(self._counts),
+            "cache": self._counts.get_stats(),
+        }
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+_services: Dict[str, TokenizerService] = {}
+_registry_lock = threading.Lock()
+
+
+def get_tokenizer_service(
+    model_name: Optional[str] = None,
+    local_only: bool = False,
+) -> TokenizerService:
+    """
+    Get the shared tokenizer service for a model.
+
+    Tokenizers are loaded once per process and shared by every model name
+    that resolves to the same tokenizer.
+
+    Args:
+        model_name: Model name (None for character approximation)
+        local_only: Never download; fall back to the approximation service
+            (without registering it for this key) if files are not cached
+
+    Returns:
+        Shared TokenizerService
+    """
+    key = resolve_tokenizer_key(model_name)
+    service = _services.get(key)
+    if service is not None:
+        return service
+
+    with _registry_lock:
+        service = _services.get(key)
+        if service is None:
+            tokenizer = _load_tokenizer(key, local_only=local_only)
+            if local_only and key != "approx" and isinstance(tokenizer, CharacterApproximationTokenizer):
+                # A later caller may still be allowed to download it
+                service = _services.get("approx")
+                if service is None:
+                    service = _services["approx"] = TokenizerService("approx", tokenizer)
+                return service
+            service = TokenizerService(key, tokenizer)
+            _services[key] = service
+            logger.info(f"Tokenizer loaded: {key} (requested by model={model_name})")
+    return service
+
+
+def get_tokenizer_stats() -> List[Dict[str, Any]]:
+    """Stats for every loaded tokenizer service."""
+    return [service.get_stats() for service in list(_services.values())]
+
+
+__all__ = [
+    "TokenizerService",
+    "PackResult",
+    "CharacterApproximationTokenizer",
+    "get_tokenizer_service",
+    "get_tokenizer_stats",
+    "resolve_tokenizer_key",
+    "TOKEN_COUNT_CACHE_SIZE",
+]
@@ -22,6 +22,9 @@ Quick Start:
      def metrics():
          return Response(get_metrics().export_prometheus(), media_type="text/plain")
   
+     With several uvicorn/gunicorn workers, point PROMETHEUS_MULTIPROC_DIR at a
+     shared (emptied on deploy) directory so every worker's series are merged.
+
   4. Set up Prometheus scraping in prometheus.yml:
      global:
        scrape_interval: 15s
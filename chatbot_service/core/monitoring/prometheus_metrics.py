@@ -12,11 +12,29 @@ Integration with Prometheus:
 - Metrics exported in Prometheus text format
 - Can be scraped via /metrics endpoint (add to FastAPI)
 - Ready for Grafana dashboard integration
+
+Series model:
+- Every distinct label set is its own series (counter/gauge/histogram/summary).
+- Histograms keep cumulative buckets (configurable per metric), so p95/p99
+  can be computed with histogram_quantile() in Prometheus.
+- Counters and histogram/summary observations go to per-thread shards with
+  no lock on the hot path; shards are merged at export time.
+- Multi-worker (uvicorn/gunicorn): set PROMETHEUS_MULTIPROC_DIR to a shared
+  directory. Each worker publishes its snapshot to an mmap'ed file there and
+  /metrics on any worker merges all of them. Clear the directory when the
+  service is (re)deployed, as with prometheus_client's multiprocess mode.
 """
 
+import os
+import json
+import mmap
+import math
 import time
+import struct
+import bisect
 import logging
-from typing import Dict, Any, Optional, List
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import threading
@@ -25,6 +43,57 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
+def _parse_buckets(raw: Optional[str], default: Tuple[float, ...]) -> Tuple[float, ...]:
+    if not raw:
+        return default
+    try:
+        return tuple(sorted(float(b) for b in raw.split(",") if b.strip()))
+    except ValueError:
+        logger.warning(f"Invalid histogram buckets '{raw}', using defaults")
+        return default
+
+
+# Default latency buckets for *_ms histograms (override with comma-separated env)
+DEFAULT_LATENCY_BUCKETS_MS = _parse_buckets(
+    os.getenv("PROMETHEUS_LATENCY_BUCKETS_MS"),
+    (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000),
+)
+# Same boundaries for *_seconds histograms
+DEFAULT_LATENCY_BUCKETS_SECONDS = tuple(b / 1000.0 for b in DEFAULT_LATENCY_BUCKETS_MS)
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+# Recent observations kept per summary series for quantiles
+SUMMARY_MAX_SAMPLES = int(os.getenv("PROMETHEUS_SUMMARY_MAX_SAMPLES", "1024"))
+# Shared directory for cross-worker aggregation (empty = single process)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+# How often each worker publishes its snapshot to the shared directory
+PROMETHEUS_FLUSH_INTERVAL = float(os.getenv("PROMETHEUS_FLUSH_INTERVAL", "1.0"))
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[List[Tuple[str, str]]] = None) -> str:
+    pairs = list(key) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
 class MetricType(Enum):
     """Prometheus metric types."""
     COUNTER = "counter"           # Only increases (requests, errors)
@@ -42,6 +111,124 @@ class MetricValue:
     help_text: str
     labels: Dict[str, str] = field(default_factory=dict)
     timestamp: float = field(default_factory=time.time)
+    buckets: Optional[Tuple[float, ...]] = None
+
+
+class _HistogramSeries:
+    """Bucket counts (non-cumulative, last slot is +Inf), sum and count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _SummarySeries:
+    """Sum, count and a bounded window of recent samples for quantiles."""
+
+    __slots__ = ("samples", "sum", "count")
+
+    def __init__(self):
+        self.samples = deque(maxlen=SUMMARY_MAX_SAMPLES)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.samples.append(value)
+        self.sum += value
+        self.count += 1
+
+
+class _Shard:
+    """Per-thread accumulation of counters and observations."""
+
+    __slots__ = ("counters", "observations")
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.observations: Dict[Tuple[str, LabelKey], Any] = {}
+
+
+class _MmapSnapshotFile:
+    """
+    One worker's metrics snapshot in a shared mmap'ed file.
+
+    Layout: sequence (u64) || payload length (u32) || JSON payload. The writer
+    makes the sequence odd while writing (seqlock), so readers never use a
+    torn snapshot.
+    """
+
+    HEADER = struct.Struct("<QI")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._size = 0
+        self._map: Optional[mmap.mmap] = None
+        self._seq = 0
+        self._ensure_size(64 * 1024)
+
+    def _ensure_size(self, needed: int):
+        if needed <= self._size:
+            return
+        size = max(self._size, 64 * 1024)
+        while size < needed:
+            size *= 2
+        if self._map is not None:
+            self._map.close()
+        os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._size = size
+
+    def write(self, payload: bytes):
+        self._ensure_size(self.HEADER.size + len(payload))
+        self._seq += 1
+        self._map[:8] = struct.pack("<Q", self._seq)
+        self._map[self.HEADER.size : self.HEADER.size + len(payload)] = payload
+        self._map[8:12] = struct.pack("<I", len(payload))
+        self._seq += 1
+        self._map[:8] = struct.pack("<Q", self._seq)
+
+    @classmethod
+    def read(cls, path: str, retries: int = 5) -> Optional[dict]:
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    for _ in range(retries):
+                        seq, length = cls.HEADER.unpack_from(view, 0)
+                        if seq == 0 or seq % 2:
+                            time.sleep(0.001)
+                            continue
+                        payload = bytes(view[cls.HEADER.size : cls.HEADER.size + length])
+                        if cls.HEADER.unpack_from(view, 0)[0] == seq:
+                            return json.loads(payload)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read metrics snapshot {path}: {e}")
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        os.close(self._fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
 
 
 class PrometheusMetrics:
@@ -54,12 +241,30 @@ class PrometheusMetrics:
     - System health metrics
     """
     
-    def __init__(self):
-        """Initialize metrics collector."""
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        """
+        Initialize metrics collector.
+
+        Args:
+            multiproc_dir: Shared directory for cross-worker aggregation
+                (defaults to PROMETHEUS_MULTIPROC_DIR; empty disables it)
+        """
         self.metrics: Dict[str, MetricValue] = {}
         self.lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._pid = os.getpid()
+        self.multiproc_dir = PROMETHEUS_MULTIPROC_DIR if multiproc_dir is None else multiproc_dir
+        self._snapshot_file: Optional[_MmapSnapshotFile] = None
+        self._flush_thread: Optional[threading.Thread] = None
         self._init_metrics()
-        logger.info("✅ PrometheusMetrics initialized")
+        if self.multiproc_dir:
+            self._start_flusher()
+        logger.info(
+            "✅ PrometheusMetrics initialized"
+            + (f" (multiprocess dir: {self.multiproc_dir})" if self.multiproc_dir else "")
+        )
     
     def _init_metrics(self):
         """Initialize all metrics."""
@@ -106,6 +311,16 @@ class PrometheusMetrics:
             MetricType.HISTOGRAM,
             "Fusion retrieval operation duration in milliseconds"
         )
+        self._register_metric(
+            "rag_source_latency_ms",
+            MetricType.HISTOGRAM,
+            "Per-source retrieval latency during context assembly in milliseconds"
+        )
+        self._register_metric(
+            "rag_source_timeouts",
+            MetricType.COUNTER,
+            "Retrieval sources cancelled for missing their deadline"
+        )
         
         # Compression metrics
         self._register_metric(
@@ -186,6 +401,27 @@ class PrometheusMetrics:
             MetricType.COUNTER,
             "Total rerank operations"
         )
+        self._register_metric(
+            "rag_rerank_queue_depth",
+            MetricType.GAUGE,
+            "Rerank pairs waiting for a scoring batch"
+        )
+        self._register_metric(
+            "rag_rerank_batch_pairs",
+            MetricType.HISTOGRAM,
+            "Pairs scored per cross-encoder batch",
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+        )
+        self._register_metric(
+            "rag_rerank_batch_duration_ms",
+            MetricType.HISTOGRAM,
+            "Cross-encoder batch inference duration in milliseconds"
+        )
+        self._register_metric(
+            "rag_rerank_coalesced_requests",
+            MetricType.COUNTER,
+            "Rerank requests served by shared scoring batches"
+        )
         self._register_metric(
             "rag_embedding_duration_ms",
             MetricType.HISTOGRAM,
@@ -202,6 +438,53 @@ class PrometheusMetrics:
             "Cache operation duration in milliseconds"
         )
         
+        # Unified cache metrics (labelled by cache and tier)
+        self._register_metric(
+            "cache_hits_total",
+            MetricType.COUNTER,
+            "Total cache hits across unified cache tiers"
+        )
+        self._register_metric(
+            "cache_misses_total",
+            MetricType.COUNTER,
+            "Total cache misses across unified cache tiers"
+        )
+        self._register_metric(
+            "cache_sets_total",
+            MetricType.COUNTER,
+            "Total cache writes across unified cache tiers"
+        )
+        self._register_metric(
+            "cache_evictions_total",
+            MetricType.COUNTER,
+            "Total capacity evictions across unified cache tiers"
+        )
+        self._register_metric(
+            "cache_expirations_total",
+            MetricType.COUNTER,
+            "Total TTL expirations across unified cache tiers"
+        )
+        self._register_metric(
+            "cache_invalidations_total",
+            MetricType.COUNTER,
+            "Total explicitly invalidated cache entries"
+        )
+        self._register_metric(
+            "cache_errors_total",
+            MetricType.COUNTER,
+            "Total cache backend errors"
+        )
+        self._register_metric(
+            "cache_entries",
+            MetricType.GAUGE,
+            "Current number of entries in a cache tier"
+        )
+        self._register_metric(
+            "cache_size_bytes",
+            MetricType.GAUGE,
+            "Current estimated size of a cache tier in bytes"
+        )
+        
         # Orchestrator metrics
         self._register_metric(
             "orchestrator_executions",
@@ -248,48 +531,107 @@ class PrometheusMetrics:
             MetricType.HISTOGRAM,
             "Web search execution latency in milliseconds"
         )
+
+        # Memori memory layer (fed by memori.memory_observability.Histogram)
+        self._register_metric(
+            "memori_search_duration_seconds",
+            MetricType.HISTOGRAM,
+            "Memori memory search latency in seconds",
+            buckets=DEFAULT_LATENCY_BUCKETS_SECONDS,
+        )
+        self._register_metric(
+            "memori_store_duration_seconds",
+            MetricType.HISTOGRAM,
+            "Memori memory store latency in seconds",
+            buckets=DEFAULT_LATENCY_BUCKETS_SECONDS,
+        )
     
-    def _register_metric(self, name: str, metric_type: MetricType, help_text: str):
-        """Register a new metric."""
+    def _register_metric(
+        self,
+        name: str,
+        metric_type: MetricType,
+        help_text: str,
+        buckets: Optional[Tuple[float, ...]] = None,
+    ):
+        """
+        Register a new metric.
+
+        Args:
+            name: Metric name
+            metric_type: Prometheus metric type
+            help_text: HELP line
+            buckets: Histogram bucket upper bounds (defaults to the latency
+                buckets matching the name's _ms/_seconds unit)
+        """
+        if metric_type == MetricType.HISTOGRAM and buckets is None:
+            buckets = (
+                DEFAULT_LATENCY_BUCKETS_SECONDS
+                if name.endswith("_seconds")
+                else DEFAULT_LATENCY_BUCKETS_MS
+            )
         with self.lock:
             if name not in self.metrics:
                 self.metrics[name] = MetricValue(
                     name=name,
                     value=0.0,
                     metric_type=metric_type,
-                    help_text=help_text
+                    help_text=help_text,
+                    buckets=tuple(sorted(buckets)) if buckets else None,
                 )
+
+    def register_metric(
+        self,
+        name: str,
+        metric_type: MetricType,
+        help_text: str,
+        buckets: Optional[Tuple[float, ...]] = None,
+    ):
+        """Register an additional metric (no-op if it already exists)."""
+        self._register_metric(name, metric_type, help_text, buckets=buckets)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self.lock:
+                self._shards.append(shard)
+        return shard
     
     def increment_counter(self, metric_name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
-        """Increment a counter metric."""
-        with self.lock:
-            if metric_name in self.metrics:
-                metric = self.metrics[metric_name]
-                metric.value += value
-                if labels:
-                    metric.labels.update(labels)
-                logger.debug(f"Counter {metric_name} incremented to {metric.value}")
+        """Increment a counter metric (one series per label set)."""
+        if metric_name not in self.metrics:
+            return
+        counters = self._shard().counters
+        key = (metric_name, _label_key(labels))
+        counters[key] = counters.get(key, 0.0) + value
     
     def set_gauge(self, metric_name: str, value: float, labels: Optional[Dict[str, str]] = None):
-        """Set a gauge metric value."""
+        """Set a gauge metric value (one series per label set)."""
+        if metric_name not in self.metrics:
+            return
         with self.lock:
-            if metric_name in self.metrics:
-                metric = self.metrics[metric_name]
-                metric.value = value
-                if labels:
-                    metric.labels = labels
-                logger.debug(f"Gauge {metric_name} set to {value}")
+            self._gauges[(metric_name, _label_key(labels))] = value
     
     def record_histogram(self, metric_name: str, value: float, labels: Optional[Dict[str, str]] = None):
-        """Record a histogram value."""
-        with self.lock:
-            if metric_name in self.metrics:
-                metric = self.metrics[metric_name]
-                # Store histogram value (for aggregation)
-                metric.value = value
-                if labels:
-                    metric.labels.update(labels)
-                logger.debug(f"Histogram {metric_name} recorded value {value}")
+        """Observe a value into a histogram or summary metric."""
+        metric = self.metrics.get(metric_name)
+        if metric is None:
+            return
+        observations = self._shard().observations
+        key = (metric_name, _label_key(labels))
+        series = observations.get(key)
+        if series is None:
+            if metric.metric_type == MetricType.SUMMARY:
+                series = _SummarySeries()
+            else:
+                series = _HistogramSeries(metric.buckets or DEFAULT_LATENCY_BUCKETS_MS)
+            observations[key] = series
+        series.observe(value)
+
+    def record_summary(self, metric_name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Observe a value into a summary metric."""
+        self.record_histogram(metric_name, value, labels)
     
     def record_memory_hit(self):
         """Record a memory cache hit."""
@@ -360,6 +702,157 @@ class PrometheusMetrics:
         """Set active request count."""
         self.set_gauge("rag_active_requests", float(count))
     
+    # ========================================================================
+    # Snapshots and multi-worker aggregation
+    # ========================================================================
+
+    def _local_snapshot(self) -> Dict[str, Any]:
+        """Merge this process's shards into a JSON-serializable snapshot."""
+        counters: Dict[Tuple[str, LabelKey], float] = {}
+        histograms: Dict[Tuple[str, LabelKey], List[Any]] = {}
+        summaries: Dict[Tuple[str, LabelKey], List[Any]] = {}
+
+        with self.lock:
+            shards = list(self._shards)
+            gauges = dict(self._gauges)
+
+        for shard in shards:
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0.0) + value
+            for key, series in list(shard.observations.items()):
+                if isinstance(series, _SummarySeries):
+                    merged = summaries.setdefault(key, [[], 0.0, 0])
+                    merged[0].extend(series.samples)
+                else:
+                    merged = histograms.setdefault(key, [[0] * len(series.counts), 0.0, 0])
+                    merged[0] = [a + b for a, b in zip(merged[0], series.counts)]
+                merged[1] += series.sum
+                merged[2] += series.count
+
+        return {
+            "pid": self._pid,
+            "counters": [[n, list(map(list, k)), v] for (n, k), v in counters.items()],
+            "gauges": [[n, list(map(list, k)), v] for (n, k), v in gauges.items()],
+            "histograms": [[n, list(map(list, k)), *h] for (n, k), h in histograms.items()],
+            "summaries": [
+                [n, list(map(list, k)), s[0][-SUMMARY_MAX_SAMPLES:], s[1], s[2]]
+                for (n, k), s in summaries.items()
+            ],
+        }
+
+    def flush(self):
+        """Publish this worker's snapshot to the shared multiprocess directory."""
+        if not self.multiproc_dir:
+            return
+        try:
+            if self._snapshot_file is None:
+                os.makedirs(self.multiproc_dir, exist_ok=True)
+                self._snapshot_file = _MmapSnapshotFile(
+                    os.path.join(self.multiproc_dir, f"metrics_{self._pid}.mmap")
+                )
+            payload = json.dumps(self._local_snapshot(), separators=(",", ":")).encode()
+            self._snapshot_file.write(payload)
+        except Exception as e:
+            logger.warning(f"Failed to flush metrics snapshot: {e}")
+
+    def _start_flusher(self):
+        def _loop():
+            while True:
+                time.sleep(PROMETHEUS_FLUSH_INTERVAL)
+                self.flush()
+
+        self._flush_thread = threading.Thread(target=_loop, name="metrics-flush", daemon=True)
+        self._flush_thread.start()
+
+    def _after_fork(self):
+        """Start clean in a forked worker (parent's series are not ours)."""
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._gauges = {}
+        self._pid = os.getpid()
+        self._snapshot_file = None
+        if self.multiproc_dir:
+            self._start_flusher()
+
+    def _collect(self) -> Dict[str, Dict[LabelKey, Any]]:
+        """
+        Aggregate series from this process or, in multiprocess mode, from
+        every worker's snapshot. Gauges get a ``pid`` label per live worker.
+        """
+        if self.multiproc_dir:
+            self.flush()
+            snapshots = []
+            try:
+                names = sorted(os.listdir(self.multiproc_dir))
+            except OSError:
+                names = []
+            for fname in names:
+                if fname.startswith("metrics_") and fname.endswith(".mmap"):
+                    snap = _MmapSnapshotFile.read(os.path.join(self.multiproc_dir, fname))
+                    if snap is not None:
+                        snapshots.append(snap)
+            if not snapshots:
+                snapshots = [self._local_snapshot()]
+        else:
+            snapshots = [self._local_snapshot()]
+
+        multi = len(snapshots) > 1
+        series: Dict[str, Dict[LabelKey, Any]] = {}
+        for snap in snapshots:
+            for name, labels, value in snap["counters"]:
+                key = tuple(map(tuple, labels))
+                bucket = series.setdefault(name, {})
+                bucket[key] = bucket.get(key, 0.0) + value
+            if not multi or _pid_alive(snap["pid"]):
+                for name, labels, value in snap["gauges"]:
+                    key = tuple(map(tuple, labels))
+                    if multi:
+                        key = key + (("pid", str(snap["pid"])),)
+                    series.setdefault(name, {})[key] = value
+            for name, labels, counts, total, count in snap["histograms"]:
+                key = tuple(map(tuple, labels))
+                bucket = series.setdefault(name, {})
+                merged = bucket.get(key)
+                if merged is None or len(merged[0]) != len(counts):
+                    bucket[key] = [list(counts), total, count]
+                else:
+                    merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                    merged[1] += total
+                    merged[2] += count
+            for name, labels, samples, total, count in snap["summaries"]:
+                key = tuple(map(tuple, labels))
+                merged = series.setdefault(name, {}).setdefault(key, [[], 0.0, 0])
+                merged[0].extend(samples)
+                merged[1] += total
+                merged[2] += count
+        return series
+
+    @staticmethod
+    def _sample_quantile(samples: List[float], q: float) -> float:
+        if not samples:
+            return float("nan")
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @staticmethod
+    def _bucket_quantile(buckets: Tuple[float, ...], counts: List[int], q: float) -> float:
+        """Estimate a quantile from bucket counts (like histogram_quantile)."""
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = buckets[i - 1] if i > 0 else 0.0
+                if i >= len(buckets):
+                    return buckets[-1] if buckets else 0.0
+                upper = buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return buckets[-1] if buckets else 0.0
+
     def export_prometheus(self) -> str:
         """
         Export all metrics in Prometheus text format.
@@ -367,72 +860,134 @@ class PrometheusMetrics:
         Format:
         # HELP metric_name Description
         # TYPE metric_name metric_type
-        metric_name value timestamp
+        metric_name{labels} value
+        metric_name_bucket{labels,le="..."} cumulative_count   (histograms)
+        metric_name{labels,quantile="..."} value               (summaries)
         
         Returns:
             Prometheus-formatted metrics string
         """
         output_lines = []
-        
-        with self.lock:
-            # Group metrics by type for better organization
-            by_type = {}
-            for metric in self.metrics.values():
-                metric_type = metric.metric_type.value
-                if metric_type not in by_type:
-                    by_type[metric_type] = []
-                by_type[metric_type].append(metric)
-            
-            # Export in order
-            for metric_type in [t.value for t in MetricType]:
-                if metric_type not in by_type:
-                    continue
-                
-                for metric in by_type[metric_type]:
-                    # Add HELP and TYPE comments
-                    output_lines.append(f"# HELP {metric.name} {metric.help_text}")
-                    output_lines.append(f"# TYPE {metric.name} {metric.metric_type.value}")
-                    
-                    # Format metric with labels if present
-                    if metric.labels:
-                        label_str = ",".join(f'{k}="{v}"' for k, v in metric.labels.items())
-                        output_lines.append(
-                            f"{metric.name}{{{label_str}}} {metric.value} {int(metric.timestamp * 1000)}"
-                        )
-                    else:
-                        output_lines.append(
-                            f"{metric.name} {metric.value} {int(metric.timestamp * 1000)}"
-                        )
+        collected = self._collect()
+
+        # Group metrics by type for better organization
+        by_type: Dict[str, List[MetricValue]] = {}
+        for metric in list(self.metrics.values()):
+            by_type.setdefault(metric.metric_type.value, []).append(metric)
+
+        for metric_type in [t.value for t in MetricType]:
+            for metric in by_type.get(metric_type, []):
+                name = metric.name
+                output_lines.append(f"# HELP {name} {metric.help_text}")
+                output_lines.append(f"# TYPE {name} {metric_type}")
+                series = collected.get(name) or {}
+
+                if metric.metric_type == MetricType.HISTOGRAM:
+                    buckets = metric.buckets or DEFAULT_LATENCY_BUCKETS_MS
+                    if not series:
+                        series = {(): [[0] * (len(buckets) + 1), 0.0, 0]}
+                    for key, (counts, total, count) in series.items():
+                        cumulative = 0
+                        for bound, bucket_count in zip(list(buckets) + [math.inf], counts):
+                            cumulative += bucket_count
+                            labels = _format_labels(key, [("le", _format_value(bound))])
+                            output_lines.append(f"{name}_bucket{labels} {cumulative}")
+                        output_lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                        output_lines.append(f"{name}_count{_format_labels(key)} {count}")
+                elif metric.metric_type == MetricType.SUMMARY:
+                    if not series:
+                        series = {(): [[], 0.0, 0]}
+                    for key, (samples, total, count) in series.items():
+                        for q in SUMMARY_QUANTILES:
+                            labels = _format_labels(key, [("quantile", str(q))])
+                            value = self._sample_quantile(samples, q)
+                            output_lines.append(f"{name}{labels} {_format_value(value)}")
+                        output_lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                        output_lines.append(f"{name}_count{_format_labels(key)} {count}")
+                else:
+                    if not series:
+                        series = {(): 0.0}
+                    for key, value in series.items():
+                        output_lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
         
         return "\n".join(output_lines) + "\n"
     
     def get_metrics_dict(self) -> Dict[str, Dict[str, Any]]:
-        """Get metrics as dictionary for programmatic access."""
-        with self.lock:
-            return {
-                name: {
-                    "value": metric.value,
-                    "type": metric.metric_type.value,
-                    "help": metric.help_text,
-                    "labels": metric.labels,
-                    "timestamp": metric.timestamp
-                }
-                for name, metric in self.metrics.items()
+        """
+        Get metrics as dictionary for programmatic access.
+
+        ``value`` is the total across series (counters), the unlabelled or
+        last-set value (gauges) or the observation count (histograms and
+        summaries, which also report p50/p95/p99 estimates per series).
+        """
+        collected = self._collect()
+        now = time.time()
+        result = {}
+        for name, metric in list(self.metrics.items()):
+            series = collected.get(name) or {}
+            entries = []
+            if metric.metric_type in (MetricType.HISTOGRAM, MetricType.SUMMARY):
+                total_count = 0
+                for key, (data, total, count) in series.items():
+                    entry = {
+                        "labels": dict(key),
+                        "count": count,
+                        "sum": total,
+                        "avg": total / count if count else 0.0,
+                    }
+                    for field, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                        if metric.metric_type == MetricType.HISTOGRAM:
+                            buckets = metric.buckets or DEFAULT_LATENCY_BUCKETS_MS
+                            entry[field] = self._bucket_quantile(buckets, data, q)
+                        else:
+                            entry[field] = self._sample_quantile(data, q)
+                    entries.append(entry)
+                    total_count += count
+                value = float(total_count)
+            else:
+                for key, v in series.items():
+                    entries.append({"labels": dict(key), "value": v})
+                if metric.metric_type == MetricType.COUNTER:
+                    value = float(sum(series.values()))
+                else:
+                    value = series.get((), next(iter(series.values()), 0.0)) if series else 0.0
+            result[name] = {
+                "value": value,
+                "type": metric.metric_type.value,
+                "help": metric.help_text,
+                "labels": entries[0]["labels"] if len(entries) == 1 else {},
+                "series": entries,
+                "timestamp": now,
             }
+        return result
 
 
 # Global singleton instance
 _metrics_instance: Optional[PrometheusMetrics] = None
 
 
+_instance_lock = threading.Lock()
+
+
 def get_metrics() -> PrometheusMetrics:
     """Get or create global metrics instance."""
     global _metrics_instance
     if _metrics_instance is None:
-        _metrics_instance = PrometheusMetrics()
+        with _instance_lock:
+            if _metrics_instance is None:
+                _metrics_instance = PrometheusMetrics()
     return _metrics_instance
 
 
+def _reset_after_fork():
+    if _metrics_instance is not None:
+        _metrics_instance._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def reset_metrics():
     """Reset metrics (for testing)."""
     global _metrics_instance
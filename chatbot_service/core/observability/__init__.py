@@ -9,6 +9,10 @@ from .tracing import (
     SpanStatus,
     get_tracer,
     init_tracer,
+    trace_span,
+    traced,
+    traces_to_otlp,
+    OTLPExporter,
 )
 
 __all__ = [
@@ -19,4 +23,8 @@ __all__ = [
     "SpanStatus",
     "get_tracer",
     "init_tracer",
+    "trace_span",
+    "traced",
+    "traces_to_otlp",
+    "OTLPExporter",
 ]
@@ -3,25 +3,58 @@ Agent Tracing - Observability for agent operations.
 
 Provides:
 - AgentTracer: Unified tracing for all operations
-- Span context management
+- Span context management propagated through contextvars (works across
+  awaits, asyncio tasks and asyncio.to_thread)
+- Head sampling (TRACE_SAMPLE_RATE) plus tail sampling of slow/failed traces
+- Ring-buffer storage of kept traces and per-node latency aggregates
+- OTLP/JSON export to a local file and/or an OTLP HTTP collector
 - Integration with Langfuse/OpenTelemetry
 - Local fallback logging
 
+Instrumented stages use ``tracer.span(...)`` / ``@traced(...)``. Spans with
+``child_only=True`` are free no-ops unless a trace is already active, so hot
+paths (cache tiers, DB queries) cost one contextvar lookup outside requests.
+
 Based on monitoring-and-evaluating-agents.ipynb patterns.
 """
-from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+import functools
+import inspect
 import json
 import logging
+import os
+import queue
+import random
+import urllib.request
 import uuid
 import threading
 from collections import deque
 
 logger = logging.getLogger(__name__)
 
+# Fraction of root traces kept regardless of outcome (head sampling)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+# Traces slower than this (or with an error) are always kept (tail sampling)
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "2000"))
+# Kept traces held in the in-memory ring buffer
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+# Spans recorded per trace before further spans are only aggregated
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "512"))
+# OTLP/JSON lines file for kept traces (empty disables)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+# OTLP HTTP collector, e.g. http://localhost:4318/v1/traces (empty disables)
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+# Recent durations kept per node for latency percentiles
+_NODE_WINDOW = 512
+_MAX_NODES = 256
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("agent_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("agent_span", default=None)
+
 
 class SpanType(Enum):
     """Types of traced operations."""
@@ -33,6 +66,10 @@ class SpanType(Enum):
     WEB_REQUEST = "web_request"
     PLANNING = "planning"
     VALIDATION = "validation"
+    VECTOR_SEARCH = "vector_search"
+    EMBEDDING = "embedding"
+    RERANK = "rerank"
+    CACHE = "cache"
     CUSTOM = "custom"
 
 
@@ -69,6 +106,7 @@ class Span:
     parent_id: Optional[str] = None
     events: List[Dict[str, Any]] = field(default_factory=list)
     error: Optional[str] = None
+    trace_id: Optional[str] = None
     
     def duration_ms(self) -> Optional[float]:
         """Get duration in milliseconds."""
@@ -83,6 +121,10 @@ class Span:
             "timestamp": datetime.utcnow().isoformat(),
             "data": data or {}
         })
+
+    def set_attribute(self, key: str, value: Any):
+        """Set a metadata attribute on this span."""
+        self.metadata[key] = value
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -114,10 +156,23 @@ class Trace:
     metadata: Dict[str, Any] = field(default_factory=dict)
     start_time: datetime = field(default_factory=datetime.utcnow)
     end_time: Optional[datetime] = None
+    sampled: bool = True
+    has_error: bool = False
+    dropped_spans: int = 0
     
     def add_span(self, span: Span):
-        """Add a span to this trace."""
+        """Add a span to this trace (bounded by TRACE_MAX_SPANS)."""
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped_spans += 1
+            return
+        span.trace_id = self.trace_id
         self.spans.append(span)
+
+    def duration_ms(self) -> Optional[float]:
+        """Get duration in milliseconds."""
+        if self.end_time:
+            return (self.end_time - self.start_time).total_seconds() * 1000
+        return None
     
     def get_root_span(self) -> Optional[Span]:
         """Get the root span (no parent)."""
@@ -134,10 +189,316 @@ class Trace:
             "spans": [s.to_dict() for s in self.spans],
             "metadata": self.metadata,
             "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "duration_ms": self.duration_ms(),
+            "dropped_spans": self.dropped_spans,
         }
 
 
+class _NoopSpan:
+    """Stand-in yielded by child-only spans when no trace is active."""
+
+    span_id = None
+    trace_id = None
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {}
+
+    def add_event(self, name: str, data: Optional[Dict] = None):
+        pass
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+def _aggregate_key(name: str) -> str:
+    # "orchestrator_execute:<intent>" / "deep_research:<query>" -> stable node name
+    return name.split(":", 1)[0]
+
+
+class _SpanContext:
+    """Sync and async context manager that opens and closes one span."""
+
+    __slots__ = (
+        "tracer", "name", "span_type", "metadata", "child_only",
+        "span", "_span_token", "_trace_token", "_trace",
+    )
+
+    def __init__(self, tracer: "AgentTracer", name: str, span_type: "SpanType",
+                 metadata: Optional[Dict[str, Any]], child_only: bool):
+        self.tracer = tracer
+        self.name = name
+        self.span_type = span_type
+        self.metadata = metadata
+        self.child_only = child_only
+        self.span = None
+        self._span_token = None
+        self._trace_token = None
+        self._trace = None
+
+    def _start(self):
+        trace = _current_trace.get()
+        if trace is None:
+            if self.child_only:
+                return _NOOP_SPAN
+            trace = Trace(
+                trace_id=uuid.uuid4().hex,
+                name=self.name,
+                sampled=random.random() < self.tracer.sample_rate,
+            )
+            self._trace = trace
+            self._trace_token = _current_trace.set(trace)
+
+        parent = _current_span.get()
+        span = Span(
+            span_id=_new_span_id(),
+            name=self.name,
+            span_type=self.span_type,
+            start_time=datetime.utcnow(),
+            metadata=dict(self.metadata) if self.metadata else {},
+            parent_id=parent.span_id if parent is not None else None,
+        )
+        trace.add_span(span)
+        self.span = span
+        self._span_token = _current_span.set(span)
+        return span
+
+    def _finish(self, exc: Optional[BaseException]):
+        span = self.span
+        if span is None:
+            return
+        span.end_time = datetime.utcnow()
+        if exc is not None:
+            span.status = SpanStatus.ERROR
+            span.error = str(exc)
+        else:
+            span.status = SpanStatus.SUCCESS
+        _current_span.reset(self._span_token)
+        self.tracer._on_span_end(span)
+
+        if self._trace is not None:
+            _current_trace.reset(self._trace_token)
+            self.tracer._finish_trace(self._trace)
+
+    def __enter__(self):
+        return self._start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._finish(exc)
+        return False
+
+    async def __aenter__(self):
+        return self._start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._finish(exc)
+        return False
+
+
+class _NodeStats:
+    """Per-node latency aggregate (count, errors, recent durations)."""
+
+    __slots__ = ("span_type", "count", "errors", "total_ms", "max_ms", "recent")
+
+    def __init__(self, span_type: str):
+        self.span_type = span_type
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent: deque = deque(maxlen=_NODE_WINDOW)
+
+    def add(self, duration_ms: float, error: bool):
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.recent.append(duration_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.recent)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(int(p * len(ordered)), len(ordered) - 1)], 2)
+
+        return {
+            "type": self.span_type,
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+# ============================================================================
+# OTLP export
+# ============================================================================
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _unix_nanos(dt: datetime) -> str:
+    return str(int(dt.replace(tzinfo=timezone.utc).timestamp() * 1_000_000_000))
+
+
+def _span_to_otlp(span: Span, trace_id: str) -> Dict[str, Any]:
+    attributes = [{"key": "span.type", "value": {"stringValue": span.span_type.value}}]
+    attributes.extend(
+        {"key": str(k), "value": _otlp_value(v)} for k, v in span.metadata.items()
+    )
+    otlp = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": _unix_nanos(span.start_time),
+        "endTimeUnixNano": _unix_nanos(span.end_time or span.start_time),
+        "attributes": attributes,
+        "status": (
+            {"code": 2, "message": span.error or ""}
+            if span.status == SpanStatus.ERROR else {"code": 1}
+        ),
+        "events": [
+            {
+                "name": e["name"],
+                "timeUnixNano": _unix_nanos(datetime.fromisoformat(e["timestamp"])),
+                "attributes": [
+                    {"key": str(k), "value": _otlp_value(v)} for k, v in e["data"].items()
+                ],
+            }
+            for e in span.events
+        ],
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+def traces_to_otlp(traces: List[Trace], service_name: str) -> Dict[str, Any]:
+    """Convert traces to an OTLP/JSON ExportTraceServiceRequest payload."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "core.observability.tracing"},
+                "spans": [
+                    _span_to_otlp(span, trace.trace_id)
+                    for trace in traces for span in trace.spans
+                ],
+            }],
+        }]
+    }
+
+
+class OTLPExporter:
+    """
+    Background exporter writing OTLP/JSON batches to a file and/or collector.
+
+    The file holds one ExportTraceServiceRequest per line (the format read by
+    the OpenTelemetry Collector's otlpjsonfile receiver).
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        file_path: str = "",
+        endpoint: str = "",
+        batch_size: int = 64,
+        flush_interval: float = 2.0,
+    ):
+        self.service_name = service_name
+        self.file_path = file_path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace):
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            logger.debug("Trace export queue full, dropping trace")
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            batch.append(item)
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._export(batch)
+            if stop:
+                return
+
+    def _export(self, batch: List[Trace]):
+        payload = json.dumps(traces_to_otlp(batch, self.service_name), default=str)
+        if self.file_path:
+            try:
+                with open(self.file_path, "a", encoding="utf-8") as f:
+                    f.write(payload + "\n")
+            except OSError as e:
+                logger.warning(f"Trace file export failed: {e}")
+        if self.endpoint:
+            try:
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=payload.encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning(f"Trace collector export failed: {e}")
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush queued traces and stop the exporter thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
 class AgentTracer:
     """
     Unified tracing for all agent operations.
@@ -164,23 +525,39 @@ class AgentTracer:
     def __init__(
         self,
         backend: str = "local",
-        max_traces: int = 1000,
-        service_name: str = "cardio-ai-agent"
+        max_traces: int = TRACE_BUFFER_SIZE,
+        service_name: str = "cardio-ai-agent",
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        slow_trace_ms: float = TRACE_SLOW_MS,
+        export_path: str = TRACE_EXPORT_PATH,
+        otlp_endpoint: str = TRACE_OTLP_ENDPOINT,
     ):
         """
         Initialize the tracer.
         
         Args:
             backend: "langfuse", "opentelemetry", or "local"
-            max_traces: Maximum traces to keep in memory
+            max_traces: Maximum kept traces in the ring buffer
             service_name: Service name for external backends
+            sample_rate: Head sampling rate for root traces (0.0-1.0)
+            slow_trace_ms: Tail sampling threshold; slower traces are always kept
+            export_path: OTLP/JSON lines file for kept traces
+            otlp_endpoint: OTLP HTTP collector URL for kept traces
         """
         self.backend = backend
         self.service_name = service_name
+        self.sample_rate = sample_rate
+        self.slow_trace_ms = slow_trace_ms
         self.traces: deque = deque(maxlen=max_traces)
-        self._current_trace: Optional[Trace] = None
-        self._current_span_id: Optional[str] = None
         self._lock = threading.Lock()
+        self._nodes: Dict[str, _NodeStats] = {}
+        self._trace_counts = {"finished": 0, "kept": 0, "kept_head": 0, "kept_tail": 0}
+        self._span_metric_registered = False
+        self._prometheus = None
+        
+        self._exporter: Optional[OTLPExporter] = None
+        if export_path or otlp_endpoint:
+            self._exporter = OTLPExporter(service_name, export_path, otlp_endpoint)
         
         # Setup external backend
         self._client = None
@@ -241,7 +618,7 @@ class AgentTracer:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Trace:
         """
-        Start a new trace.
+        Start a new trace in the current context (always kept when ended).
         
         Args:
             name: Trace name
@@ -251,37 +628,58 @@ class AgentTracer:
             New Trace object
         """
         trace = Trace(
-            trace_id=str(uuid.uuid4()),
+            trace_id=uuid.uuid4().hex,
             name=name,
             metadata=metadata or {}
         )
-        
-        with self._lock:
-            self._current_trace = trace
-        
+        trace.metadata["_token"] = _current_trace.set(trace)
         return trace
     
     def end_trace(self, trace: Optional[Trace] = None):
         """End a trace and record it."""
-        trace = trace or self._current_trace
+        trace = trace or _current_trace.get()
         if trace:
-            trace.end_time = datetime.utcnow()
-            self.traces.append(trace)
-            self._record_to_backend(trace)
-            
-            with self._lock:
-                if self._current_trace == trace:
-                    self._current_trace = None
+            token = trace.metadata.pop("_token", None)
+            if token is not None:
+                try:
+                    _current_trace.reset(token)
+                except ValueError:
+                    _current_trace.set(None)
+            self._finish_trace(trace)
+
+    def current_trace(self) -> Optional[Trace]:
+        """Trace active in the current context, if any."""
+        return _current_trace.get()
+
+    def span(
+        self,
+        name: str,
+        span_type: SpanType = SpanType.CUSTOM,
+        metadata: Optional[Dict[str, Any]] = None,
+        child_only: bool = False,
+    ) -> _SpanContext:
+        """
+        Open a span (usable with ``with`` and ``async with``).
+
+        Without an active trace a new root trace is started, unless
+        ``child_only`` is set, in which case a no-op span is yielded.
+
+        Args:
+            name: Operation name
+            span_type: Type of operation
+            metadata: Span attributes
+            child_only: Only record when nested inside an active trace
+        """
+        return _SpanContext(self, name, span_type, metadata, child_only)
     
-    @asynccontextmanager
-    async def trace_operation(
+    def trace_operation(
         self,
         name: str,
         operation_type: SpanType = SpanType.CUSTOM,
         metadata: Optional[Dict[str, Any]] = None
-    ):
+    ) -> _SpanContext:
         """
-        Context manager for tracing an operation.
+        Context manager for tracing an operation (``with`` or ``async with``).
         
         Args:
             name: Operation name
@@ -291,36 +689,84 @@ class AgentTracer:
         Yields:
             Span object for adding events
         """
-        span = Span(
-            span_id=str(uuid.uuid4())[:8],
-            name=name,
-            span_type=operation_type,
-            start_time=datetime.utcnow(),
-            metadata=metadata or {},
-            parent_id=self._current_span_id
-        )
-        
-        # Set as current span
-        previous_span_id = self._current_span_id
-        self._current_span_id = span.span_id
-        
-        # Add to current trace
-        if self._current_trace:
-            self._current_trace.add_span(span)
-        
-        try:
-            yield span
-            span.status = SpanStatus.SUCCESS
-        except Exception as e:
-            span.status = SpanStatus.ERROR
-            span.error = str(e)
-            raise
-        finally:
-            span.end_time = datetime.utcnow()
-            self._current_span_id = previous_span_id
-            
-            # Log locally
+        return self.span(name, operation_type, metadata)
+
+    def _record_finished_span(self, span: Span):
+        """Attach an already finished span to the active trace, if any."""
+        trace = _current_trace.get()
+        if trace is not None:
+            parent = _current_span.get()
+            if span.parent_id is None and parent is not None:
+                span.parent_id = parent.span_id
+            trace.add_span(span)
+        self._on_span_end(span)
+
+    def _on_span_end(self, span: Span):
+        """Aggregate per-node latency for every span (sampled or not)."""
+        duration = span.duration_ms() or 0.0
+        error = span.status == SpanStatus.ERROR
+        key = _aggregate_key(span.name)
+        with self._lock:
+            stats = self._nodes.get(key)
+            if stats is None:
+                if len(self._nodes) >= _MAX_NODES:
+                    key = "other"
+                    stats = self._nodes.get(key)
+                if stats is None:
+                    stats = self._nodes[key] = _NodeStats(span.span_type.value)
+            stats.add(duration, error)
+        if error:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.has_error = True
+
+        metrics = self._metrics()
+        if metrics is not None:
+            metrics.record_histogram("trace_span_duration_ms", duration, labels={"span": key})
+
+        if logger.isEnabledFor(logging.DEBUG):
             self._log_span(span)
+
+    def _metrics(self):
+        """Shared PrometheusMetrics registry (span latency histogram)."""
+        if not self._span_metric_registered:
+            self._span_metric_registered = True
+            try:
+                from core.monitoring.prometheus_metrics import get_metrics, MetricType
+                metrics = get_metrics()
+                metrics.register_metric(
+                    "trace_span_duration_ms",
+                    MetricType.HISTOGRAM,
+                    "Traced stage duration in milliseconds, labelled by span",
+                )
+                self._prometheus = metrics
+            except Exception as e:
+                logger.debug(f"Span latency metrics unavailable: {e}")
+        return self._prometheus
+
+    def _finish_trace(self, trace: Trace):
+        """Apply head/tail sampling and store/export kept traces."""
+        trace.end_time = datetime.utcnow()
+        duration = trace.duration_ms() or 0.0
+        head = trace.sampled
+        tail = trace.has_error or duration >= self.slow_trace_ms
+        with self._lock:
+            self._trace_counts["finished"] += 1
+            if head or tail:
+                self._trace_counts["kept"] += 1
+                self._trace_counts["kept_head" if head else "kept_tail"] += 1
+        if not (head or tail):
+            return
+        trace.metadata.setdefault("sampling", "head" if head else "tail")
+        self.traces.append(trace)
+        if self._exporter is not None:
+            self._exporter.submit(trace)
+        self._record_to_backend(trace)
+
+    def shutdown(self):
+        """Flush pending exports."""
+        if self._exporter is not None:
+            self._exporter.shutdown()
     
     def record_llm_call(
         self,
@@ -330,13 +776,14 @@ class AgentTracer:
         tokens_used: Optional[int] = None,
         latency_ms: Optional[float] = None
     ):
-        """Record an LLM call as a span."""
+        """Record an already finished LLM call as a span."""
+        end_time = datetime.utcnow()
         span = Span(
-            span_id=str(uuid.uuid4())[:8],
+            span_id=_new_span_id(),
             name=f"llm_call:{model}",
             span_type=SpanType.LLM_CALL,
-            start_time=datetime.utcnow(),
-            end_time=datetime.utcnow(),
+            start_time=end_time - timedelta(milliseconds=latency_ms or 0.0),
+            end_time=end_time,
             status=SpanStatus.SUCCESS,
             metadata={
                 "model": model,
@@ -347,10 +794,7 @@ class AgentTracer:
             }
         )
         
-        if self._current_trace:
-            self._current_trace.add_span(span)
-        
-        self._log_span(span)
+        self._record_finished_span(span)
     
     def record_tool_call(
         self,
@@ -360,13 +804,14 @@ class AgentTracer:
         success: bool,
         latency_ms: float
     ):
-        """Record a tool call as a span."""
+        """Record an already finished tool call as a span."""
+        end_time = datetime.utcnow()
         span = Span(
-            span_id=str(uuid.uuid4())[:8],
+            span_id=_new_span_id(),
             name=f"tool:{tool_name}",
             span_type=SpanType.TOOL_CALL,
-            start_time=datetime.utcnow(),
-            end_time=datetime.utcnow(),
+            start_time=end_time - timedelta(milliseconds=latency_ms or 0.0),
+            end_time=end_time,
             status=SpanStatus.SUCCESS if success else SpanStatus.ERROR,
             metadata={
                 "tool_name": tool_name,
@@ -376,19 +821,16 @@ class AgentTracer:
             }
         )
         
-        if self._current_trace:
-            self._current_trace.add_span(span)
-        
-        self._log_span(span)
+        self._record_finished_span(span)
     
     def _log_span(self, span: Span):
         """Log span to local logger."""
         duration = span.duration_ms() or 0
         status = "✅" if span.status == SpanStatus.SUCCESS else "❌"
         
-        logger.info(
+        logger.debug(
             f"TRACE {status} [{span.span_type.value}] {span.name} "
-            f"({duration:.1f}ms) {json.dumps(span.metadata)}"
+            f"({duration:.1f}ms) {json.dumps(span.metadata, default=str)}"
         )
     
     def _record_to_backend(self, trace: Trace):
@@ -408,10 +850,22 @@ class AgentTracer:
         traces = list(self.traces)[-limit:]
         return [t.to_dict() for t in traces]
     
+    def get_node_latencies(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node latency breakdown over all spans (sampled or not)."""
+        with self._lock:
+            nodes = {name: stats.to_dict() for name, stats in self._nodes.items()}
+        return dict(sorted(nodes.items(), key=lambda item: -item[1]["avg_ms"] * item[1]["count"]))
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get aggregated metrics from traces."""
+        with self._lock:
+            sampling = {
+                **self._trace_counts,
+                "sample_rate": self.sample_rate,
+                "slow_trace_ms": self.slow_trace_ms,
+            }
         if not self.traces:
-            return {"total_traces": 0}
+            return {"total_traces": 0, "sampling": sampling, "nodes": self.get_node_latencies()}
         
         total_spans = sum(len(t.spans) for t in self.traces)
         success_spans = sum(
@@ -433,7 +887,9 @@ class AgentTracer:
             "success_rate": (success_spans / total_spans * 100) if total_spans else 0,
             "avg_latency_ms": sum(latencies) / len(latencies) if latencies else 0,
             "max_latency_ms": max(latencies) if latencies else 0,
-            "span_types": self._count_span_types()
+            "span_types": self._count_span_types(),
+            "sampling": sampling,
+            "nodes": self.get_node_latencies(),
         }
     
     def _count_span_types(self) -> Dict[str, int]:
@@ -450,16 +906,66 @@ class AgentTracer:
 _tracer: Optional[AgentTracer] = None
 
 
+_tracer_lock = threading.Lock()
+
+
 def get_tracer() -> AgentTracer:
     """Get the global tracer instance."""
     global _tracer
     if _tracer is None:
-        _tracer = AgentTracer()
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = AgentTracer()
     return _tracer
 
 
 def init_tracer(backend: str = "local", **kwargs) -> AgentTracer:
     """Initialize global tracer with specific backend."""
     global _tracer
-    _tracer = AgentTracer(backend=backend, **kwargs)
+    previous, _tracer = _tracer, AgentTracer(backend=backend, **kwargs)
+    if previous is not None:
+        previous.shutdown()
     return _tracer
+
+
+def trace_span(
+    name: str,
+    span_type: SpanType = SpanType.CUSTOM,
+    metadata: Optional[Dict[str, Any]] = None,
+    child_only: bool = True,
+) -> _SpanContext:
+    """Open a span on the global tracer (child-only by default)."""
+    return get_tracer().span(name, span_type, metadata, child_only)
+
+
+def traced(
+    name: Optional[str] = None,
+    span_type: SpanType = SpanType.CUSTOM,
+    child_only: bool = True,
+) -> Callable:
+    """
+    Decorator wrapping a sync or async function in a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        span_type: Type of operation
+        child_only: Only record when called inside an active trace
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                async with get_tracer().span(span_name, span_type, child_only=child_only):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name, span_type, child_only=child_only):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
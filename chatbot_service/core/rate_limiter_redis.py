@@ -1,14 +1,25 @@
 """
 Redis-backed rate limiter for distributed environments.
 
-Uses Redis sorted sets for efficient sliding window rate limiting
-that works across multiple workers and containers.
+Uses GCRA (generic cell rate algorithm) in a single Lua script:
+- One key per user and window holding the theoretical arrival time (TAT),
+  so Redis state is O(1) per user regardless of traffic.
+- Minute and hour windows are checked and updated atomically in one round
+  trip; rejected requests are not recorded.
+- Clearly under-limit users receive a small local lease of pre-paid units,
+  so most of their requests are admitted in-process without touching Redis;
+  units a lease did not use are refunded (TAT moved back) on the user's next
+  Redis check, so the limit stays exact. Rejected users are refused locally
+  until their GCRA retry time.
+- Endpoints can carry cost weights (e.g. chat = 5, health = 0.2).
 """
 
 
+import json
+import math
 import time
 import logging
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import os
 
 logger = logging.getLogger(__name__)
@@ -23,14 +34,106 @@ except ImportError:
     logger.warning("redis not installed. Run: pip install redis")
 
 
+# Units pre-paid per lease (0 disables local admission)
+RATE_LIMIT_LOCAL_LEASE = int(os.getenv("RATE_LIMIT_LOCAL_LEASE", "5"))
+# How long a local lease may be used before asking Redis again (seconds)
+RATE_LIMIT_LEASE_TTL = float(os.getenv("RATE_LIMIT_LEASE_TTL", "1.0"))
+# A lease is only granted if this many leases' worth of budget would remain
+RATE_LIMIT_LEASE_HEADROOM = float(os.getenv("RATE_LIMIT_LEASE_HEADROOM", "3"))
+# Per-endpoint cost weights, JSON object of path (or path prefix) -> cost
+RATE_LIMIT_ENDPOINT_COSTS = os.getenv("RATE_LIMIT_ENDPOINT_COSTS", "")
+# Upper bound on tracked local leases before expired ones are pruned
+_MAX_LOCAL_LEASES = 10000
+
+
+# KEYS: one TAT key per window
+# ARGV: cost, lease, lease_headroom, refund, then (limit, period_ms) per key
+# Returns: {allowed, rejected_window_index, retry_after_ms, remaining, lease_granted}
+GCRA_SCRIPT = """
+pcall(redis.replicate_commands)
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local cost = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local headroom = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+
+local function interval_of(i)
+  return tonumber(ARGV[4 + 2 * i]) / tonumber(ARGV[3 + 2 * i])
+end
+
+local function store(i, tat)
+  if tat > now then
+    redis.call('SET', KEYS[i], string.format('%.3f', tat), 'PX', math.ceil(tat - now) + 1000)
+  else
+    redis.call('DEL', KEYS[i])
+  end
+end
+
+-- Unused units of an earlier lease are handed back first
+local tats = {}
+for i, key in ipairs(KEYS) do
+  local tat = tonumber(redis.call('GET', key) or now)
+  if refund > 0 then tat = tat - interval_of(i) * refund end
+  if tat < now then tat = now end
+  tats[i] = tat
+end
+
+local function fits(units)
+  for i = 1, #KEYS do
+    local period = tonumber(ARGV[4 + 2 * i])
+    local interval = interval_of(i)
+    if tats[i] + interval * units - now > period then
+      return i, tats[i] + interval * units - now - period
+    end
+  end
+  return 0, 0
+end
+
+local bad, over = fits(cost)
+if bad > 0 then
+  if refund > 0 then
+    for i = 1, #KEYS do store(i, tats[i]) end
+  end
+  return {0, bad, math.ceil(over), 0, 0}
+end
+if lease > 0 and fits(cost + lease * (1 + headroom)) > 0 then
+  lease = 0
+end
+
+local charged = cost + lease
+local remaining = -1
+for i = 1, #KEYS do
+  local period = tonumber(ARGV[4 + 2 * i])
+  local interval = interval_of(i)
+  local new_tat = tats[i] + interval * charged
+  store(i, new_tat)
+  local left = math.floor((period - (new_tat - now)) / interval)
+  if remaining < 0 or left < remaining then remaining = left end
+end
+return {1, 0, 0, remaining, lease}
+"""
+
+
+def _parse_endpoint_costs(raw: str) -> Dict[str, float]:
+    if not raw:
+        return {}
+    try:
+        return {str(k): float(v) for k, v in json.loads(raw).items()}
+    except (ValueError, AttributeError) as e:
+        logger.warning(f"Invalid RATE_LIMIT_ENDPOINT_COSTS, ignoring: {e}")
+        return {}
+
+
 class RedisRateLimiter:
     """
-    Distributed rate limiter using Redis sorted sets.
+    Distributed rate limiter using GCRA in Redis.
     
-    Algorithm: Sliding window log using ZSET
-    - Each request timestamp is stored as score
-    - Window cleanup happens on each check
-    - Atomic operations ensure consistency
+    Algorithm: GCRA (equivalent to a token bucket refilled continuously)
+    - Each window stores only the theoretical arrival time (TAT)
+    - A request of cost c advances TAT by c * (period / limit)
+    - It is rejected if TAT would run more than one period ahead of now
+    - One Lua script checks and updates all windows atomically
     
     Usage:
         limiter = RedisRateLimiter()
@@ -43,14 +146,36 @@ class RedisRateLimiter:
         redis_url: Optional[str] = None,
         requests_per_minute: int = 100,
         requests_per_hour: int = 5000,
-        key_prefix: str = "heartguard:ratelimit"
+        key_prefix: str = "heartguard:ratelimit",
+        endpoint_costs: Optional[Dict[str, float]] = None,
+        local_lease: int = RATE_LIMIT_LOCAL_LEASE,
     ):
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         self.key_prefix = key_prefix
+        self.endpoint_costs = (
+            endpoint_costs if endpoint_costs is not None
+            else _parse_endpoint_costs(RATE_LIMIT_ENDPOINT_COSTS)
+        )
+        self.local_lease = max(0, local_lease)
         self._redis: Optional[object] = None
+        self._script = None
         self._connected = False
+        # user_id -> [remaining leased units, lease expiry (monotonic)];
+        # expired entries stay until their leftover units are refunded
+        self._leases: Dict[str, list] = {}
+        # user_id -> (blocked until (monotonic), smallest rejected cost, reason)
+        self._blocked: Dict[str, Tuple[float, float, str]] = {}
+        self.stats = {"local_admits": 0, "redis_checks": 0, "rejected": 0}
+
+    @property
+    def _windows(self) -> Tuple[Tuple[str, int, int], ...]:
+        """(key suffix, limit, period_ms) for each enforced window."""
+        return (
+            ("min", self.requests_per_minute, 60_000),
+            ("hour", self.requests_per_hour, 3_600_000),
+        )
     
     async def connect(self) -> bool:
         """Establish Redis connection."""
@@ -65,6 +190,7 @@ class RedisRateLimiter:
                 decode_responses=True
             )
             await self._redis.ping()
+            self._script = self._redis.register_script(GCRA_SCRIPT)
             self._connected = True
             logger.info(f"Connected to Redis at {self.redis_url}")
             return True
@@ -72,18 +198,53 @@ class RedisRateLimiter:
             logger.error(f"Failed to connect to Redis: {e}")
             self._connected = False
             return False
+
+    def get_endpoint_cost(self, endpoint: str) -> float:
+        """Cost weight for ``endpoint`` (exact match, then longest prefix, else 1)."""
+        if endpoint in self.endpoint_costs:
+            return self.endpoint_costs[endpoint]
+        best, best_len = 1.0, -1
+        for prefix, cost in self.endpoint_costs.items():
+            if endpoint.startswith(prefix) and len(prefix) > best_len:
+                best, best_len = cost, len(prefix)
+        return best
+
+    def _take_local(self, user_id: str, cost: float) -> bool:
+        lease = self._leases.get(user_id)
+        if lease is None or lease[1] < time.monotonic() or lease[0] < cost:
+            return False
+        lease[0] -= cost
+        return True
+
+    def _release_lease(self, user_id: str) -> float:
+        """Drop a user's lease, returning its unused units for refund."""
+        lease = self._leases.pop(user_id, None)
+        return lease[0] if lease is not None else 0.0
+
+    def _store_lease(self, user_id: str, units: float):
+        if len(self._leases) >= _MAX_LOCAL_LEASES:
+            now = time.monotonic()
+            self._leases = {u: l for u, l in self._leases.items() if l[1] >= now}
+            if len(self._leases) >= _MAX_LOCAL_LEASES:
+                return
+        self._leases[user_id] = [units, time.monotonic() + RATE_LIMIT_LEASE_TTL]
+
+    def _key(self, window: str, user_id: str) -> str:
+        return f"{self.key_prefix}:gcra:{window}:{user_id}"
     
     async def check_rate_limit(
         self,
         user_id: str,
-        endpoint: str = "global"
+        endpoint: str = "global",
+        cost: Optional[float] = None,
     ) -> Tuple[bool, Optional[str]]:
         """
         Check if request should be allowed.
         
         Args:
             user_id: Unique user identifier
-            endpoint: API endpoint for granular limits
+            endpoint: API endpoint, used to look up its cost weight
+            cost: Explicit cost overriding the endpoint weight
             
         Returns:
             (is_allowed, reason_if_blocked)
@@ -92,78 +253,75 @@ class RedisRateLimiter:
             # Fallback: allow if Redis unavailable (fail open)
             logger.warning("Redis unavailable, allowing request (fail-open)")
             return True, None
-        
-        now = time.time()
-        now_ms = int(now * 1000)
-        
-        # Keys for minute and hour windows
-        minute_key = f"{self.key_prefix}:min:{user_id}"
-        hour_key = f"{self.key_prefix}:hour:{user_id}"
+
+        if cost is None:
+            cost = self.get_endpoint_cost(endpoint)
+        if cost <= 0:
+            return True, None
+
+        # Local admission from a lease pre-paid in Redis
+        if self._take_local(user_id, cost):
+            self.stats["local_admits"] += 1
+            return True, None
+
+        # Local rejection until GCRA's retry time for a recently rejected user
+        blocked = self._blocked.get(user_id)
+        if blocked is not None:
+            if blocked[0] > time.monotonic() and cost >= blocked[1]:
+                self.stats["rejected"] += 1
+                return False, blocked[2]
+            del self._blocked[user_id]
+
+        windows = self._windows
+        refund = self._release_lease(user_id)
+        args = [cost, self.local_lease, RATE_LIMIT_LEASE_HEADROOM, refund]
+        for _, limit, period_ms in windows:
+            args.extend((limit, period_ms))
         
         try:
-            pipe = self._redis.pipeline()
-            
-            # === Minute Window ===
-            minute_ago_ms = int((now - 60) * 1000)
-            
-            # Remove old entries
-            pipe.zremrangebyscore(minute_key, 0, minute_ago_ms)
-            # Count current entries
-            pipe.zcard(minute_key)
-            # Add new entry
-            pipe.zadd(minute_key, {f"{now_ms}": now_ms})
-            # Set expiry (cleanup)
-            pipe.expire(minute_key, 120)
-            
-            # === Hour Window ===
-            hour_ago_ms = int((now - 3600) * 1000)
-            
-            pipe.zremrangebyscore(hour_key, 0, hour_ago_ms)
-            pipe.zcard(hour_key)
-            pipe.zadd(hour_key, {f"{now_ms}": now_ms})
-            pipe.expire(hour_key, 7200)
-            
-            results = await pipe.execute()
-            
-            minute_count = results[1]  # zcard result for minute
-            hour_count = results[5]    # zcard result for hour
-            
-            # Check limits
-            if minute_count >= self.requests_per_minute:
-                return (
-                    False,
-                    f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
-                )
-            
-            if hour_count >= self.requests_per_hour:
-                return (
-                    False,
-                    f"Rate limit exceeded: {self.requests_per_hour} requests per hour"
-                )
-            
-            return True, None
-            
+            self.stats["redis_checks"] += 1
+            allowed, window_index, retry_after_ms, _remaining, lease = await self._script(
+                keys=[self._key(name, user_id) for name, _, _ in windows],
+                args=args,
+            )
         except Exception as e:
             logger.error(f"Rate limit check failed: {e}")
+            if refund > 0:
+                # Not handed back yet: keep the units (expired) for the next check
+                self._leases.setdefault(user_id, [refund, 0.0])
             # Fail open - allow request if Redis has issues
             return True, None
+
+        if int(allowed):
+            if float(lease) > 0:
+                self._store_lease(user_id, float(lease))
+            return True, None
+
+        self.stats["rejected"] += 1
+        name, limit, _ = windows[int(window_index) - 1]
+        unit = "minute" if name == "min" else "hour"
+        retry_after = max(1, math.ceil(int(retry_after_ms) / 1000))
+        reason = f"Rate limit exceeded: {limit} requests per {unit} (retry after {retry_after}s)"
+        if len(self._blocked) >= _MAX_LOCAL_LEASES:
+            self._blocked.clear()
+        self._blocked[user_id] = (time.monotonic() + int(retry_after_ms) / 1000, cost, reason)
+        return False, reason
     
     async def get_stats(self, user_id: str) -> dict:
         """Get current rate limit stats for user."""
         if not self._connected or not self._redis:
             return {"error": "Redis unavailable"}
         
-        now = time.time()
-        minute_key = f"{self.key_prefix}:min:{user_id}"
-        hour_key = f"{self.key_prefix}:hour:{user_id}"
-        
+        windows = self._windows
         try:
-            pipe = self._redis.pipeline()
-            pipe.zcard(minute_key)
-            pipe.zcard(hour_key)
-            results = await pipe.execute()
-            
-            minute_count, hour_count = results
+            tats = await self._redis.mget([self._key(name, user_id) for name, _, _ in windows])
+            now_ms = time.time() * 1000
+
+            used = []
+            for tat, (_, limit, period_ms) in zip(tats, windows):
+                ahead = max(0.0, float(tat) - now_ms) if tat else 0.0
+                used.append(min(limit, math.ceil(ahead / (period_ms / limit))))
+            minute_count, hour_count = used
             
             return {
                 "requests_this_minute": minute_count,
@@ -172,6 +330,8 @@ class RedisRateLimiter:
                 "requests_this_hour": hour_count,
                 "limit_per_hour": self.requests_per_hour,
                 "remaining_this_hour": max(0, self.requests_per_hour - hour_count),
+                "local_admits": self.stats["local_admits"],
+                "redis_checks": self.stats["redis_checks"],
             }
         except Exception as e:
             logger.error(f"Failed to get rate limit stats: {e}")
@@ -108,7 +108,9 @@ except ImportError:
             def __init__(self):
                 self.requests = {}
             
-            async def check_rate_limit(self, identifier: str, limit: int = 100, window: int = 60):
+            async def check_rate_limit(
+                self, identifier: str, endpoint: str = "global", limit: int = 100, window: int = 60
+            ):
                 import time
                 now = time.time()
                 if identifier not in self.requests:
@@ -464,9 +466,9 @@ async def check_rate_limit_dependency(request: Request):
     """Rate limiting dependency - uses Redis if available, falls back to in-memory."""
     client_ip = request.client.host
     
-    
     limiter = await get_redis_rate_limiter()
-    allowed, reason = await limiter.check_rate_limit(client_ip)
+    # Charge the path so RATE_LIMIT_ENDPOINT_COSTS weights apply
+    allowed, reason = await limiter.check_rate_limit(client_ip, endpoint=request.url.path)
     if not allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -17,7 +17,7 @@ import threading
 from collections import OrderedDict
 from datetime import datetime, timedelta
 from threading import RLock
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from contextlib import contextmanager
 
 # Optional dependencies
@@ -39,8 +39,8 @@ except ImportError:
 
 # Import query optimization modules (optional)
 try:
+    from core.cache import create_cache, session_tag, user_tag
     from core.database.query_optimizer import (
-        TieredCache,
         BatchInsertManager,
         OptimizedChatHistoryQueries,
         QueryOptimizationConfig,
@@ -57,10 +57,11 @@ except ImportError:
 
 # Import encryption service for PHI protection
 try:
-    from core.services.encryption_service import get_encryption_service
+    from core.services.encryption_service import FIELD_PREFIX, get_encryption_service
 
     ENCRYPTION_AVAILABLE = True
 except ImportError:
+    FIELD_PREFIX = "ENC:"
     ENCRYPTION_AVAILABLE = False
     logger.warning(
         "Encryption service not available - chat metadata will not be encrypted"
@@ -293,11 +294,12 @@ class PersistentChatHistory:
             try:
                 # Initialize tiered cache (L1 in-memory + L2 Redis)
                 redis_url = redis_url or os.environ.get("REDIS_URL", "redis://localhost:6379")
-                self._tiered_cache = TieredCache(
-                    l1_max_size=in_memory_cache_size,
-                    l1_ttl_seconds=60,
+                self._tiered_cache = create_cache(
+                    "chat_history",
+                    l1_max_entries=in_memory_cache_size,
+                    l1_ttl=60,
                     redis_url=redis_url,
-                    l2_ttl_seconds=300,
+                    l2_ttl=300,
                 )
                 logger.info("Tiered cache (L1+L2) initialized for chat history")
                 
@@ -364,14 +366,25 @@ class PersistentChatHistory:
             self._cleanup_thread.join(timeout=5)
             self._cleanup_thread = None
 
-    def _update_cache(self, session_id: str, history: List[Dict[str, str]]) -> None:
-        """Update cache with LRU eviction. Uses tiered cache if available."""
+    def _update_cache(
+        self,
+        session_id: str,
+        history: List[Dict[str, str]],
+        user_ids: Iterable[str] = (),
+    ) -> None:
+        """
+        Update cache with LRU eviction. Uses tiered cache if available.
+
+        Entries are tagged with the session and with every message author
+        in ``user_ids``, so a per-user purge evicts them too.
+        """
         cache_key = f"chat_history:{session_id}"
         
         # Use tiered cache if available (L1 + L2 Redis)
         if self._tiered_cache:
             try:
-                self._tiered_cache.set(cache_key, history)
+                tags = (session_tag(session_id), *(user_tag(uid) for uid in sorted(set(user_ids))))
+                self._tiered_cache.set(cache_key, history, tags=tags)
                 return
             except Exception as e:
                 logger.warning(f"Tiered cache set failed, falling back to local cache: {e}")
@@ -453,18 +466,25 @@ class PersistentChatHistory:
         Returns:
             Message ID
         """
-        # Encrypt metadata if encryption service is available
-        encrypted_metadata = None
-        if metadata and self._encryption:
+        # Encrypt content and metadata together under the user's data key
+        encrypted_content = content
+        encrypted_metadata = json.dumps(metadata or {})
+        if self._encryption:
             try:
-                metadata_json = json.dumps(metadata)
-                encrypted_metadata = self._encryption.encrypt_field(metadata_json)
+                if metadata:
+                    tokens = self._encryption.encrypt_many(
+                        [content, encrypted_metadata], context=user_id
+                    )
+                    encrypted_content = FIELD_PREFIX + tokens[0]
+                    encrypted_metadata = FIELD_PREFIX + tokens[1]
+                else:
+                    encrypted_content = self._encryption.encrypt_field(
+                        content, context=user_id
+                    )
             except Exception as e:
-                logger.error(f"Failed to encrypt metadata: {e}")
-                # Fall back to unencrypted metadata
-                encrypted_metadata = json.dumps(metadata)
-        else:
-            encrypted_metadata = json.dumps(metadata or {})
+                logger.error(f"Failed to encrypt message: {e}")
+                # Fall back to unencrypted content and metadata
+                encrypted_content = content
 
         with self._get_db() as db:
             # Ensure session exists
@@ -478,15 +498,6 @@ class PersistentChatHistory:
                 chat_session.last_activity = datetime.utcnow()
                 chat_session.message_count = (chat_session.message_count or 0) + 1
 
-            # Encrypt content if encryption service is available
-            encrypted_content = content
-            if self._encryption:
-                try:
-                    encrypted_content = self._encryption.encrypt_field(content)
-                except Exception as e:
-                    logger.error(f"Failed to encrypt content: {e}")
-                    # Fall back to unencrypted content
-
             # Add message with encrypted content and metadata
             message = ChatMessage(
                 session_id=session_id,
@@ -534,6 +545,7 @@ class PersistentChatHistory:
 
             # Reverse to chronological order
             messages = list(reversed(messages))
+            user_ids = {m.user_id for m in messages if m.user_id}
 
             if include_metadata:
                 # Decrypt metadata if encryption service is available
@@ -611,7 +623,7 @@ class PersistentChatHistory:
                 history.append({"role": m.role, "content": content})
 
         # Update cache
-        self._update_cache(session_id, history)
+        self._update_cache(session_id, history, user_ids)
 
         return history
 
@@ -4,18 +4,37 @@ Uses AES-256-GCM encryption (authenticated encryption).
 
 Phase 2: Encryption Service
 
+Key hierarchy (envelope encryption):
+- The master key is stretched ONCE per key version with PBKDF2 into a
+  key-encryption key (KEK).
+- Data keys are derived from the KEK with HKDF per tenant and per period
+  (e.g. month), so the write path costs one cached HKDF lookup plus AES-GCM
+  instead of a 100K-iteration PBKDF2 per field.
+- Every v2 ciphertext carries its key id (version.tenant-tag.period) in the
+  header, bound to the ciphertext as GCM associated data.
+
+Legacy ciphertexts (base64(salt || IV || ciphertext), per-salt PBKDF2) are
+still decrypted; they are never produced any more.
+
 Security: Cache is sized to prevent memory exhaustion from high-cardinality salts.
 """
 
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from datetime import datetime, timezone
 import os
+import hmac
 import json
+import hashlib
 import logging
 import base64
-from typing import Union, Dict, Any
+import struct
+import threading
+from collections import OrderedDict
+from typing import Union, Dict, Any, List, Optional, BinaryIO, Iterable
 
 try:
     from cachetools import LRUCache
@@ -25,6 +44,49 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Current master key version (bump when rotating ENCRYPTION_MASTER_KEY; keep the
+# old key available as ENCRYPTION_MASTER_KEY_V<old version> for decryption)
+ENCRYPTION_KEY_VERSION = int(os.getenv("ENCRYPTION_KEY_VERSION", "1"))
+# Data key rotation period: "month", "day" or "none"
+ENCRYPTION_KEY_PERIOD = os.getenv("ENCRYPTION_KEY_PERIOD", "month").lower()
+# Plaintext bytes per record in streaming mode
+ENCRYPTION_STREAM_CHUNK_SIZE = int(os.getenv("ENCRYPTION_STREAM_CHUNK_SIZE", str(64 * 1024)))
+
+# v2 token prefix; legacy tokens are bare base64 and never contain ':'
+TOKEN_PREFIX_V2 = "ev2:"
+# Field prefix used by callers storing encrypted columns (see chat_history)
+FIELD_PREFIX = "ENC:"
+# Streaming format magic
+STREAM_MAGIC = b"HES2"
+
+_PBKDF2_ITERATIONS = 100000
+_DATA_KEY_CACHE_SIZE = 1024
+_LEGACY_KEY_CACHE_SIZE = 1000
+_DEFAULT_CONTEXT = "default"
+
+
+class _BoundedKeyCache(OrderedDict):
+    """Minimal LRU used when cachetools is not installed."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _make_key_cache(maxsize: int):
+    return LRUCache(maxsize=maxsize) if HAS_CACHETOOLS else _BoundedKeyCache(maxsize)
+
 
 class EncryptionService:
     """
@@ -77,27 +139,116 @@ class EncryptionService:
         
         self.master_key = key
         self.algorithm = "AES-256-GCM"
-        
-        # Initialize cache with size limit to prevent memory exhaustion
-        # Note: Encryption uses random salts each time, so cache hits only on decryption.
-        # LRUCache with maxsize=1000 prevents unbounded growth.
-        if HAS_CACHETOOLS:
-            self._key_cache = LRUCache(maxsize=1000)  # Max 1000 cached keys (~32KB)
-            logger.info(f"✅ Encryption service initialized with LRUCache (max 1000 keys, ~32KB)")
-        else:
-            # Fallback: regular dict (but warn about memory risk)
-            self._key_cache = {}
-            logger.warning(
-                "⚠️  cachetools not installed - using unbounded dict cache for derived keys. "
-                "Install cachetools to prevent memory leaks: pip install cachetools"
-            )
-        
-        logger.info(f"Encryption service initialized with algorithm: {self.algorithm}")
+        self.key_version = ENCRYPTION_KEY_VERSION
+
+        # Master keys by version: current one plus any retired ones kept for decryption
+        self._master_keys: Dict[int, str] = {self.key_version: key}
+        for env_name, env_value in os.environ.items():
+            if env_name.startswith("ENCRYPTION_MASTER_KEY_V") and env_value:
+                try:
+                    version = int(env_name[len("ENCRYPTION_MASTER_KEY_V"):])
+                except ValueError:
+                    continue
+                self._master_keys.setdefault(version, env_value)
+
+        self._lock = threading.Lock()
+        # KEKs (one PBKDF2 per key version) and HKDF-derived data keys by key id
+        self._kek_cache: Dict[int, bytes] = {}
+        self._data_key_cache = _make_key_cache(_DATA_KEY_CACHE_SIZE)
+        self._aead_cache = _make_key_cache(_DATA_KEY_CACHE_SIZE)
+        # Legacy per-salt keys, only populated when decrypting old ciphertexts
+        self._key_cache = _make_key_cache(_LEGACY_KEY_CACHE_SIZE)
+
+        logger.info(
+            f"Encryption service initialized with algorithm: {self.algorithm} "
+            f"(key version {self.key_version}, data key period: {ENCRYPTION_KEY_PERIOD})"
+        )
+
+    # ========================================================================
+    # Key hierarchy
+    # ========================================================================
+
+    def _get_kek(self, version: int) -> bytes:
+        """
+        Stretch the master key for ``version`` into a key-encryption key.
+
+        Runs the 100K-iteration PBKDF2 once per version per process.
+        """
+        kek = self._kek_cache.get(version)
+        if kek is not None:
+            return kek
+
+        master_key = self._master_keys.get(version)
+        if master_key is None:
+            raise ValueError(f"No master key configured for key version {version}")
+
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=f"cardio-phi-kek-v{version}".encode(),
+            iterations=_PBKDF2_ITERATIONS,
+        )
+        kek = kdf.derive(master_key.encode())
+        self._kek_cache[version] = kek
+        return kek
+
+    def _current_period(self) -> str:
+        now = datetime.now(timezone.utc)
+        if ENCRYPTION_KEY_PERIOD == "day":
+            return now.strftime("%Y%m%d")
+        if ENCRYPTION_KEY_PERIOD == "none":
+            return "0"
+        return now.strftime("%Y%m")
+
+    def _key_id(self, context: Optional[str] = None) -> str:
+        """
+        Build the key id for the current version, tenant and period.
+
+        The tenant is stored as a keyed tag so ciphertext headers do not
+        reveal the raw tenant/user identifier.
+        """
+        tag = hmac.new(
+            self._get_kek(self.key_version),
+            (context or _DEFAULT_CONTEXT).encode(),
+            hashlib.sha256,
+        ).hexdigest()[:16]
+        return f"{self.key_version}.{tag}.{self._current_period()}"
+
+    def _data_key(self, key_id: str) -> bytes:
+        """Derive (and cache) the data key for ``key_id`` with HKDF."""
+        with self._lock:
+            try:
+                return self._data_key_cache[key_id]
+            except KeyError:
+                pass
+
+        version = int(key_id.split(".", 1)[0])
+        data_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"cardio-phi-dek:" + key_id.encode(),
+        ).derive(self._get_kek(version))
+
+        with self._lock:
+            self._data_key_cache[key_id] = data_key
+        return data_key
+
+    def _aead(self, key_id: str) -> AESGCM:
+        with self._lock:
+            try:
+                return self._aead_cache[key_id]
+            except KeyError:
+                pass
+        cipher = AESGCM(self._data_key(key_id))
+        with self._lock:
+            self._aead_cache[key_id] = cipher
+        return cipher
 
     def _derive_key(self, salt: bytes) -> bytes:
         """
-        Derive encryption key from master key using PBKDF2.
-        Caches derived keys to avoid expensive 100K iteration PBKDF2 on every encrypt/decrypt.
+        Derive a legacy (pre-envelope) key from master key and salt using PBKDF2.
+        Only used to decrypt old ciphertexts; cached per salt.
 
         Args:
             salt: Random salt bytes
@@ -106,65 +257,97 @@ class EncryptionService:
             32-byte key for AES-256
         """
         # Check cache first (O(1) lookup avoids 100ms PBKDF2 computation)
-        if salt in self._key_cache:
-            return self._key_cache[salt]
+        with self._lock:
+            if salt in self._key_cache:
+                return self._key_cache[salt]
 
         # Expensive operation: PBKDF2 with 100K iterations (~100ms per call)
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,  # 256 bits for AES-256
             salt=salt,
-            iterations=100000,  # NIST recommended minimum
+            iterations=_PBKDF2_ITERATIONS,  # NIST recommended minimum
             backend=None,  # Uses default backend
         )
-        derived_key = kdf.derive(self.master_key.encode())
+        derived_key = kdf.derive(self._master_keys.get(1, self.master_key).encode())
 
-        # Cache the derived key (salt is random, so cache hit on decrypt)
-        self._key_cache[salt] = derived_key
+        # Cache the derived key (repeated reads of the same legacy row)
+        with self._lock:
+            self._key_cache[salt] = derived_key
 
         return derived_key
 
-    def encrypt(self, plaintext: Union[str, Dict[str, Any]]) -> str:
-        """
-        Encrypt data and return base64-encoded string.
+    # ========================================================================
+    # Field encryption
+    # ========================================================================
+
+    @staticmethod
+    def _to_bytes(plaintext: Union[str, Dict[str, Any]]) -> bytes:
+        if isinstance(plaintext, dict):
+            plaintext = json.dumps(plaintext, default=str)
+        return plaintext.encode()
+
+    @staticmethod
+    def _from_bytes(plaintext: bytes) -> Union[str, Dict[str, Any]]:
+        plaintext_str = plaintext.decode()
+        # Try to parse as JSON
+        try:
+            return json.loads(plaintext_str)
+        except json.JSONDecodeError:
+            return plaintext_str
 
-        Format: base64(salt || IV || ciphertext)
-        - salt: 16 bytes (used for key derivation)
+    def _seal(self, cipher: AESGCM, key_id: str, data: bytes) -> str:
+        """
+        Format: "ev2:" + base64(len(key_id) || key_id || IV || ciphertext)
+        - key_id: ASCII "version.tenant-tag.period", also the GCM associated data
         - IV: 12 bytes (nonce for GCM)
         - ciphertext: encrypted data with authentication tag
+        """
+        header = key_id.encode()
+        iv = os.urandom(12)  # 96-bit IV for GCM
+        ciphertext = cipher.encrypt(iv, data, header)
+        return TOKEN_PREFIX_V2 + base64.b64encode(
+            bytes([len(header)]) + header + iv + ciphertext
+        ).decode()
+
+    def _open(self, token: str) -> bytes:
+        raw = base64.b64decode(token[len(TOKEN_PREFIX_V2):])
+        header_len = raw[0]
+        header = raw[1 : 1 + header_len]
+        iv = raw[1 + header_len : 13 + header_len]
+        ciphertext = raw[13 + header_len :]
+        return self._aead(header.decode()).decrypt(iv, ciphertext, header)
+
+    def _open_legacy(self, encrypted_data: str) -> bytes:
+        # Decode from base64
+        encrypted_bytes = base64.b64decode(encrypted_data)
+
+        # Extract components
+        salt = encrypted_bytes[:16]
+        iv = encrypted_bytes[16:28]
+        ciphertext = encrypted_bytes[28:]
+
+        # Derive key from master key and salt, then decrypt
+        return AESGCM(self._derive_key(salt)).decrypt(iv, ciphertext, None)
+
+    def encrypt(
+        self, plaintext: Union[str, Dict[str, Any]], context: Optional[str] = None
+    ) -> str:
+        """
+        Encrypt data with the current data key for ``context``.
 
         Args:
             plaintext: String or dict to encrypt
+            context: Tenant/user the data belongs to (selects the data key)
 
         Returns:
-            Base64-encoded encrypted string
+            "ev2:"-prefixed base64 token
         """
         try:
-            # Convert dict to JSON if needed
-            if isinstance(plaintext, dict):
-                # Use custom encoder for datetime serialization
-                pass
-
-                plaintext = json.dumps(plaintext, default=str)
-
-            # Generate random salt and IV
-            salt = os.urandom(16)
-            iv = os.urandom(12)  # 96-bit IV for GCM
-
-            # Derive key from master key and salt
-            key = self._derive_key(salt)
-
-            # Encrypt using AES-256-GCM
-            cipher = AESGCM(key)
-            ciphertext = cipher.encrypt(iv, plaintext.encode(), None)
-
-            # Combine salt, IV, and ciphertext
-            encrypted_data = salt + iv + ciphertext
-
-            # Encode to base64 for storage
-            encoded = base64.b64encode(encrypted_data).decode()
-
-            logger.debug(f"Data encrypted successfully ({len(plaintext)} bytes)")
+            data = self._to_bytes(plaintext)
+            key_id = self._key_id(context)
+            encoded = self._seal(self._aead(key_id), key_id, data)
+            logger.debug(f"Data encrypted successfully ({len(data)} bytes)")
             return encoded
 
         except Exception as e:
@@ -173,10 +356,10 @@ class EncryptionService:
 
     def decrypt(self, encrypted_data: str) -> Union[str, Dict[str, Any]]:
         """
-        Decrypt base64-encoded data.
+        Decrypt a token from encrypt() (v2 or legacy format).
 
         Args:
-            encrypted_data: Base64-encoded encrypted string from encrypt()
+            encrypted_data: Encrypted string from encrypt()
 
         Returns:
             Decrypted string or dict
@@ -185,33 +368,161 @@ class EncryptionService:
             Exception: If decryption fails (wrong key or corrupted data)
         """
         try:
-            # Decode from base64
-            encrypted_bytes = base64.b64decode(encrypted_data)
+            return self._from_bytes(self.decrypt_bytes(encrypted_data))
+        except Exception as e:
+            logger.error(f"Decryption error: {e}")
+            raise
 
-            # Extract components
-            salt = encrypted_bytes[:16]
-            iv = encrypted_bytes[16:28]
-            ciphertext = encrypted_bytes[28:]
+    def decrypt_bytes(self, encrypted_data: str) -> bytes:
+        """Decrypt a token to raw bytes without JSON parsing."""
+        if encrypted_data.startswith(TOKEN_PREFIX_V2):
+            return self._open(encrypted_data)
+        return self._open_legacy(encrypted_data)
+
+    def encrypt_many(
+        self,
+        plaintexts: Iterable[Union[str, Dict[str, Any]]],
+        context: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Encrypt several values under one data key lookup.
 
-            # Derive key from master key and salt
-            key = self._derive_key(salt)
+        Args:
+            plaintexts: Strings or dicts to encrypt
+            context: Tenant/user the data belongs to
 
-            # Decrypt using AES-256-GCM
-            cipher = AESGCM(key)
-            plaintext = cipher.decrypt(iv, ciphertext, None)
+        Returns:
+            Tokens in input order
+        """
+        key_id = self._key_id(context)
+        cipher = self._aead(key_id)
+        return [self._seal(cipher, key_id, self._to_bytes(p)) for p in plaintexts]
 
-            # Decode to string
-            plaintext_str = plaintext.decode()
+    def decrypt_many(
+        self, tokens: Iterable[str], parse_json: bool = True
+    ) -> List[Union[str, Dict[str, Any]]]:
+        """
+        Decrypt several tokens (v2 or legacy), reusing cached data keys.
 
-            # Try to parse as JSON
-            try:
-                return json.loads(plaintext_str)
-            except json.JSONDecodeError:
-                return plaintext_str
+        Args:
+            tokens: Tokens from encrypt()/encrypt_many()
+            parse_json: Parse JSON payloads like decrypt(); False returns strings
 
-        except Exception as e:
-            logger.error(f"Decryption error: {e}")
-            raise
+        Returns:
+            Decrypted values in input order
+        """
+        results = []
+        for token in tokens:
+            data = self.decrypt_bytes(token)
+            results.append(self._from_bytes(data) if parse_json else data.decode())
+        return results
+
+    def encrypt_field(self, value: str, context: Optional[str] = None) -> str:
+        """Encrypt a column value, returning it with the "ENC:" marker."""
+        return FIELD_PREFIX + self.encrypt(value, context)
+
+    def decrypt_field(self, value: str) -> str:
+        """Decrypt an "ENC:"-marked column value back to its original string."""
+        if not value.startswith(FIELD_PREFIX):
+            return value
+        return self.decrypt_bytes(value[len(FIELD_PREFIX):]).decode()
+
+    # ========================================================================
+    # Streaming
+    # ========================================================================
+
+    def encrypt_stream(
+        self,
+        source: BinaryIO,
+        sink: BinaryIO,
+        context: Optional[str] = None,
+        chunk_size: int = ENCRYPTION_STREAM_CHUNK_SIZE,
+    ) -> int:
+        """
+        Encrypt a large blob chunk by chunk without holding it in memory.
+
+        Format: "HES2" || len(key_id) || key_id || nonce prefix (7 bytes), then
+        records of 4-byte length || AES-GCM ciphertext. Each record nonce is
+        prefix || counter (4 bytes) || final flag (1 byte), which prevents
+        reordering and truncation.
+
+        Args:
+            source: Readable binary file-like object
+            sink: Writable binary file-like object
+            context: Tenant/user the data belongs to
+            chunk_size: Plaintext bytes per record
+
+        Returns:
+            Number of bytes written to ``sink``
+        """
+        key_id = self._key_id(context)
+        cipher = self._aead(key_id)
+        header = STREAM_MAGIC + bytes([len(key_id)]) + key_id.encode() + os.urandom(7)
+        nonce_prefix = header[-7:]
+        written = sink.write(header) or 0
+
+        counter = 0
+        chunk = source.read(chunk_size)
+        while True:
+            next_chunk = source.read(chunk_size)
+            final = not next_chunk
+            nonce = nonce_prefix + struct.pack(">IB", counter, 1 if final else 0)
+            record = cipher.encrypt(nonce, chunk, header)
+            written += sink.write(struct.pack(">I", len(record)) + record) or 0
+            if final:
+                return written
+            counter += 1
+            chunk = next_chunk
+
+    def decrypt_stream(self, source: BinaryIO, sink: BinaryIO) -> int:
+        """
+        Decrypt a blob produced by encrypt_stream().
+
+        Args:
+            source: Readable binary file-like object
+            sink: Writable binary file-like object
+
+        Returns:
+            Number of plaintext bytes written to ``sink``
+
+        Raises:
+            ValueError: If the stream is malformed or truncated
+        """
+        magic = source.read(len(STREAM_MAGIC))
+        if magic != STREAM_MAGIC:
+            raise ValueError("Not an encrypted stream")
+        key_id_len = source.read(1)[0]
+        key_id = source.read(key_id_len)
+        nonce_prefix = source.read(7)
+        header = magic + bytes([key_id_len]) + key_id + nonce_prefix
+        cipher = self._aead(key_id.decode())
+
+        written = 0
+        counter = 0
+        record = self._read_record(source)
+        while record is not None:
+            next_record = self._read_record(source)
+            final = next_record is None
+            nonce = nonce_prefix + struct.pack(">IB", counter, 1 if final else 0)
+            written += sink.write(cipher.decrypt(nonce, record, header)) or 0
+            counter += 1
+            record = next_record
+        if counter == 0:
+            raise ValueError("Encrypted stream is truncated")
+        return written
+
+    @staticmethod
+    def _read_record(source: BinaryIO) -> Optional[bytes]:
+        length = source.read(4)
+        if not length:
+            return None
+        if len(length) != 4:
+            raise ValueError("Encrypted stream is truncated")
+        (size,) = struct.unpack(">I", length)
+        record = source.read(size)
+        if len(record) != size:
+            raise ValueError("Encrypted stream is truncated")
+        return record
 
     def encrypt_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
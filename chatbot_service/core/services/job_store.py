@@ -10,6 +10,8 @@ Features:
 - User job listing with pagination
 - Automatic TTL-based cleanup
 - Priority queue support
+- Per-job event log (Redis Stream) for token streaming; stream entry IDs
+  are resumable offsets for SSE (Last-Event-ID) and WebSocket clients
 
 Usage:
     job_store = await get_job_store()
@@ -24,7 +26,7 @@ import uuid
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import redis.asyncio as redis
@@ -42,6 +44,12 @@ JOB_TTL_HOURS = int(os.getenv("JOB_TTL_HOURS", "24"))
 JOB_PREFIX = "chatbot:job:"
 USER_JOBS_PREFIX = "chatbot:user_jobs:"
 JOB_RESULT_PREFIX = "chatbot:job_result:"
+JOB_EVENTS_PREFIX = "chatbot:job_events:"
+
+# Approximate cap on events kept per job (token chunks + progress)
+JOB_EVENTS_MAXLEN = int(os.getenv("JOB_EVENTS_MAXLEN", "5000"))
+# Event log retention after the last write
+JOB_EVENTS_TTL_SECONDS = int(os.getenv("JOB_EVENTS_TTL_SECONDS", "3600"))
 
 
 # ============================================================================
@@ -372,6 +380,75 @@ class JobStore:
             return json.loads(result_data)
         return None
     
+    # ========================================================================
+    # Job Event Log (token streaming)
+    # ========================================================================
+    
+    async def append_job_event(
+        self,
+        job_id: str,
+        event_type: str,
+        data: Dict[str, Any]
+    ) -> str:
+        """
+        Append an event to the job's event stream.
+        
+        Args:
+            job_id: Job ID
+            event_type: Event type (e.g. "token", "progress")
+            data: JSON-serializable payload
+        
+        Returns:
+            Stream entry ID, usable as a resume offset
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        events_key = f"{JOB_EVENTS_PREFIX}{job_id}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                events_key,
+                {"type": event_type, "data": json.dumps(data)},
+                maxlen=JOB_EVENTS_MAXLEN,
+                approximate=True
+            )
+            pipe.expire(events_key, JOB_EVENTS_TTL_SECONDS)
+            event_id, _ = await pipe.execute()
+        return event_id
+    
+    async def read_job_events(
+        self,
+        job_id: str,
+        after: str = "0-0",
+        count: int = 200,
+        block_ms: Optional[int] = None
+    ) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Read job events after a given offset.
+        
+        Args:
+            job_id: Job ID
+            after: Stream entry ID to resume after ("0-0" = from the start)
+            count: Maximum events to return
+            block_ms: Wait up to this long for new events (None = don't block)
+        
+        Returns:
+            List of (event_id, event_type, data) tuples in order
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        response = await self.redis.xread(
+            {f"{JOB_EVENTS_PREFIX}{job_id}": after or "0-0"},
+            count=count,
+            block=block_ms
+        )
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                events.append((event_id, fields.get("type", ""), json.loads(fields.get("data", "{}"))))
+        return events
+    
     # ========================================================================
     # Job Listing and Queries
     # ========================================================================
@@ -27,13 +27,32 @@ def _get_metrics():
     return _metrics
 
 
-def record_rerank_operation(elapsed_ms: float):
+def record_rerank_operation(elapsed_ms: float, error: bool = False):
     """Record rerank operation duration to Prometheus metrics."""
     metrics = _get_metrics()
     if metrics:
         metrics.record_histogram("rag_rerank_duration_ms", elapsed_ms)
-        metrics.increment_counter("rag_rerank_operations")
-    logger.debug(f"Rerank operation: {elapsed_ms:.1f}ms")
+        metrics.increment_counter(
+            "rag_rerank_operations", labels={"status": "error"} if error else None
+        )
+    logger.debug(f"Rerank operation: {elapsed_ms:.1f}ms{' (failed)' if error else ''}")
+
+
+def record_rerank_queue_depth(depth: int):
+    """Record the number of rerank pairs waiting for a scoring batch."""
+    metrics = _get_metrics()
+    if metrics:
+        metrics.set_gauge("rag_rerank_queue_depth", depth)
+
+
+def record_rerank_batch(pairs: int, requests: int, elapsed_ms: float):
+    """Record one cross-encoder batch (pairs scored, requests coalesced)."""
+    metrics = _get_metrics()
+    if metrics:
+        metrics.record_histogram("rag_rerank_batch_pairs", pairs)
+        metrics.record_histogram("rag_rerank_batch_duration_ms", elapsed_ms)
+        metrics.increment_counter("rag_rerank_coalesced_requests", requests)
+    logger.debug(f"Rerank batch: {pairs} pairs from {requests} requests in {elapsed_ms:.1f}ms")
 
 
 def record_embedding_operation(elapsed_ms: float):
@@ -0,0 +1,197 @@
+"""
+Token Stream Service
+
+Turns raw LLM tokens into client-safe chunks and publishes them for
+SSE/WebSocket delivery.
+
+- TokenChunker coalesces tokens and releases text at sentence, line or
+  word boundaries. PHI patterns can contain whitespace (phone and SSN digit
+  groups, "Dr. Name"), so the last TOKEN_STREAM_PHI_WINDOW characters are
+  always held back, cuts never fall between digit groups or right after an
+  honorific, and a cut is only taken when scrubbing the released text alone
+  gives the same result as scrubbing it together with the held-back window.
+  Chunks carry a character offset so clients can detect gaps and resume.
+- JobTokenPublisher appends chunks to the job's event stream in Redis
+  (JobStore.append_job_event); the stream entry ID is the resume offset.
+
+The final job result remains authoritative: it carries post-processing
+(hallucination notes, interaction alerts) that is not part of the stream.
+
+Usage:
+    publisher = JobTokenPublisher(job_id, job_store)
+    result = await orchestrator.execute(..., token_callback=publisher)
+"""
+
+import os
+import re
+import time
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Release buffered text at the last word boundary once it exceeds this size
+TOKEN_STREAM_MAX_CHARS = int(os.getenv("TOKEN_STREAM_MAX_CHARS", "160"))
+# ...or once it has been held this long (keeps first-token latency low)
+TOKEN_STREAM_FLUSH_MS = float(os.getenv("TOKEN_STREAM_FLUSH_MS", "250"))
+# Bounded hand-off queue between the generator and a streaming response
+TOKEN_STREAM_QUEUE_SIZE = int(os.getenv("TOKEN_STREAM_QUEUE_SIZE", "64"))
+# Trailing characters never released before end of generation; must cover
+# the longest PHI match that can contain whitespace
+TOKEN_STREAM_PHI_WINDOW = int(os.getenv("TOKEN_STREAM_PHI_WINDOW", "48"))
+
+# Sentence end or line break followed by whitespace
+_SENTENCE_BOUNDARY = re.compile(r"[.!?:;\n](?=\s)")
+_WHITESPACE = re.compile(r"\s")
+# Text ending in an honorific ("Dr.", "Mrs") - the name follows
+_HONORIFIC_END = re.compile(r"\b(?:Mr|Mrs|Ms|Mx|Dr|Prof)\.?\s*$", re.IGNORECASE)
+# A digit group, possibly followed by separators, on each side of a cut
+_DIGITS_END = re.compile(r"[\d)][\s\-.()]*$")
+_DIGITS_START = re.compile(r"[\s\-.()]*[+\d(]")
+# Cut positions tried (latest first) before waiting for more text
+_MAX_CUT_ATTEMPTS = 8
+
+TokenCallback = Callable[[str], Awaitable[None]]
+
+
+# ============================================================================
+# Chunking
+# ============================================================================
+
+class TokenChunker:
+    """
+    Buffers tokens and releases scrubbed chunks at safe boundaries.
+
+    Args:
+        scrub: Optional text scrubber applied to every released chunk
+        max_chars: Size at which text is released at the last safe whitespace
+        flush_ms: Age at which buffered text is released at the last safe whitespace
+        phi_window: Trailing characters held back until more text (or the
+            end of generation) shows no PHI match straddles the cut
+    """
+
+    def __init__(
+        self,
+        scrub: Optional[Callable[[str], str]] = None,
+        max_chars: int = TOKEN_STREAM_MAX_CHARS,
+        flush_ms: float = TOKEN_STREAM_FLUSH_MS,
+        phi_window: int = TOKEN_STREAM_PHI_WINDOW,
+    ):
+        self.scrub = scrub
+        self.max_chars = max_chars
+        self.flush_ms = flush_ms
+        self.phi_window = phi_window
+        self.offset = 0  # Characters released so far
+        self._buffer = ""
+        self._since: Optional[float] = None
+
+    def feed(self, token: str) -> List[Tuple[str, int]]:
+        """Add a token; returns released (chunk, offset) pairs."""
+        if not token:
+            return []
+        if self._since is None:
+            self._since = time.monotonic()
+        self._buffer += token
+
+        cut = self._cut_point()
+        if cut <= 0:
+            return []
+        text, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        self._since = time.monotonic() if self._buffer else None
+        return self._release(text)
+
+    def flush(self) -> List[Tuple[str, int]]:
+        """Release whatever is buffered (end of generation)."""
+        text, self._buffer, self._since = self._buffer, "", None
+        return self._release(text) if text else []
+
+    def _cut_point(self) -> int:
+        buffer = self._buffer
+        # Never cut inside the held-back window
+        limit = len(buffer) - self.phi_window
+        if limit <= 0:
+            return -1
+
+        cuts = [m.end() for m in _SENTENCE_BOUNDARY.finditer(buffer) if m.end() <= limit]
+        if not cuts:
+            aged = (time.monotonic() - self._since) * 1000 >= self.flush_ms
+            if len(buffer) < self.max_chars and not aged:
+                return -1
+            # Whitespace, keeping the following word buffered
+            cuts = [m.start() for m in _WHITESPACE.finditer(buffer, 0, limit) if m.start() > 0]
+
+        scrubbed = None
+        for cut in reversed(cuts[-_MAX_CUT_ATTEMPTS:]):
+            head, tail = buffer[:cut], buffer[cut:]
+            if _HONORIFIC_END.search(head):
+                continue
+            if _DIGITS_END.search(head) and _DIGITS_START.match(tail):
+                continue
+            if self.scrub is None:
+                return cut
+            try:
+                if scrubbed is None:
+                    scrubbed = self.scrub(buffer)
+                # A match straddling the cut redacts differently in isolation
+                if scrubbed.startswith(self.scrub(head)):
+                    return cut
+            except Exception:
+                return cut  # _release drops the chunk (fail-secure)
+        return -1
+
+    def _release(self, text: str) -> List[Tuple[str, int]]:
+        if self.scrub is not None:
+            try:
+                text = self.scrub(text)
+            except Exception as e:
+                # FAIL-SECURE: never stream text that could not be scrubbed
+                logger.error(f"Token chunk scrubbing failed, dropping chunk: {e}")
+                return []
+        offset = self.offset
+        self.offset += len(text)
+        return [(text, offset)]
+
+
+# ============================================================================
+# Publishing
+# ============================================================================
+
+class JobTokenPublisher:
+    """
+    Token callback that appends chunks to a job's event stream.
+
+    Each chunk becomes a ``token`` event ``{"text", "offset"}``; SSE and
+    WebSocket consumers read the stream from any previous entry ID.
+    """
+
+    def __init__(self, job_id: str, job_store):
+        self.job_id = job_id
+        self.job_store = job_store
+        self.offset = 0
+        self.chunks = 0
+
+    async def __call__(self, text: str) -> None:
+        if not text:
+            return
+        try:
+            await self.job_store.append_job_event(
+                self.job_id, "token", {"text": text, "offset": self.offset}
+            )
+        except Exception as e:
+            # Streaming is best-effort; the final result is still delivered
+            logger.warning(f"Token publish failed for job {self.job_id}: {e}")
+        self.offset += len(text)
+        self.chunks += 1
+
+    async def close(self, status: str = "completed") -> None:
+        """Mark the token stream finished (clients stop waiting for tokens)."""
+        try:
+            await self.job_store.append_job_event(
+                self.job_id, "token_end", {"offset": self.offset, "status": status}
+            )
+        except Exception as e:
+            logger.warning(f"Token stream close failed for job {self.job_id}: {e}")
@@ -0,0 +1,547 @@
+"""
+Vitals Bulk Ingestion
+
+Validates, decodes and batches wearable vitals so they can be written with
+PostgresDatabase.store_device_timeseries_bulk() (COPY into
+device_timeseries and vitals in one transaction) instead of two INSERTs
+per point.
+
+Features:
+- Point validation (finite values, bounded metric/unit names, timestamp
+  parsing from ISO-8601 or epoch seconds/milliseconds)
+- Payload decoding: JSON ``metrics`` lists, columnar ``series`` blocks
+  and NDJSON, optionally gzip/deflate compressed
+- Buffered mode for high-frequency devices: points are queued in-process
+  and flushed in large batches by a background task
+
+Payload shapes:
+    {"device_id": ..., "user_id": ..., "metrics": [{metric_type, value, unit, timestamp}]}
+    {"device_id": ..., "user_id": ..., "series": [{
+        "metric_type": "heart_rate", "unit": "bpm",
+        "values": [72, 73, ...],
+        "timestamps": [...]            # or "start" + "interval_seconds"
+    }]}
+    NDJSON: one metric or series object per line; a line with only
+    device_id/user_id sets them for the whole payload. A payload carries
+    a single device and user, so a second header naming a different one
+    is rejected rather than re-attributing earlier readings.
+
+Usage:
+    rows, rejected = normalize_vitals(device_id, user_id, metrics=[...])
+    await db.store_device_timeseries_bulk(rows)
+
+    buffer = get_vitals_buffer()
+    buffer.submit(rows)
+"""
+
+
+import os
+import json
+import math
+import zlib
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+VITALS_MAX_BATCH_POINTS = int(os.getenv("VITALS_MAX_BATCH_POINTS", "200000"))
+VITALS_MAX_BODY_BYTES = int(os.getenv("VITALS_MAX_BODY_BYTES", str(64 * 1024 * 1024)))
+VITALS_BUFFER_MAX_POINTS = int(os.getenv("VITALS_BUFFER_MAX_POINTS", "500000"))
+VITALS_FLUSH_INTERVAL = float(os.getenv("VITALS_FLUSH_INTERVAL", "1.0"))
+VITALS_FLUSH_BATCH = int(os.getenv("VITALS_FLUSH_BATCH", "10000"))
+# A batch failing this many flushes in a row is dead-lettered so later rows can proceed
+VITALS_FLUSH_MAX_ATTEMPTS = int(os.getenv("VITALS_FLUSH_MAX_ATTEMPTS", "3"))
+# Optional NDJSON file receiving dead-lettered rows (logged only when unset)
+VITALS_DEAD_LETTER_PATH = os.getenv("VITALS_DEAD_LETTER_PATH", "")
+
+# Column limits from the device_timeseries / vitals schema
+MAX_METRIC_TYPE_LENGTH = 50
+MAX_UNIT_LENGTH = 20
+
+# Readings further in the future than this are rejected (clock skew allowance)
+MAX_FUTURE_SKEW = timedelta(days=1)
+
+# (device_id, user_id, metric_type, value, unit, recorded_at)
+VitalRow = Tuple[str, str, str, float, str, datetime]
+
+
+class VitalsValidationError(ValueError):
+    """Raised when a vitals payload cannot be decoded or is too large."""
+
+
+class VitalsPayloadTooLarge(VitalsValidationError):
+    """Raised when a vitals payload exceeds VITALS_MAX_BODY_BYTES."""
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+def parse_timestamp(value: Any, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a reading timestamp into a naive UTC datetime.
+
+    Args:
+        value: ISO-8601 string, epoch seconds/milliseconds, datetime or None (now)
+        now: Reference "now" (naive UTC)
+
+    Returns:
+        Naive UTC datetime
+
+    Raises:
+        ValueError: If the timestamp is unreadable or too far in the future
+    """
+    now = now or datetime.utcnow()
+    if value is None or value == "":
+        return now
+
+    if isinstance(value, datetime):
+        ts = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000.0 if value > 1e11 else float(value)
+        ts = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    elif isinstance(value, str):
+        text = value.strip()
+        ts = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+    else:
+        raise ValueError(f"Unsupported timestamp: {value!r}")
+
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    if ts > now + MAX_FUTURE_SKEW:
+        raise ValueError(f"Timestamp in the future: {value!r}")
+    return ts
+
+
+def _valid_name(value: Any, max_length: int) -> Optional[str]:
+    if value is None:
+        return ""
+    text = str(value).strip()
+    return text if len(text) <= max_length else None
+
+
+def _point_row(
+    device_id: str,
+    user_id: str,
+    metric_type: Any,
+    value: Any,
+    unit: Any,
+    timestamp: Any,
+    now: datetime,
+) -> Optional[VitalRow]:
+    """Validate one reading; None if it should be rejected."""
+    metric_type = _valid_name(metric_type or "unknown", MAX_METRIC_TYPE_LENGTH)
+    unit = _valid_name(unit, MAX_UNIT_LENGTH)
+    if not metric_type or unit is None or value is None or isinstance(value, bool):
+        return None
+    try:
+        value_float = float(value)
+        if not math.isfinite(value_float):
+            return None
+        recorded_at = parse_timestamp(timestamp, now)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+    return (device_id, user_id, metric_type, value_float, unit, recorded_at)
+
+
+def normalize_vitals(
+    device_id: str,
+    user_id: str,
+    metrics: Iterable[Dict[str, Any]] = (),
+    series: Iterable[Dict[str, Any]] = (),
+    max_points: int = VITALS_MAX_BATCH_POINTS,
+) -> Tuple[List[VitalRow], int]:
+    """
+    Validate readings into rows for store_device_timeseries_bulk().
+
+    Invalid readings are skipped and counted rather than failing the batch.
+
+    Args:
+        device_id: Device the readings came from
+        user_id: Owner of the device
+        metrics: Point readings ({metric_type, value, unit, timestamp})
+        series: Columnar blocks ({metric_type, unit, values, timestamps | start + interval_seconds})
+        max_points: Maximum readings per batch
+
+    Returns:
+        (rows, rejected_count)
+
+    Raises:
+        VitalsValidationError: If device/user is missing or the batch is too large
+    """
+    if not device_id or not user_id:
+        raise VitalsValidationError("device_id and user_id are required")
+
+    now = datetime.utcnow()
+    rows: List[VitalRow] = []
+    rejected = 0
+
+    def add(row: Optional[VitalRow]) -> None:
+        nonlocal rejected
+        if row is None:
+            rejected += 1
+            return
+        if len(rows) >= max_points:
+            raise VitalsValidationError(f"Batch exceeds {max_points} readings")
+        rows.append(row)
+
+    for metric in metrics:
+        if not isinstance(metric, dict):
+            rejected += 1
+            continue
+        add(_point_row(
+            device_id, user_id,
+            metric.get("metric_type"), metric.get("value"),
+            metric.get("unit", ""), metric.get("timestamp"), now,
+        ))
+
+    for block in series:
+        values = block.get("values") if isinstance(block, dict) else None
+        if not isinstance(values, list):
+            rejected += 1
+            continue
+        metric_type = block.get("metric_type")
+        unit = block.get("unit", "")
+        timestamps = block.get("timestamps")
+
+        if timestamps is not None:
+            if not isinstance(timestamps, list) or len(timestamps) != len(values):
+                rejected += len(values)
+                continue
+            for value, timestamp in zip(values, timestamps):
+                add(_point_row(device_id, user_id, metric_type, value, unit, timestamp, now))
+            continue
+
+        try:
+            start = parse_timestamp(block.get("start"), now)
+            interval = timedelta(seconds=float(block.get("interval_seconds", 1.0)))
+        except (ValueError, TypeError, OverflowError, OSError):
+            rejected += len(values)
+            continue
+        for i, value in enumerate(values):
+            add(_point_row(device_id, user_id, metric_type, value, unit, start + i * interval, now))
+
+    return rows, rejected
+
+
+# ============================================================================
+# Payload Decoding
+# ============================================================================
+
+def _decompress(body: bytes, content_encoding: str) -> bytes:
+    encoding = (content_encoding or "").lower().strip()
+    if not encoding and body[:2] == b"\x1f\x8b":
+        encoding = "gzip"
+    if encoding in ("", "identity"):
+        if len(body) > VITALS_MAX_BODY_BYTES:
+            raise VitalsPayloadTooLarge("Payload too large")
+        return body
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        raise VitalsValidationError(f"Unsupported Content-Encoding: {content_encoding}")
+
+    # wbits=47 auto-detects zlib or gzip headers
+    decompressor = zlib.decompressobj(wbits=47)
+    try:
+        data = decompressor.decompress(body, VITALS_MAX_BODY_BYTES)
+    except zlib.error as e:
+        raise VitalsValidationError(f"Invalid compressed payload: {e}")
+    if decompressor.unconsumed_tail:
+        raise VitalsPayloadTooLarge("Payload too large")
+    return data
+
+
+async def read_capped_body(
+    chunks: AsyncIterator[bytes],
+    content_length: Optional[str] = None,
+    limit: int = VITALS_MAX_BODY_BYTES,
+) -> bytes:
+    """
+    Read a request body, refusing it as soon as it exceeds ``limit`` bytes.
+
+    Args:
+        chunks: Body stream (e.g. ``request.stream()``)
+        content_length: Declared Content-Length header, checked up front
+        limit: Maximum body size in bytes
+
+    Raises:
+        VitalsPayloadTooLarge: If the declared or streamed size exceeds ``limit``
+    """
+    if content_length:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise VitalsValidationError("Invalid Content-Length")
+        if declared > limit:
+            raise VitalsPayloadTooLarge("Payload too large")
+
+    body = bytearray()
+    async for chunk in chunks:
+        body.extend(chunk)
+        if len(body) > limit:
+            raise VitalsPayloadTooLarge("Payload too large")
+    return bytes(body)
+
+
+def decode_vitals_payload(
+    body: bytes,
+    content_type: str = "application/json",
+    content_encoding: str = "",
+) -> Dict[str, Any]:
+    """
+    Decode a (possibly compressed) JSON or NDJSON vitals payload.
+
+    Args:
+        body: Raw request body
+        content_type: Request Content-Type
+        content_encoding: Request Content-Encoding (gzip/deflate/identity)
+
+    Returns:
+        Dict with device_id, user_id, metrics and series (ids may be None)
+
+    Raises:
+        VitalsValidationError: If the payload cannot be decoded, or an
+            NDJSON header names a different device/user than an earlier one
+    """
+    data = _decompress(body, content_encoding)
+    decoded: Dict[str, Any] = {"device_id": None, "user_id": None, "metrics": [], "series": []}
+
+    try:
+        if "ndjson" in (content_type or "") or "jsonl" in (content_type or ""):
+            for line in data.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if not isinstance(item, dict):
+                    raise VitalsValidationError("NDJSON lines must be objects")
+                if "values" in item:
+                    decoded["series"].append(item)
+                elif "value" in item:
+                    decoded["metrics"].append(item)
+                else:
+                    for key in ("device_id", "user_id"):
+                        value = item.get(key)
+                        if value is None:
+                            continue
+                        if decoded[key] is not None and decoded[key] != value:
+                            raise VitalsValidationError(
+                                f"NDJSON payload may not switch {key} mid-stream"
+                            )
+                        decoded[key] = value
+            return decoded
+
+        payload = json.loads(data)
+    except VitalsValidationError:
+        raise
+    except (ValueError, UnicodeDecodeError) as e:
+        raise VitalsValidationError(f"Invalid JSON payload: {e}")
+
+    if not isinstance(payload, dict):
+        raise VitalsValidationError("Payload must be a JSON object")
+    decoded["device_id"] = payload.get("device_id")
+    decoded["user_id"] = payload.get("user_id")
+    decoded["metrics"] = payload.get("metrics") or []
+    decoded["series"] = payload.get("series") or []
+    if not isinstance(decoded["metrics"], list) or not isinstance(decoded["series"], list):
+        raise VitalsValidationError("metrics and series must be lists")
+    return decoded
+
+
+# ============================================================================
+# Buffered Mode
+# ============================================================================
+
+class VitalsIngestBuffer:
+    """
+    In-process write buffer for high-frequency devices.
+
+    Requests hand validated rows to ``submit()`` and return immediately; a
+    background task flushes them with one bulk COPY per ``flush_batch``
+    rows, at least every ``flush_interval`` seconds. The buffer is bounded:
+    ``submit()`` refuses rows once ``max_points`` are pending so callers can
+    apply backpressure. A failed batch is retried first on the next flush;
+    after ``max_attempts`` failures it is dead-lettered so a poison batch
+    cannot block later readings.
+    """
+
+    def __init__(
+        self,
+        writer: Optional[Callable[[List[VitalRow]], Awaitable[int]]] = None,
+        max_points: int = VITALS_BUFFER_MAX_POINTS,
+        flush_interval: float = VITALS_FLUSH_INTERVAL,
+        flush_batch: int = VITALS_FLUSH_BATCH,
+        max_attempts: int = VITALS_FLUSH_MAX_ATTEMPTS,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            writer: Coroutine writing a batch of rows (defaults to the Postgres bulk path)
+            max_points: Maximum pending rows
+            flush_interval: Seconds between background flushes
+            flush_batch: Rows per bulk write (also triggers an early flush)
+            max_attempts: Failed flushes of one batch before it is dead-lettered
+        """
+        self._writer = writer or self._write_postgres
+        self.max_points = max_points
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.max_attempts = max(1, max_attempts)
+
+        self._pending: List[VitalRow] = []
+        self._failed: Optional[Tuple[List[VitalRow], int]] = None  # (batch, attempts)
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"accepted": 0, "written": 0, "rejected_full": 0, "failed_flushes": 0, "dead_lettered": 0}
+
+    @staticmethod
+    async def _write_postgres(rows: List[VitalRow]) -> int:
+        from core.database.postgres_db import get_database
+        db = await get_database()
+        return await db.store_device_timeseries_bulk(rows)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + (len(self._failed[0]) if self._failed else 0)
+
+    def submit(self, rows: List[VitalRow]) -> bool:
+        """
+        Queue rows for the next flush.
+
+        Args:
+            rows: Validated rows from normalize_vitals()
+
+        Returns:
+            False if the buffer is full (nothing was queued)
+        """
+        if self.pending + len(rows) > self.max_points:
+            self._stats["rejected_full"] += len(rows)
+            return False
+
+        self._pending.extend(rows)
+        self._stats["accepted"] += len(rows)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= self.flush_batch:
+            self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all pending rows.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._failed or self._pending:
+                if self._failed:
+                    batch, attempts = self._failed
+                    self._failed = None
+                else:
+                    batch, attempts = self._pending[:self.flush_batch], 0
+                    del self._pending[:self.flush_batch]
+                try:
+                    written += await self._writer(batch)
+                except asyncio.CancelledError:
+                    self._failed = (batch, attempts)
+                    raise
+                except Exception as e:
+                    attempts += 1
+                    self._stats["failed_flushes"] += 1
+                    if attempts >= self.max_attempts:
+                        self._dead_letter(batch, e)
+                        continue
+                    self._failed = (batch, attempts)
+                    logger.warning(
+                        f"Vitals flush failed (attempt {attempts}/{self.max_attempts}), "
+                        f"{len(batch)} rows will be retried: {e}"
+                    )
+                    break
+        self._stats["written"] += written
+        return written
+
+    def _dead_letter(self, batch: List[VitalRow], error: Exception) -> None:
+        """Give up on a batch: append it to the dead-letter file, if configured."""
+        self._stats["dead_lettered"] += len(batch)
+        logger.error(
+            f"Vitals batch of {len(batch)} rows failed {self.max_attempts} times, dead-lettered: {error}"
+        )
+        if not VITALS_DEAD_LETTER_PATH:
+            return
+        try:
+            with open(VITALS_DEAD_LETTER_PATH, "a", encoding="utf-8") as f:
+                for device_id, user_id, metric_type, value, unit, recorded_at in batch:
+                    f.write(json.dumps({
+                        "device_id": device_id,
+                        "user_id": user_id,
+                        "metric_type": metric_type,
+                        "value": value,
+                        "unit": unit,
+                        "recorded_at": recorded_at.isoformat(),
+                        "error": str(error)[:200],
+                    }) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to write vitals dead-letter file: {e}")
+
+    async def stop(self) -> None:
+        """Stop the background task and flush what is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending": self.pending, "max_points": self.max_points}
+
+
+_buffer_instance: Optional[VitalsIngestBuffer] = None
+
+
+def get_vitals_buffer() -> VitalsIngestBuffer:
+    """Get singleton vitals ingest buffer."""
+    global _buffer_instance
+    if _buffer_instance is None:
+        _buffer_instance = VitalsIngestBuffer()
+    return _buffer_instance
+
+
+async def shutdown_vitals_buffer() -> None:
+    """Flush and stop the vitals buffer (call on application shutdown)."""
+    global _buffer_instance
+    if _buffer_instance is not None:
+        await _buffer_instance.stop()
+        _buffer_instance = None
+
+
+__all__ = [
+    "VitalsIngestBuffer",
+    "VitalsValidationError",
+    "VitalsPayloadTooLarge",
+    "normalize_vitals",
+    "decode_vitals_payload",
+    "read_capped_body",
+    "parse_timestamp",
+    "get_vitals_buffer",
+    "shutdown_vitals_buffer",
+]
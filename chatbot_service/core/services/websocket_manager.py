@@ -20,6 +20,7 @@ Features:
 - Graceful disconnection handling
 - Heartbeat keep-alive during long operations
 - Redis pub/sub for multi-instance coordination
+- Token streaming from the job event stream with resumable offsets
 
 Usage:
     ws_manager = await get_ws_manager()
@@ -46,6 +47,7 @@ logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 HEARTBEAT_INTERVAL = int(os.getenv("WEBSOCKET_HEARTBEAT_INTERVAL", "15"))  # seconds
+EVENT_STREAM_BLOCK_MS = int(os.getenv("WEBSOCKET_EVENT_BLOCK_MS", "5000"))
 PUBSUB_CHANNEL = "chatbot:websocket:broadcast"
 
 
@@ -405,6 +407,52 @@ class WebSocketConnectionManager:
                 json.dumps({"job_id": job_id, "user_id": user_id, "data": result_message})
             )
     
+    async def stream_job_events(
+        self,
+        connection: WebSocketConnection,
+        job_id: str,
+        after: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Forward a job's event stream (token chunks) to one connection.
+        
+        Events are read from the job's Redis stream starting after ``after``
+        and sent one at a time, so a slow client slows the reader instead of
+        buffering in memory; nothing is dropped because the stream keeps the
+        events. Each message carries ``event_id`` for resuming.
+        
+        Returns:
+            Last delivered event ID (resume offset), or None if nothing was sent
+        """
+        from core.services.job_store import get_job_store, JobStatus
+        
+        job_store = await get_job_store()
+        cursor = after or "0-0"
+        delivered = after
+        finished = {JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
+        
+        while True:
+            events = await job_store.read_job_events(
+                job_id, after=cursor, block_ms=EVENT_STREAM_BLOCK_MS
+            )
+            for event_id, event_type, data in events:
+                cursor = event_id
+                if not await connection.send_json({
+                    "type": event_type,
+                    "job_id": job_id,
+                    "event_id": event_id,
+                    **data
+                }):
+                    return delivered
+                delivered = event_id
+                if event_type == "token_end":
+                    return delivered
+            
+            if not events:
+                job = await job_store.get_job(job_id)
+                if not job or job.status in finished:
+                    return delivered
+    
     # ========================================================================
     # Pub/Sub Listener (Multi-Instance Coordination)
     # ========================================================================
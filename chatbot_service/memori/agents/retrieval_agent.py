@@ -517,10 +517,14 @@ class MemorySearchEngine:
 
                 with db_manager.SessionLocal() as session:
                     search_service = SearchService(session, db_type)
+                    query_text = search_plan.query_text or query
                     primary_results = search_service.search_memories(
-                        query=search_plan.query_text or query,
+                        query=query_text,
                         user_id=user_id,
                         limit=limit,
+                        query_embedding=self._query_embedding(
+                            search_service, query_text
+                        ),
                     )
                 logger.debug(
                     f"Direct SearchService returned {len(primary_results)} results"
@@ -713,7 +717,12 @@ class MemorySearchEngine:
             with db_manager.SessionLocal() as session:
                 search_service = SearchService(session, db_type)
                 results = search_service.search_memories(
-                    query=search_terms, user_id=user_id, limit=limit
+                    query=search_terms,
+                    user_id=user_id,
+                    limit=limit,
+                    query_embedding=self._query_embedding(
+                        search_service, search_terms
+                    ),
                 )
 
             # Ensure results is a list of dictionaries
@@ -1116,14 +1125,6 @@ class MemorySearchEngine:
             List of memory dicts with similarity_score field added
         """
         try:
-            # Initialize embedding engine lazily
-            if not hasattr(self, '_embedding_engine') or self._embedding_engine is None:
-                self._embedding_engine = EmbeddingSearchEngine(
-                    use_local=True,
-                    openai_client=self.client,
-                    similarity_threshold=0.4,
-                )
-
             # Fetch candidate memories from database
             try:
                 from ..database.search_service import SearchService
@@ -1143,7 +1144,7 @@ class MemorySearchEngine:
                 return []
 
             # Use embedding engine to rank by semantic similarity
-            ranked_results = self._embedding_engine.search(
+            ranked_results = self._get_embedding_engine().search(
                 query=query,
                 memories=candidates,
                 content_field="content",
@@ -1167,6 +1168,29 @@ class MemorySearchEngine:
             logger.error(f"Semantic search failed: {e}", exc_info=True)
             return []
 
+    def _get_embedding_engine(self) -> EmbeddingSearchEngine:
+        """Embedding engine shared by semantic search and hybrid SQL ranking"""
+        if getattr(self, "_embedding_engine", None) is None:
+            self._embedding_engine = EmbeddingSearchEngine(
+                use_local=True,
+                openai_client=self.client,
+                similarity_threshold=0.4,
+            )
+        return self._embedding_engine
+
+    def _query_embedding(self, search_service, text: str) -> list[float] | None:
+        """Query embedding for pgvector ranking, or None when it would be unused"""
+        if not text or not text.strip():
+            return None
+        if not search_service.vector_ranking_available():
+            return None
+        try:
+            embedding = self._get_embedding_engine().get_embedding(text)
+        except Exception as e:
+            logger.debug(f"Query embedding unavailable, using FTS ranking only: {e}")
+            return None
+        return embedding.tolist() if embedding is not None else None
+
     def _execute_importance_search(
         self, search_plan: MemorySearchQuery, db_manager, user_id: str, limit: int
     ) -> list[dict[str, Any]]:
@@ -18,7 +18,8 @@ from ..utils.pydantic_models import (
     ProcessedMemory,
     RetentionType,
 )
-from ..utils.transaction_manager import TransactionManager, TransactionOperation
+from ..utils.transaction_manager import TransactionManager
+from .sqlite_pool import NonClosingConnection, SQLiteConnectionPool, SQLiteWriteQueue
 
 
 class DatabaseManager:
@@ -31,6 +32,8 @@ class DatabaseManager:
         self.database_connect = database_connect
         self.template = template
         self.db_path = self._parse_connection_string(database_connect)
+        self._pool = SQLiteConnectionPool(self.db_path)
+        self._writer = SQLiteWriteQueue(self._pool)
         self.transaction_manager = TransactionManager(self)
 
     def _parse_connection_string(self, connect_str: str) -> str:
@@ -44,25 +47,30 @@ class DatabaseManager:
             raise DatabaseError(f"Unsupported database type: {connect_str}")
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection with FTS5 support"""
+        """Get this thread's pooled database connection with FTS5 support
+
+        Connections are persistent per thread (pragmas applied once), so
+        callers must not close them; ``with conn:`` still commits/rolls back.
+        """
         try:
-            # Ensure directory exists
-            db_dir = Path(self.db_path).parent
-            db_dir.mkdir(parents=True, exist_ok=True)
+            return self._pool.connection()
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"Failed to connect to database: {e}")
 
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
+    def get_connection(self) -> NonClosingConnection:
+        """Connection for TransactionManager (its close() keeps it pooled)"""
+        return NonClosingConnection(self._get_connection())
 
-            # Enable FTS features
-            conn.execute("PRAGMA enable_fts3_tokenizer=1")
-            # Set up other performance optimizations
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
+    def _write(self, fn):
+        """Run ``fn(conn)`` on the writer thread; group-committed with others"""
+        return self._writer.write(fn)
 
-            return conn
-        except Exception as e:
-            raise DatabaseError(f"Failed to connect to database: {e}")
+    def close(self):
+        """Drain pending writes and close all pooled connections"""
+        self._writer.close()
+        self._pool.close_all()
 
     def initialize_schema(self):
         """Initialize database schema based on template"""
@@ -257,9 +265,8 @@ class DatabaseManager:
             logger.error(f"Invalid chat history data: {e}")
             raise DatabaseError(f"Cannot store chat history: {e}")
 
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        def _insert(conn: sqlite3.Connection):
+            conn.execute(
                 """
                 INSERT OR REPLACE INTO chat_history
                 (chat_id, user_input, ai_output, model, timestamp, session_id, user_id, assistant_id, tokens_used, metadata)
@@ -278,7 +285,8 @@ class DatabaseManager:
                     validated_data["metadata"],
                 ),
             )
-            conn.commit()
+
+        self._write(_insert)
 
     def get_chat_history(
         self,
@@ -347,7 +355,7 @@ class DatabaseManager:
         assistant_id: str = None,
         session_id: str = "default",
     ) -> str:
-        """Store a ProcessedLongTermMemory with enhanced schema using transactions and multi-tenant isolation"""
+        """Store a ProcessedLongTermMemory with enhanced schema via the group-committed writer, with multi-tenant isolation"""
         try:
             memory_id = str(uuid.uuid4())
 
@@ -355,73 +363,65 @@ class DatabaseManager:
             chat_id = InputValidator.validate_memory_id(chat_id)
             user_id = InputValidator.validate_user_id(user_id)
 
-            # Prepare operations for atomic execution
-            operations = []
-
-            # Main memory insert operation
-            insert_operation = TransactionOperation(
-                query="""
-                    INSERT INTO long_term_memory (
-                        memory_id, original_chat_id, processed_data, importance_score, category_primary,
-                        retention_type, user_id, assistant_id, session_id, created_at, searchable_content, summary,
-                        novelty_score, relevance_score, actionability_score, classification, memory_importance,
-                        topic, entities_json, keywords_json, is_user_context, is_preference, is_skill_knowledge,
-                        is_current_project, promotion_eligible, duplicate_of, supersedes_json, related_memories_json,
-                        confidence_score, extraction_timestamp, classification_reason, processed_for_duplicates, conscious_processed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                params=[
-                    memory_id,
-                    chat_id,
-                    json.dumps(memory.model_dump(mode="json")),
-                    memory.importance_score,
-                    memory.classification.value,
-                    "long_term",
-                    user_id,
-                    assistant_id,
-                    session_id,
-                    datetime.now().isoformat(),
-                    memory.content,
-                    memory.summary,
-                    0.5,
-                    0.5,
-                    0.5,  # novelty, relevance, actionability scores
-                    memory.classification.value,
-                    memory.importance.value,
-                    memory.topic,
-                    json.dumps(memory.entities),
-                    json.dumps(memory.keywords),
-                    memory.is_user_context,
-                    memory.is_preference,
-                    memory.is_skill_knowledge,
-                    memory.is_current_project,
-                    memory.promotion_eligible,
-                    memory.duplicate_of,
-                    json.dumps(memory.supersedes),
-                    json.dumps(memory.related_memories),
-                    memory.confidence_score,
-                    memory.extraction_timestamp.isoformat(),
-                    memory.classification_reason,
-                    False,  # processed_for_duplicates
-                    False,  # conscious_processed
-                ],
-                operation_type="insert",
-                table="long_term_memory",
-                expected_rows=1,
-            )
-
-            operations.append(insert_operation)
-
-            # Execute all operations atomically
-            result = self.transaction_manager.execute_atomic_operations(operations)
-
-            if result.success:
-                logger.debug(f"Stored enhanced long-term memory {memory_id}")
-                return memory_id
-            else:
-                raise DatabaseError(
-                    f"Failed to store enhanced long-term memory: {result.error_message}"
+            params = [
+                memory_id,
+                chat_id,
+                json.dumps(memory.model_dump(mode="json")),
+                memory.importance_score,
+                memory.classification.value,
+                "long_term",
+                user_id,
+                assistant_id,
+                session_id,
+                datetime.now().isoformat(),
+                memory.content,
+                memory.summary,
+                0.5,
+                0.5,
+                0.5,  # novelty, relevance, actionability scores
+                memory.classification.value,
+                memory.importance.value,
+                memory.topic,
+                json.dumps(memory.entities),
+                json.dumps(memory.keywords),
+                memory.is_user_context,
+                memory.is_preference,
+                memory.is_skill_knowledge,
+                memory.is_current_project,
+                memory.promotion_eligible,
+                memory.duplicate_of,
+                json.dumps(memory.supersedes),
+                json.dumps(memory.related_memories),
+                memory.confidence_score,
+                memory.extraction_timestamp.isoformat(),
+                memory.classification_reason,
+                False,  # processed_for_duplicates
+                False,  # conscious_processed
+            ]
+
+            def _insert(conn: sqlite3.Connection):
+                cursor = conn.execute(
+                    """
+                        INSERT INTO long_term_memory (
+                            memory_id, original_chat_id, processed_data, importance_score, category_primary,
+                            retention_type, user_id, assistant_id, session_id, created_at, searchable_content, summary,
+                            novelty_score, relevance_score, actionability_score, classification, memory_importance,
+                            topic, entities_json, keywords_json, is_user_context, is_preference, is_skill_knowledge,
+                            is_current_project, promotion_eligible, duplicate_of, supersedes_json, related_memories_json,
+                            confidence_score, extraction_timestamp, classification_reason, processed_for_duplicates, conscious_processed
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    params,
                 )
+                if cursor.rowcount != 1:
+                    raise DatabaseError(
+                        f"Expected 1 row inserted into long_term_memory, got {cursor.rowcount}"
+                    )
+
+            # Group-committed on the writer thread, like the other memory writes
+            self._write(_insert)
+            logger.debug(f"Stored enhanced long-term memory {memory_id}")
+            return memory_id
 
         except ValidationError as e:
             logger.error(f"Invalid memory data: {e}")
@@ -972,7 +972,8 @@ class DatabaseManager:
 
     def clear_memory(self, user_id: str = "default", memory_type: str | None = None):
         """Clear memory data with multi-tenant isolation"""
-        with self._get_connection() as conn:
+
+        def _clear(conn: sqlite3.Connection):
             cursor = conn.cursor()
 
             if memory_type == "short_term":
@@ -994,4 +995,4 @@ class DatabaseManager:
                 )
                 cursor.execute("DELETE FROM chat_history WHERE user_id = ?", (user_id,))
 
-            conn.commit()
+        self._write(_clear)
@@ -0,0 +1,274 @@
+"""
+SQLite connection pooling and group-committed writes for DatabaseManager
+
+- One persistent connection per thread, with pragmas (WAL, synchronous,
+  cache_size, mmap_size, busy_timeout) applied once when it is opened.
+  Each connection keeps sqlite3's per-connection statement cache, so the
+  fixed FTS5/search SQL is compiled once per thread and then reused.
+- A single writer thread owning its own connection. Concurrent writes are
+  drained into one transaction and committed together (group commit); each
+  write runs under a savepoint, so one failing write does not roll back
+  the others in its group.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from ..utils.exceptions import DatabaseError
+
+SQLITE_MMAP_SIZE = int(os.getenv("MEMORI_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("MEMORI_SQLITE_CACHE_SIZE", "10000"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("MEMORI_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_STATEMENT_CACHE = int(os.getenv("MEMORI_SQLITE_STATEMENT_CACHE", "256"))
+SQLITE_GROUP_COMMIT_MAX = int(os.getenv("MEMORI_SQLITE_GROUP_COMMIT_MAX", "256"))
+SQLITE_GROUP_COMMIT_WINDOW = float(os.getenv("MEMORI_SQLITE_GROUP_COMMIT_WINDOW", "0.002"))
+
+_STOP = object()
+
+
+class SQLiteConnectionPool:
+    """Persistent per-thread SQLite connections with pragmas applied once"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a new configured connection (not tracked per thread)"""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                cached_statements=SQLITE_STATEMENT_CACHE,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row  # Enable dict-like access
+
+            # Enable FTS features
+            conn.execute("PRAGMA enable_fts3_tokenizer=1")
+            # Set up other performance optimizations
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+            conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to connect to database: {e}") from e
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's persistent connection (opened on first use)"""
+        if self._closed:
+            raise DatabaseError("SQLite connection pool is closed")
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            self._local.conn = conn
+        return conn
+
+    def close_all(self):
+        """Close every connection opened by the pool"""
+        self._closed = True
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing SQLite connection: {e}")
+
+
+class SQLiteWriteQueue:
+    """Single writer thread that group-commits queued writes"""
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        max_batch: int = SQLITE_GROUP_COMMIT_MAX,
+        window: float = SQLITE_GROUP_COMMIT_WINDOW,
+    ):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.stats = {"writes": 0, "commits": 0, "failed": 0}
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="memori-sqlite-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, fn: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue a write; the future resolves after its group commits"""
+        future: Future = Future()
+        if threading.current_thread() is self._thread:
+            # Nested write from inside a queued write: run inline
+            future.set_result(fn(self._conn))
+            return future
+        self._ensure_started()
+        self._queue.put((fn, future))
+        return future
+
+    def write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Queue a write and wait until it is committed"""
+        return self.submit(fn).result()
+
+    def _collect(self, first) -> list:
+        # One deadline for the whole group, not one window per item
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        try:
+            self._conn = self.pool.connect()
+        except DatabaseError as e:
+            logger.error(f"SQLite writer could not open its connection: {e}")
+            self._fail_queued(e)
+            return
+        self._conn.isolation_level = None  # Explicit BEGIN/COMMIT below
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = self._collect(first)
+            try:
+                self._commit_group(batch)
+            except Exception as e:
+                # Never let the writer thread die with callers blocked on .result()
+                logger.error(f"SQLite group commit crashed: {e}")
+                self._rollback()
+                self._fail(batch, DatabaseError(f"Group commit failed: {e}"))
+
+    def _commit_group(self, batch: list):
+        conn = self._conn
+        done: list[tuple[Future, Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            self._fail(batch, DatabaseError(f"Failed to begin write: {e}"))
+            return
+
+        try:
+            for fn, future in batch:
+                conn.execute("SAVEPOINT memori_write")
+                try:
+                    result = fn(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO memori_write")
+                    conn.execute("RELEASE memori_write")
+                    self.stats["failed"] += 1
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                conn.execute("RELEASE memori_write")
+                done.append((future, result))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Savepoint handling or COMMIT failed: nothing in the group is durable
+            self._rollback()
+            self._fail(batch, DatabaseError(f"Group commit failed: {e}"))
+            return
+
+        self.stats["writes"] += len(done)
+        self.stats["commits"] += 1
+        for future, result in done:
+            if not future.done():
+                future.set_result(result)
+
+    def _rollback(self):
+        if not self._conn.in_transaction:
+            return
+        try:
+            self._conn.execute("ROLLBACK")
+        except sqlite3.Error as e:
+            logger.error(f"SQLite rollback failed: {e}")
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _fail_queued(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                self._fail([item], error)
+
+    def close(self, timeout: float = 5.0):
+        """Drain pending writes and stop the writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        self._thread = None
+
+
+class NonClosingConnection:
+    """Connection proxy for callers that manage their own transactions
+
+    ``close()`` is a no-op so the pooled connection survives, and the
+    ``autocommit`` attribute is left untouched so the shared connection keeps
+    its legacy transaction handling for other users on the same thread.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name == "_conn":
+            object.__setattr__(self, name, value)
+        elif name != "autocommit":
+            setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
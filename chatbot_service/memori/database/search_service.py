@@ -3,6 +3,8 @@ SQLAlchemy-based search service for Memori v2.0
 Provides PostgreSQL full-text search capabilities
 """
 
+import os
+import weakref
 from datetime import datetime
 from typing import Any
 
@@ -12,10 +14,23 @@ from sqlalchemy.orm import Session
 
 from .models import LongTermMemory, ShortTermMemory
 
+# Composite ranking weights (computed in SQL for PostgreSQL FTS)
+FTS_WEIGHTS = {"search": 0.5, "importance": 0.3, "recency": 0.2}
+HYBRID_WEIGHTS = {"search": 0.35, "vector": 0.25, "importance": 0.25, "recency": 0.15}
+# Recency decays linearly to zero over this many days
+RECENCY_WINDOW_DAYS = 30
+# Optional pgvector column on short_term_memory / long_term_memory
+VECTOR_COLUMN = os.getenv("MEMORI_VECTOR_COLUMN", "embedding")
+
 
 class SearchService:
     """Cross-database search service using SQLAlchemy"""
 
+    # pgvector column check per engine; only successful probes are cached
+    _vector_columns_by_engine: "weakref.WeakKeyDictionary[Any, bool]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(self, session: Session, database_type: str):
         self.session = session
         self.database_type = database_type
@@ -29,6 +44,7 @@ class SearchService:
         category_filter: list[str] | None = None,
         limit: int = 10,
         memory_types: list[str] | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search memories across different database backends
@@ -41,6 +57,8 @@ class SearchService:
             category_filter: List of categories to filter by
             limit: Maximum number of results
             memory_types: Types of memory to search ('short_term', 'long_term', or both)
+            query_embedding: Optional query embedding; adds a pgvector similarity
+                term to the SQL ranking when the memory tables have a vector column
 
         Returns:
             List of memory dictionaries with search metadata
@@ -78,6 +96,7 @@ class SearchService:
                     limit,
                     search_short_term,
                     search_long_term,
+                    query_embedding,
                 )
 
             logger.debug(f"[SEARCH] Primary strategy results: {len(results)} matches")
@@ -148,19 +167,17 @@ class SearchService:
         limit: int,
         search_short_term: bool,
         search_long_term: bool,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
-        """Search using PostgreSQL tsvector"""
-        results = []
+        """
+        Search using PostgreSQL tsvector, ranked entirely in SQL
 
+        Both memory tables are combined with UNION ALL and ranked by a single
+        ORDER BY on the composite score (FTS rank, importance, recency decay
+        and, when available, pgvector cosine similarity), so only the top
+        ``limit`` rows are returned to Python.
+        """
         try:
-            # Apply limit proportionally between memory types
-            short_limit = (
-                limit // 2 if search_short_term and search_long_term else limit
-            )
-            long_limit = (
-                limit - short_limit if search_short_term and search_long_term else limit
-            )
-
             # Prepare query for tsquery - handle spaces and special characters
             # Remove/sanitize special characters that cause tsquery syntax errors
             import re
@@ -170,134 +187,103 @@ class SearchService:
             # Convert to tsquery format (join words with &)
             tsquery_text = " & ".join(sanitized_query.split())
 
-            # Search short-term memory if requested
-            if search_short_term:
-
-                # Build filter clauses safely
-                category_clause = ""
-                assistant_clause = ""
-                session_clause = ""
-
-                if assistant_id:
-                    assistant_clause = "AND assistant_id = :assistant_id"
-
-                if session_id:
-                    session_clause = "AND session_id = :session_id"
+            use_vector = bool(query_embedding) and self.vector_ranking_available()
 
-                if category_filter:
-                    category_clause = "AND category_primary = ANY(:category_list)"
-
-                # Use direct SQL to avoid SQLAlchemy Row conversion issues
-                short_sql = text(
-                    f"""
-                    SELECT memory_id, processed_data, importance_score, created_at, summary, category_primary,
-                           ts_rank(search_vector, to_tsquery('english', :query)) as search_score,
-                           'short_term' as memory_type, 'postgresql_fts' as search_strategy
-                    FROM short_term_memory
-                    WHERE user_id = :user_id
-                    {assistant_clause}
-                    {session_clause}
-                    AND search_vector @@ to_tsquery('english', :query)
-                    {category_clause}
-                    ORDER BY search_score DESC
-                    LIMIT :limit
-                """
+            params: dict[str, Any] = {
+                "user_id": user_id,
+                "query": tsquery_text,
+                "limit": limit,
+            }
+            if assistant_id:
+                params["assistant_id"] = assistant_id
+            if session_id:
+                params["session_id"] = session_id
+            if category_filter:
+                params["category_list"] = category_filter
+            if use_vector:
+                params["query_vec"] = (
+                    "[" + ",".join(str(float(x)) for x in query_embedding) + "]"
                 )
 
-                params = {
-                    "user_id": user_id,
-                    "query": tsquery_text,
-                    "limit": short_limit,
-                }
-                if assistant_id:
-                    params["assistant_id"] = assistant_id
-                if session_id:
-                    params["session_id"] = session_id
-                if category_filter:
-                    params["category_list"] = category_filter
-
-                short_results = self.session.execute(short_sql, params).fetchall()
-
-                # Convert to dictionaries manually with proper column mapping
-                for row in short_results:
-                    results.append(
-                        {
-                            "memory_id": row[0],
-                            "processed_data": row[1],
-                            "importance_score": row[2],
-                            "created_at": row[3],
-                            "summary": row[4],
-                            "category_primary": row[5],
-                            "search_score": row[6],
-                            "memory_type": row[7],
-                            "search_strategy": row[8],
-                        }
+            branches = []
+            if search_short_term:
+                branches.append(
+                    self._fts_branch_sql(
+                        "short_term_memory",
+                        "short_term",
+                        assistant_id,
+                        session_id,
+                        category_filter,
+                        use_vector,
                     )
-
-            # Search long-term memory if requested
+                )
             if search_long_term:
-                # Build filter clauses safely
-                category_clause = ""
-                assistant_clause = ""
-                session_clause = ""
-
-                if assistant_id:
-                    assistant_clause = "AND assistant_id = :assistant_id"
-
-                if session_id:
-                    session_clause = "AND session_id = :session_id"
-
-                if category_filter:
-                    category_clause = "AND category_primary = ANY(:category_list)"
-
-                # Use direct SQL to avoid SQLAlchemy Row conversion issues
-                long_sql = text(
-                    f"""
-                    SELECT memory_id, processed_data, importance_score, created_at, summary, category_primary,
-                           ts_rank(search_vector, to_tsquery('english', :query)) as search_score,
-                           'long_term' as memory_type, 'postgresql_fts' as search_strategy
-                    FROM long_term_memory
-                    WHERE user_id = :user_id
-                    {assistant_clause}
-                    {session_clause}
-                    AND search_vector @@ to_tsquery('english', :query)
-                    {category_clause}
-                    ORDER BY search_score DESC
-                    LIMIT :limit
-                """
+                branches.append(
+                    self._fts_branch_sql(
+                        "long_term_memory",
+                        "long_term",
+                        assistant_id,
+                        session_id,
+                        category_filter,
+                        use_vector,
+                    )
                 )
+            if not branches:
+                return []
+
+            if use_vector:
+                weights = HYBRID_WEIGHTS
+                vector_term = f"+ vector_score * {weights['vector']}"
+                strategy = "postgresql_hybrid"
+            else:
+                weights = FTS_WEIGHTS
+                vector_term = ""
+                strategy = "postgresql_fts"
+
+            recency = (
+                "GREATEST(0.0, 1.0 - FLOOR(EXTRACT(EPOCH FROM "
+                "(timezone('utc', now()) - created_at)) / 86400.0) "
+                f"/ {RECENCY_WINDOW_DAYS}.0)"
+            )
+            union_sql = "\n                    UNION ALL\n".join(branches)
+
+            ranked_sql = text(
+                f"""
+                WITH q AS (SELECT to_tsquery('english', :query) AS tsq)
+                SELECT memory_id, processed_data, importance_score, created_at, summary,
+                       category_primary, search_score, memory_type,
+                       COALESCE({recency}, 0.0) AS recency_score,
+                       (search_score * {weights['search']}
+                        + COALESCE(importance_score, 0.5) * {weights['importance']}
+                        + COALESCE({recency}, 0.0) * {weights['recency']}
+                        {vector_term}) AS composite_score
+                FROM (
+                    {union_sql}
+                ) candidates
+                ORDER BY composite_score DESC
+                LIMIT :limit
+            """
+            )
 
-                params = {
-                    "user_id": user_id,
-                    "query": tsquery_text,
-                    "limit": long_limit,
+            rows = self.session.execute(ranked_sql, params).fetchall()
+
+            # Convert to dictionaries manually with proper column mapping
+            return [
+                {
+                    "memory_id": row[0],
+                    "processed_data": row[1],
+                    "importance_score": row[2],
+                    "created_at": row[3],
+                    "summary": row[4],
+                    "category_primary": row[5],
+                    "search_score": row[6],
+                    "memory_type": row[7],
+                    "search_strategy": strategy,
+                    "recency_score": float(row[8]),
+                    "composite_score": float(row[9]),
                 }
-                if assistant_id:
-                    params["assistant_id"] = assistant_id
-                if session_id:
-                    params["session_id"] = session_id
-                if category_filter:
-                    params["category_list"] = category_filter
-
-                long_results = self.session.execute(long_sql, params).fetchall()
-
-                # Convert to dictionaries manually with proper column mapping
-                for row in long_results:
-                    results.append(
-                        {
-                            "memory_id": row[0],
-                            "processed_data": row[1],
-                            "importance_score": row[2],
-                            "created_at": row[3],
-                            "summary": row[4],
-                            "category_primary": row[5],
-                            "search_score": row[6],
-                            "memory_type": row[7],
-                            "search_strategy": row[8],
-                        }
-                    )
-
-            return results
+                for row in rows
+            ]
 
         except Exception as e:
             logger.error(
@@ -311,6 +297,78 @@ class SearchService:
             self.session.rollback()
             return []
 
+    def _fts_branch_sql(
+        self,
+        table: str,
+        memory_type: str,
+        assistant_id: str | None,
+        session_id: str | None,
+        category_filter: list[str] | None,
+        use_vector: bool,
+    ) -> str:
+        """Build one UNION ALL branch of the ranked FTS query"""
+        # Build filter clauses safely
+        assistant_clause = "AND assistant_id = :assistant_id" if assistant_id else ""
+        session_clause = "AND session_id = :session_id" if session_id else ""
+        category_clause = (
+            "AND category_primary = ANY(:category_list)" if category_filter else ""
+        )
+
+        if use_vector:
+            # Hybrid: rows qualify by keyword match or by having an embedding
+            vector_select = (
+                f", COALESCE(1 - ({VECTOR_COLUMN} <=> CAST(:query_vec AS vector)), 0.0)"
+                " AS vector_score"
+            )
+            match_clause = (
+                f"AND (search_vector @@ q.tsq OR {VECTOR_COLUMN} IS NOT NULL)"
+            )
+        else:
+            vector_select = ""
+            match_clause = "AND search_vector @@ q.tsq"
+
+        return f"""SELECT memory_id, processed_data, importance_score, created_at, summary,
+                           category_primary, ts_rank(search_vector, q.tsq) AS search_score,
+                           '{memory_type}' AS memory_type{vector_select}
+                    FROM {table}, q
+                    WHERE user_id = :user_id
+                    {assistant_clause}
+                    {session_clause}
+                    {match_clause}
+                    {category_clause}"""
+
+    def vector_ranking_available(self) -> bool:
+        """Whether both memory tables carry a pgvector embedding column
+
+        The probe result is cached per engine. A failed probe is not cached,
+        so a transient error does not disable hybrid ranking for the process.
+        """
+        if self.database_type != "postgresql":
+            return False
+        engine = self.session.get_bind()
+        available = SearchService._vector_columns_by_engine.get(engine)
+        if available is not None:
+            return available
+        try:
+            count = self.session.execute(
+                text(
+                    """
+                    SELECT COUNT(*) FROM information_schema.columns
+                    WHERE table_name IN ('short_term_memory', 'long_term_memory')
+                    AND column_name = :column AND udt_name = 'vector'
+                """
+                ),
+                {"column": VECTOR_COLUMN},
+            ).scalar()
+        except Exception as e:
+            logger.debug(f"[SEARCH] pgvector column check failed: {e}")
+            self.session.rollback()
+            return False
+        available = count == 2
+        SearchService._vector_columns_by_engine[engine] = available
+        logger.debug(f"[SEARCH] pgvector hybrid ranking available: {available}")
+        return available
+
     def _search_like_fallback(
         self,
         query: str,
@@ -564,6 +622,10 @@ class SearchService:
         self, results: list[dict[str, Any]], limit: int
     ) -> list[dict[str, Any]]:
         """Rank and limit search results"""
+        # Results ranked in SQL already carry composite_score in order
+        if results and all("composite_score" in r for r in results):
+            return results[:limit]
+
         # Calculate composite score
         for result in results:
             search_score = result.get("search_score", 0.4)
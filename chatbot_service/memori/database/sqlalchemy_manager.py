@@ -433,6 +433,7 @@ class SQLAlchemyDatabaseManager:
         session_id: str | None = None,
         category_filter: list[str] | None = None,
         limit: int = 10,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """Search memories using the cross-database search service"""
         search_service = None
@@ -447,7 +448,13 @@ class SQLAlchemyDatabaseManager:
                 return []
 
             results = search_service.search_memories(
-                query, user_id, assistant_id, session_id, category_filter, limit
+                query,
+                user_id,
+                assistant_id,
+                session_id,
+                category_filter,
+                limit,
+                query_embedding=query_embedding,
             )
             logger.debug(f"Search for '{query}' returned {len(results)} results")
 
@@ -28,10 +28,11 @@ import asyncio
 import json
 import threading
 import time
-from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple, Protocol, runtime_checkable
 from dataclasses import dataclass, field
 
+from core.cache import MemoryTier, RedisTier, TieredCache, user_tag
+
 # Import from local memori module
 from .memory_manager import (
     PatientMemory,
@@ -774,104 +775,51 @@ def _analyze_health_trend(health_data: List[Dict[str, Any]]) -> Optional[str]:
 # ============================================================================
 
 
-class MultiTierCache:
+class MultiTierCache(TieredCache):
     """
     Multi-tier cache for memory-aware agents.
     
     Provides L1 (in-memory) and optional L2 (Redis) caching 
-    for frequently accessed memory contexts.
-    Uses OrderedDict for O(1) LRU eviction instead of list scanning.
+    for frequently accessed memory contexts, on the unified
+    ``core.cache`` tiers (O(1) LRU, tag invalidation, shared metrics).
     """
     
     def __init__(self, l1_max_size: int = 100, l2_ttl: int = 300):
-        self.l1_cache: OrderedDict[str, Any] = OrderedDict()
         self.l1_max_size = l1_max_size
         self.l2_ttl = l2_ttl
-        self._redis_client = None
-        self._hits = 0
-        self._misses = 0
-        
-        # Try to connect to Redis for L2
-        try:
-            import redis
-            self._redis_client = redis.Redis(
-                host='localhost', port=6379, db=0, 
-                decode_responses=True, socket_timeout=2
-            )
-            self._redis_client.ping()
-            logger.info("MultiTierCache: L2 Redis connected")
-        except Exception:
-            self._redis_client = None
-            logger.debug("MultiTierCache: L2 Redis unavailable, using L1 only")
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache (L1 first, then L2)."""
-        # L1 check
-        if key in self.l1_cache:
-            self.l1_cache.move_to_end(key)
-            self._hits += 1
-            return self.l1_cache[key]
-        
-        # L2 check
-        if self._redis_client:
-            try:
-                val = self._redis_client.get(f"mtc:{key}")
-                if val:
-                    result = json.loads(val)
-                    self._set_l1(key, result)
-                    self._hits += 1
-                    return result
-            except Exception:
-                pass
-        
-        self._misses += 1
-        return None
-    
-    def set(self, key: str, value: Any) -> None:
-        """Set value in both cache tiers."""
-        self._set_l1(key, value)
-        
-        if self._redis_client:
-            try:
-                self._redis_client.setex(
-                    f"mtc:{key}", self.l2_ttl, json.dumps(value, default=str)
-                )
-            except Exception:
-                pass
-    
-    def _set_l1(self, key: str, value: Any) -> None:
-        """Set value in L1 with O(1) LRU eviction using OrderedDict."""
-        if key in self.l1_cache:
-            self.l1_cache.move_to_end(key)
-            self.l1_cache[key] = value
-        else:
-            if len(self.l1_cache) >= self.l1_max_size:
-                self.l1_cache.popitem(last=False)  # O(1) eviction
-            self.l1_cache[key] = value
+        super().__init__(
+            "memory_agents",
+            [
+                MemoryTier(max_entries=l1_max_size, cache_name="memory_agents"),
+                RedisTier(
+                    key_prefix="mtc:",
+                    default_ttl=l2_ttl,
+                    cache_name="memory_agents",
+                    socket_timeout=2.0,
+                ),
+            ],
+        )
     
     def invalidate(self, key: str) -> None:
         """Remove key from all cache tiers."""
-        self.l1_cache.pop(key, None)
-        if self._redis_client:
-            try:
-                self._redis_client.delete(f"mtc:{key}")
-            except Exception:
-                pass
+        self.delete(key)
     
     def clear(self) -> None:
-        """Clear all caches."""
-        self.l1_cache.clear()
+        """Clear all cache tiers."""
+        super().clear()
     
     def stats(self) -> Dict[str, Any]:
         """Return cache statistics."""
-        total = self._hits + self._misses
+        l1_stats = self.l1.stats
+        total = l1_stats.hits + l1_stats.misses
         return {
-            "l1_size": len(self.l1_cache),
+            "l1_size": len(self.l1),
             "l1_max_size": self.l1_max_size,
-            "l2_available": self._redis_client is not None,
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_rate": round(self._hits / total * 100, 1) if total > 0 else 0.0,
+            "l2_available": self.l2._available is not False,
+            "hits": l1_stats.hits,
+            "misses": l1_stats.misses,
+            "hit_rate": round(l1_stats.hits / total * 100, 1) if total > 0 else 0.0,
+            "tiers": self.get_stats(),
         }
 
 
@@ -956,7 +904,7 @@ class BatchMemoryProcessor:
                     continue
                 pid, memories = result
                 results[pid] = memories
-                self._cache.set(f"patient:{pid}", memories)
+                self._cache.set(f"patient:{pid}", memories, tags=(user_tag(pid),))
         
         return results
     
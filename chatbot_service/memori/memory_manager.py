@@ -31,7 +31,7 @@ import json
 import logging
 import threading
 import time
-from collections import OrderedDict, deque
+from collections import deque
 from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass, field
@@ -44,6 +44,8 @@ from tenacity import (
     wait_exponential,
     retry_if_exception_type,
 )
+
+from core.cache import MemoryTier
 from .utils.exceptions import (
     TimeoutError,
     IntegrationError as ExternalServiceError,
@@ -190,12 +192,12 @@ class MemoryManagerMetrics:
 # ============================================================================
 
 
-class LRUMemoryCache:
+class LRUMemoryCache(MemoryTier):
     """
     Thread-safe LRU cache for Memori instances.
 
     Features:
-    - O(1) get/put/delete operations using OrderedDict
+    - O(1) get/put/delete operations (``core.cache.MemoryTier``)
     - Automatic eviction when maxsize exceeded
     - Thread-safe via lock
     - Metrics tracking
@@ -203,19 +205,17 @@ class LRUMemoryCache:
 
     def __init__(self, maxsize: int = 100):
         """Initialize LRU cache."""
+        super().__init__(max_entries=maxsize, cache_name="patient_memory")
         self.maxsize = maxsize
-        self.cache: OrderedDict[str, Any] = OrderedDict()
-        self._lock = threading.RLock()
-        self.evictions = 0
 
-    def get(self, key: str) -> Optional[Any]:
+    @property
+    def evictions(self) -> int:
+        """Number of capacity evictions."""
+        return self.stats.evictions
+
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
         """Get value from cache (mark as recently used)."""
-        with self._lock:
-            if key in self.cache:
-                # Move to end (mark as recently used)
-                self.cache.move_to_end(key)
-                return self.cache[key]
-            return None
+        return super().get(key, default)
 
     def put(self, key: str, value: Any) -> Optional[Any]:
         """Put value in cache (evict LRU if needed).
@@ -224,44 +224,22 @@ class LRUMemoryCache:
             Evicted item if eviction occurred, None otherwise.
             Caller is responsible for async cleanup of evicted items.
         """
-        evicted_item = None
-        with self._lock:
-            if key in self.cache:
-                # Already exists, move to end and update value
-                self.cache.move_to_end(key)
-                self.cache[key] = value
-            else:
-                # New entry
-                if len(self.cache) >= self.maxsize:
-                    # Evict LRU (first item)
-                    evicted_key, evicted_item = self.cache.popitem(last=False)
-                    self.evictions += 1
-                    logger.debug(f"LRU eviction: {evicted_key}")
-                    # DON'T cleanup here - return item for caller to handle async
-                    # This prevents asyncio.run() from being called inside a running loop
-
-                self.cache[key] = value
+        evicted = self.set(key, value)
+        if not evicted:
+            return None
+        # DON'T cleanup here - return item for caller to handle async
+        # This prevents asyncio.run() from being called inside a running loop
+        evicted_key, evicted_item = evicted[-1]
+        logger.debug(f"LRU eviction: {evicted_key}")
         return evicted_item
 
     def delete(self, key: str) -> Optional[Any]:
         """Delete entry from cache."""
-        with self._lock:
-            return self.cache.pop(key, None)
-
-    def clear(self) -> None:
-        """Clear all entries from cache."""
-        with self._lock:
-            self.cache.clear()
+        return self.pop(key)
 
     def size(self) -> int:
         """Get current cache size."""
-        with self._lock:
-            return len(self.cache)
-
-    def items(self) -> List[Tuple[str, Any]]:
-        """Get all items in cache."""
-        with self._lock:
-            return list(self.cache.items())
+        return len(self)
 
 
 # ============================================================================
@@ -723,7 +701,7 @@ class MemoryManager:
 
     Thread Safety:
         - Singleton creation: Double-checked locking
-        - Cache access: RLock for thread-safe OrderedDict ops
+        - Cache access: RLock-guarded LRU tier ops
         - Metrics: Atomic operations on primitives
     """
 
@@ -1262,16 +1240,20 @@ class MemoryManager:
         min_messages: int = 3,
         min_age_seconds: float = 120.0,
         importance_threshold: float = 0.4,
+        max_sessions_per_cycle: int = 100,
     ) -> None:
         """
         Periodically scan short-term sessions and promote important ones
         to long-term memory via FactExtractor.
 
         Steps per cycle:
-          1. Query ``RedisSessionBuffer.get_promotable_sessions()``
-          2. Score each session via ``analyze_session_importance()``
+          1. Query ``RedisSessionBuffer.get_promotable_sessions()`` (at most
+             ``max_sessions_per_cycle`` sessions, each blob fetched once)
+          2. Score each session via ``score_session_importance()``; low
+             scorers are deferred until they gain new messages
           3. Extract facts using ``FactExtractor.extract_batch()``
           4. Store extracted facts in long-term memory via ``store_memory()``
+             and mark the session promoted so it is never picked up again
         """
         logger.info("Promotion loop starting")
         while True:
@@ -1281,6 +1263,7 @@ class MemoryManager:
                     min_messages=min_messages,
                     min_age_seconds=min_age_seconds,
                     importance_threshold=importance_threshold,
+                    max_sessions=max_sessions_per_cycle,
                 )
             except asyncio.CancelledError:
                 logger.info("Promotion loop cancelled")
@@ -1295,48 +1278,61 @@ class MemoryManager:
         min_messages: int = 3,
         min_age_seconds: float = 120.0,
         importance_threshold: float = 0.4,
+        max_sessions: Optional[int] = 100,
     ) -> int:
         """
         Execute one promotion cycle.
 
+        Candidate sessions are scored and read from the ``SessionData``
+        returned by the index scan, so each blob is fetched only once.
+
         Returns:
             Number of sessions promoted.
         """
         promoted = 0
         try:
             # Import lazily to avoid circular deps
-            from .short_term.redis_buffer import RedisSessionBuffer, InMemorySessionBuffer
+            from .short_term.redis_buffer import get_session_buffer, score_session_importance
             from .long_term.fact_extractor import FactExtractor
 
-            # Try to get the session buffer instance
+            # Shared session buffer (Redis, or its in-memory fallback)
             buffer: Optional[Any] = None
             try:
-                buffer = RedisSessionBuffer.get_instance()
-            except Exception:
-                buffer = InMemorySessionBuffer()
+                buffer = get_session_buffer()
+            except Exception as e:
+                logger.warning(f"Session buffer unavailable for promotion: {e}")
 
             if buffer is None:
                 return 0
 
-            # 1. Find promotable sessions
-            promotable = buffer.get_promotable_sessions(
+            # 1. Find promotable sessions (sync Redis paging, off the loop)
+            promotable = await asyncio.to_thread(
+                buffer.get_promotable_sessions,
                 min_messages=min_messages,
                 min_age_seconds=min_age_seconds,
+                limit=max_sessions,
             )
             if not promotable:
                 return 0
 
             logger.info(f"Promotion: found {len(promotable)} candidate sessions")
 
-            # 2. Score and filter
-            qualified_sessions: List[Tuple[str, Dict[str, Any]]] = []
-            for session_id in promotable:
+            # 2. Score and filter the sessions already in hand
+            qualified_sessions: List[Tuple[Any, Dict[str, Any]]] = []
+            deferred: Dict[str, int] = {}
+            for session in promotable:
                 try:
-                    analysis = buffer.analyze_session_importance(session_id)
+                    analysis = score_session_importance(session)
                     if analysis.get("importance_score", 0) >= importance_threshold:
-                        qualified_sessions.append((session_id, analysis))
+                        qualified_sessions.append((session, analysis))
+                    else:
+                        deferred[session.session_id] = len(session.messages)
                 except Exception as e:
-                    logger.warning(f"Promotion scoring failed for {session_id}: {e}")
+                    logger.warning(f"Promotion scoring failed for {session.session_id}: {e}")
+
+            # Low scorers are not rescanned until they gain new messages
+            if deferred:
+                await asyncio.to_thread(buffer.defer_promotion, deferred)
 
             if not qualified_sessions:
                 return 0
@@ -1350,29 +1346,28 @@ class MemoryManager:
             extractor = FactExtractor()
             texts = []
             session_ids = []
-            for sid, analysis in qualified_sessions:
-                try:
-                    messages = buffer.get_messages(sid)
-                    if messages:
-                        combined = "\n".join(
-                            f"{getattr(m, 'role', 'user')}: {getattr(m, 'content', str(m))}"
-                            for m in messages
-                        )
-                        texts.append(combined)
-                        session_ids.append(sid)
-                except Exception as e:
-                    logger.warning(f"Failed to read messages for {sid}: {e}")
+            for session, analysis in qualified_sessions:
+                if session.messages:
+                    combined = "\n".join(
+                        f"{getattr(m, 'role', 'user')}: {getattr(m, 'content', str(m))}"
+                        for m in session.messages
+                    )
+                    texts.append(combined)
+                    session_ids.append(session.session_id)
 
             if not texts:
                 return 0
 
             batch_results = await extractor.extract_batch(texts, max_concurrent=5)
 
-            # 4. Store extracted facts in long-term memory
+            # 4. Store extracted facts in long-term memory. Every extracted
+            # session is marked promoted so later cycles never store its
+            # facts again.
             for idx, facts in enumerate(batch_results):
+                sid = session_ids[idx]
                 if not facts:
+                    await asyncio.to_thread(buffer.mark_promoted, [sid])
                     continue
-                sid = session_ids[idx]
                 for fact in facts:
                     try:
                         # Derive a patient_id from session metadata or use session id
@@ -1396,6 +1391,7 @@ class MemoryManager:
                     except Exception as e:
                         logger.warning(f"Failed to store promoted fact: {e}")
 
+                await asyncio.to_thread(buffer.mark_promoted, [sid])
                 promoted += 1
                 logger.debug(f"Promoted session {sid}: {len(facts)} facts")
 
@@ -45,6 +45,24 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Lazy-loaded shared PrometheusMetrics registry (None until first use)
+_registry = None
+_registry_loaded = False
+
+
+def _get_registry():
+    """Lazy-load the process-wide PrometheusMetrics registry."""
+    global _registry, _registry_loaded
+    if not _registry_loaded:
+        _registry_loaded = True
+        try:
+            from core.monitoring.prometheus_metrics import get_metrics
+
+            _registry = get_metrics()
+        except Exception as e:
+            logger.debug(f"PrometheusMetrics unavailable for memori histograms: {e}")
+    return _registry
+
 
 # ============================================================================
 # Structured Logger for ELK Compatibility
@@ -167,6 +185,8 @@ class Histogram:
     Simple histogram for tracking operation latencies.
 
     Calculates percentiles (p50, p95, p99) without external dependencies.
+    Observations are also fed into the shared PrometheusMetrics registry
+    (bucketed, aggregated across workers) under the same metric name.
     """
 
     name: str
@@ -175,6 +195,9 @@ class Histogram:
 
     def add(self, value: float):
         """Add value to histogram."""
+        registry = _get_registry()
+        if registry is not None:
+            registry.record_histogram(self.name, value)
         self.values.append(value)
         # Keep only recent values
         if len(self.values) > self.max_size:
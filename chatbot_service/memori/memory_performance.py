@@ -27,12 +27,13 @@ Performance Targets:
 """
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from core.cache import MemoryTier, RedisTier, TieredCache
+
 logger = logging.getLogger(__name__)
 
 # Optional compression library
@@ -241,28 +242,6 @@ class BatchMemoryProcessor:
 # ============================================================================
 
 
-class CacheEntry:
-    """Single cache entry with TTL."""
-
-    def __init__(self, data: Any, ttl_seconds: int = 3600):
-        self.data = data
-        self.created_at = datetime.utcnow()
-        self.ttl_seconds = ttl_seconds
-        self.access_count = 0
-        self.last_accessed = datetime.utcnow()
-
-    def is_expired(self) -> bool:
-        """Check if entry is expired."""
-        age = (datetime.utcnow() - self.created_at).total_seconds()
-        return age > self.ttl_seconds
-
-    def access(self) -> Any:
-        """Access entry and update stats."""
-        self.access_count += 1
-        self.last_accessed = datetime.utcnow()
-        return self.data
-
-
 class MultiTierCache:
     """
     Multi-tier caching strategy:
@@ -270,7 +249,8 @@ class MultiTierCache:
     2. L2: Redis cache (shared, persistent)
     3. L3: Database (authoritative)
 
-    Falls back gracefully if Redis unavailable.
+    Falls back gracefully if Redis unavailable. Backed by the unified
+    ``core.cache`` tiers.
 
     Complexity:
     - L1 hit: O(1)
@@ -285,49 +265,24 @@ class MultiTierCache:
         redis_host: str = "localhost",
         redis_port: int = 6379,
     ):
-        self.l1_cache: Dict[str, CacheEntry] = {}
         self.l1_max_size = l1_max_size
         self.redis_enabled = redis_enabled
         self.redis_host = redis_host
         self.redis_port = redis_port
-        self.redis_client = None
 
-        # Stats
-        self.l1_hits = 0
-        self.l1_misses = 0
-        self.l2_hits = 0
-        self.l2_misses = 0
-
-        # Try to initialize Redis if enabled
+        tiers = [
+            MemoryTier(max_entries=l1_max_size, default_ttl=3600, cache_name="memori")
+        ]
         if redis_enabled:
-            self._init_redis()
-
-    def _init_redis(self):
-        """Initialize Redis connection (optional)."""
-        try:
-            try:
-                import redis
-            except ImportError:
-                logger.warning("redis package not installed, Redis cache disabled")
-                self.redis_enabled = False
-                return
-
-            self.redis_client = redis.Redis(
-                host=self.redis_host,
-                port=self.redis_port,
-                db=0,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
+            tiers.append(
+                RedisTier(
+                    url=f"redis://{redis_host}:{redis_port}/0",
+                    key_prefix="memori:",
+                    default_ttl=3600,
+                    cache_name="memori",
+                )
             )
-            # Test connection
-            self.redis_client.ping()
-            logger.info("Redis cache initialized")
-
-        except Exception as e:
-            logger.warning(f"Redis initialization failed, falling back to L1 only: {e}")
-            self.redis_enabled = False
-            self.redis_client = None
+        self.cache = TieredCache("memori", tiers)
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -335,98 +290,27 @@ class MultiTierCache:
 
         Returns value and updates stats.
         """
-        # Try L1 (in-memory)
-        if key in self.l1_cache:
-            entry = self.l1_cache[key]
-            if not entry.is_expired():
-                self.l1_hits += 1
-                return entry.access()
-            else:
-                del self.l1_cache[key]
-
-        self.l1_misses += 1
-
-        # Try L2 (Redis) if enabled
-        if self.redis_enabled and self.redis_client:
-            try:
-                value = self.redis_client.get(key)
-                if value:
-                    self.l2_hits += 1
-                    # Promote to L1
-                    self.set(key, json.loads(value), ttl_seconds=3600)
-                    return json.loads(value)
-            except Exception as e:
-                logger.debug(f"Redis get failed: {e}")
-                self.l2_misses += 1
-
-        return None
-
-    async def set(self, key: str, value: Any, ttl_seconds: int = 3600):
-        """Store value in cache (L1 + L2)."""
-        # Always store in L1
-        if len(self.l1_cache) >= self.l1_max_size:
-            # Evict least recently used
-            lru_key = min(
-                self.l1_cache.keys(),
-                key=lambda k: self.l1_cache[k].last_accessed,
-            )
-            del self.l1_cache[lru_key]
-
-        self.l1_cache[key] = CacheEntry(value, ttl_seconds)
+        return self.cache.get(key)
 
-        # Try L2 (Redis) if enabled
-        if self.redis_enabled and self.redis_client:
-            try:
-                self.redis_client.setex(
-                    key,
-                    ttl_seconds,
-                    json.dumps(value, default=str),
-                )
-            except Exception as e:
-                logger.debug(f"Redis set failed: {e}")
+    async def set(
+        self, key: str, value: Any, ttl_seconds: int = 3600, tags: Iterable[str] = ()
+    ):
+        """Store value in cache (L1 + L2)."""
+        self.cache.set(key, value, ttl_seconds, tags)
 
     async def delete(self, key: str):
         """Delete value from all tiers."""
-        if key in self.l1_cache:
-            del self.l1_cache[key]
+        self.cache.delete(key)
 
-        if self.redis_enabled and self.redis_client:
-            try:
-                self.redis_client.delete(key)
-            except Exception as e:
-                logger.debug(f"Redis delete failed: {e}")
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every entry carrying any of ``tags`` from all tiers."""
+        return self.cache.invalidate_tags(*tags)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        l1_total = self.l1_hits + self.l1_misses
-        l1_hit_rate = (self.l1_hits / l1_total * 100) if l1_total > 0 else 0
-
-        l2_total = self.l2_hits + self.l2_misses
-        l2_hit_rate = (self.l2_hits / l2_total * 100) if l2_total > 0 else 0
-
-        return {
-            "l1": {
-                "size": len(self.l1_cache),
-                "max_size": self.l1_max_size,
-                "hits": self.l1_hits,
-                "misses": self.l1_misses,
-                "hit_rate_percent": round(l1_hit_rate, 2),
-            },
-            "l2": {
-                "enabled": self.redis_enabled,
-                "hits": self.l2_hits,
-                "misses": self.l2_misses,
-                "hit_rate_percent": round(l2_hit_rate, 2),
-            },
-            "combined_hit_rate_percent": round(
-                (
-                    ((self.l1_hits + self.l2_hits) / (l1_total + l2_total) * 100)
-                    if (l1_total + l2_total) > 0
-                    else 0
-                ),
-                2,
-            ),
-        }
+        stats = self.cache.get_stats()
+        stats["l2_enabled"] = self.cache.l2 is not None
+        return stats
 
 
 # ============================================================================
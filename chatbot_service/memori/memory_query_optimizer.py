@@ -14,13 +14,14 @@ import hashlib
 import json
 import logging
 import time
-from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Generic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Generic
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
+from core.cache import AsyncRedisTier, AsyncTieredCache, MemoryTier, user_tag
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -54,81 +55,33 @@ class MemoryOptimizationConfig:
     max_memories_per_user: int = 10000
 
 
-class LRUCache(Generic[T]):
-    """Thread-safe LRU cache with TTL support."""
+class LRUCache(MemoryTier, Generic[T]):
+    """Thread-safe LRU cache with TTL support (``core.cache.MemoryTier``)."""
     
-    def __init__(self, max_size: int = 500, ttl: int = 300):
+    def __init__(self, max_size: int = 500, ttl: int = 300, name: str = "memory_lru"):
+        super().__init__(max_entries=max_size, default_ttl=ttl, cache_name=name)
         self.max_size = max_size
         self.ttl = ttl
-        self._cache: OrderedDict[str, Tuple[T, float]] = OrderedDict()
-        self._lock = threading.RLock()
-        self._hits = 0
-        self._misses = 0
     
-    def get(self, key: str) -> Optional[T]:
+    def get(self, key: str, default: Any = None) -> Optional[T]:
         """Get value from cache if not expired."""
-        with self._lock:
-            if key in self._cache:
-                value, timestamp = self._cache[key]
-                if time.time() - timestamp < self.ttl:
-                    # Move to end (most recently used)
-                    self._cache.move_to_end(key)
-                    self._hits += 1
-                    return value
-                else:
-                    # Expired, remove
-                    del self._cache[key]
-            self._misses += 1
-            return None
-    
-    def set(self, key: str, value: T) -> None:
-        """Set value in cache."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-            elif len(self._cache) >= self.max_size:
-                # Remove oldest (first) item
-                self._cache.popitem(last=False)
-            self._cache[key] = (value, time.time())
-    
-    def delete(self, key: str) -> bool:
-        """Delete key from cache."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+        return super().get(key, default)
     
     def invalidate_pattern(self, pattern: str) -> int:
-        """Invalidate all keys matching pattern."""
+        """
+        Invalidate all keys containing pattern.
+        
+        Linear scan over the cache; store entries with ``tags`` and use
+        ``invalidate_tags`` on hot paths.
+        """
         count = 0
-        with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if pattern in k]
-            for key in keys_to_delete:
-                del self._cache[key]
+        for key, _ in self.items():
+            if pattern in key and self.delete(key):
                 count += 1
         return count
-    
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        with self._lock:
-            total = self._hits + self._misses
-            return {
-                "size": len(self._cache),
-                "max_size": self.max_size,
-                "hits": self._hits,
-                "misses": self._misses,
-                "hit_rate": self._hits / total if total > 0 else 0,
-                "ttl": self.ttl
-            }
 
 
-class MemoryTieredCache:
+class MemoryTieredCache(AsyncTieredCache):
     """Two-tier caching: L1 (in-memory) + L2 (Redis)."""
     
     def __init__(
@@ -137,95 +90,42 @@ class MemoryTieredCache:
         redis_client: Optional[Any] = None
     ):
         self.config = config
-        self.l1 = LRUCache[Any](
-            max_size=config.l1_cache_size,
-            ttl=config.l1_cache_ttl
-        )
         self.redis = redis_client
         self._cache_prefix = "memory:"
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """Get from L1, then L2 if miss."""
-        # L1 lookup
-        value = self.l1.get(key)
-        if value is not None:
-            return value
-        
-        # L2 lookup (Redis)
-        if self.redis:
-            try:
-                redis_key = f"{self._cache_prefix}{key}"
-                data = await self.redis.get(redis_key)
-                if data:
-                    value = json.loads(data)
-                    # Populate L1
-                    self.l1.set(key, value)
-                    return value
-            except Exception as e:
-                logger.warning(f"Redis L2 cache get failed: {e}")
-        
-        return None
-    
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set in both L1 and L2."""
-        # L1
-        self.l1.set(key, value)
-        
-        # L2 (Redis)
-        if self.redis:
-            try:
-                redis_key = f"{self._cache_prefix}{key}"
-                ttl = ttl or self.config.l2_cache_ttl
-                await self.redis.setex(
-                    redis_key,
-                    ttl,
-                    json.dumps(value, default=str)
+        tiers = [
+            MemoryTier(
+                max_entries=config.l1_cache_size,
+                default_ttl=config.l1_cache_ttl,
+                cache_name="memory",
+            )
+        ]
+        if redis_client is not None:
+            tiers.append(
+                AsyncRedisTier(
+                    key_prefix=self._cache_prefix,
+                    default_ttl=config.l2_cache_ttl,
+                    cache_name="memory",
+                    client=redis_client,
                 )
-            except Exception as e:
-                logger.warning(f"Redis L2 cache set failed: {e}")
+            )
+        super().__init__("memory", tiers)
     
-    async def delete(self, key: str) -> None:
-        """Delete from both L1 and L2."""
-        self.l1.delete(key)
-        
-        if self.redis:
-            try:
-                redis_key = f"{self._cache_prefix}{key}"
-                await self.redis.delete(redis_key)
-            except Exception as e:
-                logger.warning(f"Redis L2 cache delete failed: {e}")
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        tier_ttls: Optional[Sequence[Optional[int]]] = None,
+    ) -> None:
+        """Set in both L1 and L2 (``ttl`` applies to L2, L1 keeps its own TTL)."""
+        if tier_ttls is None and ttl is not None:
+            tier_ttls = [None, ttl]
+        await super().set(key, value, ttl, tags, tier_ttls)
     
     async def invalidate_user(self, user_id: str) -> int:
-        """Invalidate all cache entries for a user."""
-        pattern = f"user:{user_id}"
-        count = self.l1.invalidate_pattern(pattern)
-        
-        if self.redis:
-            try:
-                # Scan and delete matching keys
-                cursor = b"0"
-                while cursor:
-                    cursor, keys = await self.redis.scan(
-                        cursor,
-                        match=f"{self._cache_prefix}*{pattern}*",
-                        count=100
-                    )
-                    if keys:
-                        await self.redis.delete(*keys)
-                        count += len(keys)
-                    if cursor == b"0":
-                        break
-            except Exception as e:
-                logger.warning(f"Redis pattern invalidation failed: {e}")
-        
-        return count
-    
-    def get_stats(self) -> Dict[str, Any]:
-        """Get combined cache statistics."""
-        return {
-            "l1": self.l1.get_stats(),
-            "l2_available": self.redis is not None
-        }
+        """Invalidate all cache entries for a user (tag index, no scans)."""
+        return await self.invalidate_tags(user_tag(user_id))
 
 
 @dataclass
@@ -479,7 +379,7 @@ class OptimizedMemoryQueries:
             
             # Cache result
             if use_cache:
-                await self.cache.set(cache_key, result)
+                await self.cache.set(cache_key, result, tags=[user_tag(user_id)])
             
             # Resolve pending queries
             future.set_result(result)
@@ -572,7 +472,7 @@ class OptimizedMemoryQueries:
         asyncio.create_task(self._update_access_counts([r['id'] for r in result]))
         
         # Cache with shorter TTL for relevance queries
-        await self.cache.set(cache_key, result, ttl=60)
+        await self.cache.set(cache_key, result, ttl=60, tags=[user_tag(user_id)])
         
         return result
     
@@ -640,7 +540,8 @@ class OptimizedMemoryQueries:
         await self.cache.set(
             cache_key, 
             result, 
-            ttl=self.config.aggregation_cache_ttl
+            ttl=self.config.aggregation_cache_ttl,
+            tags=[user_tag(user_id)]
         )
         
         return result
@@ -797,7 +698,7 @@ class OptimizedMemoryQueries:
             logger.warning(f"Full-text search failed, using fallback: {e}")
             result = await self._fallback_search(user_id, query, memory_types, limit)
         
-        await self.cache.set(cache_key, result, ttl=120)
+        await self.cache.set(cache_key, result, ttl=120, tags=[user_tag(user_id)])
         return result
     
     async def _fallback_search(
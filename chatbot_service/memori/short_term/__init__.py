@@ -12,6 +12,7 @@ from .redis_buffer import (
     SessionData,
     SessionMessage,
     get_session_buffer,
+    score_session_importance,
     shutdown_session_buffer,
 )
 
@@ -21,5 +22,6 @@ __all__ = [
     "SessionData",
     "SessionMessage",
     "get_session_buffer",
+    "score_session_importance",
     "shutdown_session_buffer",
 ]
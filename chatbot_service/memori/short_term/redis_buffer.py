@@ -22,7 +22,7 @@ from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +102,83 @@ class SessionData:
         )
 
 
+_HEALTH_KEYWORDS = {
+    "pain", "symptom", "medication", "doctor", "diagnosis",
+    "blood pressure", "heart rate", "allergy", "prescription",
+    "treatment", "condition", "surgery", "lab", "test",
+}
+
+
+def score_session_importance(session_data: SessionData) -> Dict[str, Any]:
+    """
+    Score a session for promotion to long-term memory.
+    
+    Scores the session based on:
+    - Message count and density
+    - Presence of health-related keywords
+    - User engagement level
+    - Content diversity
+    
+    Args:
+        session_data: Session to score (already loaded)
+        
+    Returns:
+        Dict with importance metrics
+    """
+    messages = session_data.messages
+    if not messages:
+        return {"importance_score": 0.0, "reason": "no_messages"}
+    
+    # Scoring factors
+    msg_count = len(messages)
+    msg_score = min(msg_count / 10.0, 1.0)  # Normalize to 0-1
+    
+    # Check for medical/health keywords
+    all_content = " ".join(m.content.lower() for m in messages)
+    health_matches = sum(1 for kw in _HEALTH_KEYWORDS if kw in all_content)
+    health_score = min(health_matches / 5.0, 1.0)
+    
+    # Engagement: ratio of user messages vs assistant
+    user_msgs = sum(1 for m in messages if m.role == "user")
+    engagement_score = min(user_msgs / max(msg_count, 1), 1.0)
+    
+    # Content diversity (unique words ratio)
+    words = all_content.split()
+    diversity_score = len(set(words)) / max(len(words), 1)
+    
+    # Weighted importance
+    importance_score = (
+        msg_score * 0.2 +
+        health_score * 0.4 +
+        engagement_score * 0.2 +
+        diversity_score * 0.2
+    )
+    
+    return {
+        "importance_score": round(importance_score, 3),
+        "message_count": msg_count,
+        "health_relevance": round(health_score, 3),
+        "engagement": round(engagement_score, 3),
+        "content_diversity": round(diversity_score, 3),
+        "promotable": importance_score >= 0.4,
+    }
+
+
+# Promotion state value for sessions already promoted; a message count marks
+# a session that scored too low at that count
+_PROMOTED = "promoted"
+
+
+def _promotion_pending(state: Any, msg_count: int) -> bool:
+    """Whether a session still needs a promotion check given its recorded state."""
+    if state is None:
+        return True
+    if state == _PROMOTED:
+        return False
+    # Scored too low before: retry once the session has new messages
+    return int(state) < msg_count
+
+
 # ============================================================================
 # Base Session Buffer Interface
 # ============================================================================
@@ -186,6 +263,8 @@ class InMemorySessionBuffer(SessionBufferInterface):
         self.cleanup_interval_seconds = cleanup_interval_seconds
         
         self._sessions: OrderedDict[str, Tuple[SessionData, float]] = OrderedDict()
+        # session_id -> _PROMOTED, or message count when it last scored too low
+        self._promotion_state: Dict[str, Any] = {}
         self._lock = threading.RLock()
         
         # Start cleanup thread
@@ -341,7 +420,8 @@ class InMemorySessionBuffer(SessionBufferInterface):
         Get sessions eligible for promotion to long-term memory.
         
         Sessions qualify when they have enough context (messages) and
-        have been active long enough to contain meaningful data.
+        have been active long enough to contain meaningful data. Sessions
+        already promoted, or deferred without new messages since, are skipped.
         
         Args:
             min_messages: Minimum number of messages for promotion eligibility
@@ -354,11 +434,19 @@ class InMemorySessionBuffer(SessionBufferInterface):
         now = time.time()
         
         with self._lock:
+            # Forget state of sessions that have expired or been deleted
+            for session_id in self._promotion_state.keys() - self._sessions.keys():
+                del self._promotion_state[session_id]
+            
             for session_id, (session_data, created_time) in self._sessions.items():
                 age = now - created_time
                 msg_count = len(session_data.messages)
                 
-                if msg_count >= min_messages and age >= min_age_seconds:
+                if (
+                    msg_count >= min_messages
+                    and age >= min_age_seconds
+                    and _promotion_pending(self._promotion_state.get(session_id), msg_count)
+                ):
                     promotable.append(session_data)
         
         logger.debug(
@@ -367,68 +455,31 @@ class InMemorySessionBuffer(SessionBufferInterface):
         )
         return promotable
 
+    def mark_promoted(self, session_ids: Iterable[str]) -> None:
+        """Exclude promoted sessions from later promotion scans."""
+        with self._lock:
+            for session_id in session_ids:
+                self._promotion_state[session_id] = _PROMOTED
+    
+    def defer_promotion(self, message_counts: Dict[str, int]) -> None:
+        """Skip sessions that scored too low until they gain new messages."""
+        with self._lock:
+            self._promotion_state.update(message_counts)
+    
     def analyze_session_importance(self, session_id: str) -> Dict[str, Any]:
         """
         Analyze a session to determine its importance for promotion.
         
-        Scores the session based on:
-        - Message count and density
-        - Presence of health-related keywords
-        - User engagement level
-        - Content diversity
-        
         Args:
             session_id: Session to analyze
             
         Returns:
-            Dict with importance metrics
+            Dict with importance metrics (see ``score_session_importance``)
         """
         session_data = self.get_session(session_id)
         if not session_data:
             return {"importance_score": 0.0, "reason": "session_not_found"}
-        
-        messages = session_data.messages
-        if not messages:
-            return {"importance_score": 0.0, "reason": "no_messages"}
-        
-        # Scoring factors
-        msg_count = len(messages)
-        msg_score = min(msg_count / 10.0, 1.0)  # Normalize to 0-1
-        
-        # Check for medical/health keywords
-        health_keywords = {
-            "pain", "symptom", "medication", "doctor", "diagnosis",
-            "blood pressure", "heart rate", "allergy", "prescription",
-            "treatment", "condition", "surgery", "lab", "test",
-        }
-        all_content = " ".join(m.content.lower() for m in messages)
-        health_matches = sum(1 for kw in health_keywords if kw in all_content)
-        health_score = min(health_matches / 5.0, 1.0)
-        
-        # Engagement: ratio of user messages vs assistant
-        user_msgs = sum(1 for m in messages if m.role == "user")
-        engagement_score = min(user_msgs / max(msg_count, 1), 1.0)
-        
-        # Content diversity (unique words ratio)
-        words = all_content.split()
-        diversity_score = len(set(words)) / max(len(words), 1)
-        
-        # Weighted importance
-        importance_score = (
-            msg_score * 0.2 +
-            health_score * 0.4 +
-            engagement_score * 0.2 +
-            diversity_score * 0.2
-        )
-        
-        return {
-            "importance_score": round(importance_score, 3),
-            "message_count": msg_count,
-            "health_relevance": round(health_score, 3),
-            "engagement": round(engagement_score, 3),
-            "content_diversity": round(diversity_score, 3),
-            "promotable": importance_score >= 0.4,
-        }
+        return score_session_importance(session_data)
 
 
 # ============================================================================
@@ -457,6 +508,7 @@ class RedisSessionBuffer(SessionBufferInterface):
         default_ttl_seconds: int = 3600,
         max_messages_per_session: int = 100,
         use_fallback: bool = True,
+        promotion_page_size: int = 100,
     ):
         """
         Initialize Redis session buffer.
@@ -471,6 +523,7 @@ class RedisSessionBuffer(SessionBufferInterface):
             default_ttl_seconds: Default TTL for sessions
             max_messages_per_session: Max messages to keep per session
             use_fallback: Use in-memory fallback if Redis unavailable
+            promotion_page_size: Sessions fetched per page during promotion scans
         """
         self.redis_url = redis_url
         self.redis_host = redis_host
@@ -481,6 +534,16 @@ class RedisSessionBuffer(SessionBufferInterface):
         self.default_ttl_seconds = default_ttl_seconds
         self.max_messages_per_session = max_messages_per_session
         self.use_fallback = use_fallback
+        self.promotion_page_size = max(1, promotion_page_size)
+        
+        # Promotion candidate index. Kept outside ``key_prefix`` so the
+        # index keys never match a ``{key_prefix}*`` session pattern.
+        index_prefix = f"{key_prefix.rstrip(':')}_index:"
+        self._created_index_key = f"{index_prefix}created"
+        self._expiry_index_key = f"{index_prefix}expires"
+        self._msg_count_key = f"{index_prefix}msg_count"
+        # session_id -> _PROMOTED, or message count when it last scored too low
+        self._promoted_key = f"{index_prefix}promoted"
         
         self._redis_client = None
         self._fallback_buffer: Optional[InMemorySessionBuffer] = None
@@ -513,6 +576,10 @@ class RedisSessionBuffer(SessionBufferInterface):
             logger.info(f"Connected to Redis at {self.redis_host}:{self.redis_port}")
             self._using_fallback = False
             
+            # Sessions written before the index existed are picked up once
+            if not self._redis_client.exists(self._created_index_key):
+                self.rebuild_promotion_index()
+            
         except ImportError:
             logger.warning("redis-py not installed, using in-memory fallback")
             self._init_fallback()
@@ -535,6 +602,14 @@ class RedisSessionBuffer(SessionBufferInterface):
         """Get Redis key for a session."""
         return f"{self.key_prefix}{session_id}"
     
+    @staticmethod
+    def _created_score(created_at: str) -> float:
+        """Convert an ISO ``created_at`` to an epoch score for the index."""
+        try:
+            return datetime.fromisoformat(created_at).timestamp()
+        except (ValueError, TypeError):
+            return time.time()
+    
     def _is_available(self) -> bool:
         """Check if Redis is available."""
         if self._redis_client is None:
@@ -577,7 +652,26 @@ class RedisSessionBuffer(SessionBufferInterface):
             
             data = json.dumps(session_data.to_dict())
             ttl = session_data.ttl_seconds or self.default_ttl_seconds
-            self._redis_client.setex(key, ttl, data)
+            
+            # Blob and promotion index are written in one round trip.
+            # ZADD NX keeps the original creation score on later updates.
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl, data)
+            pipe.zadd(
+                self._created_index_key,
+                {session_data.session_id: self._created_score(session_data.created_at)},
+                nx=True,
+            )
+            pipe.zadd(
+                self._expiry_index_key,
+                {session_data.session_id: time.time() + ttl},
+            )
+            pipe.hset(
+                self._msg_count_key,
+                session_data.session_id,
+                len(session_data.messages),
+            )
+            pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Redis set error: {e}")
@@ -592,7 +686,13 @@ class RedisSessionBuffer(SessionBufferInterface):
         
         try:
             key = self._get_key(session_id)
-            result = self._redis_client.delete(key)
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.zrem(self._created_index_key, session_id)
+            pipe.zrem(self._expiry_index_key, session_id)
+            pipe.hdel(self._msg_count_key, session_id)
+            pipe.hdel(self._promoted_key, session_id)
+            result = pipe.execute()[0]
             return result > 0
         except Exception as e:
             logger.error(f"Redis delete error: {e}")
@@ -734,79 +834,241 @@ class RedisSessionBuffer(SessionBufferInterface):
         self,
         min_messages: int = 3,
         min_age_seconds: float = 300,
+        limit: Optional[int] = None,
     ) -> List[SessionData]:
         """
         Get sessions eligible for promotion to long-term memory.
         
-        For Redis-backed storage, scans all sessions matching the key prefix.
+        For Redis-backed storage, walks the ``created_at`` sorted-set index
+        in pages, filters candidates on the maintained message counts and
+        only fetches the session blobs that qualify.
         Falls back to in-memory buffer's method if using fallback.
         
         Args:
             min_messages: Minimum messages for eligibility
             min_age_seconds: Minimum session age in seconds
+            limit: Maximum number of sessions to return (None for all)
             
         Returns:
             List of promotable SessionData objects
         """
         if self._using_fallback and self._fallback_buffer:
-            return self._fallback_buffer.get_promotable_sessions(
+            promotable = self._fallback_buffer.get_promotable_sessions(
                 min_messages=min_messages,
                 min_age_seconds=min_age_seconds,
             )
+            return promotable[:limit] if limit is not None else promotable
         
-        promotable = []
-        now = datetime.now()
+        promotable: List[SessionData] = []
+        try:
+            for page in self.iter_promotable_session_pages(
+                min_messages=min_messages,
+                min_age_seconds=min_age_seconds,
+            ):
+                promotable.extend(page)
+                if limit is not None and len(promotable) >= limit:
+                    promotable = promotable[:limit]
+                    break
+        except Exception as e:
+            logger.error(f"Error scanning promotable sessions: {e}")
+        
+        logger.debug(f"Found {len(promotable)} promotable sessions in Redis")
+        return promotable
+
+    def iter_promotable_session_pages(
+        self,
+        min_messages: int = 3,
+        min_age_seconds: float = 300,
+    ) -> Iterator[List[SessionData]]:
+        """
+        Yield promotable sessions one page at a time from the Redis index.
+        
+        Each page costs one ZRANGEBYSCORE, one pipelined HMGET of message
+        counts and promotion state, and a pipelined GET limited to the
+        sessions that pass both filters. Sessions whose TTL has elapsed are
+        pruned from the index first.
+        
+        Args:
+            min_messages: Minimum messages for eligibility
+            min_age_seconds: Minimum session age in seconds
+            
+        Yields:
+            Lists of promotable SessionData objects
+        """
+        now = time.time()
+        expired = self._redis_client.zrangebyscore(self._expiry_index_key, "-inf", now)
+        if expired:
+            self._prune_index(expired)
+        
+        cutoff = now - min_age_seconds
+        offset = 0
+        
+        while True:
+            session_ids = self._redis_client.zrangebyscore(
+                self._created_index_key,
+                "-inf",
+                cutoff,
+                start=offset,
+                num=self.promotion_page_size,
+            )
+            if not session_ids:
+                return
+            offset += len(session_ids)
+            
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.hmget(self._msg_count_key, session_ids)
+            pipe.hmget(self._promoted_key, session_ids)
+            counts, states = pipe.execute()
+            candidates = []
+            done = []
+            for sid, count, state in zip(session_ids, counts, states):
+                if state == _PROMOTED:
+                    done.append(sid)
+                elif (
+                    count is not None
+                    and int(count) >= min_messages
+                    and _promotion_pending(state, int(count))
+                ):
+                    candidates.append(sid)
+            if done:
+                # Re-added by a later set_session; drop from the scan again
+                self._redis_client.zrem(self._created_index_key, *done)
+                offset -= len(done)
+            if not candidates:
+                continue
+            
+            pipe = self._redis_client.pipeline(transaction=False)
+            for sid in candidates:
+                pipe.get(self._get_key(sid))
+            values = pipe.execute()
+            
+            page: List[SessionData] = []
+            stale: List[str] = []
+            for sid, data in zip(candidates, values):
+                if not data:
+                    stale.append(sid)
+                    continue
+                try:
+                    page.append(SessionData.from_dict(json.loads(data)))
+                except (json.JSONDecodeError, Exception) as e:
+                    logger.warning(f"Failed to parse session {sid}: {e}")
+            
+            if stale:
+                self._prune_index(stale)
+                # Removed members shift the remaining range left
+                offset -= len(stale)
+            
+            if page:
+                yield page
+
+    def _prune_index(self, session_ids: List[str]) -> None:
+        """Drop index entries for sessions whose keys have expired."""
+        pipe = self._redis_client.pipeline(transaction=False)
+        pipe.zrem(self._created_index_key, *session_ids)
+        pipe.zrem(self._expiry_index_key, *session_ids)
+        pipe.hdel(self._msg_count_key, *session_ids)
+        pipe.hdel(self._promoted_key, *session_ids)
+        pipe.execute()
+        logger.debug(f"Pruned {len(session_ids)} expired sessions from promotion index")
+
+    def rebuild_promotion_index(self) -> int:
+        """
+        Rebuild the promotion index from the session keys currently in Redis.
+        
+        This is a one-off keyspace SCAN, used to backfill sessions written
+        before the index existed. Regular promotion cycles never scan.
         
+        Returns:
+            Number of sessions indexed
+        """
+        if self._using_fallback or self._redis_client is None:
+            return 0
+        
+        indexed = 0
         try:
-            # Scan Redis for all session keys
-            pattern = f"{self.key_prefix}*"
             cursor = 0
-            keys = []
-            
             while True:
-                cursor, batch_keys = self._redis_client.scan(
-                    cursor=cursor, match=pattern, count=100
+                cursor, keys = self._redis_client.scan(
+                    cursor=cursor, match=f"{self.key_prefix}*", count=100
                 )
-                keys.extend(batch_keys)
+                if keys:
+                    pipe = self._redis_client.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.get(key)
+                        pipe.ttl(key)
+                    results = pipe.execute()
+                    
+                    now = time.time()
+                    pipe = self._redis_client.pipeline(transaction=False)
+                    for data, ttl in zip(results[0::2], results[1::2]):
+                        if not data:
+                            continue
+                        try:
+                            raw = json.loads(data)
+                        except json.JSONDecodeError:
+                            continue
+                        session_id = raw.get("session_id")
+                        if not session_id:
+                            continue
+                        pipe.zadd(
+                            self._created_index_key,
+                            {session_id: self._created_score(raw.get("created_at"))},
+                            nx=True,
+                        )
+                        pipe.zadd(
+                            self._expiry_index_key,
+                            {session_id: now + (ttl if ttl and ttl > 0 else self.default_ttl_seconds)},
+                        )
+                        pipe.hset(
+                            self._msg_count_key,
+                            session_id,
+                            len(raw.get("messages", [])),
+                        )
+                        indexed += 1
+                    pipe.execute()
                 if cursor == 0:
                     break
-            
-            # Use Redis pipeline for efficient batch get
-            if keys:
-                pipe = self._redis_client.pipeline()
-                for key in keys:
-                    pipe.get(key)
-                values = pipe.execute()
-                
-                for key, data in zip(keys, values):
-                    if not data:
-                        continue
-                    try:
-                        session_data = SessionData.from_dict(json.loads(data))
-                        msg_count = len(session_data.messages)
-                        
-                        # Check age
-                        try:
-                            created_dt = datetime.fromisoformat(session_data.created_at)
-                            age_seconds = (now - created_dt).total_seconds()
-                        except (ValueError, TypeError):
-                            age_seconds = min_age_seconds + 1  # Assume old enough
-                        
-                        if msg_count >= min_messages and age_seconds >= min_age_seconds:
-                            promotable.append(session_data)
-                    except (json.JSONDecodeError, Exception) as e:
-                        logger.warning(f"Failed to parse session {key}: {e}")
-            
         except Exception as e:
-            logger.error(f"Error scanning promotable sessions: {e}")
+            logger.error(f"Failed to rebuild promotion index: {e}")
         
-        logger.debug(f"Found {len(promotable)} promotable sessions in Redis")
-        return promotable
+        if indexed:
+            logger.info(f"Rebuilt promotion index with {indexed} sessions")
+        return indexed
 
+    def mark_promoted(self, session_ids: Iterable[str]) -> None:
+        """
+        Exclude promoted sessions from later promotion scans.
+        
+        Records them as promoted (so a later ``set_session`` cannot bring
+        them back) and removes them from the creation index, so the next
+        scan starts at the sessions behind them.
+        """
+        session_ids = list(session_ids)
+        if not session_ids:
+            return
+        if self._using_fallback and self._fallback_buffer:
+            self._fallback_buffer.mark_promoted(session_ids)
+            return
+        
+        pipe = self._redis_client.pipeline(transaction=False)
+        pipe.hset(self._promoted_key, mapping={sid: _PROMOTED for sid in session_ids})
+        pipe.zrem(self._created_index_key, *session_ids)
+        pipe.execute()
+    
+    def defer_promotion(self, message_counts: Dict[str, int]) -> None:
+        """Skip sessions that scored too low until they gain new messages."""
+        if not message_counts:
+            return
+        if self._using_fallback and self._fallback_buffer:
+            self._fallback_buffer.defer_promotion(message_counts)
+            return
+        
+        self._redis_client.hset(self._promoted_key, mapping=message_counts)
+    
     def analyze_session_importance(self, session_id: str) -> Dict[str, Any]:
         """
         Analyze a session to determine its importance for promotion.
-        Delegates to the fallback buffer's implementation for consistency.
+        Uses the same scoring as the fallback buffer.
         """
         if self._using_fallback and self._fallback_buffer:
             return self._fallback_buffer.analyze_session_importance(session_id)
@@ -814,45 +1076,7 @@ class RedisSessionBuffer(SessionBufferInterface):
         session_data = self.get_session(session_id)
         if not session_data:
             return {"importance_score": 0.0, "reason": "session_not_found"}
-        
-        messages = session_data.messages
-        if not messages:
-            return {"importance_score": 0.0, "reason": "no_messages"}
-        
-        # Same scoring logic as InMemorySessionBuffer
-        msg_count = len(messages)
-        msg_score = min(msg_count / 10.0, 1.0)
-        
-        health_keywords = {
-            "pain", "symptom", "medication", "doctor", "diagnosis",
-            "blood pressure", "heart rate", "allergy", "prescription",
-            "treatment", "condition", "surgery", "lab", "test",
-        }
-        all_content = " ".join(m.content.lower() for m in messages)
-        health_matches = sum(1 for kw in health_keywords if kw in all_content)
-        health_score = min(health_matches / 5.0, 1.0)
-        
-        user_msgs = sum(1 for m in messages if m.role == "user")
-        engagement_score = min(user_msgs / max(msg_count, 1), 1.0)
-        
-        words = all_content.split()
-        diversity_score = len(set(words)) / max(len(words), 1)
-        
-        importance_score = (
-            msg_score * 0.2 +
-            health_score * 0.4 +
-            engagement_score * 0.2 +
-            diversity_score * 0.2
-        )
-        
-        return {
-            "importance_score": round(importance_score, 3),
-            "message_count": msg_count,
-            "health_relevance": round(health_score, 3),
-            "engagement": round(engagement_score, 3),
-            "content_diversity": round(diversity_score, 3),
-            "promotable": importance_score >= 0.4,
-        }
+        return score_session_importance(session_data)
 
 
 # ============================================================================
@@ -19,6 +19,7 @@ from typing import List, Optional
 from collections import OrderedDict
 
 from rag.embedding.base import BaseEmbeddingService
+from core.observability.tracing import trace_span, SpanType
 
 logger = logging.getLogger(__name__)
 
@@ -199,7 +200,8 @@ class RemoteEmbeddingService(BaseEmbeddingService):
         last_exc: Optional[Exception] = None
         for attempt in range(1, self.max_retries + 1):
             try:
-                embedding = client.embed_query(text)
+                with trace_span("embedding:query", SpanType.EMBEDDING, {"attempt": attempt}):
+                    embedding = client.embed_query(text)
                 if use_cache:
                     self._set_cached(key, embedding)
                 return embedding
@@ -254,7 +256,8 @@ class RemoteEmbeddingService(BaseEmbeddingService):
             for batch_start in range(0, len(uncached_texts), batch_size):
                 batch_texts = uncached_texts[batch_start : batch_start + batch_size]
                 batch_indices = uncached_indices[batch_start : batch_start + batch_size]
-                new_embeddings = client.embed_documents(batch_texts)
+                with trace_span("embedding:batch", SpanType.EMBEDDING, {"batch_size": len(batch_texts)}):
+                    new_embeddings = client.embed_documents(batch_texts)
 
                 for idx, emb in zip(batch_indices, new_embeddings):
                     results[idx] = emb
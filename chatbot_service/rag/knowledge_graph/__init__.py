@@ -6,6 +6,7 @@ for enhanced context understanding and semantic search.
 
 Components:
 - graph_rag: Graph-enhanced RAG pipeline
+- graph_store: Embedded property graph with entity -> chunk postings
 - medical_ontology: Medical term matching and normalization
 - phonetic_matcher: Phonetic drug name matching
 """
@@ -15,12 +16,23 @@ from .graph_rag import (
     GraphContext,
     GraphSearchResult,
 )
+from .graph_store import (
+    PropertyGraphStore,
+    get_graph_store,
+    start_graph_sync,
+    stop_graph_sync,
+)
 
 __all__ = [
     # Graph RAG
     "GraphRAGService",
     "GraphContext",
     "GraphSearchResult",
+    # Graph Store
+    "PropertyGraphStore",
+    "get_graph_store",
+    "start_graph_sync",
+    "stop_graph_sync",
     # Interaction Checker
     "GraphInteractionChecker",
 ]
@@ -5,10 +5,10 @@ Provides entity extraction, context enrichment, and reasoning
 path construction for medical queries.
 
 Features:
-- Entity extraction and linking
-- Context enrichment from medical knowledge
-- Reasoning path construction
-- Relevance scoring
+- Entity linking against the embedded property graph
+- Context enrichment via budgeted multi-hop expansion
+- Reasoning path construction from traversal paths
+- Corpus retrieval through entity -> chunk postings
 """
 
 
@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from .graph_store import GraphHop, PropertyGraphStore, get_graph_store
 
 logger = logging.getLogger(__name__)
 
@@ -114,50 +115,30 @@ class GraphRAGService:
         )
     """
 
-    # Entity type mappings
-    ENTITY_KEYWORDS = {
-        NodeLabel.SYMPTOM.value: [
-            "pain",
-            "ache",
-            "fatigue",
-            "dizziness",
-            "nausea",
-            "shortness",
-            "breath",
-            "swelling",
-            "palpitation",
-        ],
-        NodeLabel.CONDITION.value: [
-            "disease",
-            "syndrome",
-            "disorder",
-            "condition",
-            "hypertension",
-            "diabetes",
-            "failure",
-            "attack",
-        ],
-        NodeLabel.MEDICATION.value: [
-            "drug",
-            "medication",
-            "medicine",
-            "pill",
-            "tablet",
-            "dose",
-            "prescription",
-            "aspirin",
-            "statin",
-        ],
-        NodeLabel.TREATMENT.value: [
-            "treatment",
-            "therapy",
-            "surgery",
-            "procedure",
-            "intervention",
-            "lifestyle",
-            "diet",
-            "exercise",
-        ],
+    # Reverse reading of relations, used when an edge is followed backwards
+    INVERSE_RELATIONS = {
+        "INDICATES": "INDICATED_BY",
+        "TREATS": "TREATED_BY",
+        "PREVENTS": "PREVENTED_BY",
+        "CAUSES": "CAUSED_BY",
+        "RISK_FOR": "HAS_RISK_FACTOR",
+        "MEASURED_BY": "MEASURES",
+    }
+
+    # Query intent -> (entity labels to start from, relations to follow)
+    INTENT_RELATIONS = {
+        ("cause", "why"): (
+            (NodeLabel.CONDITION.value,),
+            {"CAUSES", "INDICATES", "RISK_FOR"},
+        ),
+        ("treat", "medication"): (
+            (NodeLabel.MEDICATION.value, NodeLabel.TREATMENT.value),
+            {"TREATS", "PREVENTS"},
+        ),
+        ("risk", "factor"): (
+            (NodeLabel.RISK_FACTOR.value,),
+            {"RISK_FOR"},
+        ),
     }
 
     def __init__(
@@ -165,6 +146,9 @@ class GraphRAGService:
         embedding_service: Optional[Any] = None,
         max_context_entities: int = 5,
         max_graph_depth: int = 3,
+        graph_store: Optional[PropertyGraphStore] = None,
+        max_nodes_visited: int = 64,
+        max_edges_scanned: int = 512,
     ):
         """
         Initialize Graph RAG service.
@@ -173,17 +157,23 @@ class GraphRAGService:
             embedding_service: Service for text embeddings
             max_context_entities: Max entities in context
             max_graph_depth: Max traversal depth
+            graph_store: Property graph to query (default: process-wide store)
+            max_nodes_visited: Node budget per traversal
+            max_edges_scanned: Edge budget per traversal
         """
         self.embedding_service = embedding_service
         self.max_context_entities = max_context_entities
         self.max_graph_depth = max_graph_depth
+        self.graph_store = graph_store or get_graph_store()
+        self.max_nodes_visited = max_nodes_visited
+        self.max_edges_scanned = max_edges_scanned
         
         # Latency optimization: Cache entity extraction results
         self._entity_cache: Dict[int, List[Tuple[str, str]]] = {}
         self._cache_max_size = 200
 
     async def initialize(self):
-        """Initialize services (no-op, uses local data only)."""
+        """Initialize services (no-op, the graph store is in-process)."""
         pass
     
     async def close(self):
@@ -211,19 +201,20 @@ class GraphRAGService:
 
         # Extract entities from query
         extracted_entities = self._extract_entities(query)
+        if entity_types:
+            extracted_entities = [e for e in extracted_entities if e[1] in entity_types]
 
         # Search graph for relevant entities
         primary_results = []
         total_nodes = 0
 
-        for entity_name, entity_type in extracted_entities:
-            results = await self._search_entity(
-                entity_name,
-                entity_type,
-                max_depth,
-            )
-            primary_results.extend(results)
-            total_nodes += len(results)
+        for entity_name, _entity_type in extracted_entities:
+            node = self.graph_store.get_entity(entity_name)
+            if node is None:
+                continue
+            result, visited = self._traverse(node.id, max_depth)
+            primary_results.append(result)
+            total_nodes += visited
 
         # If no specific entities found, do general search
         if not primary_results:
@@ -254,7 +245,7 @@ class GraphRAGService:
 
     def _extract_entities(self, query: str) -> List[Tuple[str, str]]:
         """
-        Extract potential entities from query.
+        Extract entities from query by linking against the graph's alias index.
 
         Args:
             query: User query
@@ -266,57 +257,84 @@ class GraphRAGService:
         query_hash = hash(query.lower().strip()[:100])
         if query_hash in self._entity_cache:
             return self._entity_cache[query_hash]
-        
-        entities = []
-        query_lower = query.lower()
-
-        # Check for known entity keywords
-        for entity_type, keywords in self.ENTITY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in query_lower:
-                    # Extract phrase around keyword
-                    words = query_lower.split()
-                    for i, word in enumerate(words):
-                        if keyword in word:
-                            # Get surrounding context
-                            start = max(0, i - 1)
-                            end = min(len(words), i + 2)
-                            phrase = " ".join(words[start:end])
-                            entities.append((phrase, entity_type))
-                            break
-
-        # Medical term detection (simple patterns)
-        medical_terms = [
-            ("chest pain", NodeLabel.SYMPTOM.value),
-            ("heart rate", NodeLabel.VITAL_SIGN.value),
-            ("blood pressure", NodeLabel.VITAL_SIGN.value),
-            ("shortness of breath", NodeLabel.SYMPTOM.value),
-            ("heart attack", NodeLabel.CONDITION.value),
-            ("heart failure", NodeLabel.CONDITION.value),
-            ("coronary artery disease", NodeLabel.CONDITION.value),
-            ("atrial fibrillation", NodeLabel.CONDITION.value),
-            ("hypertension", NodeLabel.CONDITION.value),
-            ("diabetes", NodeLabel.CONDITION.value),
-        ]
 
-        for term, entity_type in medical_terms:
-            if term in query_lower:
-                entities.append((term, entity_type))
-
-        # Deduplicate
-        seen = set()
-        unique_entities = []
-        for entity, etype in entities:
-            if entity not in seen:
-                seen.add(entity)
-                unique_entities.append((entity, etype))
+        entities = []
+        for node_id in self.graph_store.link_entities(query):
+            node = self.graph_store.get_entity(node_id)
+            entities.append((node.name, node.label))
 
         # Cache result
         if len(self._entity_cache) >= self._cache_max_size:
             self._entity_cache.clear()
-        self._entity_cache[query_hash] = unique_entities
+        self._entity_cache[query_hash] = entities
         
-        return unique_entities
+        return entities
+
+    def _traverse(
+        self,
+        node_id: int,
+        max_depth: int,
+        relations: Optional[set] = None,
+    ) -> Tuple[GraphSearchResult, int]:
+        """
+        Expand an entity's neighbourhood within the traversal budgets.
+
+        Returns:
+            (search result, number of nodes visited)
+        """
+        hops = self.graph_store.expand(
+            [node_id],
+            max_depth=max_depth,
+            max_nodes=self.max_nodes_visited,
+            max_edges=self.max_edges_scanned,
+            relations=relations,
+        )
+        root = hops[0].node
+
+        related = [
+            {
+                "entity": hop.node.name,
+                "type": hop.node.label,
+                "relationship": self._relationship_label(hop),
+            }
+            for hop in sorted(hops[1:], key=lambda h: h.score, reverse=True)
+            if hop.depth == 1
+        ]
+
+        # Reasoning paths: the strongest multi-hop chains, else direct edges
+        reasoning_path = []
+        deepest = sorted(
+            (hop for hop in hops[1:] if hop.depth > 1),
+            key=lambda h: h.score,
+            reverse=True,
+        )
+        for hop in deepest[:3]:
+            path = self.graph_store.path_to(hops, hop.node.id)
+            steps = [path[0].node.name]
+            for step in path[1:]:
+                steps.append(f"{self._relationship_label(step)} {step.node.name}")
+            reasoning_path.append(" → ".join(steps))
+        if not reasoning_path:
+            reasoning_path = self._build_reasoning_path(root.name, root.label, related)
+
+        # Entities backed by the ingested corpus rank higher
+        mentions = self.graph_store.mention_count(root.id)
+        result = GraphSearchResult(
+            entity=root.name,
+            entity_type=root.label,
+            relevance_score=0.6 + min(mentions, 10) * 0.02,
+            context=root.properties.get("description", f"Information about {root.name}"),
+            related_entities=related,
+            reasoning_path=reasoning_path,
+        )
+        return result, len(hops)
+
+    def _relationship_label(self, hop: GraphHop) -> str:
+        if hop.relation is None:
+            return ""
+        if hop.inverse:
+            return self.INVERSE_RELATIONS.get(hop.relation, hop.relation)
+        return hop.relation
 
     async def _search_entity(
         self,
@@ -325,7 +343,7 @@ class GraphRAGService:
         max_depth: int,
     ) -> List[GraphSearchResult]:
         """
-        Search for an entity using local medical knowledge.
+        Search for an entity in the graph store.
 
         Args:
             entity_name: Entity to search
@@ -335,8 +353,14 @@ class GraphRAGService:
         Returns:
             List of search results
         """
-        # Use local mock/keyword-based knowledge
-        return self._get_mock_results(entity_name, entity_type)
+        node = self.graph_store.get_entity(entity_name)
+        if node is None:
+            linked = self.graph_store.link_entities(entity_name, max_entities=1)
+            if not linked:
+                return []
+            node = self.graph_store.get_entity(linked[0])
+        result, _ = self._traverse(node.id, max_depth)
+        return [result]
 
     async def _semantic_graph_search(
         self,
@@ -344,7 +368,10 @@ class GraphRAGService:
         max_depth: int,
     ) -> List[GraphSearchResult]:
         """
-        Semantic search across the graph.
+        Intent-driven search when the query names no known entity.
+
+        Starts from the most-mentioned entities of the label the intent asks
+        about and follows only the relations relevant to that intent.
 
         Args:
             query: User query
@@ -353,137 +380,115 @@ class GraphRAGService:
         Returns:
             List of search results
         """
-        # In production, this would use embeddings
-        # For now, use keyword matching on common medical terms
-
         results = []
-
-        # Check for common medical queries
         query_lower = query.lower()
 
-        if "cause" in query_lower or "why" in query_lower:
-            # User asking about causes
-            results.extend(self._get_mock_results("causes", NodeLabel.SYMPTOM.value))
+        for keywords, (labels, relations) in self.INTENT_RELATIONS.items():
+            if not any(keyword in query_lower for keyword in keywords):
+                continue
+            for label in labels:
+                for node in self.graph_store.entities_by_label(label)[:2]:
+                    result, _ = self._traverse(node.id, max_depth, relations)
+                    result.relevance_score = 0.5
+                    results.append(result)
 
-        if "treat" in query_lower or "medication" in query_lower:
-            # User asking about treatments
-            results.extend(
-                self._get_mock_results("treatments", NodeLabel.TREATMENT.value)
-            )
+        return results
 
-        if "risk" in query_lower or "factor" in query_lower:
-            # User asking about risk factors
-            results.extend(
-                self._get_mock_results("risk factors", NodeLabel.RISK_FACTOR.value)
-            )
+    # ------------------------------------------------------------------
+    # Corpus retrieval
+    # ------------------------------------------------------------------
 
-        return results
+    def index_document(
+        self,
+        chunk_id: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Index a corpus chunk into the graph (entity linking + postings).
+
+        Returns:
+            Number of entities linked in the chunk
+        """
+        return len(self.graph_store.add_chunk(chunk_id, content, metadata))
 
-    def _get_mock_results(
+    def remove_document(self, doc_id: str) -> int:
+        """Remove a document's chunks from the graph postings."""
+        return self.graph_store.remove_document(doc_id)
+
+    def search(
         self,
-        entity_name: str,
-        entity_type: str,
-    ) -> List[GraphSearchResult]:
-        """Generate mock results for testing."""
-        mock_data = {
-            "chest pain": GraphSearchResult(
-                entity="Chest Pain",
-                entity_type=NodeLabel.SYMPTOM.value,
-                relevance_score=0.9,
-                context="Chest pain is a common symptom that can indicate various cardiac conditions.",
-                related_entities=[
-                    {
-                        "entity": "Coronary Artery Disease",
-                        "type": "Condition",
-                        "relationship": "INDICATES",
-                    },
-                    {
-                        "entity": "Myocardial Infarction",
-                        "type": "Condition",
-                        "relationship": "INDICATES",
-                    },
-                    {
-                        "entity": "Angina",
-                        "type": "Condition",
-                        "relationship": "INDICATES",
-                    },
-                ],
-                reasoning_path=[
-                    "Chest pain is a symptom",
-                    "Often indicates cardiac conditions",
-                    "May require immediate evaluation",
-                ],
-            ),
-            "hypertension": GraphSearchResult(
-                entity="Hypertension",
-                entity_type=NodeLabel.CONDITION.value,
-                relevance_score=0.85,
-                context="Hypertension (high blood pressure) is a major risk factor for cardiovascular disease.",
-                related_entities=[
-                    {
-                        "entity": "ACE Inhibitors",
-                        "type": "Medication",
-                        "relationship": "TREATS",
-                    },
-                    {
-                        "entity": "Beta Blockers",
-                        "type": "Medication",
-                        "relationship": "TREATS",
-                    },
-                    {
-                        "entity": "Stroke",
-                        "type": "Condition",
-                        "relationship": "RISK_FOR",
-                    },
-                ],
-                reasoning_path=[
-                    "Hypertension is a chronic condition",
-                    "Increases cardiovascular risk",
-                    "Treatable with medication and lifestyle changes",
-                ],
-            ),
-            "shortness of breath": GraphSearchResult(
-                entity="Shortness of Breath",
-                entity_type=NodeLabel.SYMPTOM.value,
-                relevance_score=0.85,
-                context="Dyspnea can indicate heart failure, pulmonary, or anxiety conditions.",
-                related_entities=[
-                    {
-                        "entity": "Heart Failure",
-                        "type": "Condition",
-                        "relationship": "INDICATES",
-                    },
-                    {
-                        "entity": "COPD",
-                        "type": "Condition",
-                        "relationship": "INDICATES",
-                    },
-                ],
-                reasoning_path=[
-                    "Shortness of breath is a symptom",
-                    "Can indicate cardiac or pulmonary issues",
-                    "Severity determines urgency",
-                ],
-            ),
-        }
+        query: str,
+        top_k: int = 5,
+        max_depth: int = 2,
+    ) -> List[Dict[str, Any]]:
+        """
+        Graph retrieval for context assembly.
 
-        # Check for matches
-        entity_lower = entity_name.lower()
-        for key, result in mock_data.items():
-            if key in entity_lower or entity_lower in key:
-                return [result]
-
-        # Generic result
-        return [
-            GraphSearchResult(
-                entity=entity_name.title(),
-                entity_type=entity_type,
-                relevance_score=0.5,
-                context=f"Information about {entity_name}",
-                related_entities=[],
-                reasoning_path=[f"Found reference to {entity_name}"],
-            )
-        ]
+        Links query entities, expands their neighbourhood under the traversal
+        budgets and ranks corpus chunks through the entity postings; chunk
+        text is read from the vector store. Falls back to entity facts when
+        no ingested chunk mentions the entities.
+
+        Blocks on the vector store read; call it from a worker thread when
+        on the event loop.
+
+        Args:
+            query: User query
+            top_k: Number of documents to return
+            max_depth: Traversal depth
+
+        Returns:
+            Documents as {id, content, metadata, score} dicts
+        """
+        seeds = self.graph_store.link_entities(query)
+        if not seeds:
+            return []
+        hops = self.graph_store.expand(
+            seeds,
+            max_depth=max_depth,
+            max_nodes=self.max_nodes_visited,
+            max_edges=self.max_edges_scanned,
+        )
+
+        ranked = self.graph_store.rank_chunks(hops, limit=top_k)
+        if ranked:
+            try:
+                chunks = self.graph_store.get_chunks(chunk_id for chunk_id, _ in ranked)
+            except Exception as e:
+                logger.warning(f"Graph chunk lookup failed: {e}")
+                chunks = {}
+            top_score = ranked[0][1] or 1.0
+            documents = []
+            for chunk_id, score in ranked:
+                chunk = chunks.get(chunk_id)
+                if chunk is None:
+                    continue
+                documents.append({
+                    "id": chunk_id,
+                    "content": chunk["content"],
+                    "metadata": {**chunk["metadata"], "retrieval": "graph"},
+                    "score": score / top_score,
+                })
+            if documents:
+                return documents
+
+        documents = []
+        for hop in hops:
+            if hop.depth > 0:
+                continue
+            result, _ = self._traverse(hop.node.id, 1)
+            facts = [result.context] + [
+                f"{result.entity} {rel['relationship'].lower().replace('_', ' ')} {rel['entity']}"
+                for rel in result.related_entities[:5]
+            ]
+            documents.append({
+                "id": f"graph:{hop.node.name}",
+                "content": " ".join(facts),
+                "metadata": {"entity": hop.node.name, "entity_type": hop.node.label, "retrieval": "graph"},
+                "score": result.relevance_score,
+            })
+        return documents[:top_k]
 
     def _build_reasoning_path(
         self,
@@ -0,0 +1,970 @@
+"""
+Embedded Property Graph Store.
+
+In-process knowledge graph backing GraphRAGService, so graph retrieval
+needs no external graph database.
+
+Layout:
+- Nodes are interned to integer ids; names/aliases map to ids through a
+  normalized alias index (longest-match entity linking over token n-grams).
+  Aliases of SHORT_ALIAS_CHARS characters or fewer ("MI", "AF", "BP") only
+  match as upper-case abbreviations, so "mi" or "hr" in prose never link
+- Entities come from the seed knowledge and interactions.json, plus entities
+  discovered in the corpus itself: abbreviation definitions ("atrial
+  fibrillation (AF)") and drug names by their INN stem suffix
+- Adjacency lists: per-node ``{(neighbor, relation_id): weight}`` dicts for
+  outgoing and incoming edges, so upserts and expansion are O(degree)
+- Entity -> chunk postings ``{node_id: {chunk_id: mentions}}`` built from the
+  ingested corpus; chunks mentioning the same entities get a MENTIONED_WITH
+  co-occurrence edge. Chunk text is not kept: the store records chunk ids,
+  their document and collection, and reads text back from the vector store
+
+Traversal is breadth-first with explicit node and edge budgets, so a query
+touches a bounded part of the graph regardless of its size.
+
+The process-wide store (``get_graph_store``) indexes the existing corpus
+from the vector store in a background thread and re-syncs every
+GRAPH_STORE_SYNC_SECONDS, so every worker sees chunks ingested (or
+deleted) by other workers and by earlier runs. When GRAPH_STORE_PATH is
+set, the graph is saved there after each sync that changed it and loaded
+at startup, so a restart only extracts chunks added since the last save.
+"""
+
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+GRAPH_STORE_PATH = os.getenv("GRAPH_STORE_PATH", "")
+# Re-sync corpus postings from the vector store this often (0 = initial sync only)
+GRAPH_STORE_SYNC_SECONDS = float(os.getenv("GRAPH_STORE_SYNC_SECONDS", "300"))
+
+CO_OCCURRENCE = "MENTIONED_WITH"
+
+# Aliases this short only link as upper-case abbreviations
+SHORT_ALIAS_CHARS = 3
+
+# INN stems, as in the EntityRuler of rag/nlp/factory.py
+DRUG_SUFFIXES = (
+    "mab", "nib", "pril", "sartan", "statin", "olol", "pine",
+    "zole", "pam", "lam", "mycin", "cillin", "floxacin", "vir",
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*", re.IGNORECASE)
+_ABBREVIATION_RE = re.compile(r"\(([A-Z][A-Za-z0-9-]{1,9})\)")
+_CLAUSE_BREAK_RE = re.compile(r"[.;:!?()\[\]\n]")
+_DRUG_RE = re.compile(r"\b[a-z]{4,}(?:%s)\b" % "|".join(DRUG_SUFFIXES), re.IGNORECASE)
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def normalize_name(text: str) -> str:
+    """Normalize an entity name or alias for lookup."""
+    return " ".join(_tokens(text))
+
+
+def _is_short(key: str) -> bool:
+    return len(key) <= SHORT_ALIAS_CHARS and " " not in key
+
+
+def _long_form(short: str, words: List[str]) -> Optional[str]:
+    """
+    Schwartz-Hearst match of an abbreviation against the words before it.
+
+    Walks both strings right to left; every letter/digit of ``short`` must
+    appear in order and its first character must start a word.
+    """
+    candidate = " ".join(words)
+    s, l = len(short) - 1, len(candidate) - 1
+    while s >= 0:
+        c = short[s].lower()
+        if not c.isalnum():
+            s -= 1
+            continue
+        while l >= 0 and (
+            candidate[l].lower() != c or (s == 0 and l > 0 and candidate[l - 1].isalnum())
+        ):
+            l -= 1
+        if l < 0:
+            return None
+        l -= 1
+        s -= 1
+    long_form = candidate[candidate.rfind(" ", 0, l + 1) + 1:]
+    if long_form.lower() == short.lower() or len(long_form.split()) > len(short) + 2:
+        return None
+    return long_form
+
+
+def extract_entities(text: str) -> List[Tuple[str, str, Tuple[str, ...]]]:
+    """
+    Discover entities in a corpus chunk.
+
+    - Abbreviation definitions: "atrial fibrillation (AF)" yields the long
+      form as an entity with the abbreviation as its alias
+    - Drug names carrying an INN stem suffix ("perindopril", "candesartan")
+
+    Returns:
+        (name, label, aliases) tuples
+    """
+    found: List[Tuple[str, str, Tuple[str, ...]]] = []
+    for match in _ABBREVIATION_RE.finditer(text):
+        short = match.group(1)
+        if sum(c.isupper() for c in short) < 2:
+            continue
+        clause = _CLAUSE_BREAK_RE.split(text[max(0, match.start() - 160):match.start()])[-1]
+        words = clause.split()[-min(len(short) + 5, 2 * len(short)):]
+        long_form = _long_form(short, words) if words else None
+        if long_form:
+            name = " ".join(w[:1].upper() + w[1:] for w in long_form.split())
+            found.append((name, "Concept", (short,)))
+    for word in dict.fromkeys(w.lower() for w in _DRUG_RE.findall(text)):
+        found.append((word.capitalize(), "Medication", ()))
+    return found
+
+
+@dataclass
+class GraphNode:
+    """Entity node."""
+    id: int
+    name: str
+    label: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class GraphHop:
+    """Node reached during neighbourhood expansion."""
+    node: GraphNode
+    depth: int
+    score: float
+    parent: Optional[int] = None  # Parent node id (None for seeds)
+    relation: Optional[str] = None  # Relation used to reach this node
+    inverse: bool = False  # True if the edge was followed target -> source
+
+
+class PropertyGraphStore:
+    """
+    Thread-safe in-memory property graph with entity/chunk postings.
+
+    Example:
+        store = PropertyGraphStore()
+        store.add_entity("Hypertension", "Condition", aliases=["high blood pressure"])
+        store.add_entity("Stroke", "Condition")
+        store.add_relation("Hypertension", "RISK_FOR", "Stroke")
+        store.add_chunk("doc1:0", "High blood pressure raises stroke risk.")
+        hops = store.expand(store.link_entities("high blood pressure"), max_depth=2)
+    """
+
+    def __init__(
+        self,
+        max_alias_tokens: int = 6,
+        max_cooccurring_entities: int = 16,
+        chunk_source: Any = None,
+    ):
+        """
+        Initialize the graph store.
+
+        Args:
+            max_alias_tokens: Longest alias (in tokens) considered when linking
+            max_cooccurring_entities: Entities per chunk that get co-occurrence edges
+            chunk_source: Store with ``get_chunks(ids, collection_name)`` that
+                chunk text is read from (default: the shared ChromaDB store)
+        """
+        self.max_alias_tokens = max_alias_tokens
+        self.max_cooccurring_entities = max_cooccurring_entities
+        self.chunk_source = chunk_source
+
+        self._nodes: List[GraphNode] = []
+        self._alias_index: Dict[str, int] = {}
+        self._acronym_index: Dict[str, int] = {}  # Upper-case short aliases
+        self._relations: List[str] = []
+        self._relation_ids: Dict[str, int] = {}
+        self._out: List[Dict[Tuple[int, int], float]] = []
+        self._in: List[Dict[Tuple[int, int], float]] = []
+
+        self._postings: Dict[int, Dict[str, int]] = {}
+        self._chunks: Dict[str, Tuple[Optional[str], Optional[str]]] = {}  # -> (doc_id, collection)
+        self._chunk_entities: Dict[str, List[int]] = {}
+        self._doc_chunks: Dict[str, Set[str]] = {}
+
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Entities and relations
+    # ------------------------------------------------------------------
+
+    def add_entity(
+        self,
+        name: str,
+        label: str,
+        aliases: Iterable[str] = (),
+        **properties: Any,
+    ) -> int:
+        """Add (or update) an entity and return its node id."""
+        key = normalize_name(name)
+        if not key:
+            raise ValueError(f"Invalid entity name: {name!r}")
+        with self._lock:
+            node_id = self._lookup(key)
+            if node_id is None:
+                node_id = len(self._nodes)
+                self._nodes.append(GraphNode(node_id, name, label, dict(properties)))
+                self._out.append({})
+                self._in.append({})
+                self._add_alias(key, node_id)
+            else:
+                self._nodes[node_id].properties.update(properties)
+            for alias in aliases:
+                alias_key = normalize_name(alias)
+                if alias_key:
+                    self._add_alias(alias_key, node_id)
+            return node_id
+
+    def _lookup(self, key: str) -> Optional[int]:
+        if _is_short(key):
+            return self._acronym_index.get(key.upper())
+        return self._alias_index.get(key)
+
+    def _add_alias(self, key: str, node_id: int) -> None:
+        if _is_short(key):
+            self._acronym_index.setdefault(key.upper(), node_id)
+        else:
+            self._alias_index.setdefault(key, node_id)
+
+    def _relation_id(self, relation: str) -> int:
+        rel_id = self._relation_ids.get(relation)
+        if rel_id is None:
+            rel_id = len(self._relations)
+            self._relations.append(relation)
+            self._relation_ids[relation] = rel_id
+        return rel_id
+
+    def _resolve(self, entity: Any) -> Optional[int]:
+        if isinstance(entity, int):
+            return entity if 0 <= entity < len(self._nodes) else None
+        return self._lookup(normalize_name(str(entity)))
+
+    def add_relation(
+        self,
+        source: Any,
+        relation: str,
+        target: Any,
+        weight: float = 1.0,
+        accumulate: bool = False,
+    ) -> bool:
+        """
+        Add a directed edge between two existing entities.
+
+        Args:
+            source: Source node id or name
+            relation: Relation type (e.g. "TREATS")
+            target: Target node id or name
+            weight: Edge weight
+            accumulate: Add to an existing edge's weight instead of replacing it
+
+        Returns:
+            False if either entity is unknown
+        """
+        with self._lock:
+            src, dst = self._resolve(source), self._resolve(target)
+            if src is None or dst is None or src == dst:
+                return False
+            rel_id = self._relation_id(relation)
+            if accumulate:
+                weight += self._out[src].get((dst, rel_id), 0.0)
+            self._out[src][(dst, rel_id)] = weight
+            self._in[dst][(src, rel_id)] = weight
+            return True
+
+    def _decrement_edge(self, src: int, relation: str, dst: int, amount: float) -> None:
+        rel_id = self._relation_ids.get(relation)
+        if rel_id is None:
+            return
+        weight = self._out[src].get((dst, rel_id))
+        if weight is None:
+            return
+        weight -= amount
+        if weight <= 0:
+            self._out[src].pop((dst, rel_id), None)
+            self._in[dst].pop((src, rel_id), None)
+        else:
+            self._out[src][(dst, rel_id)] = weight
+            self._in[dst][(src, rel_id)] = weight
+
+    def get_entity(self, name_or_id: Any) -> Optional[GraphNode]:
+        """Look up an entity by id, name or alias."""
+        node_id = self._resolve(name_or_id)
+        return self._nodes[node_id] if node_id is not None else None
+
+    def neighbors(self, node_id: int) -> List[Tuple[GraphNode, str, float, bool]]:
+        """Direct neighbours as (node, relation, weight, inverse) tuples."""
+        result = []
+        for (other, rel_id), weight in self._out[node_id].items():
+            result.append((self._nodes[other], self._relations[rel_id], weight, False))
+        for (other, rel_id), weight in self._in[node_id].items():
+            result.append((self._nodes[other], self._relations[rel_id], weight, True))
+        return result
+
+    # ------------------------------------------------------------------
+    # Entity linking
+    # ------------------------------------------------------------------
+
+    def link_entities(self, text: str, max_entities: int = 32) -> List[int]:
+        """
+        Find entities mentioned in ``text`` (longest alias match wins).
+
+        Returns:
+            Node ids in order of first mention, deduplicated
+        """
+        return list(self._mention_counts(text, max_entities))
+
+    def _mention_counts(self, text: str, max_entities: Optional[int] = None) -> Dict[int, int]:
+        raw = _TOKEN_RE.findall(text)
+        tokens = [token.lower() for token in raw]
+        counts: Dict[int, int] = {}
+        i = 0
+        while i < len(tokens):
+            matched = 0
+            for n in range(min(self.max_alias_tokens, len(tokens) - i), 0, -1):
+                if n == 1 and _is_short(tokens[i]):
+                    # "MI" links, "mi" (miles, Italian, typo) does not
+                    node_id = self._acronym_index.get(raw[i])
+                else:
+                    node_id = self._alias_index.get(" ".join(tokens[i:i + n]))
+                if node_id is not None:
+                    if node_id in counts or max_entities is None or len(counts) < max_entities:
+                        counts[node_id] = counts.get(node_id, 0) + 1
+                    matched = n
+                    break
+            i += matched or 1
+        return counts
+
+    # ------------------------------------------------------------------
+    # Corpus postings
+    # ------------------------------------------------------------------
+
+    def add_chunk(
+        self,
+        chunk_id: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        collection: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Index a corpus chunk: discover new entities in it, link its entities,
+        record postings and co-occurrence edges.
+
+        The text itself is not stored; ``get_chunks`` reads it back from
+        ``collection`` in the vector store.
+
+        Returns:
+            Node ids of the entities found in the chunk
+        """
+        metadata = metadata or {}
+        doc_id = metadata.get("doc_id") or metadata.get("document_id")
+        discovered = extract_entities(text)
+        with self._lock:
+            for name, label, aliases in discovered:
+                node_id = self._lookup(normalize_name(name))
+                if node_id is None:
+                    self.add_entity(name, label, aliases, source="corpus")
+                else:
+                    for alias in aliases:
+                        self._add_alias(normalize_name(alias), node_id)
+            counts = self._mention_counts(text)
+            self._add_postings(chunk_id, counts, doc_id, collection)
+        return list(counts)
+
+    def _add_postings(
+        self,
+        chunk_id: str,
+        counts: Dict[int, int],
+        doc_id: Any,
+        collection: Optional[str],
+    ) -> None:
+        if chunk_id in self._chunks:
+            self._remove_chunk(chunk_id)
+        doc_id = str(doc_id) if doc_id is not None else None
+        self._chunks[chunk_id] = (doc_id, collection)
+        if doc_id is not None:
+            self._doc_chunks.setdefault(doc_id, set()).add(chunk_id)
+
+        entity_ids = list(counts)
+        self._chunk_entities[chunk_id] = entity_ids
+        for node_id, mentions in counts.items():
+            self._postings.setdefault(node_id, {})[chunk_id] = mentions
+
+        linked = entity_ids[: self.max_cooccurring_entities]
+        for i, a in enumerate(linked):
+            for b in linked[i + 1:]:
+                self.add_relation(a, CO_OCCURRENCE, b, 1.0, accumulate=True)
+                self.add_relation(b, CO_OCCURRENCE, a, 1.0, accumulate=True)
+
+    def _remove_chunk(self, chunk_id: str) -> None:
+        entity_ids = self._chunk_entities.pop(chunk_id, [])
+        for node_id in entity_ids:
+            postings = self._postings.get(node_id)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[node_id]
+        linked = entity_ids[: self.max_cooccurring_entities]
+        for i, a in enumerate(linked):
+            for b in linked[i + 1:]:
+                self._decrement_edge(a, CO_OCCURRENCE, b, 1.0)
+                self._decrement_edge(b, CO_OCCURRENCE, a, 1.0)
+        doc_id, _ = self._chunks.pop(chunk_id, (None, None))
+        if doc_id is not None:
+            chunks = self._doc_chunks.get(doc_id)
+            if chunks is not None:
+                chunks.discard(chunk_id)
+                if not chunks:
+                    del self._doc_chunks[doc_id]
+
+    def remove_chunk(self, chunk_id: str) -> bool:
+        """Remove a chunk and its postings. Returns True if it existed."""
+        with self._lock:
+            if chunk_id not in self._chunks:
+                return False
+            self._remove_chunk(chunk_id)
+            return True
+
+    def remove_document(self, doc_id: str) -> int:
+        """Remove every chunk of a document. Returns the number removed."""
+        with self._lock:
+            chunk_ids = list(self._doc_chunks.get(str(doc_id), ()))
+            for chunk_id in chunk_ids:
+                self._remove_chunk(chunk_id)
+            return len(chunk_ids)
+
+    def sync_chunks(
+        self,
+        vector_store: Any,
+        collection_names: Optional[List[str]] = None,
+        page_size: int = 500,
+    ) -> Tuple[int, int]:
+        """
+        Bring corpus postings in line with the vector store's chunks.
+
+        Indexes chunks the graph has not seen and drops chunks that are no
+        longer stored. Patient uploads (``user_id`` metadata) are skipped.
+
+        Args:
+            vector_store: Store with ``get_chunk_ids`` and ``get_chunks``
+            collection_names: Collections feeding the graph (default: the
+                store's default collection)
+            page_size: Chunks fetched per call
+
+        Returns:
+            (chunks added, chunks removed)
+        """
+        if self.chunk_source is None:
+            self.chunk_source = vector_store
+        stored: Dict[str, Optional[str]] = {}
+        for name in collection_names or [None]:
+            for chunk_id in vector_store.get_chunk_ids(name):
+                stored.setdefault(chunk_id, name)
+        with self._lock:
+            known = set(self._chunks)
+        removed = 0
+        for chunk_id in known - stored.keys():
+            removed += self.remove_chunk(chunk_id)
+
+        missing: Dict[Optional[str], List[str]] = {}
+        for chunk_id in stored.keys() - known:
+            missing.setdefault(stored[chunk_id], []).append(chunk_id)
+        added = 0
+        for name, chunk_ids in missing.items():
+            for start in range(0, len(chunk_ids), page_size):
+                for chunk in vector_store.get_chunks(chunk_ids[start:start + page_size], name):
+                    metadata = chunk.get("metadata") or {}
+                    if metadata.get("user_id"):
+                        continue
+                    self.add_chunk(chunk["id"], chunk.get("content") or "", metadata, collection=name)
+                    added += 1
+        return added, removed
+
+    def mention_count(self, node_id: int) -> int:
+        """Number of corpus chunks mentioning an entity."""
+        return len(self._postings.get(node_id, ()))
+
+    def entities_by_label(self, label: str) -> List[GraphNode]:
+        """Entities with ``label``, most-mentioned in the corpus first."""
+        nodes = [node for node in self._nodes if node.label == label]
+        nodes.sort(key=lambda n: (self.mention_count(n.id), len(self._out[n.id]) + len(self._in[n.id])), reverse=True)
+        return nodes
+
+    def get_chunks(self, chunk_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Content and metadata of indexed chunks, read from the vector store
+        (one ``get_chunks`` call per collection).
+
+        Returns:
+            ``{chunk_id: {"id", "content", "metadata"}}``; chunks no longer in
+            the vector store are missing
+        """
+        by_collection: Dict[Optional[str], List[str]] = {}
+        with self._lock:
+            for chunk_id in chunk_ids:
+                ref = self._chunks.get(chunk_id)
+                if ref is not None:
+                    by_collection.setdefault(ref[1], []).append(chunk_id)
+        if not by_collection:
+            return {}
+        if self.chunk_source is None:
+            from rag.store.chromadb_store import get_chromadb_store
+
+            self.chunk_source = get_chromadb_store()
+        found: Dict[str, Dict[str, Any]] = {}
+        for collection, ids in by_collection.items():
+            for chunk in self.chunk_source.get_chunks(ids, collection):
+                found[chunk["id"]] = chunk
+        return found
+
+    def get_chunk(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """Content and metadata of one indexed chunk (see ``get_chunks``)."""
+        return self.get_chunks([chunk_id]).get(chunk_id)
+
+    # ------------------------------------------------------------------
+    # Traversal
+    # ------------------------------------------------------------------
+
+    def expand(
+        self,
+        seeds: Iterable[int],
+        max_depth: int = 2,
+        max_nodes: int = 64,
+        max_edges: int = 512,
+        relations: Optional[Set[str]] = None,
+        decay: float = 0.5,
+    ) -> List[GraphHop]:
+        """
+        Breadth-first neighbourhood expansion under explicit budgets.
+
+        Args:
+            seeds: Starting node ids
+            max_depth: Maximum hops from a seed
+            max_nodes: Stop after this many nodes have been reached
+            max_edges: Stop after this many edges have been scanned
+            relations: Only follow these relation types (None = all)
+            decay: Score multiplier per hop
+
+        Returns:
+            Reached nodes (seeds first), each with depth, score and the edge
+            used to reach it
+        """
+        with self._lock:
+            return self._expand(seeds, max_depth, max_nodes, max_edges, relations, decay)
+
+    def _expand(self, seeds, max_depth, max_nodes, max_edges, relations, decay) -> List[GraphHop]:
+        rel_filter = None
+        if relations is not None:
+            rel_filter = {self._relation_ids[r] for r in relations if r in self._relation_ids}
+
+        hops: Dict[int, GraphHop] = {}
+        frontier: List[int] = []
+        for node_id in seeds:
+            if node_id not in hops and 0 <= node_id < len(self._nodes):
+                hops[node_id] = GraphHop(self._nodes[node_id], 0, 1.0)
+                frontier.append(node_id)
+
+        edges_scanned = 0
+        for depth in range(1, max_depth + 1):
+            if not frontier or len(hops) >= max_nodes:
+                break
+            next_frontier: List[int] = []
+            for node_id in frontier:
+                parent_score = hops[node_id].score
+                for inverse, adjacency in ((False, self._out[node_id]), (True, self._in[node_id])):
+                    # Strongest edges first so budgets keep the most relevant nodes
+                    for (other, rel_id), weight in sorted(
+                        adjacency.items(), key=lambda item: item[1], reverse=True
+                    ):
+                        edges_scanned += 1
+                        if edges_scanned > max_edges or len(hops) >= max_nodes:
+                            break
+                        if rel_filter is not None and rel_id not in rel_filter:
+                            continue
+                        if other in hops:
+                            continue
+                        strength = weight / (1.0 + weight)
+                        hops[other] = GraphHop(
+                            node=self._nodes[other],
+                            depth=depth,
+                            score=parent_score * decay * (0.5 + strength),
+                            parent=node_id,
+                            relation=self._relations[rel_id],
+                            inverse=inverse,
+                        )
+                        next_frontier.append(other)
+            frontier = next_frontier
+
+        return list(hops.values())
+
+    def path_to(self, hops: List[GraphHop], node_id: int) -> List[GraphHop]:
+        """Reconstruct the seed -> node path from ``expand`` output."""
+        by_id = {hop.node.id: hop for hop in hops}
+        path = []
+        hop = by_id.get(node_id)
+        while hop is not None:
+            path.append(hop)
+            hop = by_id.get(hop.parent) if hop.parent is not None else None
+        return list(reversed(path))
+
+    def rank_chunks(self, hops: List[GraphHop], limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank corpus chunks by the entities reached during expansion.
+
+        score(chunk) = sum over reached entities of
+            hop_score * (1 + log(mentions)) * idf(entity)
+        """
+        scores: Dict[str, float] = {}
+        with self._lock:
+            total_chunks = max(len(self._chunks), 1)
+            for hop in hops:
+                postings = self._postings.get(hop.node.id)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + total_chunks / len(postings))
+                for chunk_id, mentions in postings.items():
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + (
+                        hop.score * (1.0 + math.log(mentions)) * idf
+                    )
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    # ------------------------------------------------------------------
+    # Persistence and stats
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot of the graph."""
+        with self._lock:
+            aliases: Dict[int, List[str]] = {}
+            for index in (self._alias_index, self._acronym_index):
+                for alias, node_id in index.items():
+                    aliases.setdefault(node_id, []).append(alias)
+            return {
+                "entities": [
+                    {
+                        "name": node.name,
+                        "label": node.label,
+                        "aliases": aliases.get(node.id, []),
+                        "properties": node.properties,
+                    }
+                    for node in self._nodes
+                ],
+                "relations": [
+                    [src, self._relations[rel_id], dst, weight]
+                    for src, edges in enumerate(self._out)
+                    for (dst, rel_id), weight in edges.items()
+                    if self._relations[rel_id] != CO_OCCURRENCE
+                ],
+                "chunks": [
+                    {
+                        "id": chunk_id,
+                        "doc_id": doc_id,
+                        "collection": collection,
+                        "entities": [
+                            [node_id, self._postings[node_id][chunk_id]]
+                            for node_id in self._chunk_entities.get(chunk_id, [])
+                        ],
+                    }
+                    for chunk_id, (doc_id, collection) in self._chunks.items()
+                ],
+            }
+
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Load entities, relations and chunk postings from ``to_dict`` output."""
+        ids = [
+            self.add_entity(e["name"], e["label"], e.get("aliases", ()), **e.get("properties", {}))
+            for e in data.get("entities", [])
+        ]
+        for src, relation, dst, weight in data.get("relations", []):
+            self.add_relation(ids[src], relation, ids[dst], weight)
+        with self._lock:
+            for chunk in data.get("chunks", []):
+                counts: Dict[int, int] = {}
+                for node_id, mentions in chunk.get("entities", []):
+                    counts[ids[node_id]] = counts.get(ids[node_id], 0) + mentions
+                self._add_postings(chunk["id"], counts, chunk.get("doc_id"), chunk.get("collection"))
+
+    def save(self, path: str) -> None:
+        """Write the graph to a JSON file (replaced atomically)."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, target)
+
+    def load(self, path: str) -> None:
+        """Load a graph written by ``save``."""
+        with open(path, "r", encoding="utf-8") as f:
+            self.load_dict(json.load(f))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Graph size statistics."""
+        return {
+            "entities": len(self._nodes),
+            "aliases": len(self._alias_index) + len(self._acronym_index),
+            "relation_types": len(self._relations),
+            "edges": sum(len(edges) for edges in self._out),
+            "chunks": len(self._chunks),
+            "documents": len(self._doc_chunks),
+            "indexed_entities": len(self._postings),
+        }
+
+
+# ============================================================================
+# Seed Knowledge
+# ============================================================================
+
+# (name, label, aliases, description)
+SEED_ENTITIES: List[Tuple[str, str, Tuple[str, ...], str]] = [
+    ("Chest Pain", "Symptom", ("chest discomfort", "angina pectoris"),
+     "Chest pain is a common symptom that can indicate various cardiac conditions."),
+    ("Shortness of Breath", "Symptom", ("dyspnea", "breathlessness", "short of breath"),
+     "Dyspnea can indicate heart failure, pulmonary, or anxiety conditions."),
+    ("Palpitations", "Symptom", ("palpitation", "racing heart"),
+     "Palpitations are a sensation of a rapid, fluttering or pounding heartbeat."),
+    ("Dizziness", "Symptom", ("lightheadedness", "vertigo"),
+     "Dizziness may reflect arrhythmia, low blood pressure or medication effects."),
+    ("Fatigue", "Symptom", ("tiredness",),
+     "Fatigue is a frequent, non-specific symptom of heart failure."),
+    ("Edema", "Symptom", ("leg swelling", "ankle swelling", "oedema"),
+     "Peripheral edema is a common sign of fluid retention in heart failure."),
+    ("Coronary Artery Disease", "Condition", ("cad", "coronary heart disease"),
+     "Coronary artery disease is narrowing of the coronary arteries by plaque."),
+    ("Myocardial Infarction", "Condition", ("heart attack", "mi"),
+     "A myocardial infarction occurs when blood flow to heart muscle is blocked."),
+    ("Angina", "Condition", ("stable angina", "unstable angina"),
+     "Angina is chest pain caused by reduced blood flow to the heart."),
+    ("Heart Failure", "Condition", ("congestive heart failure", "chf", "hf"),
+     "Heart failure means the heart cannot pump enough blood to meet the body's needs."),
+    ("Atrial Fibrillation", "Condition", ("afib", "a-fib", "af"),
+     "Atrial fibrillation is an irregular, often rapid heart rhythm."),
+    ("Hypertension", "Condition", ("high blood pressure", "htn"),
+     "Hypertension (high blood pressure) is a major risk factor for cardiovascular disease."),
+    ("Stroke", "Condition", ("cerebrovascular accident", "cva"),
+     "A stroke occurs when blood supply to part of the brain is interrupted."),
+    ("Diabetes", "Condition", ("diabetes mellitus", "type 2 diabetes", "t2dm"),
+     "Diabetes mellitus substantially increases cardiovascular risk."),
+    ("COPD", "Condition", ("chronic obstructive pulmonary disease",),
+     "COPD is a chronic lung disease that commonly causes dyspnea."),
+    ("Hyperlipidemia", "Condition", ("high cholesterol", "dyslipidemia"),
+     "Elevated blood lipids accelerate atherosclerosis."),
+    ("Smoking", "RiskFactor", ("tobacco use", "cigarette smoking"),
+     "Smoking is a major modifiable cardiovascular risk factor."),
+    ("Obesity", "RiskFactor", ("overweight",),
+     "Obesity raises the risk of hypertension, diabetes and heart disease."),
+    ("ACE Inhibitors", "Medication", ("ace inhibitor", "lisinopril", "enalapril", "ramipril"),
+     "ACE inhibitors lower blood pressure and reduce strain on the heart."),
+    ("Beta Blockers", "Medication", ("beta blocker", "metoprolol", "carvedilol", "bisoprolol"),
+     "Beta blockers slow the heart rate and lower blood pressure."),
+    ("Statins", "Medication", ("statin", "atorvastatin", "rosuvastatin", "simvastatin"),
+     "Statins lower LDL cholesterol and cardiovascular event risk."),
+    ("Aspirin", "Medication", ("acetylsalicylic acid",),
+     "Low-dose aspirin is an antiplatelet used in secondary prevention."),
+    ("Anticoagulants", "Medication", ("anticoagulant", "warfarin", "apixaban", "rivaroxaban"),
+     "Anticoagulants reduce clot formation and stroke risk in atrial fibrillation."),
+    ("Diuretics", "Medication", ("diuretic", "furosemide", "hydrochlorothiazide"),
+     "Diuretics remove excess fluid and lower blood pressure."),
+    ("Nitroglycerin", "Medication", ("nitrates", "gtn"),
+     "Nitroglycerin relieves angina by dilating blood vessels."),
+    ("Lifestyle Changes", "Treatment", ("lifestyle change", "lifestyle modification", "diet and exercise"),
+     "Diet, exercise and smoking cessation are first-line cardiovascular interventions."),
+    ("Cardiac Catheterization", "Treatment", ("angioplasty", "pci", "stent"),
+     "Catheter-based procedures open narrowed coronary arteries."),
+    ("Blood Pressure", "VitalSign", ("bp",),
+     "Blood pressure is the force of blood against artery walls."),
+    ("Heart Rate", "VitalSign", ("pulse rate", "hr"),
+     "Heart rate is the number of heartbeats per minute."),
+]
+
+# (source, relation, target)
+SEED_RELATIONS: List[Tuple[str, str, str]] = [
+    ("Chest Pain", "INDICATES", "Coronary Artery Disease"),
+    ("Chest Pain", "INDICATES", "Myocardial Infarction"),
+    ("Chest Pain", "INDICATES", "Angina"),
+    ("Shortness of Breath", "INDICATES", "Heart Failure"),
+    ("Shortness of Breath", "INDICATES", "COPD"),
+    ("Palpitations", "INDICATES", "Atrial Fibrillation"),
+    ("Dizziness", "INDICATES", "Atrial Fibrillation"),
+    ("Fatigue", "INDICATES", "Heart Failure"),
+    ("Edema", "INDICATES", "Heart Failure"),
+    ("Hypertension", "RISK_FOR", "Stroke"),
+    ("Hypertension", "RISK_FOR", "Heart Failure"),
+    ("Hypertension", "RISK_FOR", "Coronary Artery Disease"),
+    ("Diabetes", "RISK_FOR", "Coronary Artery Disease"),
+    ("Hyperlipidemia", "RISK_FOR", "Coronary Artery Disease"),
+    ("Smoking", "RISK_FOR", "Coronary Artery Disease"),
+    ("Obesity", "RISK_FOR", "Hypertension"),
+    ("Obesity", "RISK_FOR", "Diabetes"),
+    ("Atrial Fibrillation", "RISK_FOR", "Stroke"),
+    ("Coronary Artery Disease", "CAUSES", "Angina"),
+    ("Coronary Artery Disease", "CAUSES", "Myocardial Infarction"),
+    ("Myocardial Infarction", "CAUSES", "Heart Failure"),
+    ("ACE Inhibitors", "TREATS", "Hypertension"),
+    ("ACE Inhibitors", "TREATS", "Heart Failure"),
+    ("Beta Blockers", "TREATS", "Hypertension"),
+    ("Beta Blockers", "TREATS", "Heart Failure"),
+    ("Beta Blockers", "TREATS", "Atrial Fibrillation"),
+    ("Beta Blockers", "TREATS", "Angina"),
+    ("Statins", "TREATS", "Hyperlipidemia"),
+    ("Statins", "PREVENTS", "Myocardial Infarction"),
+    ("Aspirin", "PREVENTS", "Myocardial Infarction"),
+    ("Anticoagulants", "PREVENTS", "Stroke"),
+    ("Diuretics", "TREATS", "Heart Failure"),
+    ("Diuretics", "TREATS", "Hypertension"),
+    ("Diuretics", "TREATS", "Edema"),
+    ("Nitroglycerin", "TREATS", "Angina"),
+    ("Lifestyle Changes", "TREATS", "Hypertension"),
+    ("Lifestyle Changes", "PREVENTS", "Coronary Artery Disease"),
+    ("Cardiac Catheterization", "TREATS", "Coronary Artery Disease"),
+    ("Aspirin", "INTERACTS_WITH", "Anticoagulants"),
+    ("Hypertension", "MEASURED_BY", "Blood Pressure"),
+    ("Atrial Fibrillation", "MEASURED_BY", "Heart Rate"),
+]
+
+
+def load_seed_knowledge(store: PropertyGraphStore) -> None:
+    """Populate ``store`` with the built-in cardiology entities and relations."""
+    for name, label, aliases, description in SEED_ENTITIES:
+        store.add_entity(name, label, aliases, description=description)
+    for source, relation, target in SEED_RELATIONS:
+        store.add_relation(source, relation, target)
+
+
+def load_interactions(store: PropertyGraphStore, path: Path) -> int:
+    """
+    Add INTERACTS_WITH edges from an interactions.json file.
+
+    Returns:
+        Number of interactions loaded
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        interactions = json.load(f).get("interactions", [])
+    count = 0
+    for item in interactions:
+        drug_a, drug_b = item.get("drug_a"), item.get("drug_b")
+        if not drug_a or not drug_b:
+            continue
+        store.add_entity(drug_a.title(), "Medication")
+        store.add_entity(drug_b.title(), "Medication")
+        severity = str(item.get("severity", "")).lower()
+        weight = {"major": 3.0, "moderate": 2.0}.get(severity, 1.0)
+        store.add_relation(drug_a, "INTERACTS_WITH", drug_b, weight)
+        store.add_relation(drug_b, "INTERACTS_WITH", drug_a, weight)
+        count += 1
+    return count
+
+
+_graph_store: Optional[PropertyGraphStore] = None
+_graph_store_lock = threading.Lock()
+_graph_sync_stop = threading.Event()
+_graph_sync_thread: Optional[threading.Thread] = None
+
+
+def _sync_loop(store: PropertyGraphStore, interval: float) -> None:
+    """Background corpus sync: once at startup, then every ``interval`` seconds."""
+    try:
+        from rag.store.chromadb_store import get_chromadb_store
+
+        vector_store = get_chromadb_store()
+        # Same collections ChromaDBVectorStore indexes into the graph on write
+        collections = [
+            vector_store.MEDICAL_COLLECTION,
+            vector_store.DRUG_COLLECTION,
+            vector_store.SYMPTOMS_COLLECTION,
+        ]
+    except Exception as e:
+        logger.warning(f"Graph corpus sync disabled, vector store unavailable: {e}")
+        return
+
+    while not _graph_sync_stop.is_set():
+        try:
+            added, removed = store.sync_chunks(vector_store, collections)
+            if added or removed:
+                logger.info(f"Graph store synced: +{added} / -{removed} chunks ({store.get_stats()['chunks']} total)")
+                if GRAPH_STORE_PATH:
+                    store.save(GRAPH_STORE_PATH)
+        except Exception as e:
+            logger.warning(f"Graph corpus sync failed: {e}")
+        if interval <= 0 or _graph_sync_stop.wait(interval):
+            break
+
+
+def start_graph_sync(store: PropertyGraphStore, interval: float = GRAPH_STORE_SYNC_SECONDS) -> None:
+    """Start the background corpus sync for ``store`` (idempotent)."""
+    global _graph_sync_thread
+    if _graph_sync_thread is not None and _graph_sync_thread.is_alive():
+        return
+    _graph_sync_stop.clear()
+    _graph_sync_thread = threading.Thread(
+        target=_sync_loop, args=(store, interval), name="graph-sync", daemon=True
+    )
+    _graph_sync_thread.start()
+
+
+def stop_graph_sync(timeout: float = 5.0) -> None:
+    """Stop the background corpus sync."""
+    _graph_sync_stop.set()
+    if _graph_sync_thread is not None:
+        _graph_sync_thread.join(timeout)
+
+
+def get_graph_store() -> PropertyGraphStore:
+    """
+    Get the process-wide graph store.
+
+    Loads ``GRAPH_STORE_PATH`` when it exists; otherwise starts from the
+    seed knowledge plus drug interactions (if interactions.json is found).
+    Corpus chunks are then indexed from the vector store in the background
+    (see ``start_graph_sync``), which writes ``GRAPH_STORE_PATH`` back.
+    """
+    global _graph_store
+    if _graph_store is None:
+        with _graph_store_lock:
+            if _graph_store is None:
+                store = PropertyGraphStore()
+                if GRAPH_STORE_PATH and Path(GRAPH_STORE_PATH).exists():
+                    store.load(GRAPH_STORE_PATH)
+                    logger.info(f"Graph store loaded from {GRAPH_STORE_PATH}")
+                else:
+                    load_seed_knowledge(store)
+                    try:
+                        from .interaction_checker import GraphInteractionChecker
+
+                        path = GraphInteractionChecker._find_interactions_file()
+                        if path.exists():
+                            load_interactions(store, path)
+                    except Exception as e:
+                        logger.debug(f"Drug interactions not loaded into graph: {e}")
+                logger.info(f"✅ Graph store ready: {store.get_stats()}")
+                _graph_store = store
+                start_graph_sync(store)
+    return _graph_store
+
+
+__all__ = [
+    "PropertyGraphStore",
+    "GraphNode",
+    "GraphHop",
+    "normalize_name",
+    "extract_entities",
+    "load_seed_knowledge",
+    "load_interactions",
+    "get_graph_store",
+    "start_graph_sync",
+    "stop_graph_sync",
+]
@@ -7,8 +7,8 @@ Provides multimodal document processing capabilities:
 - Context-aware content processing
 - Integration with existing RAG pipeline
 
-NOTE: Ingestion services have been archived to _archive_ingestion/.
-This module now provides QUERY-TIME multimodal processing only.
+Ingestion: MultimodalIngestionService streams parse -> chunk -> embed ->
+upsert through bounded queues (see ingestion.py).
 """
 
 from .config import MultimodalConfig, ContextConfig
@@ -41,6 +41,12 @@ from .batch_parser import (
 )
 from .batch import BatchMixin
 
+# Streaming Ingestion
+from .ingestion import (
+    MultimodalIngestionService,
+    IngestionResult,
+)
+
 # Query Functionality (from RAG-Anything)
 from .query import (
     MultimodalQueryMixin,
@@ -87,6 +93,9 @@ __all__ = [
     "BatchParser",
     "BatchProcessingResult",
     "BatchMixin",
+    # Streaming Ingestion
+    "MultimodalIngestionService",
+    "IngestionResult",
     # Query Functionality
     "MultimodalQueryMixin",
     "QueryService",
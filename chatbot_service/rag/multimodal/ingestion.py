@@ -0,0 +1,602 @@
+"""
+Streaming Document Ingestion for Cardio AI
+
+Parse -> chunk -> embed -> upsert, run as concurrent stages connected by
+bounded asyncio queues so a large document never has to be fully parsed,
+chunked or embedded before the next stage starts, and memory stays
+bounded by the queue sizes (backpressure).
+
+Stages:
+- parse:  PDF pages are streamed with PyMuPDF when MinerU is not installed;
+          text/markdown is read natively; other formats go through
+          MineruParser (full layout, tables and images)
+- chunk:  word-window chunks over text blocks; tables/equations/image
+          captions become standalone chunks with ContextExtractor context;
+          duplicate chunks within a document are dropped by content hash
+- embed:  batched embedding (``embed_batch``), reusing embeddings of content
+          already stored (same content hash) instead of recomputing them
+- upsert: batched writes to the vector store
+
+Each stage records items, busy time and throughput.
+"""
+
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from rag.retrieval.sentence_index import METADATA_KEY, SentenceIndex
+
+from .config import ContextConfig, MultimodalConfig
+from .parser import MineruParser, Parser
+from .processors import ContextExtractor
+from .utils import compute_content_hash
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    fitz = None
+    PYMUPDF_AVAILABLE = False
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_END = object()  # Queue sentinel
+
+
+# ============================================================================
+# Results and Statistics
+# ============================================================================
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = (self.finished_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "wall_seconds": round(wall, 3),
+            "throughput_per_s": round(self.items_out / wall, 2) if wall > 0 else None,
+        }
+
+
+@dataclass
+class IngestionResult:
+    """Outcome of ingesting one document."""
+    success: bool
+    doc_id: str
+    file_path: str
+    chunks_created: int = 0
+    tables_processed: int = 0
+    images_processed: int = 0
+    duplicates_skipped: int = 0
+    embeddings_reused: int = 0
+    content_hash: str = ""
+    elapsed_seconds: float = 0.0
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "success": self.success,
+            "doc_id": self.doc_id,
+            "chunks_created": self.chunks_created,
+            "tables_processed": self.tables_processed,
+            "images_processed": self.images_processed,
+            "duplicates_skipped": self.duplicates_skipped,
+            "embeddings_reused": self.embeddings_reused,
+            "content_hash": self.content_hash,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "stages": self.stages,
+            "error": self.error,
+        }
+
+
+@dataclass
+class _Chunk:
+    id: str
+    content: str
+    content_hash: str
+    metadata: Dict[str, Any]
+    embedding: Optional[List[float]] = None
+
+
+# ============================================================================
+# Ingestion Service
+# ============================================================================
+
+class MultimodalIngestionService:
+    """
+    Streaming ingestion of uploaded documents into the vector store.
+
+    Example:
+        service = MultimodalIngestionService(get_vector_store(), get_embedding_service())
+        result = await service.ingest_document("report.pdf", metadata={"user_id": "42"})
+    """
+
+    MODAL_TYPES = {"table", "equation", "image"}
+
+    def __init__(
+        self,
+        vector_store: Any,
+        embedding_service: Any,
+        config: Optional[MultimodalConfig] = None,
+        chunk_size: int = 300,
+        chunk_overlap: int = 50,
+        embed_batch_size: int = 32,
+        upsert_batch_size: int = 64,
+        queue_size: int = 128,
+        embed_workers: int = 2,
+        batch_linger: float = 0.05,
+    ):
+        """
+        Initialize ingestion service.
+
+        Args:
+            vector_store: Store with ``upsert_chunks`` (ChromaDBVectorStore)
+            embedding_service: Service with ``embed_batch`` or ``embed_text``
+            config: Multimodal configuration (parser, output dir, toggles)
+            chunk_size: Target chunk size in words
+            chunk_overlap: Words shared between consecutive chunks
+            embed_batch_size: Chunks per embedding call
+            upsert_batch_size: Chunks per vector store write
+            queue_size: Capacity of each inter-stage queue
+            embed_workers: Concurrent embedding batches in flight
+            batch_linger: Seconds a partial batch waits for more chunks
+        """
+        self.vector_store = vector_store
+        self.embedding_service = embedding_service
+        self.config = config or MultimodalConfig()
+        self.chunk_size = chunk_size
+        self.chunk_overlap = min(chunk_overlap, chunk_size // 2)
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = queue_size
+        self.embed_workers = max(1, embed_workers)
+        self.batch_linger = batch_linger
+
+        context_config = self.config.context_config
+        self.context_extractor = ContextExtractor(
+            ContextConfig(
+                context_window=max(context_config.context_window, 2),
+                context_mode="both",
+                max_context_tokens=min(context_config.max_context_tokens, 200),
+                include_headers=context_config.include_headers,
+            )
+        )
+
+        self._mineru: Optional[MineruParser] = None
+        self._mineru_checked = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def ingest_document(
+        self,
+        file_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        doc_id: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> IngestionResult:
+        """
+        Ingest one document through the streaming pipeline.
+
+        Args:
+            file_path: Path of the document on disk
+            metadata: Metadata copied onto every chunk (user_id, category, ...).
+                Chunks with a ``user_id`` go to the per-user document
+                collection, never the shared knowledge base.
+            doc_id: Document ID (generated if omitted)
+            progress_callback: Awaited with stage statistics as chunks are written
+
+        Returns:
+            IngestionResult with per-stage throughput
+        """
+        doc_id = doc_id or str(uuid.uuid4())
+        metadata = dict(metadata or {})
+        start = time.perf_counter()
+        result = IngestionResult(success=False, doc_id=doc_id, file_path=str(file_path))
+        stats = {name: StageStats(name) for name in ("parse", "chunk", "embed", "upsert")}
+
+        try:
+            result.content_hash = await asyncio.to_thread(self._file_hash, file_path)
+            metadata.setdefault("doc_id", doc_id)
+            metadata["file_hash"] = result.content_hash
+
+            blocks: asyncio.Queue = asyncio.Queue(self.queue_size)
+            chunks: asyncio.Queue = asyncio.Queue(self.queue_size)
+            embedded: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+            tasks = [
+                asyncio.ensure_future(self._parse_stage(file_path, blocks, stats["parse"])),
+                asyncio.ensure_future(
+                    self._chunk_stage(blocks, chunks, metadata, result, stats["chunk"])
+                ),
+                asyncio.ensure_future(self._embed_stage(chunks, embedded, result, stats["embed"])),
+                asyncio.ensure_future(
+                    self._upsert_stage(embedded, metadata, result, stats, progress_callback)
+                ),
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Stages only send the end sentinel after finishing cleanly, so
+                # cancelled stages never block on a full queue here
+                for task in tasks:
+                    task.cancel()
+                for stage_queue in (blocks, chunks, embedded):
+                    while not stage_queue.empty():
+                        stage_queue.get_nowait()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            result.success = True
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"Ingestion failed for {file_path}: {e}", exc_info=True)
+
+        result.elapsed_seconds = time.perf_counter() - start
+        result.stages = {name: stage.to_dict() for name, stage in stats.items()}
+        result.metadata = metadata
+        logger.info(
+            f"Ingested {Path(file_path).name}: {result.chunks_created} chunks "
+            f"({result.duplicates_skipped} duplicates, {result.embeddings_reused} reused embeddings) "
+            f"in {result.elapsed_seconds:.2f}s"
+        )
+        return result
+
+    # ------------------------------------------------------------------
+    # Stage 1: parse
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_hash(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _get_mineru(self) -> Optional[MineruParser]:
+        if not self._mineru_checked:
+            self._mineru_checked = True
+            try:
+                parser = MineruParser()
+                if parser.check_installation():
+                    self._mineru = parser
+            except Exception as e:
+                logger.debug(f"MinerU unavailable: {e}")
+        return self._mineru
+
+    def _iter_blocks(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield content blocks ({type, text, page_idx, ...}) lazily."""
+        path = Path(file_path)
+        ext = path.suffix.lower()
+
+        if ext in Parser.TEXT_FORMATS:
+            yield from self._iter_text_file(path)
+            return
+
+        mineru = self._get_mineru()
+        if ext == ".pdf" and mineru is None and PYMUPDF_AVAILABLE:
+            yield from self._iter_pdf_pages(path)
+            return
+
+        if mineru is None:
+            raise RuntimeError(f"No parser available for {ext} files (MinerU not installed)")
+        yield from mineru.parse_document(
+            path, method=self.config.parse_method, output_dir=self.config.output_dir
+        )
+
+    @staticmethod
+    def _iter_text_file(path: Path) -> Iterator[Dict[str, Any]]:
+        paragraph: List[str] = []
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith("#"):
+                    if paragraph:
+                        yield {"type": "text", "text": " ".join(paragraph), "page_idx": 0}
+                        paragraph = []
+                    yield {"type": "text", "text": stripped, "text_level": 1, "page_idx": 0}
+                elif stripped:
+                    paragraph.append(stripped)
+                elif paragraph:
+                    yield {"type": "text", "text": " ".join(paragraph), "page_idx": 0}
+                    paragraph = []
+        if paragraph:
+            yield {"type": "text", "text": " ".join(paragraph), "page_idx": 0}
+
+    @staticmethod
+    def _iter_pdf_pages(path: Path) -> Iterator[Dict[str, Any]]:
+        with fitz.open(path) as pdf:
+            for page_idx, page in enumerate(pdf):
+                for block in page.get_text("blocks"):
+                    text = block[4].strip()
+                    if text and block[6] == 0:  # block_type 0 = text
+                        yield {"type": "text", "text": " ".join(text.split()), "page_idx": page_idx}
+
+    async def _parse_stage(self, file_path: str, out: asyncio.Queue, stats: StageStats) -> None:
+        stats.started_at = time.perf_counter()
+        iterator = self._iter_blocks(file_path)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                # Parsers are blocking; pull the next block in a worker thread
+                block = await asyncio.to_thread(next, iterator, _END)
+                stats.busy_seconds += time.perf_counter() - t0
+                if block is _END:
+                    break
+                stats.items_out += 1
+                await out.put(block)
+            await out.put(_END)
+        finally:
+            stats.finished_at = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Stage 2: chunk
+    # ------------------------------------------------------------------
+
+    def _modal_text(self, block: Dict[str, Any]) -> str:
+        block_type = block.get("type")
+        if block_type == "table":
+            caption = " ".join(block.get("table_caption") or [])
+            return f"{caption}\n{block.get('table_body', '')}".strip()
+        if block_type == "equation":
+            return block.get("text") or block.get("latex", "")
+        if block_type == "image":
+            return " ".join(block.get("img_caption") or []) or " ".join(block.get("img_footnote") or [])
+        return ""
+
+    async def _chunk_stage(
+        self,
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        metadata: Dict[str, Any],
+        result: IngestionResult,
+        stats: StageStats,
+    ) -> None:
+        stats.started_at = time.perf_counter()
+        blocks: List[Dict[str, Any]] = []  # Parsed so far (context for modal items)
+        pending_modal: List[int] = []  # Modal blocks awaiting following context
+        window = self.context_extractor.config.context_window
+        words: List[str] = []
+        page_idx = 0
+        seen_hashes = set()
+        chunk_index = 0
+
+        async def emit(text: str, extra: Dict[str, Any]) -> None:
+            nonlocal chunk_index
+            text = text.strip()
+            if not text:
+                return
+            content_hash = compute_content_hash(text, prefix="")
+            if content_hash in seen_hashes:
+                result.duplicates_skipped += 1
+                return
+            seen_hashes.add(content_hash)
+            chunk_meta = {
+                **metadata,
+                **extra,
+                "chunk_index": chunk_index,
+                "content_hash": content_hash,
+                # Precomputed for query-time extractive compression
+                METADATA_KEY: SentenceIndex.build(text).to_json(),
+            }
+            chunk_index += 1
+            stats.items_out += 1
+            await out.put(_Chunk(
+                id=f"{result.doc_id}-{content_hash}",
+                content=text,
+                content_hash=content_hash,
+                metadata=chunk_meta,
+            ))
+
+        async def emit_modal(index: int) -> None:
+            block = blocks[index]
+            body = self._modal_text(block)
+            if not body:
+                return
+            context = self.context_extractor.extract_context(blocks, index, block.get("type"))
+            if block.get("type") == "table":
+                result.tables_processed += 1
+            elif block.get("type") == "image":
+                result.images_processed += 1
+            text = f"{body}\n\n{context}" if context else body
+            await emit(text, {"content_type": block.get("type"), "page": block.get("page_idx", 0)})
+
+        try:
+            while True:
+                block = await inp.get()
+                if block is _END:
+                    break
+                stats.items_in += 1
+                t0 = time.perf_counter()
+
+                blocks.append(block)
+                block_type = block.get("type", "text")
+                if block_type == "text":
+                    page_idx = block.get("page_idx", page_idx)
+                    words.extend((block.get("text") or "").split())
+                    while len(words) >= self.chunk_size:
+                        await emit(" ".join(words[: self.chunk_size]), {"content_type": "text", "page": page_idx})
+                        words = words[self.chunk_size - self.chunk_overlap:]
+                elif block_type in self.MODAL_TYPES:
+                    pending_modal.append(len(blocks) - 1)
+
+                # Modal items are emitted once their following context has arrived
+                while pending_modal and len(blocks) - 1 - pending_modal[0] >= window:
+                    await emit_modal(pending_modal.pop(0))
+
+                stats.busy_seconds += time.perf_counter() - t0
+
+            for index in pending_modal:
+                await emit_modal(index)
+            if words and (len(words) > self.chunk_overlap or stats.items_out == 0):
+                await emit(" ".join(words), {"content_type": "text", "page": page_idx})
+            await out.put(_END)
+        finally:
+            stats.finished_at = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Stage 3: embed
+    # ------------------------------------------------------------------
+
+    async def _next_batch(self, inp: asyncio.Queue, size: int) -> Optional[List[Any]]:
+        """
+        Take up to ``size`` items, waiting at most ``batch_linger`` seconds
+        for a batch to fill. Returns None once the stream has ended.
+        """
+        first = await inp.get()
+        if first is _END:
+            await inp.put(_END)  # Let sibling workers see the end too
+            return None
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_linger
+        while len(batch) < size:
+            remaining = deadline - loop.time()
+            try:
+                if remaining > 0:
+                    item = await asyncio.wait_for(inp.get(), remaining)
+                else:
+                    item = inp.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if item is _END:
+                await inp.put(_END)
+                break
+            batch.append(item)
+        return batch
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if hasattr(self.embedding_service, "embed_batch"):
+            return self.embedding_service.embed_batch(texts, batch_size=len(texts))
+        return [self.embedding_service.embed_text(text) for text in texts]
+
+    async def _embed_worker(
+        self,
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        result: IngestionResult,
+        stats: StageStats,
+    ) -> None:
+        lookup = getattr(self.vector_store, "get_embeddings_by_hash", None)
+        while True:
+            batch = await self._next_batch(inp, self.embed_batch_size)
+            if batch is None:
+                return
+            stats.items_in += len(batch)
+            t0 = time.perf_counter()
+
+            # Reuse embeddings of content that is already stored
+            if lookup is not None:
+                known = await asyncio.to_thread(lookup, [c.content_hash for c in batch])
+                for chunk in batch:
+                    chunk.embedding = known.get(chunk.content_hash)
+                result.embeddings_reused += sum(1 for c in batch if c.embedding is not None)
+
+            missing = [c for c in batch if c.embedding is None]
+            if missing:
+                vectors = await asyncio.to_thread(self._embed_texts, [c.content for c in missing])
+                for chunk, vector in zip(missing, vectors):
+                    chunk.embedding = vector
+
+            stats.busy_seconds += time.perf_counter() - t0
+            stats.items_out += len(batch)
+            for chunk in batch:
+                await out.put(chunk)
+
+    async def _embed_stage(
+        self,
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        result: IngestionResult,
+        stats: StageStats,
+    ) -> None:
+        stats.started_at = time.perf_counter()
+        try:
+            await asyncio.gather(*(
+                self._embed_worker(inp, out, result, stats) for _ in range(self.embed_workers)
+            ))
+            await out.put(_END)
+        finally:
+            stats.finished_at = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Stage 4: upsert
+    # ------------------------------------------------------------------
+
+    async def _upsert_stage(
+        self,
+        inp: asyncio.Queue,
+        metadata: Dict[str, Any],
+        result: IngestionResult,
+        stats: Dict[str, StageStats],
+        progress_callback: Optional[ProgressCallback],
+    ) -> None:
+        stage = stats["upsert"]
+        stage.started_at = time.perf_counter()
+        # Patient uploads stay out of the shared knowledge base and graph
+        index_graph = not metadata.get("user_id")
+        collection_name = None
+        if metadata.get("user_id"):
+            collection_name = getattr(self.vector_store, "USER_DOCUMENTS_COLLECTION", None)
+            if collection_name is None:
+                raise RuntimeError("Vector store has no per-user document collection")
+        try:
+            while True:
+                batch = await self._next_batch(inp, self.upsert_batch_size)
+                if batch is None:
+                    break
+                stage.items_in += len(batch)
+                t0 = time.perf_counter()
+                await asyncio.to_thread(
+                    self.vector_store.upsert_chunks,
+                    [c.id for c in batch],
+                    [c.content for c in batch],
+                    [c.embedding for c in batch],
+                    [c.metadata for c in batch],
+                    collection_name=collection_name,
+                    index_graph=index_graph,
+                )
+                stage.busy_seconds += time.perf_counter() - t0
+                stage.items_out += len(batch)
+                result.chunks_created += len(batch)
+
+                if progress_callback is not None:
+                    try:
+                        await progress_callback({
+                            "chunks_written": result.chunks_created,
+                            "stages": {name: s.to_dict() for name, s in stats.items()},
+                        })
+                    except Exception as e:
+                        logger.debug(f"Ingestion progress callback failed: {e}")
+        finally:
+            stage.finished_at = time.perf_counter()
+
+
+__all__ = [
+    "MultimodalIngestionService",
+    "IngestionResult",
+    "StageStats",
+    "PYMUPDF_AVAILABLE",
+]
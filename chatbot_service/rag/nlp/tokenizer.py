@@ -7,6 +7,11 @@ Key features:
 1. Preserves hyphenated medical terms (e.g., "non-small-cell", "beta-blocker")
 2. Handles dosage units attached to numbers (e.g., "500mg", "5ml")
 3. Preserves chemical names and abbreviations
+
+``create_medical_tokenizer`` plugs these rules into a spaCy pipeline.
+``tokenize_medical_text`` applies the same rules with plain regexes for
+hot paths that index or search many texts (e.g. the BM25 keyword index)
+and works without spaCy.
 """
 
 
@@ -25,7 +30,7 @@ except Exception as e:
     import logging as _logging
     _logging.warning(f"spaCy not available in tokenizer: {e}")
 
-def create_medical_tokenizer(nlp: spacy.Language) -> Tokenizer:
+def create_medical_tokenizer(nlp: "spacy.Language") -> "Tokenizer":
     """
     Create a custom tokenizer for medical text.
     
@@ -77,3 +82,49 @@ def create_medical_tokenizer(nlp: spacy.Language) -> Tokenizer:
     )
     
     return tokenizer
+
+
+# Word-like runs: decimals with an optional unit ("2.5mg"), or alphanumeric
+# runs joined by hyphens ("non-small-cell", "10-20", "covid-19")
+_WORD_RE = re.compile(r"\d+(?:\.\d+)+[^\W\d_]*|[^\W_]+(?:-[^\W_]+)*")
+# Dosage unit attached to a number: 500mg -> 500, mg
+_UNIT_RE = re.compile(r"(\d+(?:\.\d+)*)(mg|ml|g|kg|mcg|l|oz|lb|lbs)")
+
+
+def tokenize_medical_text(text: str, expand_compounds: bool = True) -> List[str]:
+    """
+    Lowercased medical tokens using the same rules as the spaCy tokenizer.
+
+    - Hyphens between letters are kept ("beta-blocker"); with
+      ``expand_compounds`` the parts are emitted as well, so "beta blocker"
+      and "beta-blocker" still match.
+    - Hyphens next to digits split ("10-20" -> "10", "20").
+    - Units attached to numbers split ("500mg" -> "500", "mg").
+    - Other punctuation separates tokens.
+
+    Args:
+        text: Text to tokenize
+        expand_compounds: Also emit the parts of hyphenated terms
+
+    Returns:
+        Tokens in text order
+    """
+    tokens: List[str] = []
+    for match in _WORD_RE.finditer(text.lower()):
+        word = match.group()
+        if "-" in word:
+            parts = word.split("-")
+            if all(part.isalpha() for part in parts):
+                tokens.append(word)
+                if expand_compounds:
+                    tokens.extend(parts)
+                continue
+        else:
+            parts = [word]
+        for part in parts:
+            unit = _UNIT_RE.fullmatch(part)
+            if unit:
+                tokens.extend(unit.groups())
+            else:
+                tokens.append(part)
+    return tokens
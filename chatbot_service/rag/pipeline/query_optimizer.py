@@ -28,7 +28,6 @@ import logging
 import os
 import threading
 import time
-from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Generic
@@ -37,6 +36,8 @@ from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from core.cache import collection_tag, create_cache, document_tags
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -95,194 +96,6 @@ class CachedRAGResult:
         return (datetime.utcnow() - self.created_at).total_seconds() > self.ttl_seconds
 
 
-# ============================================================================
-# L1 CACHE (IN-MEMORY LRU)
-# ============================================================================
-
-class RAGL1Cache:
-    """
-    Thread-safe in-memory LRU cache for RAG results.
-    
-    Features:
-    - O(1) get/set operations
-    - TTL-based expiration
-    - LRU eviction
-    - Thread-safe
-    """
-    
-    def __init__(self, max_size: int = RAG_L1_CACHE_SIZE, ttl_seconds: int = RAG_CACHE_TTL):
-        self.max_size = max_size
-        self.ttl_seconds = ttl_seconds
-        self._cache: OrderedDict[str, CachedRAGResult] = OrderedDict()
-        self._lock = threading.RLock()
-        self._hits = 0
-        self._misses = 0
-    
-    def get(self, key: str) -> Optional[CachedRAGResult]:
-        """Get item from cache."""
-        with self._lock:
-            if key not in self._cache:
-                self._misses += 1
-                return None
-            
-            entry = self._cache[key]
-            
-            # Check TTL
-            if entry.is_expired():
-                del self._cache[key]
-                self._misses += 1
-                return None
-            
-            # Move to end (mark as recently used)
-            self._cache.move_to_end(key)
-            self._hits += 1
-            return entry
-    
-    def set(self, key: str, value: CachedRAGResult) -> None:
-        """Set item in cache."""
-        with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)
-            else:
-                # Evict LRU if needed
-                while len(self._cache) >= self.max_size:
-                    self._cache.popitem(last=False)
-            
-            self._cache[key] = value
-    
-    def delete(self, key: str) -> None:
-        """Delete item from cache."""
-        with self._lock:
-            self._cache.pop(key, None)
-    
-    def clear(self) -> None:
-        """Clear all items."""
-        with self._lock:
-            self._cache.clear()
-    
-    @property
-    def stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        with self._lock:
-            total = self._hits + self._misses
-            return {
-                "size": len(self._cache),
-                "max_size": self.max_size,
-                "hits": self._hits,
-                "misses": self._misses,
-                "hit_ratio": self._hits / total if total > 0 else 0.0
-            }
-
-
-# ============================================================================
-# L2 CACHE (REDIS)
-# ============================================================================
-
-class RAGL2Cache:
-    """
-    Redis-based L2 cache for RAG results.
-    
-    Features:
-    - Distributed caching
-    - TTL expiration
-    - Graceful fallback if Redis unavailable
-    """
-    
-    def __init__(self, redis_url: str = REDIS_URL, ttl_seconds: int = RAG_CACHE_TTL):
-        self.redis_url = redis_url
-        self.ttl_seconds = ttl_seconds
-        self._client = None
-        self._available = None
-        self._hits = 0
-        self._misses = 0
-    
-    def _get_client(self):
-        """Get Redis client (lazy initialization)."""
-        if self._available is False:
-            return None
-        
-        if self._client is not None:
-            return self._client
-        
-        try:
-            import redis
-            self._client = redis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-                socket_connect_timeout=2.0,
-                socket_timeout=5.0,
-            )
-            self._client.ping()
-            self._available = True
-            logger.info(f"✅ RAG L2 cache Redis connected (TTL={self.ttl_seconds}s)")
-            return self._client
-        except Exception as e:
-            logger.warning(f"⚠️ RAG L2 cache Redis unavailable: {e}")
-            self._available = False
-            return None
-    
-    def get(self, key: str) -> Optional[CachedRAGResult]:
-        """Get item from Redis cache."""
-        client = self._get_client()
-        if not client:
-            return None
-        
-        try:
-            data = client.get(f"rag:{key}")
-            if data:
-                self._hits += 1
-                parsed = json.loads(data)
-                return CachedRAGResult(
-                    results=parsed["results"],
-                    embedding=parsed.get("embedding"),
-                    created_at=datetime.fromisoformat(parsed["created_at"]),
-                    ttl_seconds=self.ttl_seconds
-                )
-            self._misses += 1
-            return None
-        except Exception as e:
-            logger.debug(f"RAG L2 cache get failed: {e}")
-            self._misses += 1
-            return None
-    
-    def set(self, key: str, value: CachedRAGResult) -> None:
-        """Set item in Redis cache."""
-        client = self._get_client()
-        if not client:
-            return
-        
-        try:
-            data = json.dumps({
-                "results": value.results,
-                "embedding": value.embedding,
-                "created_at": value.created_at.isoformat()
-            })
-            client.setex(f"rag:{key}", self.ttl_seconds, data)
-        except Exception as e:
-            logger.debug(f"RAG L2 cache set failed: {e}")
-    
-    def delete(self, key: str) -> None:
-        """Delete item from Redis cache."""
-        client = self._get_client()
-        if client:
-            try:
-                client.delete(f"rag:{key}")
-            except Exception:
-                pass
-    
-    @property
-    def stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
-        total = self._hits + self._misses
-        return {
-            "available": self._available or False,
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_ratio": self._hits / total if total > 0 else 0.0
-        }
-
-
 # ============================================================================
 # TIERED CACHE
 # ============================================================================
@@ -293,6 +106,9 @@ class RAGTieredCache:
     
     Read: Check L1, if miss check L2, promote to L1 on L2 hit.
     Write: Write to both L1 and L2.
+    
+    Backed by the unified ``core.cache`` tiers; entries are stored as plain
+    dicts so both tiers share one msgpack-friendly representation.
     """
     
     def __init__(
@@ -302,8 +118,25 @@ class RAGTieredCache:
         redis_url: str = REDIS_URL,
         l2_ttl_seconds: int = RAG_CACHE_TTL
     ):
-        self.l1 = RAGL1Cache(max_size=l1_max_size, ttl_seconds=l1_ttl_seconds)
-        self.l2 = RAGL2Cache(redis_url=redis_url, ttl_seconds=l2_ttl_seconds)
+        self.l2_ttl_seconds = l2_ttl_seconds
+        self._cache = create_cache(
+            "rag",
+            l1_max_entries=l1_max_size,
+            l1_ttl=l1_ttl_seconds,
+            redis_url=redis_url,
+            l2_ttl=l2_ttl_seconds,
+            enable_l2=True,
+        )
+    
+    @property
+    def l1(self):
+        """In-memory tier."""
+        return self._cache.l1
+    
+    @property
+    def l2(self):
+        """Redis tier."""
+        return self._cache.l2
     
     def get(self, key: str) -> Tuple[Optional[CachedRAGResult], str]:
         """
@@ -312,29 +145,32 @@ class RAGTieredCache:
         Returns:
             Tuple of (result, cache_level) where cache_level is "L1", "L2", or ""
         """
-        # Try L1 first
-        result = self.l1.get(key)
-        if result:
-            return result, "L1"
-        
-        # Try L2
-        result = self.l2.get(key)
-        if result:
-            # Promote to L1
-            self.l1.set(key, result)
-            return result, "L2"
+        payload, tier = self._cache.get_with_tier(key)
+        if tier is None:
+            return None, ""
         
-        return None, ""
-    
-    def set(self, key: str, value: CachedRAGResult) -> None:
+        return CachedRAGResult(
+            results=payload["results"],
+            embedding=payload.get("embedding"),
+            created_at=datetime.fromisoformat(payload["created_at"]),
+            ttl_seconds=self.l2_ttl_seconds
+        ), tier.upper()
+    
+    def set(self, key: str, value: CachedRAGResult, tags: Tuple[str, ...] = ()) -> None:
         """Set in both cache levels."""
-        self.l1.set(key, value)
-        self.l2.set(key, value)
+        self._cache.set(key, {
+            "results": value.results,
+            "embedding": value.embedding,
+            "created_at": value.created_at.isoformat()
+        }, tags=tags)
     
     def delete(self, key: str) -> None:
         """Delete from both cache levels."""
-        self.l1.delete(key)
-        self.l2.delete(key)
+        self._cache.delete(key)
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete entries carrying any of ``tags`` from both cache levels."""
+        return self._cache.invalidate_tags(*tags)
     
     def clear(self) -> None:
         """Clear L1 cache (L2 uses TTL)."""
@@ -343,10 +179,7 @@ class RAGTieredCache:
     @property
     def stats(self) -> Dict[str, Any]:
         """Get combined cache statistics."""
-        return {
-            "l1": self.l1.stats,
-            "l2": self.l2.stats
-        }
+        return self._cache.get_stats()
 
 
 # ============================================================================
@@ -568,6 +401,17 @@ class OptimizedRAGQueryExecutor:
         key_data = f"{query}:{top_k}:{json.dumps(filters or {}, sort_keys=True)}"
         return hashlib.md5(key_data.encode()).hexdigest()
     
+    def _cache_tags(
+        self, results: List[Dict[str, Any]], filters: Optional[Dict] = None
+    ) -> Tuple[str, ...]:
+        """Invalidation tags for a cached result: its documents and collection."""
+        collection = (filters or {}).get("collection")
+        searched = collection or getattr(self.vector_store, "MEDICAL_COLLECTION", None)
+        tags = set(document_tags(results, searched))
+        if collection:
+            tags.add(collection_tag(collection))
+        return tuple(sorted(tags))
+    
     async def search(
         self,
         query: str,
@@ -633,7 +477,9 @@ class OptimizedRAGQueryExecutor:
                         results=results,
                         created_at=datetime.utcnow()
                     )
-                    self.cache.set(cache_key, cached_result)
+                    self.cache.set(
+                        cache_key, cached_result, tags=self._cache_tags(results, filters)
+                    )
                 
                 # Complete future for waiting queries
                 future.set_result(results)
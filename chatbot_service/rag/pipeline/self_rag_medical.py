@@ -85,6 +85,16 @@ def _get_raptor_retriever():
         return None, None
 
 
+def _get_graph_rag_service():
+    """Lazy load GraphRAGService (embedded knowledge graph)."""
+    try:
+        from rag.knowledge_graph.graph_rag import GraphRAGService
+        return GraphRAGService
+    except ImportError:
+        logger.debug("GraphRAGService not available")
+        return None
+
+
 class SupportLevel(Enum):
     """Response support levels."""
     FULLY_SUPPORTED = "fully_supported"
@@ -249,9 +259,11 @@ class MedicalSelfRAG:
         logger.info(f"MedicalSelfRAG initialized with TokenBudgetManager (max_tokens={self.token_budget.max_tokens})")
         
         # Context Assembler for parallel multi-source retrieval
+        GraphRAGService = _get_graph_rag_service()
         self.context_assembler = ContextAssembler(
             vector_store=vector_store,
-            memory_bridge=memory_bridge
+            memory_bridge=memory_bridge,
+            graph_service=GraphRAGService(embedding_service) if GraphRAGService else None,
         )
         logger.info("MedicalSelfRAG: ContextAssembler initialized for parallel retrieval")
         
@@ -488,7 +500,9 @@ class MedicalSelfRAG:
                     logger.info(f"FusionRetriever returned {len(docs)} documents")
                 except Exception as e:
                     logger.warning(f"FusionRetriever failed, falling back: {e}")
-                    docs = await self.vector_store.async_search(query, top_k=5)
+                    docs = await self.vector_store.async_search(
+                        query, top_k=5, include_embeddings=self.reranker is not None
+                    )
             # P2.2: RAPTOR fallback if available
             elif self.raptor_retriever and self.raptor_store:
                 try:
@@ -520,9 +534,13 @@ class MedicalSelfRAG:
                     logger.info(f"RAPTOR returned {len(docs)} documents")
                 except Exception as e:
                     logger.debug(f"RAPTOR retrieval failed: {e}")
-                    docs = await self.vector_store.async_search(query, top_k=5)
+                    docs = await self.vector_store.async_search(
+                        query, top_k=5, include_embeddings=self.reranker is not None
+                    )
             else:
-                docs = await self.vector_store.async_search(query, top_k=5)
+                docs = await self.vector_store.async_search(
+                    query, top_k=5, include_embeddings=self.reranker is not None
+                )
         
         # STEP 3: Filter relevant documents & OPTIONAL PARALLEL RERANKING
         # MEDIUM RISK FIX: Run filtering and reranking in parallel if available
@@ -533,7 +551,7 @@ class MedicalSelfRAG:
             # Parallel execution: filter AND rerank at same time
             relevant_docs, reranked_docs = await asyncio.gather(
                 self._filter_relevant_docs(query, docs),
-                self.reranker.rerank(query, docs),
+                self._rerank(query, docs),
                 return_exceptions=True
             )
             
@@ -647,7 +665,8 @@ class MedicalSelfRAG:
         #   - Support level grading (~300ms)
         # Instead of sequential (~500-700ms total), we do parallel (~400ms total)
         
-        context_text = "\n\n".join([doc.get('content', '') for doc in relevant_docs[:3]])
+        # Pack top documents into the context budget using cached token counts
+        context_text = self.token_budget.pack(relevant_docs[:3]).text
         
         
         # NOTE: P0.3 skip_grading logic moved after response generation (line 645)
@@ -741,6 +760,14 @@ Answer: YES or NO"""
         logger.debug(f"Retrieval need: LLM fallback -> {needs_retrieval}")
         return needs_retrieval
     
+    async def _rerank(self, query: str, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rerank without blocking the event loop (sync rerankers run in a thread)."""
+        if hasattr(self.reranker, "arerank"):
+            return await self.reranker.arerank(query, documents)
+        if asyncio.iscoroutinefunction(self.reranker.rerank):
+            return await self.reranker.rerank(query, documents)
+        return await asyncio.to_thread(self.reranker.rerank, query, documents)
+
     async def _filter_relevant_docs(
         self,
         query: str,
@@ -13,7 +13,7 @@ This module operates in INFERENCE-ONLY mode:
 import logging
 import os
 
-from rag.store.chromadb_store import ChromaDBVectorStore
+from rag.store.vector_store import get_vector_store
 from rag.embedding.remote import RemoteEmbeddingService
 
 logger = logging.getLogger(__name__)
@@ -50,9 +50,8 @@ class HeartDiseaseRAG:
                     "Chromadb",
                 ),
             )
-            self.vector_store = ChromaDBVectorStore(
-                persist_directory=persist_dir,
-            )
+            # Shared store: one client, query cache and BM25 keyword index
+            self.vector_store = get_vector_store(persist_directory=persist_dir)
 
             # 3. Register the ACTUAL data collections used during training
             #    Training created: medical_text_768 (text) and medical_images_1152 (images)
@@ -123,22 +122,34 @@ class HeartDiseaseRAG:
             query_embedding = query_embedding.tolist()
 
         # Query the actual trained collection
+        # Stored embeddings ride along when reranking, so MMR reuses them
+        with_embeddings = bool(self.reranker and self.reranker.is_available())
+        include = ["documents", "metadatas", "distances"]
+        if with_embeddings:
+            include.append("embeddings")
         raw = self._text_collection.query(
             query_embeddings=[query_embedding],
             n_results=top_k,
-            include=["documents", "metadatas", "distances"],
+            include=include,
         )
 
         results = []
         if raw and raw["ids"] and raw["ids"][0]:
+            embeddings = raw.get("embeddings") if with_embeddings else None
             for i, doc_id in enumerate(raw["ids"][0]):
                 distance = raw["distances"][0][i] if raw["distances"] else 0.0
-                results.append({
+                result = {
                     "id": doc_id,
                     "content": raw["documents"][0][i] if raw["documents"] else "",
                     "metadata": raw["metadatas"][0][i] if raw["metadatas"] else {},
                     "score": 1.0 - distance,
-                })
+                }
+                if embeddings is not None and len(embeddings) and embeddings[0] is not None:
+                    embedding = embeddings[0][i]
+                    result["embedding"] = (
+                        embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+                    )
+                results.append(result)
 
         return results
 
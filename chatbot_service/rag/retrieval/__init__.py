@@ -6,6 +6,7 @@ Provides intelligent query routing and tiered document retrieval:
 - Intent Detection: Classifies queries to determine best retrieval strategy
 - Tiered Retrieval: Routes to Tier 1 (high-confidence) or Tier 2 (research) sources
 - Result Merging: Combines and ranks results by confidence and relevance
+- Keyword Search: In-process BM25 index over the vector store's chunks
 - Explainability: Provides reasoning for retrieval decisions
 
 Query Intent Classification:
@@ -31,6 +32,10 @@ from rag.retrieval.fusion_retriever import (
     SearchResult,
 )
 
+from rag.retrieval.diversity import diversify, mmr_select
+
+from rag.retrieval.bm25_index import BM25Index
+
 from rag.retrieval.unified_compressor import (
     UnifiedDocumentCompressor,
     CompressedDocument,
@@ -59,12 +64,18 @@ __all__ = [
     "clean_query",
     "lemmatize_medical_terms",
     "SearchResult",
+    # Keyword Search (BM25)
+    "BM25Index",
+    # Diversity (MMR)
+    "diversify",
+    "mmr_select",
     # Unified Compressor
     "UnifiedDocumentCompressor",
     "CompressedDocument",
     "CompressionStrategy",
     # Reranker
     "MedicalReranker",
+    "CrossEncoderScoringService",
     # Context Assembly
     "ContextAssembler",
     "TokenBudgetManager",
@@ -73,6 +84,7 @@ __all__ = [
 # Lazy imports for optional components (heavy dependencies)
 try:
     from rag.retrieval.reranker import MedicalReranker
+    from rag.retrieval.rerank_service import CrossEncoderScoringService
 except ImportError:
     pass
 
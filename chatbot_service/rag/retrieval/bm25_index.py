@@ -0,0 +1,495 @@
+"""
+BM25 Index - In-process inverted index for keyword search
+
+Replaces the external LangChain BM25 retriever used by FusionRetriever with
+an index over the vector store's chunks:
+
+- Compact postings: a CSR "base" segment (term offsets + uint32 doc ids +
+  uint16 term frequencies, sorted by doc id) plus a small append-only
+  "delta" segment for documents added since the last compaction.
+- Incremental updates: adds go to the delta segment, deletes (and the old
+  version of an upserted document) become tombstones. Both are merged into
+  the base segment once they exceed BM25_COMPACT_RATIO of the index.
+- MaxScore top-k: query terms are processed by decreasing score upper
+  bound. Once the remaining terms cannot lift an unseen document above the
+  current k-th score, later terms are only looked up (binary search) for
+  the surviving candidates instead of scoring their whole posting list.
+- Persistence: ``save`` writes the base segment as ``.npy`` arrays that
+  ``load`` memory-maps, so large indexes open instantly and share pages
+  between worker processes.
+- Content digests: every document keeps a 64-bit digest of its text and
+  the index a fingerprint (sum of live digests), both saved with the
+  snapshot, so a loaded index can be diffed against its source and
+  re-indexes only the documents whose content changed.
+
+Tokenization uses the medical rules from ``rag.nlp.tokenizer`` (hyphenated
+terms kept, dosage units split from numbers) for documents and queries.
+
+Usage:
+    index = BM25Index()
+    index.add("doc-1", "Metoprolol 50mg twice daily for AF rate control")
+    index.search("metoprolol 50 mg", k=10)  # [("doc-1", 3.1), ...]
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from rag.nlp.tokenizer import tokenize_medical_text
+
+logger = logging.getLogger(__name__)
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# Merge delta postings and tombstones into the base segment above this share
+BM25_COMPACT_RATIO = float(os.getenv("BM25_COMPACT_RATIO", "0.25"))
+# Never compact for fewer pending changes than this
+BM25_COMPACT_MIN = int(os.getenv("BM25_COMPACT_MIN", "1000"))
+
+_FORMAT_VERSION = 2
+_TF_MAX = np.iinfo(np.uint16).max
+_DIGEST_MASK = (1 << 64) - 1
+
+Tokenizer = Callable[[str], List[str]]
+
+
+def content_digest(text: str) -> int:
+    """64-bit digest of a document's text (as tracked by the index)."""
+    data = (text or "").encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class BM25Index:
+    """
+    Thread-safe BM25 inverted index with MaxScore top-k search.
+
+    Args:
+        k1: Term-frequency saturation
+        b: Document length normalization
+        tokenizer: Text -> tokens (default: medical tokenizer)
+    """
+
+    def __init__(
+        self,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        tokenizer: Tokenizer = tokenize_medical_text,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Documents (internal ids are assigned in increasing order)
+        self._keys: List[Optional[str]] = []
+        self._key_ids: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.uint32)
+        self._digests = np.zeros(1024, dtype=np.uint64)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._fingerprint = 0
+        self._live_count = 0
+        self._live_length = 0
+        self._tombstones = 0
+
+        # Base segment (CSR, possibly memory-mapped)
+        self._vocab: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._doc_ids = np.zeros(0, dtype=np.uint32)
+        self._tfs = np.zeros(0, dtype=np.uint16)
+        self._max_tf = np.zeros(0, dtype=np.uint16)
+
+        # Delta segment: term -> (doc ids, tfs), plus max tf per term
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_max_tf: Dict[str, int] = {}
+        self._delta_docs = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, key: str, text: str) -> None:
+        """Index ``text`` under ``key`` (replaces an existing document)."""
+        self.add_many([(key, text)])
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """Index (key, text) pairs; returns the number indexed."""
+        count = 0
+        with self._lock:
+            for key, text in documents:
+                self._remove(key)
+                self._insert(key, text or "")
+                count += 1
+            self._maybe_compact()
+        return count
+
+    def delete(self, keys: Iterable[str]) -> int:
+        """Remove documents; returns the number that were indexed."""
+        with self._lock:
+            removed = sum(1 for key in keys if self._remove(key))
+            self._maybe_compact()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def digest(self, key: str) -> Optional[int]:
+        """Content digest of an indexed document (None when not indexed)."""
+        doc_id = self._key_ids.get(key)
+        return None if doc_id is None else int(self._digests[doc_id])
+
+    def keys(self) -> List[str]:
+        """Keys of every indexed document."""
+        with self._lock:
+            return list(self._key_ids)
+
+    @property
+    def fingerprint(self) -> int:
+        """Order-independent digest of the indexed documents."""
+        return self._fingerprint
+
+    def _insert(self, key: str, text: str) -> None:
+        doc_id = len(self._keys)
+        if doc_id >= len(self._lengths):
+            self._grow(doc_id + 1)
+        counts = Counter(self.tokenizer(text))
+        length = sum(counts.values())
+        digest = content_digest(text)
+
+        self._keys.append(key)
+        self._key_ids[key] = doc_id
+        self._lengths[doc_id] = length
+        self._digests[doc_id] = digest
+        self._fingerprint = (self._fingerprint + digest) & _DIGEST_MASK
+        self._alive[doc_id] = True
+        self._live_count += 1
+        self._live_length += length
+        self._delta_docs += 1
+
+        for term, tf in counts.items():
+            tf = min(tf, _TF_MAX)
+            postings = self._delta.get(term)
+            if postings is None:
+                postings = self._delta[term] = (array("I"), array("H"))
+            postings[0].append(doc_id)
+            postings[1].append(tf)
+            if tf > self._delta_max_tf.get(term, 0):
+                self._delta_max_tf[term] = tf
+
+    def _remove(self, key: str) -> bool:
+        doc_id = self._key_ids.pop(key, None)
+        if doc_id is None:
+            return False
+        self._keys[doc_id] = None
+        self._alive[doc_id] = False
+        self._live_count -= 1
+        self._live_length -= int(self._lengths[doc_id])
+        self._fingerprint = (self._fingerprint - int(self._digests[doc_id])) & _DIGEST_MASK
+        self._tombstones += 1
+        return True
+
+    def _grow(self, size: int) -> None:
+        capacity = max(size, 2 * len(self._lengths))
+        lengths = np.zeros(capacity, dtype=np.uint32)
+        digests = np.zeros(capacity, dtype=np.uint64)
+        alive = np.zeros(capacity, dtype=bool)
+        lengths[: len(self._lengths)] = self._lengths
+        digests[: len(self._digests)] = self._digests
+        alive[: len(self._alive)] = self._alive
+        self._lengths, self._digests, self._alive = lengths, digests, alive
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _maybe_compact(self) -> None:
+        pending = self._delta_docs + self._tombstones
+        if pending >= BM25_COMPACT_MIN and pending >= BM25_COMPACT_RATIO * max(len(self._keys), 1):
+            self.compact()
+
+    def compact(self) -> None:
+        """Merge delta postings and drop tombstones (ids become dense)."""
+        with self._lock:
+            if not self._delta_docs and not self._tombstones:
+                return
+            live = np.flatnonzero(self._alive[: len(self._keys)])
+            remap = np.full(len(self._keys), -1, dtype=np.int64)
+            remap[live] = np.arange(len(live))
+
+            vocab = dict(self._vocab)
+            for term in self._delta:
+                vocab.setdefault(term, len(vocab))
+
+            base_terms = np.repeat(
+                np.arange(len(self._offsets) - 1, dtype=np.int64), np.diff(self._offsets)
+            )
+            delta_terms = [np.full(len(ids), vocab[t], dtype=np.int64) for t, (ids, _) in self._delta.items()]
+            terms = np.concatenate([base_terms] + delta_terms)
+            docs = np.concatenate(
+                [np.asarray(self._doc_ids, dtype=np.int64)]
+                + [np.array(ids, dtype=np.int64) for ids, _ in self._delta.values()]
+            )
+            tfs = np.concatenate(
+                [np.asarray(self._tfs, dtype=np.uint16)]
+                + [np.array(tf, dtype=np.uint16) for _, tf in self._delta.values()]
+            )
+
+            docs = remap[docs]
+            keep = docs >= 0
+            terms, docs, tfs = terms[keep], docs[keep], tfs[keep]
+
+            # Drop terms that no longer have postings
+            used = np.zeros(len(vocab), dtype=bool)
+            used[terms] = True
+            term_remap = np.cumsum(used) - 1
+            terms = term_remap[terms]
+            self._vocab = {t: int(term_remap[row]) for t, row in vocab.items() if used[row]}
+
+            order = np.lexsort((docs, terms))
+            terms, docs, tfs = terms[order], docs[order], tfs[order]
+            n_terms = len(self._vocab)
+            counts = np.bincount(terms, minlength=n_terms)
+            self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            self._doc_ids = docs.astype(np.uint32)
+            self._tfs = tfs
+            self._max_tf = np.zeros(n_terms, dtype=np.uint16)
+            if len(tfs):
+                np.maximum.at(self._max_tf, terms, tfs)
+
+            keys = [self._keys[i] for i in live]
+            lengths = self._lengths[live]
+            digests = self._digests[live]
+            self._keys = keys
+            self._key_ids = {key: i for i, key in enumerate(keys)}
+            self._lengths = np.zeros(max(len(keys), 1024), dtype=np.uint32)
+            self._digests = np.zeros(len(self._lengths), dtype=np.uint64)
+            self._alive = np.zeros(len(self._lengths), dtype=bool)
+            self._lengths[: len(keys)] = lengths
+            self._digests[: len(keys)] = digests
+            self._alive[: len(keys)] = True
+            self._delta = {}
+            self._delta_max_tf = {}
+            self._delta_docs = 0
+            self._tombstones = 0
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Doc ids (sorted) and tfs of ``term`` across both segments."""
+        parts_ids, parts_tfs = [], []
+        row = self._vocab.get(term)
+        if row is not None:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            parts_ids.append(self._doc_ids[start:end])
+            parts_tfs.append(self._tfs[start:end])
+        delta = self._delta.get(term)
+        if delta is not None:
+            # Delta ids are all newer than base ids, so order is preserved
+            parts_ids.append(np.array(delta[0], dtype=np.uint32))
+            parts_tfs.append(np.array(delta[1], dtype=np.uint16))
+        if len(parts_ids) == 1:
+            return parts_ids[0], parts_tfs[0]
+        return np.concatenate(parts_ids), np.concatenate(parts_tfs)
+
+    def _term_stats(self, term: str) -> Tuple[int, int]:
+        """(document frequency, max tf) including tombstoned postings."""
+        df, max_tf = 0, 0
+        row = self._vocab.get(term)
+        if row is not None:
+            df += int(self._offsets[row + 1] - self._offsets[row])
+            max_tf = int(self._max_tf[row])
+        delta = self._delta.get(term)
+        if delta is not None:
+            df += len(delta[0])
+            max_tf = max(max_tf, self._delta_max_tf[term])
+        return df, max_tf
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-``k`` documents for ``query``.
+
+        Returns:
+            (key, score) pairs, best first
+        """
+        with self._lock:
+            if k <= 0 or not self._live_count:
+                return []
+            total_docs = len(self._keys)
+            avgdl = self._live_length / self._live_count or 1.0
+            k1, b = self.k1, self.b
+
+            terms = []
+            for term in dict.fromkeys(self.tokenizer(query)):
+                df, max_tf = self._term_stats(term)
+                if not df:
+                    continue
+                idf = math.log(1.0 + (total_docs - df + 0.5) / (df + 0.5))
+                # Highest possible contribution: max tf in the shortest document
+                bound = idf * (k1 + 1) * max_tf / (max_tf + k1 * (1 - b))
+                terms.append((bound, idf, term))
+            if not terms:
+                return []
+            terms.sort(reverse=True)
+            remaining = np.cumsum([t[0] for t in terms][::-1])[::-1]
+
+            cand_ids = np.zeros(0, dtype=np.int64)
+            cand_scores = np.zeros(0, dtype=np.float64)
+            threshold = 0.0
+
+            for i, (_, idf, term) in enumerate(terms):
+                ids, tfs = self._postings(term)
+                full = len(cand_ids) < k or remaining[i] >= threshold
+                if full:
+                    # Unseen documents can still reach the top k: score every posting
+                    ids = ids.astype(np.int64)
+                    keep = self._alive[ids]
+                    ids, tfs = ids[keep], tfs[keep]
+                else:
+                    # Essential terms are done: only look up surviving candidates
+                    viable = cand_scores + remaining[i] >= threshold
+                    cand_ids, cand_scores = cand_ids[viable], cand_scores[viable]
+                    pos = np.searchsorted(ids, cand_ids)
+                    pos[pos >= len(ids)] = 0
+                    found = len(ids) > 0
+                    hit = (ids[pos] == cand_ids) if found else np.zeros(len(cand_ids), dtype=bool)
+                    ids, tfs = cand_ids[hit], tfs[pos[hit]]
+
+                tf = tfs.astype(np.float64)
+                norm = k1 * (1 - b + b * self._lengths[ids] / avgdl)
+                scores = idf * tf * (k1 + 1) / (tf + norm)
+
+                if full:
+                    merged = np.concatenate([cand_ids, ids])
+                    cand_ids, inverse = np.unique(merged, return_inverse=True)
+                    cand_scores = np.bincount(
+                        inverse, weights=np.concatenate([cand_scores, scores]), minlength=len(cand_ids)
+                    )
+                else:
+                    cand_scores[hit] += scores
+
+                if len(cand_scores) >= k:
+                    threshold = float(np.partition(cand_scores, -k)[-k])
+
+            # Everything tied with the k-th score, so ties break by doc id
+            top = np.flatnonzero(cand_scores >= threshold) if len(cand_ids) > k else np.arange(len(cand_ids))
+            top = top[np.lexsort((cand_ids[top], -cand_scores[top]))][:k]
+            return [(self._keys[cand_ids[i]], float(cand_scores[i])) for i in top]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: str) -> None:
+        """Compact and write the index to ``directory`` (replaced atomically)."""
+        with self._lock:
+            self.compact()
+            # Per-process scratch names: several workers may snapshot the same index
+            tmp = f"{directory.rstrip(os.sep)}.tmp.{os.getpid()}"
+            shutil.rmtree(tmp, ignore_errors=True)
+            os.makedirs(tmp)
+            np.save(os.path.join(tmp, "offsets.npy"), self._offsets)
+            np.save(os.path.join(tmp, "doc_ids.npy"), self._doc_ids)
+            np.save(os.path.join(tmp, "tfs.npy"), self._tfs)
+            np.save(os.path.join(tmp, "max_tf.npy"), self._max_tf)
+            np.save(os.path.join(tmp, "lengths.npy"), self._lengths[: len(self._keys)])
+            np.save(os.path.join(tmp, "digests.npy"), self._digests[: len(self._keys)])
+            terms = sorted(self._vocab, key=self._vocab.get)
+            with open(os.path.join(tmp, "terms.json"), "w", encoding="utf-8") as f:
+                json.dump(terms, f)
+            with open(os.path.join(tmp, "keys.json"), "w", encoding="utf-8") as f:
+                json.dump(self._keys, f)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": _FORMAT_VERSION,
+                        "k1": self.k1,
+                        "b": self.b,
+                        "documents": self._live_count,
+                        "fingerprint": f"{self._fingerprint:016x}",
+                    },
+                    f,
+                )
+
+            old = f"{directory.rstrip(os.sep)}.old.{os.getpid()}"
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(directory):
+                os.rename(directory, old)
+            os.rename(tmp, directory)
+            shutil.rmtree(old, ignore_errors=True)
+        logger.info(f"BM25 index saved: {self._live_count} documents, {len(self._vocab)} terms -> {directory}")
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True, tokenizer: Tokenizer = tokenize_medical_text) -> "BM25Index":
+        """
+        Open an index written by :meth:`save`.
+
+        Args:
+            directory: Index directory
+            mmap: Memory-map the postings instead of reading them into memory
+            tokenizer: Must match the tokenizer the index was built with
+        """
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 index version: {meta.get('version')}")
+
+        mode = "r" if mmap else None
+        index = cls(k1=meta["k1"], b=meta["b"], tokenizer=tokenizer)
+        index._offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode=mode)
+        index._doc_ids = np.load(os.path.join(directory, "doc_ids.npy"), mmap_mode=mode)
+        index._tfs = np.load(os.path.join(directory, "tfs.npy"), mmap_mode=mode)
+        index._max_tf = np.load(os.path.join(directory, "max_tf.npy"), mmap_mode=mode)
+        with open(os.path.join(directory, "terms.json"), encoding="utf-8") as f:
+            index._vocab = {term: row for row, term in enumerate(json.load(f))}
+        with open(os.path.join(directory, "keys.json"), encoding="utf-8") as f:
+            index._keys = json.load(f)
+
+        # Document tables stay in memory: they grow with every add
+        lengths = np.load(os.path.join(directory, "lengths.npy"))
+        digests = np.load(os.path.join(directory, "digests.npy"))
+        index._grow(len(lengths))
+        index._lengths[: len(lengths)] = lengths
+        index._digests[: len(digests)] = digests
+        index._alive[: len(lengths)] = True
+        index._fingerprint = int(digests.sum(dtype=np.uint64))  # Wraps mod 2**64
+        if f"{index._fingerprint:016x}" != meta.get("fingerprint"):
+            raise ValueError("BM25 index digests do not match the snapshot fingerprint")
+        index._key_ids = {key: i for i, key in enumerate(index._keys)}
+        index._live_count = len(index._keys)
+        index._live_length = int(lengths.sum())
+        return index
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_ids
+
+    def get_stats(self) -> Dict:
+        return {
+            "documents": self._live_count,
+            "terms": len(self._vocab) + sum(1 for t in self._delta if t not in self._vocab),
+            "postings": int(len(self._doc_ids)) + sum(len(ids) for ids, _ in self._delta.values()),
+            "delta_documents": self._delta_docs,
+            "tombstones": self._tombstones,
+            "memory_mapped": isinstance(self._doc_ids, np.memmap),
+            "fingerprint": f"{self._fingerprint:016x}",
+        }
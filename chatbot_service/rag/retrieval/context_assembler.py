@@ -6,7 +6,10 @@ and combines results into unified context.
 
 Performance Optimizations:
 - Redis caching with 300s TTL for assembled context
-- Parallel retrieval from all sources
+- Parallel retrieval from all sources with per-source deadlines: slow
+  sources are cancelled, finished ones are kept
+- Adaptive timeouts from per-source latency history, optional hedging
+  to replica sources
 - Document compression for token efficiency
 """
 
@@ -20,12 +23,17 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from rag.retrieval.source_deadlines import SourceLatencyTracker, gather_with_deadlines
+
 logger = logging.getLogger(__name__)
 
 # Redis cache configuration
 CONTEXT_CACHE_TTL = int(os.getenv("CONTEXT_CACHE_TTL", "300"))  # 5 minutes default
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# Retrieval deadlines
+CONTEXT_ASSEMBLY_DEADLINE = float(os.getenv("CONTEXT_ASSEMBLY_DEADLINE", "2.0"))  # seconds
+
 # Lazy Redis import
 _redis_client = None
 _redis_available = None
@@ -86,6 +94,8 @@ class AssembledContext:
     combined_ranked: List[Dict[str, Any]] = field(default_factory=list)
     total_documents: int = 0
     retrieval_time_ms: float = 0.0
+    source_status: Dict[str, str] = field(default_factory=dict)  # source -> ok/timeout/error/disabled
+    partial: bool = False  # True if any enabled source missed its deadline or failed
 
 
 class ContextAssembler:
@@ -99,6 +109,7 @@ class ContextAssembler:
         self,
         vector_store: Optional[Any] = None,
         memory_bridge: Optional[Any] = None,
+        graph_service: Optional[Any] = None,
         vector_weight: Optional[float] = None,
         graph_weight: Optional[float] = None,
         memory_weight: Optional[float] = None,
@@ -106,6 +117,11 @@ class ContextAssembler:
         enable_compression: bool = True,
         compression_strategy: CompressionStrategy = CompressionStrategy.HYBRID,
         compression_ratio: float = 0.5,
+        deadline: float = CONTEXT_ASSEMBLY_DEADLINE,
+        source_timeouts: Optional[Dict[str, float]] = None,
+        adaptive_timeouts: bool = True,
+        replica_vector_store: Optional[Any] = None,
+        replica_memory_bridge: Optional[Any] = None,
     ):
         """
         Initialize context assembler with retrieval sources.
@@ -113,6 +129,7 @@ class ContextAssembler:
         Args:
             vector_store: Vector store for semantic search
             memory_bridge: Memory service for user context
+            graph_service: Graph retrieval service (e.g. GraphRAGService)
             vector_weight: Weight for vector results (default: 0.5, from AppConfig)
             graph_weight: Weight for graph results (default: 0.35, from AppConfig)
             memory_weight: Weight for memory results (default: 0.15, from AppConfig)
@@ -120,9 +137,26 @@ class ContextAssembler:
             enable_compression: Enable document compression after assembly
             compression_strategy: Strategy for compression (HYBRID auto-selects)
             compression_ratio: Target compression ratio (0.5 = 50% of original)
+            deadline: Overall retrieval budget in seconds
+            source_timeouts: Fixed per-source timeouts in seconds
+                ("vector", "graph", "memory"); others are adaptive
+            adaptive_timeouts: Derive per-source timeouts from recent latencies
+            replica_vector_store: Replica used for hedged vector searches
+            replica_memory_bridge: Replica used for hedged memory lookups
         """
         self.vector_store = vector_store
         self.memory_bridge = memory_bridge
+        self.graph_service = graph_service
+        self.replica_vector_store = replica_vector_store
+        self.replica_memory_bridge = replica_memory_bridge
+        
+        # Per-source deadlines
+        self.deadline = deadline
+        self.source_timeouts = source_timeouts or {}
+        self.latency_tracker = (
+            SourceLatencyTracker(default_timeout=deadline, max_timeout=deadline)
+            if adaptive_timeouts else None
+        )
         
         # Load weights from config if not provided
         if vector_weight is None or graph_weight is None or memory_weight is None:
@@ -183,6 +217,7 @@ class ContextAssembler:
         logger.info(
             f"ContextAssembler initialized: "
             f"vector={bool(vector_store)}, "
+            f"graph={bool(graph_service)}, "
             f"memory={bool(memory_bridge)}, "
             f"weights=(vector={self.vector_weight:.2f}, graph={self.graph_weight:.2f}, memory={self.memory_weight:.2f}), "
             f"cache_ttl={self.cache_ttl}s"
@@ -286,35 +321,56 @@ class ContextAssembler:
                 return cached
         
         try:
-            # Create parallel retrieval tasks
-            tasks = []
+            # Build per-source retrieval calls
+            sources = {}
+            replicas = {}
+            source_status = {}
             
             if self.vector_store:
-                tasks.append(self._vector_search(query, top_k))
+                sources["vector"] = lambda: self._vector_search(query, top_k)
+                if self.replica_vector_store:
+                    replicas["vector"] = lambda: self._vector_search(
+                        query, top_k, store=self.replica_vector_store
+                    )
             else:
-                tasks.append(self._empty_search("vector"))
+                source_status["vector"] = "disabled"
             
-            # Graph search slot (no backend configured)
-            tasks.append(self._empty_search("graph"))
+            if self.graph_service:
+                sources["graph"] = lambda: self._graph_search(query, top_k)
+            else:
+                source_status["graph"] = "disabled"
             
             if self.memory_bridge and user_id:
-                tasks.append(self._memory_search(query, user_id, top_k))
+                sources["memory"] = lambda: self._memory_search(query, user_id, top_k)
+                if self.replica_memory_bridge:
+                    replicas["memory"] = lambda: self._memory_search(
+                        query, user_id, top_k, bridge=self.replica_memory_bridge
+                    )
             else:
-                tasks.append(self._empty_search("memory"))
+                source_status["memory"] = "disabled"
             
-            # Execute in parallel with timeout to prevent slow sources from blocking
-            try:
-                results = await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True),
-                    timeout=2.0  # Max 2 seconds for all retrievals
-                )
-            except asyncio.TimeoutError:
-                logger.warning("Context assembly timed out after 2s, using partial results")
-                results = [[], [], []]  # Return empty results on timeout
+            # Each source runs under its own deadline; laggards are cancelled
+            # and whatever finished in time is kept
+            outcomes = await gather_with_deadlines(
+                sources,
+                deadline=self.deadline,
+                tracker=self.latency_tracker,
+                timeouts=self.source_timeouts,
+                replicas=replicas,
+            )
+            for name, outcome in outcomes.items():
+                source_status[name] = outcome.status
+            partial = any(outcome.status != "ok" for outcome in outcomes.values())
+            if partial:
+                logger.warning(f"Context assembly using partial results: {source_status}")
+            
+            def _results(name: str) -> List[Dict[str, Any]]:
+                outcome = outcomes.get(name)
+                return outcome.results if outcome else []
             
-            vector_results = results[0] if not isinstance(results[0], Exception) else []
-            graph_results = results[1] if not isinstance(results[1], Exception) else []
-            memory_results = results[2] if not isinstance(results[2], Exception) else []
+            vector_results = _results("vector")
+            graph_results = _results("graph")
+            memory_results = _results("memory")
             
             # Combine results
             combined = self._combine_and_rank(
@@ -375,10 +431,14 @@ class ContextAssembler:
                 combined_ranked=combined,
                 total_documents=len(vector_results) + len(graph_results) + len(memory_results),
                 retrieval_time_ms=elapsed,
+                source_status=source_status,
+                partial=partial,
             )
             
-            # Cache the result for future requests
-            await self._set_cached_context(cache_key, context)
+            # Cache the result for future requests (degraded results are not
+            # cached so the next request gets a chance at the full context)
+            if not partial:
+                await self._set_cached_context(cache_key, context)
             
             logger.info(
                 f"Context assembled in {elapsed:.1f}ms: "
@@ -392,54 +452,83 @@ class ContextAssembler:
             elapsed = (time.time() - start_time) * 1000
             return AssembledContext(retrieval_time_ms=elapsed)
     
-    async def _vector_search(self, query: str, top_k: int) -> List[Dict]:
-        """Search vector store."""
-        try:
-            if hasattr(self.vector_store, 'search_medical_knowledge'):
-                results = self.vector_store.search_medical_knowledge(query, top_k=top_k)
-            elif hasattr(self.vector_store, 'search'):
-                results = self.vector_store.search(query, top_k=top_k)
-            else:
-                results = []
-            
-            logger.debug(f"Vector search returned {len(results)} results")
-            return results
-        except Exception as e:
-            logger.warning(f"Vector search failed: {e}")
+    async def _vector_search(
+        self,
+        query: str,
+        top_k: int,
+        store: Optional[Any] = None,
+    ) -> List[Dict]:
+        """
+        Search vector store.
+        
+        Sync stores run in a worker thread so a slow search cannot block the
+        event loop past its deadline. Errors propagate to the deadline runner.
+        """
+        store = store or self.vector_store
+        if hasattr(store, 'search_medical_knowledge'):
+            search = store.search_medical_knowledge
+        elif hasattr(store, 'search'):
+            search = store.search
+        else:
             return []
+        
+        if asyncio.iscoroutinefunction(search):
+            results = await search(query, top_k=top_k)
+        else:
+            results = await asyncio.to_thread(search, query, top_k=top_k)
+        
+        results = results or []
+        logger.debug(f"Vector search returned {len(results)} results")
+        return results
+    
+    async def _graph_search(self, query: str, top_k: int) -> List[Dict]:
+        """
+        Search the knowledge graph. Errors propagate to the deadline runner.
+        
+        Graph hits read their chunk text back from the vector store, so sync
+        services run in a worker thread like ``_vector_search``.
+        """
+        search = getattr(self.graph_service, 'search', None)
+        if search is None:
+            return []
+        
+        if asyncio.iscoroutinefunction(search):
+            results = await search(query, top_k=top_k)
+        else:
+            results = await asyncio.to_thread(search, query, top_k=top_k)
+            if asyncio.iscoroutine(results):
+                results = await results
+        
+        results = results or []
+        logger.debug(f"Graph search returned {len(results)} results")
+        return results
     
     async def _memory_search(
         self,
         query: str,
         user_id: str,
         top_k: int,
+        bridge: Optional[Any] = None,
     ) -> List[Dict]:
-        """Search user memory."""
-        try:
-            if hasattr(self.memory_bridge, 'search'):
-                result = self.memory_bridge.search(query, user_id=user_id, top_k=top_k)
-                # Handle both async and sync search methods
-                if asyncio.iscoroutine(result):
-                    results = await result
-                else:
-                    results = result
-            else:
-                results = []
-            
-            # Ensure results is a list
-            if results is None:
-                results = []
-            
-            logger.debug(f"Memory search returned {len(results)} results")
-            return results
-        except Exception as e:
-            logger.warning(f"Memory search failed: {e}")
+        """Search user memory. Errors propagate to the deadline runner."""
+        bridge = bridge or self.memory_bridge
+        if not hasattr(bridge, 'search'):
             return []
-    
-    async def _empty_search(self, source: str) -> List[Dict]:
-        """Return empty results for disabled source."""
-        logger.debug(f"{source} source not available")
-        return []
+        
+        if asyncio.iscoroutinefunction(bridge.search):
+            results = await bridge.search(query, user_id=user_id, top_k=top_k)
+        else:
+            results = await asyncio.to_thread(
+                bridge.search, query, user_id=user_id, top_k=top_k
+            )
+            # Handle sync wrappers that return a coroutine
+            if asyncio.iscoroutine(results):
+                results = await results
+        
+        # Ensure results is a list
+        results = results or []
+        logger.debug(f"Memory search returned {len(results)} results")
+        return results
     
     def _combine_and_rank(
         self,
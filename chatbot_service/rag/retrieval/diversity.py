@@ -0,0 +1,189 @@
+"""
+Diversity Selection - Vectorized Maximal Marginal Relevance (MMR)
+
+MMR picks items one at a time by
+
+    (1 - λ) * relevance - λ * max_similarity_to_already_selected
+
+Instead of comparing candidates pairwise in Python, the pairwise
+similarity matrix is computed once and a running max-similarity vector is
+updated with one row per selected item (O(n) numpy work per pick).
+
+Similarity comes from the embeddings the vector search already produced
+(dict ``"embedding"`` key or ``.embedding`` attribute). When any item lacks
+one, it falls back to word-set Jaccard similarity, computed as a single
+binary term-matrix product.
+
+Used by MedicalReranker (post-rerank), FusionRetriever (post-RRF) and
+TieredRetriever (post-merge).
+"""
+
+import logging
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def document_embedding(doc: Any) -> Optional[Sequence[float]]:
+    """Embedding attached to a retrieved document, if any."""
+    if isinstance(doc, dict):
+        embedding = doc.get("embedding")
+    else:
+        embedding = getattr(doc, "embedding", None)
+    if embedding is None or len(embedding) == 0:
+        return None
+    return embedding
+
+
+def document_text(doc: Any) -> str:
+    """Text of a retrieved document in any of the supported formats."""
+    if isinstance(doc, dict):
+        return doc.get("content") or doc.get("page_content") or doc.get("text", "") or ""
+    for attr in ("page_content", "content"):
+        value = getattr(doc, attr, None)
+        if value:
+            return value
+    return str(doc)
+
+
+def cosine_similarity_matrix(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    """Pairwise cosine similarity of row vectors."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.maximum(norms, 1e-12)
+    return matrix @ matrix.T
+
+
+def jaccard_similarity_matrix(texts: Sequence[str]) -> np.ndarray:
+    """Pairwise Jaccard similarity of lowercased word sets."""
+    vocabulary = {}
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for word in set(text.lower().split()):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    terms = np.zeros((len(texts), max(len(vocabulary), 1)), dtype=np.float64)
+    terms[rows, cols] = 1.0
+    intersection = terms @ terms.T
+    sizes = terms.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def similarity_matrix(
+    docs: Sequence[Any],
+    texts: Optional[Sequence[str]] = None,
+    embeddings: Optional[Sequence[Optional[Sequence[float]]]] = None,
+) -> np.ndarray:
+    """
+    Pairwise similarity for ``docs``.
+
+    Args:
+        docs: Retrieved documents (dicts or objects)
+        texts: Texts to use for the Jaccard fallback (default: document text)
+        embeddings: Embeddings aligned with ``docs`` (default: attached ones)
+    """
+    if embeddings is None:
+        embeddings = [document_embedding(doc) for doc in docs]
+    if docs and all(e is not None for e in embeddings):
+        try:
+            return cosine_similarity_matrix(embeddings)
+        except ValueError as e:
+            # Mixed dimensions (e.g. results from different collections)
+            logger.debug(f"Embedding similarity unavailable, using text overlap: {e}")
+    if texts is None:
+        texts = [document_text(doc) for doc in docs]
+    return jaccard_similarity_matrix(texts)
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    similarity: np.ndarray,
+    k: int,
+    diversity: float,
+) -> List[int]:
+    """
+    Indices chosen by MMR, in selection order.
+
+    Args:
+        relevance: Relevance per candidate (comparable scale, e.g. 0-1)
+        similarity: Pairwise candidate similarity matrix
+        k: Number of items to select
+        diversity: λ; 0 = pure relevance, 1 = pure novelty
+
+    Ties go to the lower index.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    n = len(relevance)
+    k = min(k, n)
+    base = (1.0 - diversity) * relevance
+    max_similarity = np.zeros(n, dtype=np.float64)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+
+    for _ in range(k):
+        scores = np.where(available, base - diversity * max_similarity, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+def normalize_scores(scores: Sequence[float]) -> np.ndarray:
+    """Min-max scale scores to 0-1 (all ones when they are equal)."""
+    array = np.asarray(scores, dtype=np.float64)
+    if array.size == 0:
+        return array
+    low, high = array.min(), array.max()
+    if high == low:
+        return np.ones_like(array)
+    return (array - low) / (high - low)
+
+
+def diversify(
+    docs: List[Any],
+    k: int,
+    diversity: float,
+    relevance: Optional[Sequence[float]] = None,
+    embeddings: Optional[Sequence[Optional[Sequence[float]]]] = None,
+    embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+) -> List[Any]:
+    """
+    Reorder a ranked list with MMR and keep the top ``k``.
+
+    Args:
+        docs: Candidates, best first
+        k: Number of documents to return
+        diversity: λ (0 returns ``docs[:k]`` unchanged)
+        relevance: Scores aligned with ``docs`` (default: rank position)
+        embeddings: Embeddings aligned with ``docs`` (default: attached ones)
+        embed_fn: Batch embedder for documents missing an embedding
+
+    Returns:
+        Selected documents in MMR order
+    """
+    if diversity <= 0 or len(docs) <= 1:
+        return docs[:k]
+
+    if relevance is None:
+        relevance = [1.0 - i / len(docs) for i in range(len(docs))]
+    if embeddings is None:
+        embeddings = [document_embedding(doc) for doc in docs]
+
+    missing = [i for i, e in enumerate(embeddings) if e is None]
+    if missing and embed_fn is not None and len(missing) < len(docs):
+        try:
+            computed = embed_fn([document_text(docs[i]) for i in missing])
+            embeddings = list(embeddings)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+        except Exception as e:
+            logger.debug(f"Embedding missing documents for MMR failed: {e}")
+
+    similarity = similarity_matrix(docs, embeddings=embeddings)
+    order = mmr_select(normalize_scores(relevance), similarity, k, diversity)
+    return [docs[i] for i in order]
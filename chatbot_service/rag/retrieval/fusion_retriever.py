@@ -8,6 +8,12 @@ Combines:
 Algorithm:
 RRF Score = 1 / (k + rank_vector) + 1 / (k + rank_bm25)
 
+Keyword search uses the vector store's in-process BM25 index
+(``keyword_search``, see rag/retrieval/bm25_index.py) unless a LangChain
+``bm25_retriever`` is passed. The native index is cheap enough to run on
+every query, so hybrid search is no longer limited to queries that
+``_needs_hybrid_search`` flags.
+
 RAGFlow Enhancement:
 - Implements query cleaning (normalization/tokenization) before BM25
 - Handles medical terminology (hypertension vs hypertensive)
@@ -22,11 +28,15 @@ from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 import numpy as np
 from collections import defaultdict
+import asyncio
 import logging
+import os
 import re
 
 from langchain_core.documents import Document
 
+from rag.retrieval.diversity import diversify
+
 if TYPE_CHECKING:
     from rag.store.chromadb_store import ChromaDBVectorStore
     from rag.store.vector_store import InMemoryVectorStore
@@ -35,6 +45,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# MMR λ applied to fused results (0 = plain RRF order)
+FUSION_MMR_DIVERSITY = float(os.getenv("FUSION_MMR_DIVERSITY", "0.0"))
+# Run keyword search for every query when the vector store has a native BM25 index
+FUSION_ALWAYS_HYBRID = os.getenv("FUSION_ALWAYS_HYBRID", "true").lower() == "true"
+
 
 def clean_query(query: str) -> str:
     """
@@ -137,19 +152,27 @@ class FusionRetriever:
         bm25_retriever=None,  # Optional: Pass a pre-built BM25 retriever
         rrf_k: int = 60,
         use_query_cleaning: bool = True,
-        use_lemmatization: bool = True
+        use_lemmatization: bool = True,
+        diversity: float = FUSION_MMR_DIVERSITY,
+        always_hybrid: bool = FUSION_ALWAYS_HYBRID,
     ):
         self.vector_store = vector_store
         self.bm25_retriever = bm25_retriever
+        # In-process BM25 over the store's chunks (when no retriever is given)
+        self.native_keyword_search = bm25_retriever is None and hasattr(vector_store, "keyword_search")
+        self.always_hybrid = always_hybrid and self.native_keyword_search
         self.rrf_k = rrf_k
         self.use_query_cleaning = use_query_cleaning
         self.use_lemmatization = use_lemmatization
+        self.diversity = diversity
         
         logger.info(
             f"✓ FusionRetriever initialized\n"
             f"  - Query Cleaning: {use_query_cleaning}\n"
             f"  - Lemmatization: {use_lemmatization}\n"
-            f"  - RRF K: {rrf_k}"
+            f"  - RRF K: {rrf_k}\n"
+            f"  - Keyword Search: {'native BM25' if self.native_keyword_search else 'bm25_retriever' if bm25_retriever else 'disabled'}\n"
+            f"  - MMR Diversity: {diversity}"
         )
     
     async def retrieve(
@@ -157,7 +180,8 @@ class FusionRetriever:
         query: str, 
         top_k: int = 5,
         collection_name: str = "medical_knowledge",
-        use_both_methods: bool = True
+        use_both_methods: bool = True,
+        diversity: Optional[float] = None,
     ) -> List[Document]:
         """
         Perform fusion retrieval with optional dual-search.
@@ -165,20 +189,25 @@ class FusionRetriever:
         P2.4 Optimization: Adaptive retrieval based on query characteristics.
         - Drug names, dosages, acronyms → hybrid search (vector + BM25)
         - Conceptual questions → vector-only search (faster)
+        With the native BM25 index (and FUSION_ALWAYS_HYBRID) every query
+        uses hybrid search.
         
         Args:
             query: User query string
             top_k: Number of top results to return
             collection_name: Vector store collection name
             use_both_methods: If True, use both vector and keyword search. If False, only vector.
+            diversity: MMR λ for post-fusion diversification (default: self.diversity)
         
         Returns:
             List of top-k fused documents
         """
+        if diversity is None:
+            diversity = self.diversity
         logger.debug(f"Retrieving for query: {query}")
         
         # P2.4: Adaptive strategy selection
-        if use_both_methods:
+        if use_both_methods and not self.always_hybrid:
             use_both_methods = self._needs_hybrid_search(query)
             if not use_both_methods:
                 logger.debug("P2.4: Using vector-only retrieval (fast path)")
@@ -195,12 +224,19 @@ class FusionRetriever:
             logger.debug(f"Lemmatized query: {clean_q}")
         
         # Step 1: Vector Search (uses original query for semantic understanding)
-        vector_results = await self._vector_search(query, top_k * 2, collection_name)
+        # Search embeddings are kept (by doc key) when diversifying
+        embeddings: Optional[Dict[str, Any]] = {} if diversity > 0 else None
+        vector_search = self._vector_search(query, top_k * 2, collection_name, embeddings)
         
-        # Step 2: Keyword Search (uses cleaned query) - only if needed
+        # Step 2: Keyword Search (uses cleaned query) - only if needed.
+        # It starts first so its worker thread overlaps the vector search.
         keyword_results = []
-        if use_both_methods and self.bm25_retriever:
-            keyword_results = await self._keyword_search(clean_q, top_k * 2)
+        if use_both_methods and (self.bm25_retriever or self.native_keyword_search):
+            keyword_results, vector_results = await asyncio.gather(
+                self._keyword_search(clean_q, top_k * 2, query), vector_search
+            )
+        else:
+            vector_results = await vector_search
         
         # Step 3: Apply RRF if we have results from both methods
         if keyword_results and vector_results:
@@ -212,7 +248,10 @@ class FusionRetriever:
             # Fall back to single method
             fused_results = vector_results or keyword_results
         
-        final_results = fused_results[:top_k]
+        if diversity > 0 and len(fused_results) > top_k:
+            final_results = await self._diversify(fused_results, top_k, diversity, embeddings)
+        else:
+            final_results = fused_results[:top_k]
         
         logger.debug(f"Retrieved {len(final_results)} documents from {len(vector_results)} vector + {len(keyword_results)} keyword results")
         
@@ -254,7 +293,13 @@ class FusionRetriever:
         # Default: vector-only for conceptual queries
         return False
     
-    async def _vector_search(self, query: str, k: int, collection: str) -> List[Document]:
+    async def _vector_search(
+        self,
+        query: str,
+        k: int,
+        collection: str,
+        embeddings: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
         """
         Execute vector search via VectorStore.
         
@@ -262,6 +307,7 @@ class FusionRetriever:
             query: Original query (for semantic understanding)
             k: Number of results to retrieve
             collection: Collection name in vector store
+            embeddings: If given, filled with doc key -> stored embedding
         
         Returns:
             List of Document objects ranked by semantic similarity
@@ -269,7 +315,12 @@ class FusionRetriever:
         try:
             # Assuming VectorStore has a method that returns Documents
             # Adapting to the existing VectorStore interface
-            results = self.vector_store.search_medical_knowledge(query, top_k=k)
+            if embeddings is not None:
+                results = self.vector_store.search_medical_knowledge(
+                    query, top_k=k, include_embeddings=True
+                )
+            else:
+                results = self.vector_store.search_medical_knowledge(query, top_k=k)
             
             # Convert dict results to Documents if needed
             documents = []
@@ -281,6 +332,8 @@ class FusionRetriever:
                         metadata=r.get("metadata", {})
                     )
                     documents.append(doc)
+                    if embeddings is not None and r.get("embedding") is not None:
+                        embeddings[self._doc_key(doc)] = r["embedding"]
                 else:
                     documents.append(r)
             
@@ -291,24 +344,44 @@ class FusionRetriever:
             logger.error(f"Vector search failed: {e}")
             return []
 
-    async def _keyword_search(self, clean_query: str, k: int) -> List[Document]:
+    async def _keyword_search(
+        self, clean_query: str, k: int, query: Optional[str] = None
+    ) -> List[Document]:
         """
         Execute keyword search via BM25.
         
+        The native index tokenizes ``query`` with the same medical tokenizer
+        used for indexing (hyphenated terms and dosage units stay intact), so
+        it gets the raw query; a LangChain ``bm25_retriever`` gets the
+        cleaned one. Both run off the event loop.
+        
         Args:
             clean_query: Cleaned/normalized query string
             k: Number of results to retrieve
+            query: Original query string (native index)
         
         Returns:
             List of Document objects ranked by BM25 score
         """
         try:
-            # This assumes bm25_retriever follows LangChain Retriever interface
-            if not self.bm25_retriever:
+            if self.bm25_retriever:
+                # This assumes bm25_retriever follows LangChain Retriever interface
+                results = await asyncio.to_thread(
+                    self.bm25_retriever.get_relevant_documents, clean_query
+                )
+                results = results[:k]
+            elif self.native_keyword_search:
+                # Top-k selection happens inside the index (MaxScore pruning)
+                hits = await asyncio.to_thread(
+                    self.vector_store.keyword_search, query or clean_query, k
+                )
+                results = [
+                    Document(page_content=r.get("content", ""), metadata=r.get("metadata", {}))
+                    for r in hits
+                ]
+            else:
                 return []
             
-            results = self.bm25_retriever.get_relevant_documents(clean_query)[:k]
-            
             logger.debug(f"Keyword search returned {len(results)} results")
             return results
             
@@ -344,10 +417,7 @@ class FusionRetriever:
         for result_set in result_sets:
             for rank, doc in enumerate(result_set):
                 # Use content as unique key (or doc_id if available)
-                doc_key = doc.page_content if hasattr(doc, 'page_content') else str(doc)
-                
-                if "id" in getattr(doc, 'metadata', {}):
-                    doc_key = doc.metadata["id"]
+                doc_key = self._doc_key(doc)
                 
                 doc_map[doc_key] = doc
                 rrf_score = 1 / (k + rank + 1)
@@ -361,3 +431,26 @@ class FusionRetriever:
         logger.debug(f"RRF fused {sum(len(rs) for rs in result_sets)} results -> {len(fused_docs)} unique documents")
         
         return fused_docs
+
+    @staticmethod
+    def _doc_key(doc) -> str:
+        """Unique key for a result: metadata id if available, else content."""
+        if "id" in getattr(doc, 'metadata', {}):
+            return doc.metadata["id"]
+        return doc.page_content if hasattr(doc, 'page_content') else str(doc)
+
+    async def _diversify(
+        self,
+        docs: List[Document],
+        top_k: int,
+        diversity: float,
+        embeddings: Optional[Dict[str, Any]],
+    ) -> List[Document]:
+        """MMR over the fused list, reusing vector-search embeddings."""
+        aligned = [(embeddings or {}).get(self._doc_key(doc)) for doc in docs]
+        embedding_service = getattr(self.vector_store, "embedding_service", None)
+        embed_fn = getattr(embedding_service, "embed_batch", None)
+        # Keyword-only hits may need embedding; keep that off the event loop
+        return await asyncio.to_thread(
+            diversify, docs, top_k, diversity, None, aligned, embed_fn
+        )
@@ -59,3 +59,6 @@ class MedicalDocument:
     keywords: Optional[List[str]] = field(default_factory=list)
     related_conditions: Optional[List[str]] = field(default_factory=list)
     clinical_context: Optional[str] = None
+
+    # Vector-search embedding, when the store returns it (reused for MMR)
+    embedding: Optional[List[float]] = field(default=None, repr=False)
@@ -0,0 +1,299 @@
+"""
+Cross-Encoder Scoring Service - Batched, cached reranker inference
+
+Cross-encoder inference is the largest CPU cost of a RAG query on GPU-less
+nodes. This service sits between MedicalReranker and the model:
+
+- Score cache: LRU keyed by (query hash, doc id, direction), so pairs seen
+  by earlier requests are never re-scored.
+- Cross-request batching: misses from concurrent requests are queued and a
+  dedicated scoring thread drains them into one ``predict`` call (up to
+  RERANK_MAX_BATCH pairs, waiting at most RERANK_BATCH_WINDOW_MS for more).
+  Identical pairs within a batch are scored once.
+- Dedicated executor: inference never runs on the calling thread or the
+  event loop; sync callers block on a future, async callers await it.
+- Queue depth (pairs waiting for a batch) is published as the
+  ``rag_rerank_queue_depth`` gauge.
+
+Usage:
+    service = CrossEncoderScoringService(model.predict)
+    scores = service.score(query, [(doc_id, text), ...])          # sync
+    scores = await service.ascore(query, [(doc_id, text), ...])   # async
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.services.performance_monitor import record_rerank_batch, record_rerank_queue_depth
+
+logger = logging.getLogger(__name__)
+
+# Maximum pairs scored in one model call across all waiting requests
+RERANK_MAX_BATCH = int(os.getenv("RERANK_MAX_BATCH", "64"))
+# How long the scoring thread waits for more requests before running a batch
+RERANK_BATCH_WINDOW_MS = float(os.getenv("RERANK_BATCH_WINDOW_MS", "3"))
+# Cached (query, doc, direction) scores
+RERANK_SCORE_CACHE_SIZE = int(os.getenv("RERANK_SCORE_CACHE_SIZE", "20000"))
+
+# predict(pairs) -> sequence of float scores, one per [text_a, text_b] pair
+PredictFn = Callable[[List[List[str]]], Sequence[float]]
+ScoreKey = Tuple[str, str, bool]
+
+_STOP = object()
+
+
+def text_digest(text: str) -> str:
+    """Stable short digest used for query hashes and content-derived doc ids."""
+    return hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=12).hexdigest()
+
+
+class _ScoreRequest:
+    """Pairs from one rerank call waiting to be scored."""
+
+    __slots__ = ("keys", "pairs", "future")
+
+    def __init__(self, keys: List[ScoreKey], pairs: List[List[str]]):
+        self.keys = keys
+        self.pairs = pairs
+        self.future: Future = Future()
+
+
+class CrossEncoderScoringService:
+    """
+    Batches and caches cross-encoder scoring on a dedicated thread.
+
+    Args:
+        predict: Model scoring function for a list of text pairs
+        max_batch: Maximum pairs per model call
+        window_ms: Time to wait for more requests before scoring
+        cache_size: Number of cached pair scores
+    """
+
+    def __init__(
+        self,
+        predict: PredictFn,
+        max_batch: int = RERANK_MAX_BATCH,
+        window_ms: float = RERANK_BATCH_WINDOW_MS,
+        cache_size: int = RERANK_SCORE_CACHE_SIZE,
+    ):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[ScoreKey, float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._queued_pairs = 0
+        self._depth_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.stats = {"requests": 0, "pairs": 0, "cache_hits": 0, "batches": 0, "scored": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def score(
+        self,
+        query: str,
+        documents: Sequence[Tuple[str, str]],
+        bidirectional: bool = False,
+    ) -> List[float]:
+        """
+        Score (query, document) pairs, blocking until they are available.
+
+        Args:
+            query: Query text (already cleaned/truncated)
+            documents: (doc_id, text) pairs
+            bidirectional: Average with the (doc, query) score
+
+        Returns:
+            One score per document, in input order
+        """
+        keys, scores, request = self._lookup(query, documents, bidirectional)
+        if request is not None:
+            self._fill(keys, scores, request.keys, request.future.result())
+        return self._combine(scores, len(documents), bidirectional)
+
+    async def ascore(
+        self,
+        query: str,
+        documents: Sequence[Tuple[str, str]],
+        bidirectional: bool = False,
+    ) -> List[float]:
+        """Async variant of :meth:`score`; the event loop is never blocked."""
+        keys, scores, request = self._lookup(query, documents, bidirectional)
+        if request is not None:
+            results = await asyncio.wrap_future(request.future)
+            self._fill(keys, scores, request.keys, results)
+        return self._combine(scores, len(documents), bidirectional)
+
+    @property
+    def queue_depth(self) -> int:
+        """Pairs waiting to be scored."""
+        return self._queued_pairs
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def close(self, timeout: float = 5.0):
+        """Score whatever is queued and stop the scoring thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "queue_depth": self._queued_pairs, "cache_entries": len(self._cache)}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _lookup(self, query: str, documents, bidirectional: bool):
+        """Resolve cached scores; queue a request for the rest."""
+        query_hash = text_digest(query)
+        keys: List[ScoreKey] = []
+        pairs: List[List[str]] = []
+        for doc_id, text in documents:
+            keys.append((query_hash, doc_id, False))
+            pairs.append([query, text])
+        if bidirectional:
+            for doc_id, text in documents:
+                keys.append((query_hash, doc_id, True))
+                pairs.append([text, query])
+
+        scores: List[Optional[float]] = [None] * len(keys)
+        missing_keys: List[ScoreKey] = []
+        missing_pairs: List[List[str]] = []
+        seen = set()
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    scores[i] = cached
+                elif key not in seen:
+                    seen.add(key)
+                    missing_keys.append(key)
+                    missing_pairs.append(pairs[i])
+
+        hits = len(keys) - sum(1 for s in scores if s is None)
+        self.stats["requests"] += 1
+        self.stats["pairs"] += len(keys)
+        self.stats["cache_hits"] += hits
+
+        request = None
+        if missing_keys:
+            request = _ScoreRequest(missing_keys, missing_pairs)
+            self._submit(request)
+        return keys, scores, request
+
+    def _fill(self, keys: List[ScoreKey], scores: List[Optional[float]], new_keys, new_scores):
+        fresh = dict(zip(new_keys, new_scores))
+        for i, key in enumerate(keys):
+            if scores[i] is None:
+                scores[i] = fresh[key]
+
+    def _store(self, keys: Sequence[ScoreKey], scores: Sequence[float]):
+        with self._cache_lock:
+            for key, value in zip(keys, scores):
+                self._cache[key] = value
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _combine(scores: List[float], count: int, bidirectional: bool) -> List[float]:
+        if not bidirectional:
+            return scores
+        return [(scores[i] + scores[count + i]) / 2.0 for i in range(count)]
+
+    # ------------------------------------------------------------------
+    # Scoring thread
+    # ------------------------------------------------------------------
+
+    def _submit(self, request: _ScoreRequest):
+        self._ensure_started()
+        self._adjust_depth(len(request.pairs))
+        self._queue.put(request)
+
+    def _adjust_depth(self, delta: int):
+        with self._depth_lock:
+            self._queued_pairs += delta
+            depth = self._queued_pairs
+        record_rerank_queue_depth(depth)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="rerank-scorer", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self, first: _ScoreRequest) -> List[_ScoreRequest]:
+        batch = [first]
+        size = len(first.pairs)
+        deadline = time.monotonic() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+            size += len(item.pairs)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = self._collect(first)
+            self._adjust_depth(-sum(len(r.pairs) for r in batch))
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: List[_ScoreRequest]):
+        # Deduplicate pairs shared by concurrent requests
+        positions: Dict[ScoreKey, int] = {}
+        pairs: List[List[str]] = []
+        for request in batch:
+            for key, pair in zip(request.keys, request.pairs):
+                if key not in positions:
+                    positions[key] = len(pairs)
+                    pairs.append(pair)
+
+        started = time.perf_counter()
+        try:
+            raw = self.predict(pairs)
+            scores = [float(s) for s in raw]
+        except Exception as e:
+            logger.error(f"Cross-encoder batch of {len(pairs)} pairs failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        self._store(list(positions), scores)
+        self.stats["batches"] += 1
+        self.stats["scored"] += len(pairs)
+        record_rerank_batch(len(pairs), len(batch), (time.perf_counter() - started) * 1000)
+
+        for request in batch:
+            request.future.set_result([scores[positions[key]] for key in request.keys])
@@ -12,10 +12,13 @@ Key Features:
 - Batch size: 32 (prevents GPU memory issues)
 - Token truncation: Applied before model input
 - Fallback: Returns original ranking if reranker unavailable
+- Scoring: cached and batched across concurrent requests on a dedicated
+  thread (rag/retrieval/rerank_service.py); optional ONNX/int8 backend
 """
 
 
 import logging
+import os
 import time
 from typing import List, Dict, Optional
 import numpy as np
@@ -23,6 +26,17 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 from core.services.performance_monitor import record_rerank_operation
+from core.observability.tracing import traced, SpanType
+from rag.retrieval.rerank_service import CrossEncoderScoringService, text_digest
+from rag.retrieval.diversity import mmr_select, normalize_scores, similarity_matrix
+
+# Inference backend: "torch", or "onnx"/"openvino" for CPU-only nodes
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "torch")
+# Model file for non-torch backends, e.g. "onnx/model_qint8_avx512_vnni.onnx"
+RERANKER_ONNX_FILE = os.getenv("RERANKER_ONNX_FILE", "")
+# Also score (doc, query); doubles inference cost. MS-MARCO cross-encoders
+# are trained query-first, so this is off unless explicitly enabled.
+RERANK_BIDIRECTIONAL = os.getenv("RERANK_BIDIRECTIONAL", "false").lower() == "true"
 
 # Try to import sentence-transformers for cross-encoder
 try:
@@ -46,6 +60,11 @@ class MedicalReranker:
     - Token truncation (max_length=512)
     - Batch processing to prevent OOM
     - Graceful fallback on errors
+
+    Scoring goes through a CrossEncoderScoringService: pair scores are
+    cached and misses from concurrent requests are batched on a dedicated
+    scoring thread. Set RERANKER_BACKEND=onnx (and RERANKER_ONNX_FILE, see
+    export_quantized_onnx) for ONNX Runtime / int8 inference on CPU.
     """
 
     # RAGFlow-inspired configuration constants
@@ -60,7 +79,9 @@ class MedicalReranker:
         model_name: str = "models/cross-encoder_model",
         max_length: int = MAX_LENGTH,
         batch_size: int = BATCH_SIZE,
-        device: str = "cpu"
+        device: str = "cpu",
+        backend: str = RERANKER_BACKEND,
+        onnx_file: str = RERANKER_ONNX_FILE,
     ):
         """
         Initialize medical reranker with configurable parameters.
@@ -70,12 +91,16 @@ class MedicalReranker:
             max_length: Maximum token length for model input (default 512)
             batch_size: Batch size for processing documents (default 32)
             device: Device to use for inference - "cpu" or "cuda" (default "cpu")
+            backend: "torch", "onnx" or "openvino" (non-torch needs sentence-transformers >= 4.1)
+            onnx_file: Model file inside the model folder, e.g. "onnx/model_qint8_avx512_vnni.onnx"
         """
         self.model_name = model_name
         self.max_length = max_length
         self.batch_size = batch_size
         self.device = device
+        self.backend = "torch"
         self.model = None
+        self.scorer: Optional[CrossEncoderScoringService] = None
 
         if not CROSS_ENCODER_AVAILABLE:
             logger.warning(
@@ -87,10 +112,12 @@ class MedicalReranker:
         try:
             # CHANGE: Added explicit local_files_only=True check if you want to force offline mode,
             # but usually passing the path is enough for sentence-transformers to detect it.
-            self.model = CrossEncoder(model_name, device=device)
+            self.model = self._load_model(backend, onnx_file)
+            self.scorer = CrossEncoderScoringService(self._predict)
             logger.info(
                 f"✓ Medical reranker initialized\n"
                 f"  - Model: {model_name}\n"
+                f"  - Backend: {self.backend}\n"
                 f"  - Max Length: {max_length}\n"
                 f"  - Batch Size: {batch_size}\n"
                 f"  - Device: {device}"
@@ -99,6 +126,37 @@ class MedicalReranker:
             logger.error(f"Failed to initialize cross-encoder: {e}")
             self.model = None
 
+    def _load_model(self, backend: str, onnx_file: str):
+        """Load the cross-encoder, falling back to torch if the backend is unsupported."""
+        if backend and backend != "torch":
+            kwargs = {"model_kwargs": {"file_name": onnx_file}} if onnx_file else {}
+            try:
+                model = CrossEncoder(
+                    self.model_name,
+                    device=self.device,
+                    max_length=self.max_length,
+                    backend=backend,
+                    **kwargs,
+                )
+                self.backend = backend
+                return model
+            except TypeError:
+                logger.warning(
+                    f"Installed sentence-transformers does not support backend='{backend}' "
+                    "for cross-encoders; using torch"
+                )
+        return CrossEncoder(self.model_name, device=self.device, max_length=self.max_length)
+
+    def _predict(self, pairs: List[List[str]]) -> List[float]:
+        """Model call used by the scoring thread."""
+        scores = self.model.predict(
+            pairs,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+        return np.asarray(scores, dtype=np.float32).ravel().tolist()
+
     def _truncate_text(self, text: str, max_chars: int = 1200) -> str:
         """
         Truncate text to prevent token explosion in the model.
@@ -128,13 +186,14 @@ class MedicalReranker:
         
         return text
 
+    @traced("rerank", SpanType.RERANK)
     def rerank(
         self,
         query: str,
         documents: List[Dict],
         top_k: int = 5,
         show_progress: bool = False,
-        bidirectional: bool = True,
+        bidirectional: Optional[bool] = None,
         diversity_penalty: float = 0.1,
         temperature: float = 1.0
     ) -> List[Dict]:
@@ -145,7 +204,7 @@ class MedicalReranker:
         - Token truncation before model input
         - Batch processing to prevent OOM
         - Graceful fallback on errors
-        - Bidirectional scoring (query→doc AND doc→query)
+        - Optional bidirectional scoring (query→doc AND doc→query)
         - Temperature-scaled confidence calibration
         - MMR-based diversity penalty
 
@@ -153,8 +212,9 @@ class MedicalReranker:
             query: User query string
             documents: List of retrieved docs with 'content' or 'page_content' field
             top_k: Number of top results to return
-            show_progress: Whether to show progress bar during inference
-            bidirectional: If True, score both (query,doc) and (doc,query) and average
+            show_progress: Unused; scoring runs batched on the scoring thread
+            bidirectional: Also score (doc, query) and average; doubles inference
+                cost (default RERANK_BIDIRECTIONAL)
             diversity_penalty: MMR lambda for penalizing similar documents (0=no penalty, 1=max)
             temperature: Temperature for score calibration (lower = more confident)
 
@@ -164,219 +224,205 @@ class MedicalReranker:
         start_time = time.time()
 
         try:
-            # Early return if model not available or no documents
-            if not self.model or not documents:
-                logger.warning("Reranker unavailable or no documents provided")
+            prepared = self._prepare(query, documents)
+            if prepared is None:
                 return documents[:top_k] if documents else []
+            clean_query, valid_docs, doc_contents, doc_ids = prepared
 
-            # LATENCY OPTIMIZATION: Skip reranking for small result sets (negligible benefit)
-            if len(documents) <= 3:
-                logger.debug(f"Skipping reranking: only {len(documents)} documents (threshold=3)")
-                return documents[:top_k]
+            if bidirectional is None:
+                bidirectional = RERANK_BIDIRECTIONAL
+            scores = self.scorer.score(clean_query, list(zip(doc_ids, doc_contents)), bidirectional)
 
-            # Step 1: Clean and truncate query (RAGFlow practice)
-            clean_query = self._truncate_text(query, self.QUERY_MAX_LENGTH)
-            if not clean_query:
-                return documents[:top_k]
+            return self._select(
+                documents, valid_docs, doc_contents, scores,
+                top_k, bidirectional, diversity_penalty, temperature
+            )
 
-            # Step 2: Extract and truncate document content
-            pairs_forward = []  # (query, doc) pairs
-            pairs_reverse = []  # (doc, query) pairs for bidirectional
-            valid_docs = []
-            doc_contents = []  # Store for diversity calculation
+        except Exception as e:
+            logger.error(f"Reranking failed: {e}", exc_info=True)
+            # Graceful fallback: return original ranking
+            elapsed_ms = (time.time() - start_time) * 1000
+            record_rerank_operation(elapsed_ms, error=True)
+            return documents[:top_k]
 
-            for doc in documents:
-                # Handle different document formats
-                if isinstance(doc, dict):
-                    content = doc.get("content") or doc.get("page_content") or doc.get("text", "")
-                elif hasattr(doc, "page_content"):
-                    content = doc.page_content
-                elif hasattr(doc, "content"):
-                    content = doc.content
-                else:
-                    content = str(doc)
-
-                # Truncate document content (RAGFlow safety check)
-                clean_content = self._truncate_text(content, self.DOC_MAX_LENGTH)
-
-                if clean_content:  # Only include non-empty documents
-                    pairs_forward.append([clean_query, clean_content])
-                    if bidirectional:
-                        pairs_reverse.append([clean_content, clean_query])
-                    valid_docs.append(doc)
-                    doc_contents.append(clean_content)
-
-            if not pairs_forward:
-                logger.warning("No valid document-query pairs for reranking")
-                return documents[:top_k]
-
-            # Step 3: Process in batches to prevent OOM (RAGFlow pattern)
-            all_scores_forward = []
-            all_scores_reverse = []
-
-            for batch_idx in range(0, len(pairs_forward), self.batch_size):
-                batch_end = min(batch_idx + self.batch_size, len(pairs_forward))
-                batch_pairs = pairs_forward[batch_idx:batch_end]
-
-                try:
-                    # Score forward batch (query → doc)
-                    batch_scores = self.model.predict(
-                        batch_pairs,
-                        batch_size=self.batch_size,
-                        show_progress_bar=show_progress,
-                        convert_to_numpy=True,
-                        max_length=self.max_length
-                    )
-
-                    # Ensure scores are numpy array
-                    if not isinstance(batch_scores, np.ndarray):
-                        batch_scores = np.array(batch_scores)
-
-                    all_scores_forward.extend(batch_scores.tolist())
-
-                    # Score reverse batch if bidirectional (doc → query)
-                    if bidirectional:
-                        reverse_batch = pairs_reverse[batch_idx:batch_end]
-                        reverse_scores = self.model.predict(
-                            reverse_batch,
-                            batch_size=self.batch_size,
-                            show_progress_bar=False,
-                            convert_to_numpy=True,
-                            max_length=self.max_length
-                        )
-                        if not isinstance(reverse_scores, np.ndarray):
-                            reverse_scores = np.array(reverse_scores)
-                        all_scores_reverse.extend(reverse_scores.tolist())
-
-                    logger.debug(f"Processed batch {batch_idx // self.batch_size + 1}/{(len(pairs_forward) + self.batch_size - 1) // self.batch_size}")
-
-                except RuntimeError as e:
-                    # Handle OOM or other runtime errors
-                    if "cuda" in str(e).lower() or "memory" in str(e).lower():
-                        logger.error(f"GPU memory error during reranking: {e}. Falling back to original ranking.")
-                        elapsed_ms = (time.time() - start_time) * 1000
-                        record_rerank_operation(elapsed_ms, error=True)
-                        return documents[:top_k]
-                    raise
-
-            # Step 4: Combine scores with calibration
-            final_scores = []
-            for i, (forward_score) in enumerate(all_scores_forward):
-                if bidirectional and all_scores_reverse:
-                    # Average forward and reverse scores
-                    combined = (forward_score + all_scores_reverse[i]) / 2.0
-                else:
-                    combined = forward_score
-                
-                # Apply temperature calibration (softmax-style normalization later)
-                calibrated = combined / temperature
-                final_scores.append(calibrated)
-            
-            # Normalize scores to 0-1 range for MMR calculation
-            scores_array = np.array(final_scores)
-            if scores_array.max() != scores_array.min():
-                normalized_scores = (scores_array - scores_array.min()) / (scores_array.max() - scores_array.min())
-            else:
-                normalized_scores = np.ones_like(scores_array)
-            
-            # Step 5: MMR-style diversity-aware selection
-            if diversity_penalty > 0 and top_k < len(valid_docs):
-                selected_indices = []
-                selected_contents = []
-                remaining_indices = list(range(len(valid_docs)))
-                
-                for _ in range(min(top_k, len(valid_docs))):
-                    best_idx = None
-                    best_mmr_score = float('-inf')
-                    
-                    for idx in remaining_indices:
-                        relevance = normalized_scores[idx]
-                        
-                        # Calculate max similarity to already selected docs
-                        max_sim = 0.0
-                        if selected_contents:
-                            doc_content = doc_contents[idx]
-                            for sel_content in selected_contents:
-                                # Simple Jaccard similarity as proxy
-                                words1 = set(doc_content.lower().split())
-                                words2 = set(sel_content.lower().split())
-                                if words1 or words2:
-                                    sim = len(words1 & words2) / len(words1 | words2) if (words1 | words2) else 0
-                                    max_sim = max(max_sim, sim)
-                        
-                        # MMR score: λ * relevance - (1-λ) * max_similarity
-                        mmr_score = (1 - diversity_penalty) * relevance - diversity_penalty * max_sim
-                        
-                        if mmr_score > best_mmr_score:
-                            best_mmr_score = mmr_score
-                            best_idx = idx
-                    
-                    if best_idx is not None:
-                        selected_indices.append(best_idx)
-                        selected_contents.append(doc_contents[best_idx])
-                        remaining_indices.remove(best_idx)
-                
-                # Assign final scores to selected docs
-                result = []
-                for rank, idx in enumerate(selected_indices):
-                    doc = valid_docs[idx]
-                    if isinstance(doc, dict):
-                        doc["rerank_score"] = float(final_scores[idx])
-                        doc["diversity_rank"] = rank + 1
-                    else:
-                        if not hasattr(doc, "metadata"):
-                            doc.metadata = {}
-                        doc.metadata["rerank_score"] = float(final_scores[idx])
-                        doc.metadata["diversity_rank"] = rank + 1
-                    result.append(doc)
-            else:
-                # Standard sorting without diversity
-                for doc, score in zip(valid_docs, final_scores):
-                    if isinstance(doc, dict):
-                        doc["rerank_score"] = float(score)
-                    else:
-                        if not hasattr(doc, "metadata"):
-                            doc.metadata = {}
-                        doc.metadata["rerank_score"] = float(score)
-
-                sorted_docs = sorted(
-                    valid_docs,
-                    key=lambda x: (
-                        x.get("rerank_score") if isinstance(x, dict)
-                        else x.metadata.get("rerank_score", 0)
-                    ),
-                    reverse=True
-                )
-                result = sorted_docs[:top_k]
-
-            # Log statistics
-            if result:
-                scores_in_result = [
-                    d.get("rerank_score") if isinstance(d, dict) else d.metadata.get("rerank_score")
-                    for d in result
-                ]
-                min_score = min(scores_in_result)
-                max_score = max(scores_in_result)
-                logger.info(
-                    f"✓ Reranked {len(documents)} docs → {len(result)} returned "
-                    f"(bidirectional={bidirectional}, diversity={diversity_penalty:.2f}, "
-                    f"score range: {min_score:.3f}-{max_score:.3f})"
-                )
+        finally:
+            # Record performance metrics (RAGFlow practice)
+            elapsed_ms = (time.time() - start_time) * 1000
+            record_rerank_operation(elapsed_ms)
 
-            return result
+    @traced("rerank", SpanType.RERANK)
+    async def arerank(
+        self,
+        query: str,
+        documents: List[Dict],
+        top_k: int = 5,
+        bidirectional: Optional[bool] = None,
+        diversity_penalty: float = 0.1,
+        temperature: float = 1.0
+    ) -> List[Dict]:
+        """
+        Async variant of :meth:`rerank`.
+
+        Inference runs on the scoring thread; the event loop only awaits the
+        batch result.
+        """
+        start_time = time.time()
+
+        try:
+            prepared = self._prepare(query, documents)
+            if prepared is None:
+                return documents[:top_k] if documents else []
+            clean_query, valid_docs, doc_contents, doc_ids = prepared
+
+            if bidirectional is None:
+                bidirectional = RERANK_BIDIRECTIONAL
+            scores = await self.scorer.ascore(
+                clean_query, list(zip(doc_ids, doc_contents)), bidirectional
+            )
+
+            return self._select(
+                documents, valid_docs, doc_contents, scores,
+                top_k, bidirectional, diversity_penalty, temperature
+            )
 
         except Exception as e:
             logger.error(f"Reranking failed: {e}", exc_info=True)
-            # Graceful fallback: return original ranking
             elapsed_ms = (time.time() - start_time) * 1000
             record_rerank_operation(elapsed_ms, error=True)
             return documents[:top_k]
 
         finally:
-            # Record performance metrics (RAGFlow practice)
             elapsed_ms = (time.time() - start_time) * 1000
             record_rerank_operation(elapsed_ms)
 
+    def _prepare(self, query: str, documents: List[Dict]):
+        """
+        Clean the query and extract truncated document texts.
+
+        Returns:
+            (clean_query, valid_docs, doc_contents, doc_ids), or None when
+            the original ranking should be returned unchanged
+        """
+        # Early return if model not available or no documents
+        if not self.model or not documents:
+            logger.warning("Reranker unavailable or no documents provided")
+            return None
+
+        # LATENCY OPTIMIZATION: Skip reranking for small result sets (negligible benefit)
+        if len(documents) <= 3:
+            logger.debug(f"Skipping reranking: only {len(documents)} documents (threshold=3)")
+            return None
+
+        # Step 1: Clean and truncate query (RAGFlow practice)
+        clean_query = self._truncate_text(query, self.QUERY_MAX_LENGTH)
+        if not clean_query:
+            return None
+
+        # Step 2: Extract and truncate document content
+        valid_docs = []
+        doc_contents = []  # Store for diversity calculation
+        doc_ids = []
+
+        for doc in documents:
+            # Handle different document formats
+            if isinstance(doc, dict):
+                content = doc.get("content") or doc.get("page_content") or doc.get("text", "")
+            elif hasattr(doc, "page_content"):
+                content = doc.page_content
+            elif hasattr(doc, "content"):
+                content = doc.content
+            else:
+                content = str(doc)
+
+            # Truncate document content (RAGFlow safety check)
+            clean_content = self._truncate_text(content, self.DOC_MAX_LENGTH)
+
+            if clean_content:  # Only include non-empty documents
+                valid_docs.append(doc)
+                doc_contents.append(clean_content)
+                # Content digest as the cache id: stays correct if a chunk
+                # is re-ingested with new text under the same id
+                doc_ids.append(text_digest(clean_content))
+
+        if not valid_docs:
+            logger.warning("No valid document-query pairs for reranking")
+            return None
+
+        return clean_query, valid_docs, doc_contents, doc_ids
+
+    def _select(
+        self,
+        documents: List[Dict],
+        valid_docs: List,
+        doc_contents: List[str],
+        scores: List[float],
+        top_k: int,
+        bidirectional: bool,
+        diversity_penalty: float,
+        temperature: float,
+    ) -> List[Dict]:
+        """Calibrate scores and pick the top-k (MMR when diversity is requested)."""
+        # Step 4: Apply temperature calibration (scores are already
+        # forward/reverse averaged when bidirectional)
+        final_scores = [score / temperature for score in scores]
+        
+        # Step 5: MMR-style diversity-aware selection
+        if diversity_penalty > 0 and top_k < len(valid_docs):
+            # Search embeddings when the results carry them, else word overlap
+            similarity = similarity_matrix(valid_docs, texts=doc_contents)
+            selected_indices = mmr_select(
+                normalize_scores(final_scores), similarity, top_k, diversity_penalty
+            )
+            
+            # Assign final scores to selected docs
+            result = []
+            for rank, idx in enumerate(selected_indices):
+                doc = valid_docs[idx]
+                if isinstance(doc, dict):
+                    doc["rerank_score"] = float(final_scores[idx])
+                    doc["diversity_rank"] = rank + 1
+                else:
+                    if not hasattr(doc, "metadata"):
+                        doc.metadata = {}
+                    doc.metadata["rerank_score"] = float(final_scores[idx])
+                    doc.metadata["diversity_rank"] = rank + 1
+                result.append(doc)
+        else:
+            # Standard sorting without diversity
+            for doc, score in zip(valid_docs, final_scores):
+                if isinstance(doc, dict):
+                    doc["rerank_score"] = float(score)
+                else:
+                    if not hasattr(doc, "metadata"):
+                        doc.metadata = {}
+                    doc.metadata["rerank_score"] = float(score)
+
+            sorted_docs = sorted(
+                valid_docs,
+                key=lambda x: (
+                    x.get("rerank_score") if isinstance(x, dict)
+                    else x.metadata.get("rerank_score", 0)
+                ),
+                reverse=True
+            )
+            result = sorted_docs[:top_k]
+
+        # Log statistics
+        if result:
+            scores_in_result = [
+                d.get("rerank_score") if isinstance(d, dict) else d.metadata.get("rerank_score")
+                for d in result
+            ]
+            min_score = min(scores_in_result)
+            max_score = max(scores_in_result)
+            logger.info(
+                f"✓ Reranked {len(documents)} docs → {len(result)} returned "
+                f"(bidirectional={bidirectional}, diversity={diversity_penalty:.2f}, "
+                f"score range: {min_score:.3f}-{max_score:.3f})"
+            )
+
+        return result
+
     def is_available(self) -> bool:
         """Check if reranker model is available and ready."""
         return self.model is not None
@@ -388,10 +434,42 @@ class MedicalReranker:
             "max_length": self.max_length,
             "batch_size": self.batch_size,
             "device": self.device,
-            "available": self.is_available()
+            "backend": self.backend,
+            "available": self.is_available(),
+            "scoring": self.scorer.get_stats() if self.scorer else None,
         }
 
 
+def export_quantized_onnx(
+    model_name: str,
+    quantization: str = "avx512_vnni",
+) -> str:
+    """
+    Export a cross-encoder to ONNX with dynamic int8 quantization for CPU.
+
+    Writes ``onnx/model_qint8_<quantization>.onnx`` into the model folder;
+    serve it with RERANKER_BACKEND=onnx and RERANKER_ONNX_FILE set to the
+    returned path. Requires sentence-transformers >= 4.1 with the
+    ``onnx`` extra (optimum, onnxruntime).
+
+    Args:
+        model_name: Local model folder (the export is written into it)
+        quantization: "arm64", "avx2", "avx512" or "avx512_vnni"
+
+    Returns:
+        Model file path relative to the model folder
+    """
+    if not CROSS_ENCODER_AVAILABLE:
+        raise RuntimeError("sentence-transformers is required to export the reranker")
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    model = CrossEncoder(model_name, backend="onnx")
+    export_dynamic_quantized_onnx_model(model, quantization, model_name)
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    logger.info(f"Exported quantized reranker: {model_name}/{file_name}")
+    return file_name
+
+
 class LLMReranker:
     """LLM-based document reranking for Phase 1.3."""
     
@@ -401,6 +479,7 @@ class LLMReranker:
         self.k = k
         self.rerank_threshold = rerank_threshold
     
+    @traced("rerank_llm", SpanType.RERANK)
     async def rerank(self, query: str, documents: List[Dict], k: int = None) -> List[Dict]:
         """Rerank documents by LLM relevance judgment."""
         
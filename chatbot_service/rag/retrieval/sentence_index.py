@@ -0,0 +1,224 @@
+"""
+Precomputed Sentence / Term Index for Extractive Compression.
+
+Extractive compression used to re-split, lowercase and regex-scan every
+chunk on every query. The query-independent part of that work is done once
+per chunk instead:
+
+- Sentence and paragraph boundaries (character spans)
+- Medical-term spans (PRESERVE_PATTERNS matches) and low-priority flags
+- Per-sentence token sets and static scores (term and length components)
+
+At query time scoring is a single pass of set intersections plus
+precomputed constants.
+
+The index is built at ingestion and stored in chunk metadata as compact
+JSON (spans only; token sets are rebuilt on load), and kept in an
+in-process sidecar cache keyed by content hash for chunks indexed before
+this existed.
+"""
+
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from core.cache import MISSING, MemoryTier
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+METADATA_KEY = "sentence_index"
+
+# Medical and pharmaceutical terms to always preserve
+PRESERVE_PATTERNS = [
+    r'\b\d+\s*(?:mg|mcg|ml|mL|g|kg|mmHg|bpm)\b',  # Dosages and measurements
+    r'\b(?:daily|twice|three times|weekly|monthly|as needed|PRN)\b',  # Frequencies
+    r'\b(?:contraindicated|warning|caution|avoid|monitor|adjust)\b',  # Safety terms
+    r'\b(?:recommended|first-line|standard|guideline)\b',  # Recommendations
+    r'\b(?:side effect|adverse|interaction|contraindication)\b',  # Medical concepts
+]
+
+# Sentence patterns to deprioritize
+LOW_PRIORITY_PATTERNS = [
+    r'^(?:In this|This article|We will|Here we|As mentioned)',
+    r'(?:for more information|see also|refer to)',
+    r'^(?:Furthermore|Moreover|Additionally|However),?\s*$',
+]
+
+_PRESERVE_RES = [re.compile(p, re.IGNORECASE) for p in PRESERVE_PATTERNS]
+_LOW_PRIORITY_RES = [re.compile(p, re.IGNORECASE) for p in LOW_PRIORITY_PATTERNS]
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    for match in _SENTENCE_BREAK.finditer(text):
+        spans.append(_strip_span(text, start, match.start()))
+        start = match.end()
+    spans.append(_strip_span(text, start, len(text)))
+    return [(a, b) for a, b in spans if b > a]
+
+
+def _paragraph_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    while True:
+        end = text.find('\n\n', start)
+        if end == -1:
+            spans.append((start, len(text)))
+            return spans
+        spans.append((start, end))
+        start = end + 2
+
+
+@dataclass
+class SentenceIndex:
+    """Query-independent scoring structures for one chunk."""
+    content: str
+    sentence_spans: List[Tuple[int, int]]
+    paragraph_spans: List[Tuple[int, int]]  # Raw spans (split on blank lines)
+    paragraph_low_priority: List[int]  # Low-priority pattern hits per paragraph
+    term_spans: List[Tuple[int, int, int]]  # (start, end, pattern index)
+
+    def __post_init__(self):
+        self.sentences: List[str] = [self.content[a:b] for a, b in self.sentence_spans]
+        self.token_sets: List[FrozenSet[str]] = [
+            frozenset(s.lower().split()) for s in self.sentences
+        ]
+        self.sentence_static: List[float] = []
+        for (a, b), sentence in zip(self.sentence_spans, self.sentences):
+            score = 3 * len(self._patterns_in(a, b))
+            word_count = len(sentence.split())
+            if 10 <= word_count <= 50:
+                score += 1
+            elif word_count < 5:
+                score -= 2
+            self.sentence_static.append(score)
+
+        self.paragraphs: List[str] = []
+        self.paragraphs_lower: List[str] = []
+        self.paragraph_static: List[int] = []
+        for (a, b), low in zip(self.paragraph_spans, self.paragraph_low_priority):
+            sa, sb = _strip_span(self.content, a, b)
+            self.paragraphs.append(self.content[sa:sb])
+            self.paragraphs_lower.append(self.content[sa:sb].lower())
+            self.paragraph_static.append(3 * len(self._patterns_in(a, b)) - low)
+
+    # ------------------------------------------------------------------
+
+    def _patterns_in(self, start: int, end: int) -> set:
+        return {k for a, b, k in self.term_spans if a >= start and b <= end}
+
+    def terms_in(self, spans: List[Tuple[int, int]], limit: int = 20) -> List[str]:
+        """Distinct medical terms inside the given spans."""
+        terms = {
+            self.content[a:b]
+            for a, b, _ in self.term_spans
+            if any(a >= s and b <= e for s, e in spans)
+        }
+        return list(terms)[:limit]
+
+    # ------------------------------------------------------------------
+    # Construction and serialization
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, content: str) -> "SentenceIndex":
+        """Index a chunk (the expensive, query-independent pass)."""
+        paragraph_spans = _paragraph_spans(content)
+        low_priority = []
+        for a, b in paragraph_spans:
+            paragraph = content[a:b]
+            low_priority.append(sum(1 for p in _LOW_PRIORITY_RES if p.search(paragraph)))
+        term_spans = [
+            (m.start(), m.end(), k)
+            for k, pattern in enumerate(_PRESERVE_RES)
+            for m in pattern.finditer(content)
+        ]
+        return cls(content, _sentence_spans(content), paragraph_spans, low_priority, term_spans)
+
+    def to_json(self) -> str:
+        """Compact JSON for chunk metadata (spans only)."""
+        return json.dumps(
+            {
+                "v": INDEX_VERSION,
+                "h": content_hash(self.content),
+                "s": self.sentence_spans,
+                "p": [[a, b, low] for (a, b), low in zip(self.paragraph_spans, self.paragraph_low_priority)],
+                "t": self.term_spans,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, content: str, data: str) -> Optional["SentenceIndex"]:
+        """Load a stored index; None if it is stale or unreadable."""
+        try:
+            payload = json.loads(data)
+            if payload.get("v") != INDEX_VERSION or payload.get("h") != content_hash(content):
+                return None
+            return cls(
+                content,
+                [tuple(span) for span in payload["s"]],
+                [(a, b) for a, b, _ in payload["p"]],
+                [low for _, _, low in payload["p"]],
+                [tuple(span) for span in payload["t"]],
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable sentence index: {e}")
+            return None
+
+
+def content_hash(content: str) -> str:
+    """Short content fingerprint used to key and validate indexes."""
+    return hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+# ============================================================================
+# Sidecar Cache
+# ============================================================================
+
+_index_cache = MemoryTier(max_entries=2000, cache_name="sentence_index")
+
+
+def get_sentence_index(content: str, metadata: Optional[Dict[str, Any]] = None) -> SentenceIndex:
+    """
+    Index for ``content``: from the sidecar cache, the chunk metadata, or
+    built on the spot (and cached).
+    """
+    key = content_hash(content)
+    index = _index_cache.get(key)
+    if index is not MISSING:
+        return index
+
+    index = None
+    stored = (metadata or {}).get(METADATA_KEY)
+    if stored:
+        index = SentenceIndex.from_json(content, stored)
+    if index is None:
+        index = SentenceIndex.build(content)
+    _index_cache.set(key, index)
+    return index
+
+
+__all__ = [
+    "SentenceIndex",
+    "get_sentence_index",
+    "content_hash",
+    "PRESERVE_PATTERNS",
+    "LOW_PRIORITY_PATTERNS",
+    "METADATA_KEY",
+]
@@ -0,0 +1,270 @@
+"""
+Deadline-Aware Multi-Source Retrieval
+
+Runs retrieval sources concurrently, each under its own deadline, and keeps
+whatever finished in time:
+
+- Per-source timeouts; sources that miss them are cancelled, the rest are kept
+- Adaptive timeouts derived from each source's recent latency distribution
+- Optional hedged requests: if a source has not answered by its usual
+  (p90) latency, the same query is sent to a replica and the first answer wins
+
+Reference: Dean & Barroso, "The Tail at Scale" (CACM 2013)
+"""
+
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SourceFn = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+@dataclass
+class SourceOutcome:
+    """Result of querying a single retrieval source."""
+    source: str
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "ok"  # "ok", "timeout", "error"
+    latency_ms: float = 0.0
+    timeout_ms: float = 0.0
+    hedged: bool = False  # A replica request was issued
+    served_by_replica: bool = False
+
+
+class SourceLatencyTracker:
+    """
+    Rolling per-source latency window used to derive adaptive timeouts.
+
+    The timeout for a source is ``percentile`` latency times ``headroom``,
+    clamped to [min_timeout, max_timeout]. Until ``min_samples`` samples
+    exist the default timeout is used. Timeouts are recorded at the value
+    that was allowed, so a source that keeps timing out drifts towards
+    ``max_timeout`` instead of being starved.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 2.0,
+        min_timeout: float = 0.05,
+        max_timeout: float = 5.0,
+        percentile: float = 0.95,
+        headroom: float = 1.5,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.percentile = percentile
+        self.headroom = headroom
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, latency_s: float, timed_out: bool = False) -> None:
+        """Record one observation for ``source`` (seconds)."""
+        with self._lock:
+            samples = self._samples.get(source)
+            if samples is None:
+                samples = self._samples[source] = deque(maxlen=self.window)
+            samples.append(latency_s)
+            if timed_out:
+                self._timeouts[source] = self._timeouts.get(source, 0) + 1
+
+        try:
+            from core.monitoring.prometheus_metrics import get_metrics
+
+            metrics = get_metrics()
+            metrics.record_histogram(
+                "rag_source_latency_ms", latency_s * 1000, labels={"source": source}
+            )
+            if timed_out:
+                metrics.increment_counter("rag_source_timeouts", labels={"source": source})
+        except Exception:
+            pass  # metrics are best-effort
+
+    def quantile(self, source: str, q: float) -> Optional[float]:
+        """Latency quantile in seconds, or None with too few samples."""
+        with self._lock:
+            samples = self._samples.get(source)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def timeout_for(self, source: str) -> float:
+        """Adaptive timeout for ``source`` in seconds."""
+        observed = self.quantile(source, self.percentile)
+        if observed is None:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, observed * self.headroom))
+
+    def hedge_delay(self, source: str) -> Optional[float]:
+        """Delay before hedging ``source`` (its p90 latency), if known."""
+        return self.quantile(source, 0.9)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-source latency summary."""
+        stats = {}
+        for source in list(self._samples):
+            p50 = self.quantile(source, 0.5)
+            p95 = self.quantile(source, 0.95)
+            stats[source] = {
+                "samples": len(self._samples[source]),
+                "timeouts": self._timeouts.get(source, 0),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "timeout_ms": round(self.timeout_for(source) * 1000, 1),
+            }
+        return stats
+
+
+async def _cancel_all(tasks) -> None:
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _run_source(
+    name: str,
+    primary: SourceFn,
+    replica: Optional[SourceFn],
+    timeout: float,
+    hedge_delay: Optional[float],
+) -> SourceOutcome:
+    """Run one source (and optionally its hedge) under ``timeout``."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    outcome = SourceOutcome(source=name, timeout_ms=timeout * 1000)
+
+    primary_task = asyncio.ensure_future(primary())
+    tasks = {primary_task}
+    replica_task = None
+    errors: List[BaseException] = []
+
+    try:
+        if replica is not None and hedge_delay is not None and hedge_delay < timeout:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done or primary_task.exception() is not None:
+                replica_task = asyncio.ensure_future(replica())
+                tasks.add(replica_task)
+                outcome.hedged = True
+
+        while tasks:
+            remaining = timeout - (loop.time() - start)
+            if remaining <= 0:
+                break
+            done, tasks = await asyncio.wait(
+                tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                if task.exception() is None:
+                    outcome.results = task.result() or []
+                    outcome.served_by_replica = task is replica_task
+                    outcome.latency_ms = (loop.time() - start) * 1000
+                    return outcome
+                errors.append(task.exception())
+            # Primary failed before its hedge delay; hedge immediately
+            if (
+                not tasks
+                and replica is not None
+                and replica_task is None
+                and loop.time() - start < timeout
+            ):
+                replica_task = asyncio.ensure_future(replica())
+                tasks = {replica_task}
+                outcome.hedged = True
+
+        outcome.latency_ms = (loop.time() - start) * 1000
+        if tasks or not errors:
+            outcome.status = "timeout"
+            logger.warning(f"Retrieval source '{name}' missed its {timeout * 1000:.0f}ms deadline")
+        else:
+            outcome.status = "error"
+            logger.warning(f"Retrieval source '{name}' failed: {errors[-1]}")
+        return outcome
+    finally:
+        await _cancel_all([t for t in (primary_task, replica_task) if t is not None and not t.done()])
+
+
+async def gather_with_deadlines(
+    sources: Dict[str, SourceFn],
+    deadline: float,
+    tracker: Optional[SourceLatencyTracker] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    replicas: Optional[Dict[str, SourceFn]] = None,
+) -> Dict[str, SourceOutcome]:
+    """
+    Query all sources concurrently and return per-source outcomes.
+
+    Each source runs under ``timeouts[name]`` (or the tracker's adaptive
+    timeout), never longer than the overall ``deadline``. Sources that miss
+    their deadline are cancelled; finished sources are always kept.
+
+    Args:
+        sources: Source name -> zero-argument coroutine function
+        deadline: Overall budget in seconds
+        tracker: Latency tracker for adaptive timeouts and hedge delays
+        timeouts: Fixed per-source timeouts in seconds (override tracker)
+        replicas: Source name -> replica coroutine function for hedging
+
+    Returns:
+        Source name -> SourceOutcome, in the order of ``sources``
+    """
+    timeouts = timeouts or {}
+    replicas = replicas or {}
+
+    runners = {}
+    for name, fn in sources.items():
+        timeout = timeouts.get(name)
+        if timeout is None:
+            timeout = tracker.timeout_for(name) if tracker else deadline
+        timeout = min(timeout, deadline)
+        hedge_delay = tracker.hedge_delay(name) if tracker and name in replicas else None
+        runners[name] = asyncio.ensure_future(
+            _run_source(name, fn, replicas.get(name), timeout, hedge_delay)
+        )
+
+    started = time.perf_counter()
+    try:
+        # Each runner enforces its own deadline; the outer wait is a backstop
+        await asyncio.wait(runners.values(), timeout=deadline + 0.05)
+    finally:
+        await _cancel_all([t for t in runners.values() if not t.done()])
+
+    outcomes: Dict[str, SourceOutcome] = {}
+    for name, task in runners.items():
+        if task.cancelled() or task.exception() is not None:
+            outcome = SourceOutcome(
+                source=name,
+                status="timeout",
+                latency_ms=(time.perf_counter() - started) * 1000,
+                timeout_ms=deadline * 1000,
+            )
+        else:
+            outcome = task.result()
+        outcomes[name] = outcome
+        if tracker:
+            tracker.record(name, outcome.latency_ms / 1000, timed_out=outcome.status == "timeout")
+
+    return outcomes
+
+
+__all__ = [
+    "SourceOutcome",
+    "SourceLatencyTracker",
+    "gather_with_deadlines",
+]
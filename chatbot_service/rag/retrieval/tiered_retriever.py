@@ -28,6 +28,7 @@ from rag.retrieval.models import (
     MedicalDocument,
     SourceTier,
 )
+from rag.retrieval.diversity import diversify
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,7 @@ class RetrievalConfig:
     max_combined_results: int = 15
     always_search_tier1: bool = True  # Always start with Tier 1
     stream_pubmed_if_needed: bool = True  # Stream PubMed on demand
+    diversity: float = 0.0  # MMR λ within each tier after merging (0 = off)
 
 
 class IntentDetector:
@@ -311,6 +313,8 @@ class TieredRetriever:
         - Tier 2 results supplement Tier 1
         - Higher confidence scores ranked higher within tier
         - For research queries, Tier 2 gets more prominence
+        - With config.diversity > 0, each tier is reordered by MMR
+          (confidence as relevance), so near-duplicates sink within a tier
         
         Args:
             tier1: Tier 1 search results
@@ -344,8 +348,21 @@ class TieredRetriever:
         tier1_sorted = sorted(tier1_merged, key=lambda x: -x.confidence_score)
         tier2_sorted = sorted(tier2_merged, key=lambda x: -x.confidence_score)
         
+        if self.config.diversity > 0:
+            tier1_sorted = self._diversify(tier1_sorted)
+            tier2_sorted = self._diversify(tier2_sorted)
+        
         return tier1_sorted + tier2_sorted
     
+    def _diversify(self, docs: List[MedicalDocument]) -> List[MedicalDocument]:
+        """MMR reorder of one tier (keeps every document)."""
+        return diversify(
+            docs,
+            len(docs),
+            self.config.diversity,
+            relevance=[doc.confidence_score for doc in docs],
+        )
+    
     def retrieve_with_explanation(
         self,
         query: str,
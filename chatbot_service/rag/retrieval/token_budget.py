@@ -9,6 +9,8 @@ Features:
 - Budget allocation for multi-component prompts (query, context, history)
 - Token limit enforcement
 - Fallback to character approximation for unknown models
+- Process-wide tokenizers with cached per-text counts (core.llm.tokenizer_service)
+- Greedy packing of ranked chunks into the context budget
 
 Performance:
 - tiktoken: <1ms per tokenization
@@ -28,36 +30,18 @@ Example:
 """
 
 import logging
-from typing import Dict, Optional, Any
-from functools import lru_cache
-
-logger = logging.getLogger(__name__)
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+from core.llm.tokenizer_service import PackResult, get_tokenizer_service
 
-class CharacterApproximationTokenizer:
-    """Fallback tokenizer using character count approximation."""
-    
-    def __init__(self, chars_per_token: int = 4):
-        self.chars_per_token = chars_per_token
-    
-    def encode(self, text: str) -> list:
-        """Approximate token count from character count."""
-        if not text:
-            return []
-        # Return list of "fake" tokens (just indices)
-        token_count = max(1, len(text) // self.chars_per_token)
-        return list(range(token_count))
+logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=10)
 def _get_model_tokenizer(model_name: Optional[str]) -> Any:
     """
     Get appropriate tokenizer for the given model.
     
-    Uses:
-    - tiktoken for OpenAI models (gpt-4, gpt-3.5-turbo)
-    - HuggingFace for Gemma, LLaMA, etc.
-    - Character approximation as fallback
+    Tokenizers are loaded once per process by the shared tokenizer service.
     
     Args:
         model_name: Name of the model
@@ -65,56 +49,7 @@ def _get_model_tokenizer(model_name: Optional[str]) -> Any:
     Returns:
         Tokenizer instance with encode() method
     """
-    if model_name is None:
-        logger.debug("No model specified, using character approximation")
-        return CharacterApproximationTokenizer()
-    
-    model_lower = model_name.lower()
-    
-    # OpenAI models: use tiktoken
-    if any(name in model_lower for name in ["gpt-4", "gpt-3", "gpt-3.5", "openai"]):
-        try:
-            import tiktoken
-            if "gpt-4" in model_lower:
-                return tiktoken.encoding_for_model("gpt-4")
-            else:
-                return tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except ImportError:
-            logger.warning("tiktoken not available, using character approximation for OpenAI models")
-            return CharacterApproximationTokenizer()
-        except Exception as e:
-            logger.warning(f"Failed to load tiktoken: {e}")
-            return CharacterApproximationTokenizer()
-    
-    # Gemma, LLaMA, Mistral: try HuggingFace transformers
-    if any(name in model_lower for name in ["gemma", "llama", "mistral", "codellama"]):
-        try:
-            from transformers import AutoTokenizer
-            
-            # Map to actual HuggingFace model names
-            hf_model_map = {
-                "gemma": "google/gemma-2-2b-it",
-                "llama": "meta-llama/Llama-2-7b-hf",
-                "mistral": "mistralai/Mistral-7B-v0.1",
-            }
-            
-            hf_model_name = None
-            for key, value in hf_model_map.items():
-                if key in model_lower:
-                    hf_model_name = value
-                    break
-            
-            if hf_model_name:
-                tokenizer = AutoTokenizer.from_pretrained(hf_model_name)
-                return tokenizer
-        except ImportError:
-            logger.debug("transformers not available for HuggingFace tokenizers")
-        except Exception as e:
-            logger.debug(f"Failed to load HuggingFace tokenizer: {e}")
-    
-    # Fallback to character approximation
-    logger.debug(f"Using character approximation for model: {model_name}")
-    return CharacterApproximationTokenizer()
+    return get_tokenizer_service(model_name).tokenizer
 
 
 class TokenBudgetManager:
@@ -157,8 +92,9 @@ class TokenBudgetManager:
         self.max_tokens = max_tokens
         self.allocations = allocations or self.DEFAULT_ALLOCATIONS
         
-        # Get appropriate tokenizer
-        self._tokenizer = _get_model_tokenizer(model_name)
+        # Shared tokenizer and token-count cache for this model's tokenizer family
+        self._service = get_tokenizer_service(model_name)
+        self._tokenizer = self._service.tokenizer
         
         logger.debug(f"TokenBudgetManager initialized: model={model_name}, max_tokens={max_tokens}")
     
@@ -166,21 +102,51 @@ class TokenBudgetManager:
         """
         Count tokens in text using model-specific tokenizer.
         
+        Counts are cached per text, so repeated budget passes over the same
+        component do not re-encode it.
+        
         Args:
             text: Text to tokenize
             
         Returns:
             Token count
         """
-        if not text:
-            return 0
+        return self._service.count(text)
+    
+    def count_tokens_batch(self, texts: Sequence[Optional[str]]) -> List[int]:
+        """
+        Count tokens for several texts, batch-encoding uncached ones.
         
-        try:
-            tokens = self._tokenizer.encode(text)
-            return len(tokens)
-        except Exception as e:
-            logger.warning(f"Tokenization failed: {e}, using character approximation")
-            return len(text) // 4
+        Args:
+            texts: Texts to tokenize
+            
+        Returns:
+            Token counts in input order
+        """
+        return self._service.count_batch(texts)
+    
+    def pack(
+        self,
+        chunks: Sequence[Union[str, Dict[str, Any]]],
+        max_tokens: Optional[int] = None,
+        separator: str = "\n\n",
+    ) -> PackResult:
+        """
+        Greedily fill a token budget from ranked chunks.
+        
+        Args:
+            chunks: Ranked chunks (strings or dicts with "content")
+            max_tokens: Budget (defaults to the medical context allocation)
+            separator: Joiner placed between chunks
+            
+        Returns:
+            PackResult; ``.text`` is the packed context
+        """
+        if max_tokens is None:
+            reserved_tokens = int(self.max_tokens * self.allocations.get("reserved", 0.05))
+            available_tokens = self.max_tokens - reserved_tokens
+            max_tokens = int(available_tokens * self.allocations.get("medical_context", 0.50))
+        return self._service.pack(chunks, max_tokens, separator=separator)
     
     def allocate(
         self,
@@ -250,34 +216,7 @@ class TokenBudgetManager:
         Returns:
             Truncated text
         """
-        if not text:
-            return ""
-        
-        current_tokens = self.count_tokens(text)
-        if current_tokens <= max_tokens:
-            return text
-        
-        # Binary search for optimal truncation point
-        low, high = 0, len(text)
-        
-        while low < high:
-            mid = (low + high + 1) // 2
-            truncated = text[:mid]
-            if self.count_tokens(truncated) <= max_tokens:
-                low = mid
-            else:
-                high = mid - 1
-        
-        truncated_text = text[:low]
-        
-        # Add truncation indicator if we actually truncated
-        if len(truncated_text) < len(text):
-            # Make room for ellipsis
-            while self.count_tokens(truncated_text + "...") > max_tokens and truncated_text:
-                truncated_text = truncated_text[:-10]
-            truncated_text += "..."
-        
-        return truncated_text
+        return self._service.truncate(text, max_tokens)
     
     def get_remaining_budget(self, used_tokens: int) -> int:
         """
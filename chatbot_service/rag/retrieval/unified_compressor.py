@@ -21,7 +21,9 @@ Benefits:
 """
 
 
+import asyncio
 import logging
+import os
 import re
 import hashlib
 from typing import List, Dict, Any, Optional
@@ -29,8 +31,22 @@ from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
 
+from core.cache import MISSING, MemoryTier
+from rag.retrieval.sentence_index import (
+    LOW_PRIORITY_PATTERNS,
+    METADATA_KEY,
+    PRESERVE_PATTERNS,
+    get_sentence_index,
+)
+
 logger = logging.getLogger(__name__)
 
+# Total time budget for compressing one retrieval result set (seconds);
+# documents still compressing at the deadline get extractive compression
+COMPRESSION_DEADLINE = float(os.getenv("COMPRESSION_DEADLINE", "1.5"))
+# Maximum concurrent per-document compressions (bounds LLM fan-out)
+COMPRESSION_MAX_CONCURRENCY = int(os.getenv("COMPRESSION_MAX_CONCURRENCY", "4"))
+
 
 class CompressionStrategy(Enum):
     """Supported compression strategies."""
@@ -62,20 +78,10 @@ class UnifiedDocumentCompressor:
     """
     
     # Medical and pharmaceutical terms to always preserve
-    PRESERVE_PATTERNS = [
-        r'\b\d+\s*(?:mg|mcg|ml|mL|g|kg|mmHg|bpm)\b',  # Dosages and measurements
-        r'\b(?:daily|twice|three times|weekly|monthly|as needed|PRN)\b',  # Frequencies
-        r'\b(?:contraindicated|warning|caution|avoid|monitor|adjust)\b',  # Safety terms
-        r'\b(?:recommended|first-line|standard|guideline)\b',  # Recommendations
-        r'\b(?:side effect|adverse|interaction|contraindication)\b',  # Medical concepts
-    ]
+    PRESERVE_PATTERNS = PRESERVE_PATTERNS
     
     # Sentence patterns to deprioritize
-    LOW_PRIORITY_PATTERNS = [
-        r'^(?:In this|This article|We will|Here we|As mentioned)',
-        r'(?:for more information|see also|refer to)',
-        r'^(?:Furthermore|Moreover|Additionally|However),?\s*$',
-    ]
+    LOW_PRIORITY_PATTERNS = LOW_PRIORITY_PATTERNS
     
     # Content type detection patterns
     TABLE_PATTERN = re.compile(r'\|[^\|]+\|')
@@ -88,6 +94,9 @@ class UnifiedDocumentCompressor:
         max_tokens: int = 2000,
         preserve_medical_terms: bool = True,
         default_strategy: CompressionStrategy = CompressionStrategy.HYBRID,
+        deadline: float = COMPRESSION_DEADLINE,
+        max_concurrency: int = COMPRESSION_MAX_CONCURRENCY,
+        cache_max_size: int = 200,
     ):
         """
         Initialize the unified compressor.
@@ -98,16 +107,23 @@ class UnifiedDocumentCompressor:
             max_tokens: Maximum tokens in output
             preserve_medical_terms: Always keep medical terminology
             default_strategy: Default compression strategy
+            deadline: Total compression budget per call in seconds
+            max_concurrency: Maximum documents compressed concurrently
+            cache_max_size: Maximum cached compression results (LRU)
         """
         self.llm_gateway = llm_gateway
         self.target_ratio = target_ratio
         self.max_tokens = max_tokens
         self.preserve_medical_terms = preserve_medical_terms
         self.default_strategy = default_strategy
+        self.deadline = deadline
+        self.max_concurrency = max(1, max_concurrency)
         
-        # Latency optimization: Cache compression results
-        self._compression_cache: Dict[str, CompressedDocument] = {}
-        self._cache_max_size = 200
+        # Latency optimization: Cache compression results (bounded LRU keyed
+        # on full query/content hashes)
+        self._compression_cache = MemoryTier(
+            max_entries=cache_max_size, cache_name="compression"
+        )
         
         # Compile regex patterns
         self._preserve_patterns = [
@@ -127,75 +143,95 @@ class UnifiedDocumentCompressor:
         query: str,
         documents: List[Any],
         strategy: Optional[CompressionStrategy] = None,
+        deadline: Optional[float] = None,
     ) -> List[CompressedDocument]:
         """
         Main entry point for document compression.
         
+        Documents are compressed concurrently (at most ``max_concurrency`` at
+        a time) under a total ``deadline``; any document not finished by then
+        gets extractive compression instead, so compression adds at most the
+        deadline to the request.
+        
         Args:
             query: User query for relevance scoring
             documents: Retrieved documents (dicts or LangChain Document objects)
             strategy: Override default compression strategy
+            deadline: Override the total compression budget in seconds
             
         Returns:
             List of CompressedDocument objects
         """
         strategy = strategy or self.default_strategy
+        deadline = self.deadline if deadline is None else deadline
         
         logger.info(f"📄 Compressing {len(documents)} documents using {strategy.value} strategy")
         
-        compressed_docs = []
+        compressed_docs: List[Optional[CompressedDocument]] = [None] * len(documents)
+        pending: Dict[int, tuple] = {}  # index -> (content, cache_key)
         
-        for doc in documents:
+        for i, doc in enumerate(documents):
             content = self._extract_content(doc)
             
+            # Load the sentence index stored at ingestion, if any
+            metadata = self._extract_metadata(doc)
+            if content and metadata.get(METADATA_KEY):
+                get_sentence_index(content, metadata)
+            
             # Skip very short documents
             if not content or len(content) < 100:
-                compressed_docs.append(CompressedDocument(
+                compressed_docs[i] = CompressedDocument(
                     original_content=content or "",
                     compressed_content=content or "",
                     compression_ratio=1.0,
                     preserved_terms=[],
                     method="none",
                     token_count=len((content or "").split()),
-                ))
+                )
                 continue
             
             # Latency optimization: Check cache first
-            cache_key = hashlib.md5(f"{query[:100]}:{content[:500]}".encode()).hexdigest()
-            if cache_key in self._compression_cache:
+            cache_key = self._cache_key(query, content, strategy)
+            cached = self._compression_cache.get(cache_key)
+            if cached is not MISSING:
                 logger.debug("Compression cache hit")
-                compressed_docs.append(self._compression_cache[cache_key])
+                compressed_docs[i] = cached
                 continue
             
-            try:
-                # Select strategy
-                if strategy == CompressionStrategy.AUTO or strategy == CompressionStrategy.HYBRID:
-                    compressed = await self._adaptive_compress(query, content)
-                elif strategy == CompressionStrategy.LLM:
-                    if self.llm_gateway:
-                        compressed = await self._llm_compress(query, content)
-                    else:
-                        logger.warning("LLM gateway not available, falling back to extractive")
-                        compressed = self._extractive_compress(query, content)
-                elif strategy == CompressionStrategy.SENTENCE:
-                    compressed = self._sentence_compress(query, content)
-                elif strategy == CompressionStrategy.LIST_AWARE:
-                    compressed = self._adaptive_compress(query, content)
-                else:  # EXTRACTIVE
+            pending[i] = (content, cache_key)
+        
+        if pending:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def run(content: str) -> CompressedDocument:
+                async with semaphore:
+                    return await self._compress_one(query, content, strategy)
+            
+            tasks = {
+                i: asyncio.ensure_future(run(content))
+                for i, (content, _) in pending.items()
+            }
+            done, not_done = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in not_done:
+                task.cancel()
+            if not_done:
+                await asyncio.gather(*not_done, return_exceptions=True)
+                logger.warning(
+                    f"Compression deadline ({deadline:.2f}s) hit: "
+                    f"{len(not_done)}/{len(tasks)} documents fell back to extractive"
+                )
+            
+            for i, task in tasks.items():
+                content, cache_key = pending[i]
+                if task in done and task.exception() is None:
+                    compressed = task.result()
+                    self._compression_cache.set(cache_key, compressed)
+                elif task in done:
+                    logger.error(f"Compression failed: {task.exception()}, using truncation fallback")
+                    compressed = self._truncate_compress(content)
+                else:
                     compressed = self._extractive_compress(query, content)
-                
-                # Store in cache
-                if len(self._compression_cache) >= self._cache_max_size:
-                    # Remove oldest entry
-                    oldest_key = next(iter(self._compression_cache))
-                    del self._compression_cache[oldest_key]
-                self._compression_cache[cache_key] = compressed
-                
-                compressed_docs.append(compressed)
-                
-            except Exception as e:
-                logger.error(f"Compression failed: {e}, using truncation fallback")
-                compressed_docs.append(self._truncate_compress(content))
+                compressed_docs[i] = compressed
         
         # Deduplicate across documents
         compressed_docs = self._deduplicate(compressed_docs)
@@ -203,6 +239,36 @@ class UnifiedDocumentCompressor:
         logger.info(f"✅ Compressed {len(compressed_docs)} documents")
         return compressed_docs
     
+    @staticmethod
+    def _cache_key(query: str, content: str, strategy: CompressionStrategy) -> str:
+        """Cache key over the full query and content."""
+        digest = hashlib.sha256()
+        for part in (strategy.value, query, content):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    async def _compress_one(
+        self,
+        query: str,
+        content: str,
+        strategy: CompressionStrategy,
+    ) -> CompressedDocument:
+        """Compress a single document with the selected strategy."""
+        if strategy == CompressionStrategy.AUTO or strategy == CompressionStrategy.HYBRID:
+            return await self._adaptive_compress(query, content)
+        elif strategy == CompressionStrategy.LLM:
+            if self.llm_gateway:
+                return await self._llm_compress(query, content)
+            logger.warning("LLM gateway not available, falling back to extractive")
+            return self._extractive_compress(query, content)
+        elif strategy == CompressionStrategy.SENTENCE:
+            return self._sentence_compress(query, content)
+        elif strategy == CompressionStrategy.LIST_AWARE:
+            return await self._adaptive_compress(query, content)
+        else:  # EXTRACTIVE
+            return self._extractive_compress(query, content)
+    
     async def _adaptive_compress(
         self,
         query: str,
@@ -243,10 +309,13 @@ Extracted relevant content:"""
         try:
             # Handle both async and sync LLM gateways
             if hasattr(self.llm_gateway, 'generate'):
-                result = self.llm_gateway.generate(
-                    prompt,
-                    content_type="medical"
-                )
+                generate = self.llm_gateway.generate
+                if asyncio.iscoroutinefunction(generate):
+                    result = generate(prompt, content_type="medical")
+                else:
+                    # Sync gateways run in a worker thread so concurrent
+                    # compressions overlap and the deadline stays enforceable
+                    result = await asyncio.to_thread(generate, prompt, content_type="medical")
                 # Handle awaitable result
                 if hasattr(result, '__await__'):
                     compressed = await result
@@ -277,37 +346,35 @@ Extracted relevant content:"""
         query: str,
         content: str
     ) -> CompressedDocument:
-        """Sentence-level relevance filtering."""
-        sentences = self._split_sentences(content)
+        """Sentence-level relevance filtering over the precomputed sentence index."""
+        index = get_sentence_index(content)
         
-        if not sentences:
+        if not index.sentences:
             return self._truncate_compress(content)
         
-        # Score each sentence
+        # Score each sentence: query overlap + precomputed term/length score
         query_terms = set(query.lower().split())
-        scored_sentences = [
-            (sent, self._score_sentence(sent, query_terms))
-            for sent in sentences
+        scores = [
+            max(0, 2 * len(query_terms & tokens) + static)
+            for tokens, static in zip(index.token_sets, index.sentence_static)
         ]
         
-        # Sort by relevance
-        scored_sentences.sort(key=lambda x: x[1], reverse=True)
-        
-        # Keep sentences up to target size
+        # Keep sentences by relevance up to target size
         target_chars = int(len(content) * self.target_ratio)
-        kept_sentences = []
+        kept = []
         current_chars = 0
         
-        for sent, score in scored_sentences:
-            if current_chars + len(sent) <= target_chars:
-                kept_sentences.append((sent, score))
-                current_chars += len(sent)
+        for i in sorted(range(len(scores)), key=scores.__getitem__, reverse=True):
+            length = len(index.sentences[i])
+            if current_chars + length <= target_chars:
+                kept.append(i)
+                current_chars += length
         
         # Re-order by original position in document
-        kept_sentences.sort(key=lambda x: sentences.index(x[0]))
+        kept.sort()
         
-        compressed = " ".join(s[0] for s in kept_sentences)
-        preserved = self._extract_preserved_terms(compressed)
+        compressed = " ".join(index.sentences[i] for i in kept)
+        preserved = index.terms_in([index.sentence_spans[i] for i in kept])
         
         return CompressedDocument(
             original_content=content,
@@ -323,35 +390,18 @@ Extracted relevant content:"""
         query: str,
         content: str
     ) -> CompressedDocument:
-        """Paragraph-level extractive compression."""
-        query_terms = set(query.lower().split())
-        paragraphs = content.split('\n\n')
+        """Paragraph-level extractive compression over the precomputed index."""
+        index = get_sentence_index(content)
+        query_terms = [term for term in set(query.lower().split()) if len(term) > 3]
         
-        # Score paragraphs
+        # Score paragraphs: query term matches + precomputed medical/low-priority score
         scored_paras = []
-        for para in paragraphs:
-            if not para.strip():
+        for i, para_lower in enumerate(index.paragraphs_lower):
+            if not para_lower:
                 continue
-            
-            score = 0
-            para_lower = para.lower()
-            
-            # Query term matches (bonus for longer terms)
-            for term in query_terms:
-                if len(term) > 3 and term in para_lower:
-                    score += 2
-            
-            # Medical term preservation
-            for pattern in self._preserve_patterns:
-                if pattern.search(para):
-                    score += 3
-            
-            # Penalize low-priority content
-            for pattern in self._low_priority_patterns:
-                if pattern.search(para):
-                    score -= 1
-            
-            scored_paras.append((para.strip(), max(0, score)))
+            score = 2 * sum(1 for term in query_terms if term in para_lower)
+            score += index.paragraph_static[i]
+            scored_paras.append((i, max(0, score)))
         
         # Select paragraphs up to target size
         scored_paras.sort(key=lambda x: x[1], reverse=True)
@@ -359,19 +409,22 @@ Extracted relevant content:"""
         selected = []
         current_chars = 0
         
-        for para, score in scored_paras:
+        for i, score in scored_paras:
             if score == 0:
                 continue
-            if current_chars + len(para) <= target_chars:
-                selected.append(para)
-                current_chars += len(para)
-        
-        # Fallback: keep first paragraph if nothing selected
-        if not selected and paragraphs:
-            selected = [paragraphs[0][:target_chars]]
-        
-        compressed = "\n\n".join(selected)
-        preserved = self._extract_preserved_terms(compressed)
+            length = len(index.paragraphs[i])
+            if current_chars + length <= target_chars:
+                selected.append(i)
+                current_chars += length
+        
+        if selected:
+            compressed = "\n\n".join(index.paragraphs[i] for i in selected)
+            preserved = index.terms_in([index.paragraph_spans[i] for i in selected])
+        else:
+            # Fallback: keep first paragraph if nothing selected
+            start, end = index.paragraph_spans[0]
+            compressed = content[start:end][:target_chars]
+            preserved = self._extract_preserved_terms(compressed)
         
         return CompressedDocument(
             original_content=content,
@@ -491,6 +544,12 @@ Extracted relevant content:"""
             token_count=len(truncated.split())
         )
     
+    def _extract_metadata(self, doc: Any) -> Dict[str, Any]:
+        """Extract metadata from various document formats."""
+        if isinstance(doc, dict):
+            return doc.get("metadata") or {}
+        return getattr(doc, "metadata", None) or {}
+    
     def _extract_content(self, doc: Any) -> str:
         """Extract text content from various document formats."""
         if isinstance(doc, dict):
@@ -10,6 +10,10 @@ Features:
 - Multi-tenant support with user_id isolation
 - Async and sync query support
 - LRU + Redis caching for repeated queries
+- In-process BM25 keyword index over medical_knowledge, kept in sync on
+  every write and snapshotted (memory-mappable) next to the ChromaDB files;
+  loaded and verified against the collection on a background thread, which
+  also picks up other workers' writes
 
 Performance:
 - L1: In-memory LRU cache (100 entries)
@@ -21,6 +25,7 @@ Collections:
 2. drug_interactions - Medication information
 3. symptoms_conditions - Symptom-to-condition mapping
 4. user_memories - Per-user memory storage
+5. user_documents - Patient uploads (always queried with a user_id filter)
 """
 
 import asyncio
@@ -28,19 +33,29 @@ import hashlib
 import json
 import logging
 import os
+import shutil
 import threading
 from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+from core.observability.tracing import trace_span, SpanType
+
 logger = logging.getLogger(__name__)
 
 # Redis cache configuration
 VECTOR_CACHE_TTL = int(os.getenv("VECTOR_CACHE_TTL", "300"))
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# BM25 keyword index over the medical collection (see rag/retrieval/bm25_index.py)
+BM25_INDEX_ENABLED = os.getenv("BM25_INDEX_ENABLED", "true").lower() == "true"
+# Snapshot the index to disk after this many document changes
+BM25_SAVE_EVERY = int(os.getenv("BM25_SAVE_EVERY", "2000"))
+# Re-sync the index with the collection (other workers' writes) this often
+BM25_SYNC_SECONDS = float(os.getenv("BM25_SYNC_SECONDS", "300"))
+
 # Lazy Redis client
 _vector_redis_client = None
 _vector_redis_available = None
@@ -81,6 +96,22 @@ except ImportError:
     RemoteEmbeddingService = None  # type: ignore[assignment,misc]
 
 
+def _index_in_graph(doc_id: str, content: str, metadata: Dict, collection_name: str) -> None:
+    """
+    Add a knowledge-base chunk to the embedded graph's entity postings (best-effort).
+
+    The graph is shared by all users, so user-owned chunks are never indexed.
+    """
+    if (metadata or {}).get("user_id"):
+        return
+    try:
+        from rag.knowledge_graph.graph_store import get_graph_store
+
+        get_graph_store().add_chunk(doc_id, content, metadata, collection=collection_name)
+    except Exception as e:
+        logger.debug(f"Graph indexing skipped for {doc_id}: {e}")
+
+
 class ChromaDBVectorStore:
     """
     ChromaDB-based vector store for healthcare RAG.
@@ -98,6 +129,7 @@ class ChromaDBVectorStore:
     - drug_interactions: Medication information
     - symptoms_conditions: Symptom-condition mapping
     - user_memories: Per-user memory storage
+    - user_documents: Per-user uploaded documents
 
     Example:
         store = ChromaDBVectorStore()
@@ -121,6 +153,9 @@ class ChromaDBVectorStore:
     DRUG_COLLECTION = "drug_interactions"
     SYMPTOMS_COLLECTION = "symptoms_conditions"
     MEMORIES_COLLECTION = "user_memories"
+    USER_DOCUMENTS_COLLECTION = "user_documents"
+    # Per-user collections, kept out of the shared knowledge graph
+    USER_COLLECTIONS = frozenset({MEMORIES_COLLECTION, USER_DOCUMENTS_COLLECTION})
 
     # Embedding dimension (MedCPT 768-dim via remote Colab)
     EMBEDDING_DIMENSION = 768
@@ -170,6 +205,14 @@ class ChromaDBVectorStore:
         self._query_cache_max_size = 100
         self._query_cache_lock = threading.Lock()
 
+        # BM25 keyword index (loaded/built by the bm25-sync thread)
+        self._keyword_index = None
+        self._keyword_index_pending = None  # Being built; receives writes, not searches
+        self._keyword_index_lock = threading.Lock()
+        self._keyword_sync_lock = threading.Lock()
+        self._keyword_index_dir = os.path.join(self.persist_directory, "bm25_medical")
+        self._keyword_index_unsaved = 0
+
         # Pre-create collections
         self._collections: Dict[str, Any] = {}
         for name in [
@@ -177,6 +220,7 @@ class ChromaDBVectorStore:
             self.DRUG_COLLECTION,
             self.SYMPTOMS_COLLECTION,
             self.MEMORIES_COLLECTION,
+            self.USER_DOCUMENTS_COLLECTION,
         ]:
             self._collections[name] = self._client.get_or_create_collection(
                 name=name,
@@ -196,6 +240,15 @@ class ChromaDBVectorStore:
             )
         return self._collections[name]
 
+    def _query(self, collection, **query_kwargs) -> Dict[str, Any]:
+        """Run a collection query inside a vector_query span."""
+        with trace_span(
+            f"vector_query:{collection.name}",
+            SpanType.VECTOR_SEARCH,
+            metadata={"collection": collection.name, "n_results": query_kwargs.get("n_results")},
+        ):
+            return collection.query(**query_kwargs)
+
     # =========================================================================
     # CACHING
     # =========================================================================
@@ -297,6 +350,9 @@ class ChromaDBVectorStore:
             metadatas=[meta],
         )
 
+        _index_in_graph(doc_id, content, meta, self.MEDICAL_COLLECTION)
+        self._update_keyword_index([doc_id], [content], [meta])
+
         logger.debug(f"Added medical document: {doc_id}")
         return doc_id
 
@@ -342,6 +398,7 @@ class ChromaDBVectorStore:
         top_k: int = 5,
         filter_metadata: Optional[Dict] = None,
         query_embedding: Optional[List[float]] = None,
+        include_embeddings: bool = False,
     ) -> List[Dict]:
         """
         Search medical knowledge base using vector similarity.
@@ -351,13 +408,16 @@ class ChromaDBVectorStore:
             top_k: Number of results to return
             filter_metadata: Metadata filters (applied as ChromaDB where clause)
             query_embedding: Pre-computed embedding vector
+            include_embeddings: Attach each result's stored ``embedding`` (lets
+                reranking/MMR reuse it instead of re-embedding)
 
         Returns:
             List of matching documents with scores
         """
         # Check cache
         if query:
-            cache_key = self._cache_key(query, self.MEDICAL_COLLECTION, top_k, filter_metadata)
+            collection_key = self.MEDICAL_COLLECTION + (":emb" if include_embeddings else "")
+            cache_key = self._cache_key(query, collection_key, top_k, filter_metadata)
             cached = self._check_cache(cache_key)
             if cached:
                 return cached
@@ -379,6 +439,8 @@ class ChromaDBVectorStore:
             "n_results": top_k,
             "include": ["documents", "metadatas", "distances"],
         }
+        if include_embeddings:
+            query_kwargs["include"].append("embeddings")
 
         if filter_metadata:
             where = {}
@@ -386,20 +448,31 @@ class ChromaDBVectorStore:
                 where[key] = str(value)
             query_kwargs["where"] = where
 
-        raw = collection.query(**query_kwargs)
+        raw = self._query(collection, **query_kwargs)
 
         # Format results (ChromaDB returns lists-of-lists)
         results = []
         if raw and raw["ids"] and raw["ids"][0]:
+            embeddings = raw.get("embeddings") if include_embeddings else None
             for i, doc_id in enumerate(raw["ids"][0]):
                 # ChromaDB returns cosine distance; similarity = 1 - distance
                 distance = raw["distances"][0][i] if raw["distances"] else 0.0
-                results.append({
+                meta = raw["metadatas"][0][i] if raw["metadatas"] else {}
+                if self._is_user_owned(meta):
+                    # Legacy patient upload in the shared collection
+                    continue
+                result = {
                     "id": doc_id,
                     "content": raw["documents"][0][i] if raw["documents"] else "",
-                    "metadata": raw["metadatas"][0][i] if raw["metadatas"] else {},
+                    "metadata": meta,
                     "score": 1.0 - distance,
-                })
+                }
+                if embeddings is not None and len(embeddings) and embeddings[0] is not None:
+                    embedding = embeddings[0][i]
+                    result["embedding"] = (
+                        embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+                    )
+                results.append(result)
 
         # Update cache
         if query:
@@ -413,12 +486,13 @@ class ChromaDBVectorStore:
         top_k: int = 5,
         filter_metadata: Optional[Dict] = None,
         query_embedding: Optional[List[float]] = None,
+        include_embeddings: bool = False,
     ) -> List[Dict]:
         """Async version of search_medical_knowledge."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.search_medical_knowledge(query, top_k, filter_metadata, query_embedding),
+        # to_thread copies contextvars, so the query span joins the request trace
+        return await asyncio.to_thread(
+            self.search_medical_knowledge,
+            query, top_k, filter_metadata, query_embedding, include_embeddings,
         )
 
     # Alias for compatibility
@@ -438,7 +512,9 @@ class ChromaDBVectorStore:
             user_id = kwargs.get("user_id", "default")
             return await self.search_user_memories_async(query, user_id, top_k)
         else:
-            return await self.search_medical_knowledge_async(query, top_k)
+            return await self.search_medical_knowledge_async(
+                query, top_k, include_embeddings=kwargs.get("include_embeddings", False)
+            )
 
     # =========================================================================
     # DRUG INTERACTIONS
@@ -487,7 +563,8 @@ class ChromaDBVectorStore:
 
         collection = self._get_collection(self.DRUG_COLLECTION)
 
-        raw = collection.query(
+        raw = self._query(
+            collection,
             query_embeddings=[embedding],
             n_results=top_k,
             include=["documents", "metadatas", "distances"],
@@ -509,8 +586,7 @@ class ChromaDBVectorStore:
 
     async def search_drug_interactions_async(self, query: str, top_k: int = 5) -> List[Dict]:
         """Async version of search_drug_interactions."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.search_drug_interactions, query, top_k)
+        return await asyncio.to_thread(self.search_drug_interactions, query, top_k)
 
     # =========================================================================
     # SYMPTOMS CONDITIONS
@@ -529,7 +605,8 @@ class ChromaDBVectorStore:
 
         collection = self._get_collection(self.SYMPTOMS_COLLECTION)
 
-        raw = collection.query(
+        raw = self._query(
+            collection,
             query_embeddings=[embedding],
             n_results=top_k,
             include=["documents", "metadatas", "distances"],
@@ -551,8 +628,7 @@ class ChromaDBVectorStore:
 
     async def search_symptoms_async(self, query: str, top_k: int = 5) -> List[Dict]:
         """Async version of search_symptoms."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.search_symptoms, query, top_k)
+        return await asyncio.to_thread(self.search_symptoms, query, top_k)
 
     # =========================================================================
     # USER MEMORIES (Multi-tenant)
@@ -641,7 +717,8 @@ class ChromaDBVectorStore:
         if memory_type:
             where = {"$and": [{"user_id": user_id}, {"memory_type": memory_type}]}
 
-        raw = collection.query(
+        raw = self._query(
+            collection,
             query_embeddings=[embedding],
             n_results=top_k,
             where=where,
@@ -672,10 +749,8 @@ class ChromaDBVectorStore:
         memory_type: Optional[str] = None,
     ) -> List[Dict]:
         """Async version of search_user_memories."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.search_user_memories(query, user_id, top_k, memory_type),
+        return await asyncio.to_thread(
+            self.search_user_memories, query, user_id, top_k, memory_type
         )
 
     def delete_user_memory(self, memory_id: str, user_id: str) -> bool:
@@ -697,6 +772,77 @@ class ChromaDBVectorStore:
             logger.warning(f"Failed to delete memory {memory_id}: {e}")
             return False
 
+    # =========================================================================
+    # USER DOCUMENTS
+    # =========================================================================
+
+    def search_user_documents(
+        self,
+        query: str,
+        user_id: str,
+        top_k: int = 5,
+        doc_ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Search a user's uploaded documents with multi-tenant isolation.
+
+        Results are not cached: uploads and deletes must be visible on the
+        next query, and patient document text should not sit in Redis.
+
+        Args:
+            query: Search query
+            user_id: Owner of the documents (REQUIRED)
+            top_k: Number of results
+            doc_ids: Optional restriction to specific documents
+
+        Returns:
+            List of matching chunks with scores
+        """
+        if not user_id:
+            raise ValueError("user_id is required to search user documents")
+        user_id = str(user_id)
+
+        embedding = self.embedding_service.embed_text(query)
+        if isinstance(embedding, np.ndarray):
+            embedding = embedding.tolist()
+
+        collection = self._get_collection(self.USER_DOCUMENTS_COLLECTION)
+
+        where: Dict[str, Any] = {"user_id": user_id}
+        if doc_ids:
+            where = {"$and": [{"user_id": user_id}, {"doc_id": {"$in": list(doc_ids)}}]}
+
+        raw = self._query(
+            collection,
+            query_embeddings=[embedding],
+            n_results=top_k,
+            where=where,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        results = []
+        if raw and raw["ids"] and raw["ids"][0]:
+            for i, doc_id in enumerate(raw["ids"][0]):
+                distance = raw["distances"][0][i] if raw["distances"] else 0.0
+                results.append({
+                    "id": doc_id,
+                    "content": raw["documents"][0][i] if raw["documents"] else "",
+                    "metadata": raw["metadatas"][0][i] if raw["metadatas"] else {},
+                    "score": 1.0 - distance,
+                })
+
+        return results
+
+    async def search_user_documents_async(
+        self,
+        query: str,
+        user_id: str,
+        top_k: int = 5,
+        doc_ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """Async version of search_user_documents."""
+        return await asyncio.to_thread(self.search_user_documents, query, user_id, top_k, doc_ids)
+
     # =========================================================================
     # BATCH OPERATIONS
     # =========================================================================
@@ -763,10 +909,319 @@ class ChromaDBVectorStore:
                     logger.warning(f"Batch upsert failed: {e}")
                     errors += len(batch_ids)
                     added -= len(batch_ids)
+                else:
+                    # User data stays out of the shared knowledge graph
+                    if collection_name not in self.USER_COLLECTIONS:
+                        for doc_id, content, meta in zip(batch_ids, batch_docs, batch_metas):
+                            _index_in_graph(doc_id, content, meta, collection_name)
+                    if collection_name == self.MEDICAL_COLLECTION:
+                        self._update_keyword_index(batch_ids, batch_docs, batch_metas)
 
         logger.info(f"Batch insert complete: {added} added, {errors} errors")
         return {"added": added, "errors": errors}
 
+    def upsert_chunks(
+        self,
+        ids: List[str],
+        contents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict],
+        collection_name: str = None,
+        index_graph: bool = True,
+    ) -> int:
+        """
+        Upsert pre-embedded chunks in a single call.
+
+        Args:
+            ids: Chunk IDs
+            contents: Chunk texts
+            embeddings: Pre-computed embeddings (same order as ``ids``)
+            metadatas: Chunk metadata
+            collection_name: Target collection (default: medical_knowledge)
+            index_graph: Also add the chunks to the knowledge graph postings
+
+        Returns:
+            Number of chunks written
+        """
+        if not ids:
+            return 0
+        collection_name = collection_name or self.MEDICAL_COLLECTION
+        collection = self._get_collection(collection_name)
+
+        embeddings = [e.tolist() if isinstance(e, np.ndarray) else e for e in embeddings]
+        added_at = datetime.now().isoformat()
+        metas = [self._sanitize_metadata({**meta, "added_at": added_at}) for meta in metadatas]
+
+        collection.upsert(ids=ids, documents=contents, embeddings=embeddings, metadatas=metas)
+
+        if index_graph and collection_name not in self.USER_COLLECTIONS:
+            for chunk_id, content, meta in zip(ids, contents, metas):
+                _index_in_graph(chunk_id, content, meta, collection_name)
+        if collection_name == self.MEDICAL_COLLECTION:
+            self._update_keyword_index(ids, contents, metas)
+        return len(ids)
+
+    def get_embeddings_by_hash(
+        self,
+        content_hashes: List[str],
+        collection_name: str = None,
+    ) -> Dict[str, List[float]]:
+        """
+        Look up stored embeddings by ``content_hash`` metadata.
+
+        Lets ingestion reuse embeddings for content that is already indexed
+        instead of re-embedding it.
+
+        Returns:
+            content_hash -> embedding for the hashes found
+        """
+        if not content_hashes:
+            return {}
+        collection = self._get_collection(collection_name or self.MEDICAL_COLLECTION)
+        try:
+            found = collection.get(
+                where={"content_hash": {"$in": list(content_hashes)}},
+                include=["embeddings", "metadatas"],
+            )
+        except Exception as e:
+            logger.debug(f"Embedding lookup by hash failed: {e}")
+            return {}
+
+        result: Dict[str, List[float]] = {}
+        embeddings = found.get("embeddings")
+        if embeddings is None:
+            return result
+        for meta, embedding in zip(found.get("metadatas") or [], embeddings):
+            content_hash = (meta or {}).get("content_hash")
+            if content_hash and content_hash not in result:
+                result[content_hash] = (
+                    embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+                )
+        return result
+
+    def delete_by_metadata(self, where: Dict[str, Any], collection_name: str = None) -> bool:
+        """Delete all chunks matching a metadata filter."""
+        collection_name = collection_name or self.MEDICAL_COLLECTION
+        collection = self._get_collection(collection_name)
+        try:
+            if collection_name == self.MEDICAL_COLLECTION and BM25_INDEX_ENABLED:
+                ids = collection.get(where=where, include=[])["ids"]
+                collection.delete(ids=ids)
+                self._update_keyword_index(ids)
+            else:
+                collection.delete(where=where)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to delete chunks matching {where}: {e}")
+            return False
+
+    # =========================================================================
+    # KEYWORD (BM25) SEARCH
+    # =========================================================================
+
+    def get_keyword_index(self):
+        """
+        BM25 index over the medical collection.
+
+        Never builds in the caller's thread: until the bm25-sync thread has
+        loaded (or built) and verified the index this returns None, and
+        keyword search contributes no results.
+
+        Returns:
+            BM25Index, or None when disabled/not ready
+        """
+        if not BM25_INDEX_ENABLED:
+            return None
+        if self._keyword_index is None:
+            start_keyword_index_sync(self)
+        return self._keyword_index
+
+    def sync_keyword_index(self, page_size: int = 1000) -> Tuple[int, int]:
+        """
+        Bring the keyword index in line with the medical collection.
+
+        The first call opens the on-disk snapshot (or starts empty). Every
+        call compares each chunk's content digest with the indexed one, so
+        a stale snapshot, same-id upserts and writes made by other worker
+        processes are all re-indexed; chunks no longer stored are dropped.
+
+        Args:
+            page_size: Chunks fetched per collection read
+
+        Returns:
+            (chunks indexed, chunks removed)
+        """
+        if not BM25_INDEX_ENABLED:
+            return 0, 0
+        try:
+            from rag.retrieval.bm25_index import BM25Index, content_digest
+        except ImportError as e:
+            logger.warning(f"BM25 index unavailable: {e}")
+            return 0, 0
+
+        with self._keyword_sync_lock:
+            index = self._writable_keyword_index()
+            if index is None:
+                index = self._keyword_index_pending = self._load_keyword_snapshot(BM25Index)
+
+            collection = self._get_collection(self.MEDICAL_COLLECTION)
+            seen = set()
+            added = 0
+            for offset in range(0, collection.count(), page_size):
+                page = collection.get(
+                    limit=page_size, offset=offset, include=["documents", "metadatas"]
+                )
+                changed = []
+                for doc_id, content, meta in zip(
+                    page["ids"], page["documents"] or [], page["metadatas"] or []
+                ):
+                    if self._is_user_owned(meta):
+                        continue
+                    seen.add(doc_id)
+                    if index.digest(doc_id) != content_digest(content or ""):
+                        changed.append((doc_id, content or ""))
+                added += index.add_many(changed)
+
+            # Offset paging can skip chunks under concurrent deletes: confirm before dropping
+            unseen = [doc_id for doc_id in index.keys() if doc_id not in seen]
+            stale = []
+            for start in range(0, len(unseen), page_size):
+                ids = unseen[start:start + page_size]
+                stored = set(collection.get(ids=ids, include=[])["ids"])
+                stale.extend(doc_id for doc_id in ids if doc_id not in stored)
+            removed = index.delete(stale)
+
+            if self._keyword_index is None:
+                self._keyword_index = index
+                self._keyword_index_pending = None
+                logger.info(f"✅ BM25 index ready: {len(index)} chunks")
+            if added or removed:
+                with self._keyword_index_lock:
+                    self._keyword_index_unsaved += added + removed
+            return added, removed
+
+    def _writable_keyword_index(self):
+        """The ready index, else the one being built (an empty index is falsy)."""
+        if self._keyword_index is not None:
+            return self._keyword_index
+        return self._keyword_index_pending
+
+    def _load_keyword_snapshot(self, index_cls):
+        """Open the on-disk snapshot, or an empty index when there is none."""
+        if os.path.exists(os.path.join(self._keyword_index_dir, "meta.json")):
+            try:
+                index = index_cls.load(self._keyword_index_dir)
+                logger.info(f"BM25 snapshot loaded: {len(index)} chunks, verifying against the collection")
+                return index
+            except Exception as e:
+                logger.warning(f"Failed to load BM25 snapshot, rebuilding: {e}")
+        return index_cls()
+
+    def _update_keyword_index(
+        self,
+        ids: List[str],
+        contents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict]] = None,
+    ):
+        """Apply a write to the keyword index (``contents=None`` deletes).
+
+        Patient-owned chunks (``user_id`` metadata) are never indexed.
+        """
+        if not ids or not BM25_INDEX_ENABLED:
+            return
+        try:
+            index = self._writable_keyword_index()
+            if index is None:
+                # Not loaded yet: the first sync reads this write from the collection
+                self.get_keyword_index()
+                return
+            if contents is None:
+                index.delete(ids)
+            else:
+                metadatas = metadatas or [None] * len(ids)
+                private = [i for i, meta in zip(ids, metadatas) if self._is_user_owned(meta)]
+                if private:
+                    index.delete(private)
+                index.add_many(
+                    (doc_id, content)
+                    for doc_id, content, meta in zip(ids, contents, metadatas)
+                    if not self._is_user_owned(meta)
+                )
+            with self._keyword_index_lock:
+                self._keyword_index_unsaved += len(ids)
+                save = (
+                    index is self._keyword_index
+                    and self._keyword_index_unsaved >= BM25_SAVE_EVERY
+                )
+                if save:
+                    self._keyword_index_unsaved = 0
+            if save:
+                index.save(self._keyword_index_dir)
+        except Exception as e:
+            logger.warning(f"BM25 index update failed for {len(ids)} chunks: {e}")
+
+    def save_keyword_index(self) -> bool:
+        """Snapshot the keyword index to disk (e.g. at the end of ingestion)."""
+        index = self._keyword_index
+        if index is None:
+            return False
+        try:
+            with self._keyword_index_lock:
+                self._keyword_index_unsaved = 0
+            index.save(self._keyword_index_dir)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save BM25 index: {e}")
+            return False
+
+    def _drop_keyword_index(self):
+        with self._keyword_index_lock:
+            for index in (self._keyword_index, self._keyword_index_pending):
+                if index is not None:
+                    index.clear()
+            self._keyword_index_unsaved = 0
+            shutil.rmtree(self._keyword_index_dir, ignore_errors=True)
+
+    def keyword_search(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        BM25 search over the medical knowledge base.
+
+        Args:
+            query: Raw query text (tokenized with the medical tokenizer)
+            top_k: Number of results to return
+
+        Returns:
+            Results in the same format as search_medical_knowledge, with the
+            BM25 score as ``score``
+        """
+        index = self.get_keyword_index()
+        if index is None or not query:
+            return []
+        hits = index.search(query, top_k)
+        if not hits:
+            return []
+
+        collection = self._get_collection(self.MEDICAL_COLLECTION)
+        found = collection.get(ids=[doc_id for doc_id, _ in hits], include=["documents", "metadatas"])
+        rows = {
+            doc_id: (content, meta)
+            for doc_id, content, meta in zip(
+                found["ids"], found.get("documents") or [], found.get("metadatas") or []
+            )
+        }
+        results = []
+        for doc_id, score in hits:
+            if doc_id in rows:
+                content, meta = rows[doc_id]
+                if self._is_user_owned(meta):
+                    continue
+                results.append({"id": doc_id, "content": content or "", "metadata": meta or {}, "score": score})
+        return results
+
+    async def keyword_search_async(self, query: str, top_k: int = 5) -> List[Dict]:
+        """Async version of keyword_search."""
+        return await asyncio.to_thread(self.keyword_search, query, top_k)
+
     # =========================================================================
     # STATS & UTILITIES
     # =========================================================================
@@ -779,6 +1234,7 @@ class ChromaDBVectorStore:
             self.DRUG_COLLECTION,
             self.SYMPTOMS_COLLECTION,
             self.MEMORIES_COLLECTION,
+            self.USER_DOCUMENTS_COLLECTION,
         ]:
             try:
                 collection = self._get_collection(name)
@@ -789,6 +1245,24 @@ class ChromaDBVectorStore:
 
         return stats
 
+    def get_chunk_ids(self, collection_name: str = None) -> List[str]:
+        """IDs of every chunk in a collection (default: medical_knowledge)."""
+        collection = self._get_collection(collection_name or self.MEDICAL_COLLECTION)
+        return list(collection.get(include=[])["ids"])
+
+    def get_chunks(self, ids: List[str], collection_name: str = None) -> List[Dict]:
+        """Content and metadata of chunks by ID (missing IDs are skipped)."""
+        if not ids:
+            return []
+        collection = self._get_collection(collection_name or self.MEDICAL_COLLECTION)
+        found = collection.get(ids=list(ids), include=["documents", "metadatas"])
+        return [
+            {"id": doc_id, "content": content or "", "metadata": meta or {}}
+            for doc_id, content, meta in zip(
+                found["ids"], found.get("documents") or [], found.get("metadatas") or []
+            )
+        ]
+
     def clear_cache(self):
         """Clear query cache."""
         with self._query_cache_lock:
@@ -810,6 +1284,8 @@ class ChromaDBVectorStore:
         try:
             self._client.delete_collection(name)
             self._collections.pop(name, None)
+            if name == self.MEDICAL_COLLECTION:
+                self._drop_keyword_index()
             logger.info(f"Deleted collection: {name}")
             return True
         except Exception as e:
@@ -820,6 +1296,11 @@ class ChromaDBVectorStore:
     # HELPERS
     # =========================================================================
 
+    @staticmethod
+    def _is_user_owned(meta: Optional[Dict]) -> bool:
+        """Whether a chunk belongs to a patient (must never be served from shared search)."""
+        return bool((meta or {}).get("user_id"))
+
     @staticmethod
     def _sanitize_metadata(meta: Dict) -> Dict:
         """Sanitize metadata values for ChromaDB (must be str, int, float, or bool)."""
@@ -836,23 +1317,90 @@ class ChromaDBVectorStore:
         return sanitized
 
 
+# ============================================================================
+# Keyword index sync
+# ============================================================================
+
+_keyword_sync_stop = threading.Event()
+_keyword_sync_thread: Optional[threading.Thread] = None
+_keyword_sync_start_lock = threading.Lock()
+
+
+def _keyword_sync_loop(store: "ChromaDBVectorStore", interval: float) -> None:
+    """Load/verify the keyword index once at startup, then re-sync every ``interval`` seconds."""
+    while not _keyword_sync_stop.is_set():
+        try:
+            added, removed = store.sync_keyword_index()
+            if added or removed:
+                logger.info(f"BM25 index synced: +{added} / -{removed} chunks")
+            if store._keyword_index_unsaved:
+                store.save_keyword_index()
+        except Exception as e:
+            logger.warning(f"BM25 index sync failed: {e}")
+        if interval <= 0 or _keyword_sync_stop.wait(interval):
+            break
+    if store._keyword_index_unsaved:
+        store.save_keyword_index()
+
+
+def start_keyword_index_sync(
+    store: Optional["ChromaDBVectorStore"] = None,
+    interval: float = BM25_SYNC_SECONDS,
+) -> None:
+    """Start the background keyword index sync for ``store`` (idempotent)."""
+    global _keyword_sync_thread
+    if not BM25_INDEX_ENABLED:
+        return
+    with _keyword_sync_start_lock:
+        if _keyword_sync_thread is not None and _keyword_sync_thread.is_alive():
+            return
+        _keyword_sync_stop.clear()
+        _keyword_sync_thread = threading.Thread(
+            target=_keyword_sync_loop,
+            args=(store or get_chromadb_store(), interval),
+            name="bm25-sync",
+            daemon=True,
+        )
+        _keyword_sync_thread.start()
+
+
+def stop_keyword_index_sync(timeout: float = 5.0) -> None:
+    """Stop the background keyword index sync."""
+    _keyword_sync_stop.set()
+    if _keyword_sync_thread is not None:
+        _keyword_sync_thread.join(timeout)
+
+
 # ============================================================================
 # Singleton instance
 # ============================================================================
 
 _chromadb_store_instance = None
+_chromadb_store_kwargs: Dict[str, Any] = {}
 _chromadb_store_lock = threading.Lock()
 
 
 def get_chromadb_store(**kwargs) -> ChromaDBVectorStore:
-    """Get singleton ChromaDBVectorStore instance."""
-    global _chromadb_store_instance
+    """
+    Get singleton ChromaDBVectorStore instance.
+
+    ``kwargs`` only take effect on the first call. Later calls passing
+    different ones get the existing store and a warning.
+    """
+    global _chromadb_store_instance, _chromadb_store_kwargs
 
     if _chromadb_store_instance is None:
         with _chromadb_store_lock:
             if _chromadb_store_instance is None:
                 _chromadb_store_instance = ChromaDBVectorStore(**kwargs)
+                _chromadb_store_kwargs = dict(kwargs)
+                return _chromadb_store_instance
 
+    if kwargs and kwargs != _chromadb_store_kwargs:
+        logger.warning(
+            f"get_chromadb_store() ignoring {sorted(kwargs)}: the shared store "
+            f"was already created with {_chromadb_store_kwargs or 'defaults'}"
+        )
     return _chromadb_store_instance
 
 
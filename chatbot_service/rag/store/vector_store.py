@@ -205,10 +205,12 @@ _ChromaDBVectorStoreClass = None
 
 try:
     from .chromadb_store import ChromaDBVectorStore as _ChromaDBVectorStoreClass
+    from .chromadb_store import get_chromadb_store
     CHROMADB_STORE_AVAILABLE = True
 except ImportError:
     try:
         from rag.store.chromadb_store import ChromaDBVectorStore as _ChromaDBVectorStoreClass
+        from rag.store.chromadb_store import get_chromadb_store
         CHROMADB_STORE_AVAILABLE = True
     except ImportError:
         logger.warning("ChromaDBVectorStore not available")
@@ -219,7 +221,9 @@ def get_vector_store(**kwargs) -> Union["ChromaDBVectorStoreType", "InMemoryVect
     Factory function to get the appropriate vector store.
     
     Priority:
-    1. ChromaDBVectorStore (ChromaDB) - Production recommended
+    1. ChromaDBVectorStore (ChromaDB) - Production recommended. This is the
+       process-wide ``get_chromadb_store()`` singleton, so every caller shares
+       one client, query cache and BM25 keyword index.
     2. InMemoryVectorStore - Development/testing fallback
     
     Args:
@@ -231,7 +235,7 @@ def get_vector_store(**kwargs) -> Union["ChromaDBVectorStoreType", "InMemoryVect
     # Priority 1: ChromaDB store (recommended for production)
     if CHROMADB_STORE_AVAILABLE and _ChromaDBVectorStoreClass is not None:
         try:
-            store = _ChromaDBVectorStoreClass(**kwargs)
+            store = get_chromadb_store(**kwargs)
             logger.info("✅ Using ChromaDBVectorStore (ChromaDB)")
             return store
         except Exception as e:
@@ -91,14 +91,17 @@ async def get_graph_json():
 
 @router.get("/metrics", summary="Get tracing and performance metrics summary")
 async def get_graph_metrics():
-    """Returns aggregated tracing metrics and Prometheus metrics summary."""
+    """Returns aggregated tracing metrics, per-node latency and Prometheus metrics summary."""
     result = {}
 
     # Tracing metrics
     try:
         from core.observability.tracing import get_tracer
         tracer = get_tracer()
-        result["tracing"] = tracer.get_metrics()
+        tracing = tracer.get_metrics()
+        # Per-node/stage latency (count, errors, avg/p50/p95/p99/max ms)
+        result["node_latency"] = tracing.pop("nodes", {})
+        result["tracing"] = tracing
         result["recent_traces"] = tracer.get_recent_traces(limit=5)
     except Exception as e:
         result["tracing"] = {"error": str(e)}
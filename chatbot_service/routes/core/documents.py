@@ -17,16 +17,16 @@ Uses rag/multimodal/ components for:
 import os
 import uuid
 import json
+import asyncio
 import tempfile
 import logging
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from pathlib import Path
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any
 
 from routes.core.file_security import validate_upload
 from core.security import get_current_user
@@ -83,6 +83,12 @@ class DocumentQueryResponse(BaseModel):
 # PostgreSQL-Backed Document Store
 # ============================================================
 
+def _get_vector_store():
+    """The shared vector store (the DI container's, so writes reach its caches and BM25 index)."""
+    from core.dependencies import DIContainer
+    return DIContainer.get_instance().vector_store
+
+
 async def _get_db():
     """Get the PostgreSQL database instance."""
     from core.database.postgres_db import get_database
@@ -176,41 +182,23 @@ async def _db_delete_document(doc_id: str) -> bool:
 
 _ingestion_service = None
 _query_service = None
+# Strong refs to ingestion jobs started without BackgroundTasks, so the
+# event loop cannot garbage-collect them mid-run
+_ingestion_tasks: Set[asyncio.Task] = set()
 
 
 def _get_ingestion_service():
-    """Lazy load the multimodal ingestion service."""
+    """Lazy load the streaming ingestion service."""
     global _ingestion_service
     if _ingestion_service is None:
         try:
             from rag.multimodal import MultimodalIngestionService, MultimodalConfig
-            from rag.store.vector_store import get_vector_store
             from rag.embedding import get_embedding_service
-            from core.llm import get_llm_gateway
-            
-            vector_store = get_vector_store()
-            embedding_service = get_embedding_service()
-            llm_gateway = get_llm_gateway()
-            
-            # Create embedding function wrapper
-            async def embed_func(text: str) -> List[float]:
-                return await embedding_service.embed_text(text)
-            
-            # Create LLM function wrapper
-            async def llm_func(prompt: str) -> str:
-                return await llm_gateway.generate(prompt)
-            
-            config = MultimodalConfig(
-                enable_table_processing=True,
-                enable_image_processing=True,
-                enable_equation_processing=True,
-            )
             
             _ingestion_service = MultimodalIngestionService(
-                vector_store=vector_store,
-                embedding_func=embed_func,
-                llm_func=llm_func,
-                config=config,
+                vector_store=_get_vector_store(),
+                embedding_service=get_embedding_service(),
+                config=MultimodalConfig(),
             )
             logger.info("MultimodalIngestionService initialized for document routes")
         except Exception as e:
@@ -220,16 +208,127 @@ def _get_ingestion_service():
     return _ingestion_service
 
 
+# ============================================================
+# Background Ingestion Jobs
+# ============================================================
+
+async def _get_job_store_or_none():
+    """JobStore for tracking ingestion jobs, or None if Redis is unavailable."""
+    try:
+        from core.services.job_store import get_job_store
+        return await get_job_store()
+    except Exception as e:
+        logger.warning(f"JobStore unavailable, ingestion job will not be tracked: {e}")
+        return None
+
+
+async def _run_ingestion_job(
+    job_id: Optional[str],
+    ingestion_service,
+    temp_path: str,
+    doc_id: str,
+    doc_record: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> None:
+    """Ingest an uploaded file in the background and record the outcome."""
+    from core.services.job_store import JobStatus
+    
+    job_store = await _get_job_store_or_none() if job_id else None
+    
+    async def report_progress(progress: Dict[str, Any]) -> None:
+        if job_store:
+            await job_store.update_job_progress(
+                job_id,
+                current_step=progress["chunks_written"],
+                total_steps=0,
+                current_node="upsert",
+                message=f"{progress['chunks_written']} chunks indexed",
+            )
+    
+    try:
+        if job_store:
+            await job_store.update_job_status(job_id, JobStatus.PROCESSING.value)
+        
+        result = await ingestion_service.ingest_document(
+            file_path=temp_path,
+            metadata=metadata,
+            doc_id=doc_id,
+            progress_callback=report_progress,
+        )
+        
+        doc_record.update({
+            "status": "processed" if result.success else "failed",
+            "chunks_created": result.chunks_created,
+            "content_hash": result.content_hash,
+        })
+        await _db_store_document(doc_record)
+        
+        if job_store:
+            if result.success:
+                await job_store.complete_job(job_id, result.to_dict())
+            else:
+                await job_store.fail_job(
+                    job_id, {"error": result.error, "error_type": "IngestionError"}
+                )
+    except Exception as e:
+        logger.error(f"Ingestion job {job_id} for {doc_id} failed: {e}", exc_info=True)
+        if job_store:
+            await job_store.fail_job(job_id, {"error": str(e), "error_type": type(e).__name__})
+    finally:
+        try:
+            os.unlink(temp_path)
+        except Exception:
+            pass
+
+
+async def _queue_ingestion(
+    background_tasks: Optional[BackgroundTasks],
+    ingestion_service,
+    temp_path: str,
+    doc_record: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Record the document, create its ingestion job and schedule the work.
+    
+    Returns:
+        Job ID, or None if the job could not be tracked
+    """
+    doc_id = doc_record["id"]
+    await _db_store_document(doc_record)
+    
+    job_id = None
+    job_store = await _get_job_store_or_none()
+    if job_store:
+        try:
+            job = await job_store.create_job(
+                user_id=str(doc_record.get("user_id")),
+                query=f"ingest:{doc_record.get('filename', doc_id)}",
+                metadata={"job_type": "document_ingestion", "doc_id": doc_id},
+            )
+            job_id = job.id
+        except Exception as e:
+            logger.warning(f"Failed to create ingestion job for {doc_id}: {e}")
+    
+    args = (job_id, ingestion_service, temp_path, doc_id, doc_record, metadata)
+    if background_tasks is not None:
+        background_tasks.add_task(_run_ingestion_job, *args)
+    else:
+        task = asyncio.create_task(_run_ingestion_job(*args))
+        _ingestion_tasks.add(task)
+        task.add_done_callback(_ingestion_tasks.discard)
+    return job_id
+
+
 def _get_query_service():
     """Lazy load the multimodal query service."""
     global _query_service
     if _query_service is None:
         try:
             from rag.multimodal import MultimodalQueryService
-            from rag.store.vector_store import get_vector_store
             from core.llm import get_llm_gateway
             
-            vector_store = get_vector_store()
+            vector_store = _get_vector_store()
             llm_gateway = get_llm_gateway()
             
             # MultimodalQueryService expects retriever (not vector_store) and llm_func (not llm_gateway)
@@ -305,11 +404,11 @@ async def upload_document(
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
     category: Optional[str] = Form("medical"),
-    user_id: Optional[str] = Form(None),
+    background_tasks: BackgroundTasks = None,
     current_user: Dict[str, Any] = Depends(get_current_user),
 ):
     """
-    Upload and process a single document.
+    Upload a single document and queue it for ingestion.
     
     Supported formats:
     - PDF (with OCR support)
@@ -321,17 +420,18 @@ async def upload_document(
     - Extracts tables, images, and equations
     - Generates embeddings for semantic search
     - Stores in vector database
+    - Runs as a background job; poll GET /api/v2/jobs/{job_id} for progress
     
     **Security:**
     ✅ Streams file in 1MB chunks (prevents OOM on large uploads)
     ✅ Validates MIME type from binary signature (prevents spoofing)
     ✅ Respects max file size limits
+    ✅ Owner is always the authenticated caller (no client-supplied user_id)
     
     Args:
         file: Document file to upload
         description: Optional description of the document
         category: Document category (default: medical)
-        user_id: Optional user ID to associate with document
     
     Returns:
         DocumentUploadResponse with ingestion details
@@ -407,71 +507,52 @@ async def upload_document(
                 detail=f"File validation failed: {error_msg}"
             )
         
-        # Prepare metadata
+        # Prepare metadata; the owner comes from the token, never the form
+        _resolved_uid = current_user.get("user_id") or current_user.get("sub")
         metadata = {
             "original_filename": file.filename,
             "description": description,
             "category": category,
-            "user_id": user_id,
+            "user_id": str(_resolved_uid) if _resolved_uid is not None else None,
             "file_size": total_bytes,
         }
         
         logger.info(f"📁 File uploaded and validated: {file.filename} ({total_bytes / (1024*1024):.1f}MB)")
         
-        # Try to ingest document with full multimodal pipeline, fallback to basic storage
+        # Queue streaming ingestion as a background job, fallback to basic storage
         doc_id = str(uuid.uuid4())
+        _now = datetime.now().isoformat()
         
         if ingestion_service is not None:
-            try:
-                result = await ingestion_service.ingest_document(
-                    file_path=temp_path,
-                    metadata=metadata
-                )
-                
-                # Clean up temp file
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
-                
-                if result.success:
-                    # Persist to PostgreSQL
-                    _now = datetime.now().isoformat()
-                    _resolved_uid = user_id or (current_user.get("user_id") or current_user.get("sub"))
-                    doc_record = {
-                        "id": result.doc_id,
-                        "document_id": result.doc_id,
-                        "filename": file.filename,
-                        "classification": {"document_type": category, "category": category},
-                        "status": "processed",
-                        "uploaded_at": _now,
-                        "created_at": _now,
-                        "file_size": total_bytes,
-                        "content_type": category or "medical",
-                        "description": description,
-                        "user_id": str(_resolved_uid) if _resolved_uid is not None else None,
-                    }
-                    await _db_store_document(doc_record)
-                    
-                    return DocumentUploadResponse(
-                        success=True,
-                        doc_id=result.doc_id,
-                        file_name=file.filename,
-                        chunks_created=result.chunks_created,
-                        tables_processed=result.tables_processed,
-                        images_processed=result.images_processed,
-                        message="Document processed successfully",
-                        metadata=result.metadata,
-                    )
-                else:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Document processing failed: {result.error}"
-                    )
-            except HTTPException:
-                raise
-            except Exception as e:
-                logger.warning(f"Full ingestion failed, using basic storage: {e}")
+            doc_record = {
+                "id": doc_id,
+                "document_id": doc_id,
+                "filename": file.filename,
+                "classification": {"document_type": category, "category": category},
+                "status": "processing",
+                "uploaded_at": _now,
+                "created_at": _now,
+                "file_size": total_bytes,
+                "content_type": category or "medical",
+                "description": description,
+                "user_id": metadata["user_id"],
+            }
+            job_id = await _queue_ingestion(
+                background_tasks, ingestion_service, temp_path, doc_record, metadata
+            )
+            
+            return DocumentUploadResponse(
+                success=True,
+                doc_id=doc_id,
+                file_name=file.filename,
+                message="Document queued for ingestion",
+                metadata={
+                    **metadata,
+                    "status": "processing",
+                    "job_id": job_id,
+                    "status_url": f"/api/v2/jobs/{job_id}" if job_id else None,
+                },
+            )
         
         # Fallback: basic document storage without multimodal processing
         # Clean up temp file
@@ -480,8 +561,6 @@ async def upload_document(
         except Exception:
             pass
         
-        _now = datetime.now().isoformat()
-        _resolved_uid = user_id or (current_user.get("user_id") or current_user.get("sub"))
         fallback_record = {
             "id": doc_id,
             "document_id": doc_id,
@@ -493,7 +572,7 @@ async def upload_document(
             "file_size": total_bytes,
             "content_type": category or "medical",
             "description": description,
-            "user_id": str(_resolved_uid) if _resolved_uid is not None else None,
+            "user_id": metadata["user_id"],
         }
         await _db_store_document(fallback_record)
         
@@ -522,17 +601,15 @@ async def upload_document(
 async def upload_documents_batch(
     files: List[UploadFile] = File(...),
     category: Optional[str] = Form("medical"),
-    user_id: Optional[str] = Form(None),
     background_tasks: BackgroundTasks = None,
     current_user: Dict[str, Any] = Depends(get_current_user),
 ):
     """
-    Upload multiple documents in batch.
+    Upload multiple documents in batch, each queued as its own ingestion job.
     
     Args:
         files: List of document files
         category: Document category for all files
-        user_id: Optional user ID
         background_tasks: FastAPI background tasks
     
     Returns:
@@ -558,39 +635,44 @@ async def upload_documents_batch(
                 temp_file.write(content)
                 temp_path = temp_file.name
             
+            if ingestion_service is None:
+                os.unlink(temp_path)
+                raise RuntimeError("Ingestion service not available")
+            
+            _now = datetime.now().isoformat()
+            _resolved_uid = current_user.get("user_id") or current_user.get("sub")
+            doc_id = str(uuid.uuid4())
+            doc_record = {
+                "id": doc_id,
+                "document_id": doc_id,
+                "filename": file.filename,
+                "classification": {"document_type": category, "category": category},
+                "status": "processing",
+                "uploaded_at": _now,
+                "created_at": _now,
+                "file_size": len(content),
+                "content_type": category or "medical",
+                "user_id": str(_resolved_uid) if _resolved_uid is not None else None,
+            }
             metadata = {
                 "original_filename": file.filename,
                 "category": category,
-                "user_id": user_id,
+                "user_id": doc_record["user_id"],
                 "file_size": len(content),
             }
             
-            result = await ingestion_service.ingest_document(
-                file_path=temp_path,
-                metadata=metadata
+            job_id = await _queue_ingestion(
+                background_tasks, ingestion_service, temp_path, doc_record, metadata
             )
             
-            # Cleanup
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
-            
-            if result.success:
-                successful += 1
-                results.append({
-                    "file_name": file.filename,
-                    "success": True,
-                    "doc_id": result.doc_id,
-                    "chunks_created": result.chunks_created,
-                })
-            else:
-                failed += 1
-                results.append({
-                    "file_name": file.filename,
-                    "success": False,
-                    "error": result.error,
-                })
+            successful += 1
+            results.append({
+                "file_name": file.filename,
+                "success": True,
+                "doc_id": doc_id,
+                "status": "processing",
+                "job_id": job_id,
+            })
         
         except Exception as e:
             failed += 1
@@ -629,15 +711,20 @@ async def query_documents(
         DocumentQueryResponse with matching results
     """
     try:
-        from rag.store.vector_store import get_vector_store
-        
-        vector_store = get_vector_store()
+        vector_store = _get_vector_store()
+        user_id = current_user.get("user_id") or current_user.get("sub")
         
-        # Perform search
+        # Perform search: shared knowledge base plus the caller's own uploads
         results = vector_store.search_medical_knowledge(
             query=request.query,
             top_k=request.top_k
         )
+        if user_id is not None and hasattr(vector_store, "search_user_documents"):
+            results = results + vector_store.search_user_documents(
+                request.query, str(user_id), top_k=request.top_k, doc_ids=request.doc_ids
+            )
+            results.sort(key=lambda r: r.get("score", 0.0), reverse=True)
+            results = results[:request.top_k]
         
         # Filter by doc_ids if specified
         if request.doc_ids:
@@ -741,14 +828,44 @@ async def delete_document(
         await _db_delete_document(doc_id)
 
         # Also try to delete vector chunks
+        touched_collections = []
         try:
-            from rag.store.vector_store import get_vector_store
-            vector_store = get_vector_store()
+            vector_store = _get_vector_store()
             if hasattr(vector_store, "delete_by_metadata"):
                 vector_store.delete_by_metadata({"doc_id": doc_id})
+                touched_collections.append(getattr(vector_store, "MEDICAL_COLLECTION", None))
+                user_id = current_user.get("user_id") or current_user.get("sub")
+                user_collection = getattr(vector_store, "USER_DOCUMENTS_COLLECTION", None)
+                if user_id is not None and user_collection:
+                    # Only the caller's own chunks
+                    vector_store.delete_by_metadata(
+                        {"$and": [{"doc_id": doc_id}, {"user_id": str(user_id)}]},
+                        collection_name=user_collection,
+                    )
+                    touched_collections.append(user_collection)
         except Exception:
             pass  # vector store cleanup is best-effort
 
+        # Evict cached retrievals built from this document, and those whose
+        # results carried no document id (tagged by collection instead)
+        try:
+            from core.cache import collection_tag, document_tag, invalidate_everywhere
+            await invalidate_everywhere(
+                document_tag(doc_id),
+                *(collection_tag(name) for name in touched_collections if name),
+            )
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for document {doc_id}: {e}")
+
+        # Drop the document's entity postings from the knowledge graph
+        try:
+            from rag.knowledge_graph.graph_store import get_graph_store
+            graph_store = get_graph_store()
+            graph_store.remove_document(doc_id)
+            graph_store.remove_chunk(doc_id)
+        except Exception as e:
+            logger.warning(f"Graph cleanup failed for document {doc_id}: {e}")
+
         return {
             "success": True,
             "doc_id": doc_id,
@@ -21,6 +21,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
+from core.cache import invalidate_everywhere, user_tag
 from core.security import get_current_user
 from core.user.user_preferences import (
     UserPreferencesManager,
@@ -1137,9 +1138,17 @@ async def delete_user_data(
         except Exception as e:
             logger.warning(f"Failed to delete chat sessions: {e}")
 
+        # Evict cached data derived from this user
+        cache_entries_deleted = 0
+        try:
+            cache_entries_deleted = await invalidate_everywhere(user_tag(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate user caches: {e}")
+
         return {
             "user_id": user_id,
             "deleted": True,
+            "cache_entries_deleted": cache_entries_deleted,
             "preferences_deleted": pref_result.get("preferences_deleted", 0),
             "sessions_deleted": chat_deleted,
             "timestamp": datetime.utcnow().isoformat(),
@@ -14,10 +14,12 @@ Migration from sync to async pattern enables:
 """
 
 
+import asyncio
 import logging
 import uuid
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, status, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
 import re
 
@@ -102,6 +104,7 @@ class ChatRequest(BaseModel):
     
     # Async pattern options
     sync: bool = Field(False, description="If True, wait for result (backward compat). Default: async")
+    stream: bool = Field(False, description="With sync=True, stream the answer as SSE token events")
     webhook_url: Optional[str] = Field(None, description="URL for result delivery via webhook")
     priority: int = Field(0, ge=-10, le=10, description="Job priority (-10 to 10, higher = more urgent)")
     
@@ -200,6 +203,8 @@ async def orchestrated_chat(
     - Blocks until result is ready
     - For backward compatibility only
     - Not recommended for production
+    - With request.stream=True, returns an SSE stream of answer tokens
+      followed by the final result
     
     Requires Authentication.
     """
@@ -216,6 +221,8 @@ async def orchestrated_chat(
     
     # 2. Check if sync mode requested (backward compatibility)
     if request.sync:
+        if request.stream:
+            return _stream_sync_chat(request, session_id)
         return await _process_sync_chat(request, session_id)
     
     # 3. Async mode (default): Enqueue job and return immediately
@@ -242,29 +249,99 @@ async def _process_sync_chat(request: ChatRequest, session_id: str) -> ChatRespo
             file_ids=request.file_ids
         )
         
-        is_success = bool(result.get("response")) and result.get("confidence", 0) > 0.3
-        
-        return ChatResponse(
-            response=result.get("response", "I apologize, but I couldn't generate a response."),
-            sources=result.get("sources", []),
-            metadata={
-                "processing_time": result.get("processing_time"),
-                "steps": result.get("steps", []),
-                "confidence": result.get("confidence", 0.0),
-                "source": result.get("metadata", {}).get("source", "unknown"),
-                "intent": result.get("intent", "unknown"),
-                "pii_scrubbed": result.get("pii_scrubbed", False),
-                "sync_mode": True  # Indicate this was processed synchronously
-            },
-            session_id=session_id,
-            success=is_success
-        )
+        return _build_chat_response(result, session_id)
         
     except Exception as e:
         logger.error(f"[SYNC] Error processing chat request: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _build_chat_response(result: Dict[str, Any], session_id: str) -> ChatResponse:
+    """Map an orchestrator result to the sync ChatResponse."""
+    is_success = bool(result.get("response")) and result.get("confidence", 0) > 0.3
+    
+    return ChatResponse(
+        response=result.get("response", "I apologize, but I couldn't generate a response."),
+        sources=result.get("sources", []),
+        metadata={
+            "processing_time": result.get("processing_time"),
+            "steps": result.get("steps", []),
+            "confidence": result.get("confidence", 0.0),
+            "source": result.get("metadata", {}).get("source", "unknown"),
+            "intent": result.get("intent", "unknown"),
+            "pii_scrubbed": result.get("pii_scrubbed", False),
+            "sync_mode": True  # Indicate this was processed synchronously
+        },
+        session_id=session_id,
+        success=is_success
+    )
+
+
+def _stream_sync_chat(request: ChatRequest, session_id: str) -> StreamingResponse:
+    """
+    Process chat in-request and stream the answer as Server-Sent Events.
+    
+    Events: ``token`` ({"text", "offset"}) as the final answer is generated,
+    then ``result`` (the full ChatResponse, which is authoritative) or
+    ``error``. Tokens pass through a bounded queue: when the client reads
+    slowly, generation waits instead of buffering the answer in memory.
+    Disconnecting cancels the orchestrator run.
+    """
+    from routes.core.sse_routes import format_sse_message
+    from core.services.token_stream import TOKEN_STREAM_QUEUE_SIZE
+    
+    orchestrator = get_orchestrator()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=TOKEN_STREAM_QUEUE_SIZE)
+    
+    async def on_token(text: str):
+        await queue.put(("token", text))
+    
+    async def run():
+        try:
+            result = await orchestrator.execute(
+                query=request.message,
+                user_id=request.user_id,
+                thinking=request.thinking,
+                web_search=request.web_search,
+                deep_search=request.deep_search,
+                file_ids=request.file_ids,
+                token_callback=on_token
+            )
+            await queue.put(("result", _build_chat_response(result, session_id).dict()))
+        except Exception as e:
+            logger.error(f"[SYNC] Error streaming chat request: {e}", exc_info=True)
+            await queue.put(("error", {"message": "Failed to process chat request"}))
+    
+    async def events():
+        logger.info("[SYNC] Streaming message")
+        task = asyncio.create_task(run())
+        offset = 0
+        try:
+            yield format_sse_message("connected", {"session_id": session_id}, event_id="0")
+            while True:
+                kind, payload = await queue.get()
+                if kind == "token":
+                    yield format_sse_message(
+                        "token", {"text": payload, "offset": offset}, event_id=str(offset)
+                    )
+                    offset += len(payload)
+                    continue
+                yield format_sse_message(kind, payload, event_id=str(offset))
+                break
+        finally:
+            task.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        }
+    )
+
+
 async def _enqueue_chat_job(
     request: ChatRequest,
     session_id: str,
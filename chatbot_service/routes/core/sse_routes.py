@@ -13,6 +13,11 @@ Advantages over WebSocket:
 Usage:
     GET /sse/job/{job_id} - Stream updates for a single job
     GET /sse/user/{user_id} - Stream updates for all user's jobs
+
+Job streams include ``token`` events (answer text as it is generated) read
+from the job's Redis event stream. Event IDs are stream offsets, so a
+reconnecting EventSource resumes via the Last-Event-ID header (or ``after``
+query parameter) without losing or repeating tokens.
 """
 
 
@@ -21,7 +26,7 @@ import json
 import asyncio
 from typing import Optional, AsyncGenerator
 from datetime import datetime
-from fastapi import APIRouter, Request, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Request, Depends, Query, HTTPException, Header, status
 from fastapi.responses import StreamingResponse
 
 from core.security import get_current_user
@@ -91,21 +96,29 @@ async def job_event_generator(
     request: Request,
     job_id: str,
     user_id: str,
-    timeout: float = 300
+    timeout: float = 300,
+    after: Optional[str] = None
 ) -> AsyncGenerator[str, None]:
     """
     Generator that yields SSE events for a job.
     
-    Polls job status and yields:
+    Reads the job's event stream (blocking up to 1s, which doubles as the
+    status poll interval) and yields:
+    - token: Answer text chunks ({"text", "offset"}) as they are generated
     - progress: When job progress updates
-    - heartbeat: Every 15 seconds to keep connection alive
+    - heartbeat: Every poll to keep connection alive
     - result: When job completes or fails
     
+    Every event ID is the current stream offset. The generator only reads
+    more events once the client has consumed the previous ones, so a slow
+    client applies backpressure instead of growing a server-side buffer.
+    
     Args:
         request: FastAPI request (for disconnect detection)
         job_id: Job ID to monitor
         user_id: User ID for verification
         timeout: Maximum time to stream (seconds)
+        after: Stream offset to resume after (Last-Event-ID)
     
     Yields:
         SSE formatted messages
@@ -113,14 +126,14 @@ async def job_event_generator(
     job_store = await get_job_store()
     start_time = asyncio.get_event_loop().time()
     last_progress = None
-    event_counter = 0
+    cursor = after or "0-0"
     
     # Send initial connection event
     yield format_sse_message("connected", {
         "job_id": job_id,
+        "resumed_from": after,
         "timestamp": datetime.utcnow().isoformat()
-    }, event_id=str(event_counter))
-    event_counter += 1
+    }, event_id=cursor)
     
     try:
         while True:
@@ -135,7 +148,7 @@ async def job_event_generator(
                 yield format_sse_message("timeout", {
                     "message": "Stream timeout reached",
                     "elapsed_seconds": int(elapsed)
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             # Get current job status
@@ -144,14 +157,14 @@ async def job_event_generator(
             if not job:
                 yield format_sse_message("error", {
                     "message": "Job not found"
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             # Verify ownership
             if str(job.user_id) != str(user_id):
                 yield format_sse_message("error", {
                     "message": "Access denied"
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             # Check for progress update
@@ -160,10 +173,18 @@ async def job_event_generator(
                     "job_id": job_id,
                     "status": job.status,
                     **job.progress
-                }, event_id=str(event_counter))
-                event_counter += 1
+                }, event_id=cursor)
                 last_progress = dict(job.progress)  # Deep copy to avoid identity comparison
             
+            # Drain streamed events (tokens) before reporting completion
+            while True:
+                events = await job_store.read_job_events(job_id, after=cursor)
+                for event_id, event_type, data in events:
+                    cursor = event_id
+                    yield format_sse_message(event_type, {"job_id": job_id, **data}, event_id=cursor)
+                if not events:
+                    break
+            
             # Check for completion
             if job.status == JobStatus.COMPLETED.value:
                 result = await job_store.get_job_result(job_id)
@@ -171,7 +192,7 @@ async def job_event_generator(
                     "job_id": job_id,
                     "status": "completed",
                     **(result or {})
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             elif job.status == JobStatus.FAILED.value:
@@ -180,21 +201,25 @@ async def job_event_generator(
                     "status": "failed",
                     "error": job.error,
                     "error_type": job.error_type
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             elif job.status == JobStatus.CANCELLED.value:
                 yield format_sse_message("result", {
                     "job_id": job_id,
                     "status": "cancelled"
-                }, event_id=str(event_counter))
+                }, event_id=cursor)
                 break
             
             # Send heartbeat comment (not a real event, just keeps connection alive)
             yield format_sse_comment(f"heartbeat {datetime.utcnow().isoformat()}")
             
-            # Poll interval
-            await asyncio.sleep(1)
+            # Wait up to the poll interval for new events
+            for event_id, event_type, data in await job_store.read_job_events(
+                job_id, after=cursor, block_ms=1000
+            ):
+                cursor = event_id
+                yield format_sse_message(event_type, {"job_id": job_id, **data}, event_id=cursor)
             
     except asyncio.CancelledError:
         logger.info(f"SSE stream cancelled: job={job_id}")
@@ -202,7 +227,7 @@ async def job_event_generator(
         logger.error(f"SSE error: {e}")
         yield format_sse_message("error", {
             "message": str(e)
-        }, event_id=str(event_counter))
+        }, event_id=cursor)
 
 
 async def user_event_generator(
@@ -316,19 +341,23 @@ async def sse_job_updates(
     request: Request,
     job_id: str,
     timeout: Optional[float] = Query(300, description="Stream timeout in seconds"),
+    after: Optional[str] = Query(None, description="Stream offset to resume after"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Stream Server-Sent Events for a job.
     
     Provides real-time updates for a single job:
+    - token: Answer text as it is generated ({"text", "offset"})
     - progress: Processing progress updates
-    - result: Final result when complete
+    - result: Final result when complete (authoritative full response)
     - error: If job fails
     
     Args:
         job_id: Job ID to monitor
         timeout: Maximum stream duration (default 5 minutes)
+        after: Resume offset (the browser sends Last-Event-ID automatically)
     
     Returns:
         SSE stream
@@ -337,6 +366,11 @@ async def sse_job_updates(
     ```javascript
     const eventSource = new EventSource('/sse/job/123?token=xxx');
     
+    eventSource.addEventListener('token', (e) => {
+        const data = JSON.parse(e.data);
+        appendAnswer(data.text);
+    });
+    
     eventSource.addEventListener('progress', (e) => {
         const data = JSON.parse(e.data);
         console.log('Progress:', data.current_step, '/', data.total_steps);
@@ -368,7 +402,7 @@ async def sse_job_updates(
         )
     
     return StreamingResponse(
-        job_event_generator(request, job_id, user_id, timeout),
+        job_event_generator(request, job_id, user_id, timeout, after=last_event_id or after),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
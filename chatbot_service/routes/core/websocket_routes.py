@@ -8,12 +8,14 @@ Provides WebSocket endpoints for:
 - User-level update streams
 
 Usage:
-    WebSocket /ws/job/{job_id} - Subscribe to single job updates
+    WebSocket /ws/job/{job_id}?after=<event_id> - Subscribe to single job updates
+                                                  (streams answer tokens; resumable)
     WebSocket /ws/jobs - Subscribe to multiple jobs (send job IDs via messages)
     WebSocket /ws/user/{user_id} - Subscribe to all user's job updates
 """
 
 
+import asyncio
 import logging
 import json
 from typing import Optional, Set, Dict, Any
@@ -71,24 +73,29 @@ async def authenticate_websocket(
 async def websocket_job_updates(
     websocket: WebSocket,
     job_id: str,
-    token: Optional[str] = Query(None)
+    token: Optional[str] = Query(None),
+    after: Optional[str] = Query(None)
 ):
     """
     WebSocket endpoint for single job updates.
     
     Connects and immediately subscribes to the specified job's updates.
     Receives:
+    - token: Answer text as it is generated ({"text", "offset", "event_id"})
+    - token_end: Answer stream finished
     - progress: Step-by-step progress updates
     - heartbeat: Keep-alive signals during processing
-    - result: Final job result or error
+    - result: Final job result or error (authoritative full response)
     
     Client can send:
     - {"type": "ping"}: Respond with pong
+    - {"type": "resume", "after": "<event_id>"}: Replay tokens after an offset
     - {"type": "unsubscribe"}: Stop receiving updates
     
     Args:
         job_id: Job ID to subscribe to
         token: Optional authentication token
+        after: Event ID to resume the token stream after (reconnects)
     """
     # Authenticate
     user_info = await authenticate_websocket(websocket, token)
@@ -116,6 +123,7 @@ async def websocket_job_updates(
     # Get WebSocket manager and connect
     ws_manager = await get_ws_manager()
     connection = await ws_manager.connect(websocket, user_id)
+    token_task: Optional[asyncio.Task] = None
     
     try:
         # Subscribe to job updates
@@ -147,6 +155,13 @@ async def websocket_job_updates(
                 "error_type": job.error_type
             })
         
+        # Stream answer tokens from the job event stream (finished jobs
+        # already delivered the full result above)
+        if job.status not in (JobStatus.COMPLETED.value, JobStatus.FAILED.value):
+            token_task = asyncio.create_task(
+                ws_manager.stream_job_events(connection, job_id, after=after)
+            )
+        
         # Listen for client messages
         while True:
             try:
@@ -158,6 +173,13 @@ async def websocket_job_updates(
                 if msg_type == "ping":
                     await connection.send_json({"type": "pong"})
                     
+                elif msg_type == "resume":
+                    if token_task:
+                        token_task.cancel()
+                    token_task = asyncio.create_task(
+                        ws_manager.stream_job_events(connection, job_id, after=message.get("after"))
+                    )
+                    
                 elif msg_type == "unsubscribe":
                     await ws_manager.unsubscribe_from_job(connection, job_id)
                     await connection.send_json({
@@ -187,6 +209,8 @@ async def websocket_job_updates(
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
+        if token_task:
+            token_task.cancel()
         await ws_manager.disconnect(connection)
 
 
@@ -6,6 +6,7 @@ Persisted to PostgreSQL (user_devices, vitals, device_timeseries tables).
 Endpoints:
     POST /smartwatch/register
     POST /smartwatch/vitals/ingest
+    POST /smartwatch/vitals/ingest/bulk
     GET  /smartwatch/vitals/{device_id}/aggregated
     POST /smartwatch/analyze
 """
@@ -15,10 +16,19 @@ import uuid
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from core.database.postgres_db import get_database
+from core.services.vitals_ingest import (
+    VitalsPayloadTooLarge,
+    VitalsValidationError,
+    decode_vitals_payload,
+    get_vitals_buffer,
+    normalize_vitals,
+    read_capped_body,
+)
 
 logger = logging.getLogger("smartwatch")
 
@@ -40,6 +50,10 @@ class VitalsPayload(BaseModel):
     device_id: str
     user_id: str
     metrics: List[Dict[str, Any]] = Field(..., description="List of {metric_type, value, unit, timestamp}")
+    series: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Columnar blocks of {metric_type, unit, values, timestamps | start + interval_seconds}",
+    )
 
 
 class AggregatedVitals(BaseModel):
@@ -94,37 +108,86 @@ async def register_device(device: DeviceRegistration):
     }
 
 
+async def _store_vitals(device_id: str, user_id: str, metrics, series, buffered: bool = False):
+    """Validate readings and write them in one bulk transaction (or queue them)."""
+    try:
+        rows, rejected = normalize_vitals(device_id, user_id, metrics=metrics, series=series)
+    except VitalsValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if buffered:
+        if not get_vitals_buffer().submit(rows):
+            raise HTTPException(status_code=429, detail="Vitals buffer full, retry later")
+        logger.info(f"Queued {len(rows)} vitals from device {device_id}")
+        return JSONResponse(
+            status_code=202,
+            content={"accepted": len(rows), "rejected": rejected, "device_id": device_id, "status": "queued"},
+        )
+
+    db = await get_database()
+    try:
+        count = await db.store_device_timeseries_bulk(rows)
+    except Exception as e:
+        logger.error(f"Bulk vitals ingest failed for device {device_id}: {e}")
+        raise HTTPException(status_code=503, detail="Failed to store vitals")
+
+    logger.info(f"Ingested {count} vitals from device {device_id}")
+    return {"ingested": count, "rejected": rejected, "device_id": device_id, "status": "ok"}
+
+
 @router.post("/vitals/ingest")
-async def ingest_vitals(payload: VitalsPayload):
+async def ingest_vitals(payload: VitalsPayload, buffered: bool = Query(False)):
     """Ingest vitals data from a smartwatch."""
-    if not payload.metrics:
+    if not payload.metrics and not payload.series:
         raise HTTPException(status_code=400, detail="No metrics provided")
 
-    db = await get_database()
-    count = 0
-    for metric in payload.metrics:
-        metric_type = metric.get("metric_type", "unknown")
-        value = metric.get("value")
-        if value is None:
-            continue
-        try:
-            value_float = float(value)
-        except (ValueError, TypeError):
-            continue
-        unit = metric.get("unit", "")
-        timestamp = metric.get("timestamp")
-        await db.store_device_timeseries(
-            device_id=payload.device_id,
-            user_id=payload.user_id,
-            metric_type=metric_type,
-            value=value_float,
-            unit=unit,
-            timestamp=timestamp,
+    return await _store_vitals(
+        payload.device_id, payload.user_id, payload.metrics, payload.series, buffered=buffered
+    )
+
+
+@router.post("/vitals/ingest/bulk")
+async def ingest_vitals_bulk(
+    request: Request,
+    device_id: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    buffered: bool = Query(False, description="Queue for background flush (202)"),
+):
+    """
+    Ingest a large vitals batch.
+
+    Accepts JSON (``metrics`` and/or columnar ``series``) or NDJSON
+    (``application/x-ndjson``), optionally gzip/deflate compressed.
+    device_id/user_id come from the query string or the payload.
+    """
+    try:
+        decoded = decode_vitals_payload(
+            await read_capped_body(
+                request.stream(), request.headers.get("content-length")
+            ),
+            content_type=request.headers.get("content-type", ""),
+            content_encoding=request.headers.get("content-encoding", ""),
         )
-        count += 1
+    except VitalsPayloadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except VitalsValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    logger.info(f"Ingested {count} vitals from device {payload.device_id}")
-    return {"ingested": count, "device_id": payload.device_id, "status": "ok"}
+    if not decoded["metrics"] and not decoded["series"]:
+        raise HTTPException(status_code=400, detail="No metrics provided")
+    for key, value in (("device_id", device_id), ("user_id", user_id)):
+        if value and decoded[key] is not None and str(decoded[key]) != value:
+            raise HTTPException(
+                status_code=400, detail=f"{key} in query and payload disagree"
+            )
+
+    return await _store_vitals(
+        device_id or decoded["device_id"],
+        user_id or decoded["user_id"],
+        decoded["metrics"],
+        decoded["series"],
+        buffered=buffered,
+    )
 
 
 @router.get("/vitals/{device_id}/aggregated", response_model=AggregatedVitals)
@@ -133,42 +196,27 @@ async def get_aggregated_vitals(
     metric_type: str = Query(..., description="e.g. heart_rate, spo2, steps"),
     interval: str = Query("1h", description="Aggregation interval: 1h, 6h, 24h, 7d"),
 ):
-    """Get aggregated vitals for a device and metric type."""
+    """Get aggregated vitals for a device and metric type (aggregated in SQL from rollups)."""
     interval_map = {"1h": 1, "6h": 6, "24h": 24, "7d": 168}
     hours = interval_map.get(interval, 24)
 
     db = await get_database()
-    records = await db.get_device_timeseries(device_id, metric_type, hours)
-
-    if not records:
-        return AggregatedVitals(
-            device_id=device_id,
-            metric_type=metric_type,
-            interval=interval,
-            data_points=0,
-        )
+    aggregate = await db.get_vitals_aggregate(metric_type, hours, device_id=device_id)
 
-    values = []
-    unit = ""
-    for r in records:
-        if r.get("value") is not None:
-            try:
-                values.append(float(r["value"]))
-            except (ValueError, TypeError):
-                pass
-        if not unit and r.get("unit"):
-            unit = r["unit"]
+    def _rounded(key: str) -> Optional[float]:
+        value = aggregate.get(key)
+        return round(float(value), 2) if value is not None else None
 
     return AggregatedVitals(
         device_id=device_id,
         metric_type=metric_type,
         interval=interval,
-        data_points=len(values),
-        min_value=round(min(values), 2) if values else None,
-        max_value=round(max(values), 2) if values else None,
-        avg_value=round(sum(values) / len(values), 2) if values else None,
-        latest_value=values[-1] if values else None,
-        unit=unit,
+        data_points=int(aggregate.get("data_points") or 0),
+        min_value=_rounded("min_value"),
+        max_value=_rounded("max_value"),
+        avg_value=_rounded("avg_value"),
+        latest_value=aggregate.get("latest_value"),
+        unit=aggregate.get("unit") or "",
     )
 
 
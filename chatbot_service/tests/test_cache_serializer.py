@@ -0,0 +1,51 @@
+"""Cache serializer round-trips and size estimates."""
+
+import datetime
+from collections import namedtuple
+
+import pytest
+
+from core.cache import serializer
+from core.cache.serializer import CacheSerializer, estimate_size
+
+Point = namedtuple("Point", "x y")
+
+VALUE = {
+    "pair": (1, 2),
+    "nested": [(3, (4, 5)), {"inner": ("a", "b")}],
+    "members": {(1, 2)},
+    "point": Point(1, 2),
+    "when": datetime.date(2024, 1, 1),
+}
+
+
+@pytest.mark.parametrize("text_mode", [False, True])
+def test_tuples_round_trip(text_mode):
+    ser = CacheSerializer(text_mode=text_mode)
+    restored = ser.loads(ser.dumps(VALUE))
+
+    assert restored == {**VALUE, "point": (1, 2)}
+    assert type(restored["pair"]) is tuple
+    assert type(restored["nested"][0][1]) is tuple
+    assert type(restored["nested"]) is list
+
+
+def test_tuples_round_trip_without_msgpack(monkeypatch):
+    monkeypatch.setattr(serializer, "MSGPACK_AVAILABLE", False)
+    ser = CacheSerializer()
+
+    restored = ser.loads(ser.dumps(VALUE))
+
+    assert type(restored["pair"]) is tuple
+    assert restored["members"] == {(1, 2)}
+
+
+def test_estimate_size_tracks_encoded_size():
+    value = {"rows": [{"id": i, "text": "x" * 500} for i in range(1000)]}
+    encoded = len(CacheSerializer(compression_threshold=10**12).dumps(value))
+
+    assert 0.8 * encoded < estimate_size(value) < 1.2 * encoded
+
+
+def test_estimate_size_falls_back_for_opaque_objects():
+    assert estimate_size(object()) > 0
@@ -0,0 +1,41 @@
+"""A per-user purge must evict cached chat history for that user."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from core.cache import invalidate_everywhere, user_tag
+from core.services.chat_history import PersistentChatHistory, SessionTimeoutPolicy
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_ENABLE_L2", "false")
+    store = PersistentChatHistory(
+        database_url=f"sqlite:///{tmp_path / 'chat.db'}",
+        timeout_policy=SessionTimeoutPolicy(auto_cleanup=False),
+    )
+    if store._tiered_cache is None:
+        pytest.skip("tiered cache not available")
+    return store
+
+
+def test_user_purge_evicts_cached_history(history):
+    history.add_message("s1", "user", "my chest hurts", user_id="u1")
+    assert history.get_history("s1")
+    assert history._tiered_cache.get("chat_history:s1") is not None
+
+    asyncio.run(invalidate_everywhere(user_tag("u1")))
+
+    assert history._tiered_cache.get("chat_history:s1") is None
+
+
+def test_other_users_purge_keeps_cached_history(history):
+    history.add_message("s2", "user", "hello", user_id="u2")
+    history.get_history("s2")
+
+    asyncio.run(invalidate_everywhere(user_tag("someone-else")))
+
+    assert history._tiered_cache.get("chat_history:s2") is not None
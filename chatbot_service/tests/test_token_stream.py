@@ -0,0 +1,68 @@
+"""TokenChunker must never let a PHI match straddle a chunk boundary."""
+
+import re
+
+import pytest
+
+from core.services.token_stream import TokenChunker
+
+# Whitespace-tolerant patterns from core/compliance/pii_scrubber_v2.py
+_PATTERNS = [
+    (re.compile(r"\b\d{3}[\s\-.]?\d{3}[\s\-.]?\d{4}\b"), "[PHONE_REDACTED]"),
+    (re.compile(r"(?i:\b(?:Mr|Mrs|Ms|Dr|Prof)\.?)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\b"), "[NAME_REDACTED]"),
+]
+
+
+def scrub(text: str) -> str:
+    for pattern, replacement in _PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def stream(chunker: TokenChunker, tokens, force_flush_after=()):
+    """Feed tokens, forcing age-based flushes after the given token indexes."""
+    chunks = []
+    for i, token in enumerate(tokens):
+        if i in force_flush_after:
+            chunker._since = 0.0  # Buffered text is "old": the age flush fires
+        chunks.extend(text for text, _ in chunker.feed(token))
+    chunks.extend(text for text, _ in chunker.flush())
+    return chunks
+
+
+TEXT = "Please follow up with Dr. Smith at 555 123 4567 tomorrow."
+
+
+@pytest.mark.parametrize("phi_window", [0, 8, 48])
+def test_phone_and_honorific_straddling_a_flush_are_redacted(phi_window):
+    tokens = re.findall(r"\S+|\s+", TEXT)
+    chunker = TokenChunker(scrub=scrub, max_chars=10_000, flush_ms=10_000, phi_window=phi_window)
+
+    # Age flushes right after "Dr." and between the phone's digit groups
+    flush_after = {tokens.index("Dr."), tokens.index("123"), tokens.index("555")}
+    chunks = stream(chunker, tokens, flush_after)
+
+    joined = "".join(chunks)
+    assert joined == scrub(TEXT)
+    assert "555" not in joined and "4567" not in joined and "Smith" not in joined
+    assert len(chunks) > 1
+
+
+def test_offsets_follow_released_text():
+    chunker = TokenChunker(scrub=scrub, max_chars=20, flush_ms=10_000, phi_window=8)
+    released = []
+    for token in re.findall(r"\S+|\s+", TEXT * 3):
+        released.extend(chunker.feed(token))
+    released.extend(chunker.flush())
+
+    offset = 0
+    for text, chunk_offset in released:
+        assert chunk_offset == offset
+        offset += len(text)
+    assert "".join(text for text, _ in released) == scrub(TEXT * 3)
+
+
+def test_held_back_window_is_released_on_flush():
+    chunker = TokenChunker(max_chars=1, flush_ms=0, phi_window=48)
+    assert chunker.feed("Short answer. Done.") == []
+    assert chunker.flush() == [("Short answer. Done.", 0)]
@@ -5,8 +5,12 @@ This is the Phase 1.1 implementation of the Unified Master Plan.
 Routes medical queries to the appropriate handler (SQL, RAG, Emergency, etc).
 
 Key Design:
-- Regex first (safety-critical, <10ms)
-- Embedding fallback (optional, for edge cases)
+- Regex first (safety-critical): every pattern is compiled into one combined
+  scanner, so a single pass over the query finds all matching intents and
+  priority is resolved afterwards (microseconds per route)
+- Embedding fallback (optional, for edge cases): nearest-centroid match
+  against precomputed intent exemplar embeddings
+- LRU cache of recent routing decisions
 - Medical triage patterns optimized for emergency detection
 - Confidence scoring for decision transparency
 
@@ -16,15 +20,40 @@ Integration:
 """
 
 
+import os
 import re
 import logging
+import threading
+from collections import OrderedDict, deque
 from enum import Enum
-from dataclasses import dataclass
-from typing import Optional, List, Tuple, Dict
-from functools import lru_cache
+from dataclasses import dataclass, replace
+from typing import Optional, List, Tuple, Dict, Set, FrozenSet
+
+try:  # Python 3.11+
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Minimum regex confidence for a route to be accepted
+ROUTE_CONFIDENCE_THRESHOLD = 0.70
+# LRU route cache size; queries longer than the key limit are not cached
+ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", "500"))
+ROUTE_CACHE_MAX_QUERY_CHARS = int(os.getenv("ROUTE_CACHE_MAX_QUERY_CHARS", "512"))
+# Minimum cosine similarity to an intent centroid for the embedding fallback
+ROUTER_EMBEDDING_THRESHOLD = float(os.getenv("ROUTER_EMBEDDING_THRESHOLD", "0.55"))
+# Embedding routes are capped below the orchestrator's fast-path cut-off (> 0.8),
+# so they always go through the supervisor
+ROUTER_EMBEDDING_MAX_CONFIDENCE = 0.80
+
 
 class IntentCategory(Enum):
     """Top-level intent categories for Heart Health AI."""
@@ -39,6 +68,19 @@ class IntentCategory(Enum):
     GENERAL = "general"                 # "Hi", "Thanks", off-topic
 
 
+# Intents in routing priority order (safety-critical first)
+ROUTE_PRIORITY: Tuple[IntentCategory, ...] = (
+    IntentCategory.EMERGENCY,               # 1. Safety-critical first
+    IntentCategory.TRIAGE,                  # 1.5 Triage assessment
+    IntentCategory.HEART_RISK,              # 2. Heart risk assessment
+    IntentCategory.DIFFERENTIAL_DIAGNOSIS,  # 2.5 Clinical reasoning
+    IntentCategory.VITALS_QUERY,            # 3. Data queries
+    IntentCategory.DRUG_INTERACTION,        # 4. Specific medical checks
+    IntentCategory.RESEARCH,                # 4.5 Research queries
+    IntentCategory.MEDICAL_QA,              # 5. Knowledge last
+)
+
+
 @dataclass
 class RouteDecision:
     """Result of semantic routing."""
@@ -50,6 +92,125 @@ class RouteDecision:
     matched_pattern: Optional[str] = None
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MULTI-PATTERN SCANNER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Case-insensitive equivalences in ``re`` that str.casefold() does not produce
+# (dotless i; the combining dot casefold leaves after "i" for U+0130)
+_FOLD_FIXES = str.maketrans({"\u0131": "i", "\u0307": None})
+
+
+def _fold(text: str) -> str:
+    return text.casefold().translate(_FOLD_FIXES)
+
+
+def _required_literals(items) -> Optional[Set[str]]:
+    """
+    Literals of which every match of a parsed pattern contains at least one.
+    
+    Returns None when no such set can be derived (the pattern must then
+    always be confirmed).
+    """
+    options: List[Set[str]] = []
+    run: List[str] = []
+    for op, av in items:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            options.append({_fold("".join(run))})
+            run = []
+        if op is _sre.SUBPATTERN:
+            required = _required_literals(av[-1])
+        elif op is _sre.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            required = None if any(b is None for b in branches) else set().union(*branches)
+        elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT) and av[0] >= 1:
+            required = _required_literals(av[2])
+        else:
+            required = None
+        if required:
+            options.append(required)
+    if run:
+        options.append({_fold("".join(run))})
+    if not options:
+        return None
+    # Most selective: the set whose shortest literal is longest
+    return max(options, key=lambda literals: min(len(lit) for lit in literals))
+
+
+class MultiPatternScanner:
+    """
+    Single-pass matcher for a list of case-insensitive regexes.
+    
+    Python's ``re`` tries alternation branches one by one, so one big
+    alternation is slower than the separate searches it replaces. Instead,
+    like Hyperscan, each pattern is reduced to literals that any match must
+    contain; one Aho-Corasick pass over the query finds every pattern whose
+    literals occur, and only those candidates are confirmed with their regex.
+    
+    Args:
+        patterns: Compiled patterns; candidate indices refer to this list
+    """
+    
+    def __init__(self, patterns: List["re.Pattern"]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[int]] = [frozenset()]
+        self._always: Set[int] = set()
+        
+        pending: Dict[int, Set[int]] = {}
+        for index, pattern in enumerate(patterns):
+            literals = _required_literals(_sre_parse.parse(pattern.pattern, pattern.flags))
+            if not literals:
+                self._always.add(index)
+                continue
+            for literal in literals:
+                state = 0
+                for ch in literal:
+                    child = self._goto[state].get(ch)
+                    if child is None:
+                        child = self._goto[state][ch] = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append(frozenset())
+                    state = child
+                pending.setdefault(state, set()).add(index)
+        for state, indices in pending.items():
+            self._out[state] = frozenset(indices)
+        
+        # Breadth-first failure links; outputs inherit along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+        
+        logger.debug(
+            f"MultiPatternScanner: {len(patterns)} patterns, {len(self._goto)} states, "
+            f"{len(self._always)} always confirmed"
+        )
+    
+    def candidates(self, text: str) -> List[int]:
+        """Indices of patterns that may match ``text``, in ascending order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set(self._always)
+        state = 0
+        for ch in _fold(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return sorted(hits)
+
+
 class SemanticRouterV2:
     """
     Routes medical queries to appropriate handler.
@@ -432,6 +593,54 @@ class SemanticRouterV2:
         (r"\b(cardiology|cardiology.*research|heart.*disease.*research)\b", 0.80, "Cardiology research"),
     ]
     
+    # ═══════════════════════════════════════════════════════════════════════════
+    # EMBEDDING FALLBACK EXEMPLARS (nearest-centroid, only when no regex matches)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    INTENT_EXEMPLARS = {
+        IntentCategory.EMERGENCY: [
+            "I think I'm having a heart attack right now",
+            "my chest feels crushed and my left arm is numb",
+            "I suddenly can't feel one side of my face",
+            "I'm about to pass out and my heart is racing",
+        ],
+        IntentCategory.TRIAGE: [
+            "is this serious enough to see a doctor today",
+            "how urgently do I need medical attention for this",
+            "should I wait or get checked right away",
+        ],
+        IntentCategory.HEART_RISK: [
+            "how likely am I to develop heart problems",
+            "what is my chance of a cardiac event in ten years",
+            "does my family history make my heart worse",
+        ],
+        IntentCategory.DIFFERENTIAL_DIAGNOSIS: [
+            "what could explain these symptoms I've been having",
+            "which conditions cause fatigue and swollen ankles",
+            "why would my heart skip beats at night",
+        ],
+        IntentCategory.VITALS_QUERY: [
+            "how has my pulse looked over the past month",
+            "show me the readings from my watch",
+            "was my pressure higher this morning than yesterday",
+        ],
+        IntentCategory.DRUG_INTERACTION: [
+            "is it safe to combine my pills with this supplement",
+            "will these two prescriptions react badly together",
+            "can I drink alcohol while on my heart medication",
+        ],
+        IntentCategory.RESEARCH: [
+            "what does recent science say about this treatment",
+            "summarise the published findings on statins",
+            "are there new trials for heart failure patients",
+        ],
+        IntentCategory.MEDICAL_QA: [
+            "explain how a pacemaker works",
+            "what is atrial fibrillation",
+            "how does cholesterol affect the arteries",
+        ],
+    }
+
     def __init__(self, embedding_service=None):
         """
         Initialize router with optional embedding service for edge cases.
@@ -441,9 +650,10 @@ class SemanticRouterV2:
         """
         self.embedding_service = embedding_service
         
-        # P2.2: Route caching for repeated queries
-        self._route_cache: Dict[int, Tuple[str, float, str]] = {}
-        self._cache_max_size = 500
+        # P2.2: LRU route cache for repeated queries (normalized query -> decision)
+        self._route_cache: "OrderedDict[str, RouteDecision]" = OrderedDict()
+        self._cache_max_size = ROUTE_CACHE_SIZE
+        self._cache_lock = threading.Lock()
         
         # Compile regex patterns for performance
         self.compiled_patterns = {
@@ -480,79 +690,157 @@ class SemanticRouterV2:
                 for p, conf, reason in self.DIFFERENTIAL_DIAGNOSIS_PATTERNS
             ],
         }
+        
+        # One scanner over every pattern. Entries are ordered by (intent
+        # priority, -confidence, declaration order), so the first confirmed
+        # candidate is exactly the route the per-intent loop would pick.
+        # Patterns below the threshold can never win and are left out.
+        ranked = []
+        for rank, intent in enumerate(ROUTE_PRIORITY):
+            for order, (pattern, conf, reason) in enumerate(self.compiled_patterns[intent]):
+                if conf >= ROUTE_CONFIDENCE_THRESHOLD:
+                    ranked.append(((rank, -conf, order), (intent, conf, reason, pattern)))
+        ranked.sort(key=lambda r: r[0])
+        self._scan_entries = [entry for _, entry in ranked]
+        self._scanner = MultiPatternScanner([entry[3] for entry in self._scan_entries])
+        
+        # Embedding fallback: (intents, normalized centroid matrix), built lazily
+        self._centroids: Optional[Tuple[List[IntentCategory], "np.ndarray"]] = None
+        self._centroid_lock = threading.Lock()
     
     def route(self, query: str) -> RouteDecision:
         """
         Route query to appropriate handler.
         
         Algorithm:
-        1. Emergency detection (highest priority, safety-critical)
-        2. Vitals queries (data access)
-        3. Medical QA (knowledge)
-        4. General (fallback)
+        1. One combined regex pass finds every matching intent; priority is
+           resolved afterwards (emergency first, medical QA last)
+        2. Embedding nearest-centroid fallback when no pattern matches and an
+           embedding service is configured
+        3. General (fallback)
         
         Returns:
             RouteDecision with intent, confidence, and target handler
         """
         # P2.2: Normalize query for caching
-        query_normalized = query.lower().strip()[:200]
-        query_hash = hash(query_normalized)
+        query_normalized = query.lower().strip()
+        cacheable = len(query_normalized) <= ROUTE_CACHE_MAX_QUERY_CHARS
         
         # P2.2: Check cache first
-        if query_hash in self._route_cache:
-            cached = self._route_cache[query_hash]
-            logger.debug(f"P2.2: Cache hit for query hash {query_hash}")
-            return RouteDecision(
-                intent=IntentCategory(cached[0]),
-                confidence=cached[1],
-                target_handler=cached[2],
-                reasoning="Cached route",
+        if cacheable:
+            with self._cache_lock:
+                cached = self._route_cache.get(query_normalized)
+                if cached is not None:
+                    self._route_cache.move_to_end(query_normalized)
+            if cached is not None:
+                logger.debug("P2.2: Route cache hit")
+                return replace(cached)
+        
+        logger.debug(f"Routing query: {query}")
+        
+        # PHASE 1: Single regex pass, priority resolved afterwards
+        result = self._scan(query_normalized)
+        
+        # PHASE 2: Embedding fallback for queries no pattern recognises
+        if result is None and self.embedding_service is not None:
+            result = self._embedding_route(query)
+        
+        # PHASE 3: Fallback to general
+        if result is None:
+            result = RouteDecision(
+                intent=IntentCategory.GENERAL,
+                confidence=0.0,
+                target_handler="general_chat",
+                reasoning="No specific intent detected, routing to general chat",
                 requires_embedding=False
             )
+        else:
+            logger.info(f"Route decision: {result.intent.value} (confidence: {result.confidence})")
         
-        query_lower = query.lower()
-        logger.debug(f"Routing query: {query}")
+        if cacheable:
+            with self._cache_lock:
+                self._route_cache[query_normalized] = result
+                self._route_cache.move_to_end(query_normalized)
+                if len(self._route_cache) > self._cache_max_size:
+                    self._route_cache.popitem(last=False)
         
-        # PHASE 1: Regex matching in priority order
-        for intent_category in [
-            IntentCategory.EMERGENCY,      # 1. Safety-critical first
-            IntentCategory.TRIAGE,         # 1.5 Triage assessment
-            IntentCategory.HEART_RISK,     # 2. Heart risk assessment
-            IntentCategory.DIFFERENTIAL_DIAGNOSIS, # 2.5 Clinical reasoning
-            IntentCategory.VITALS_QUERY,   # 3. Data queries
-            IntentCategory.DRUG_INTERACTION, # 4. Specific medical checks
-            IntentCategory.RESEARCH,       # 4.5 Research queries
-            IntentCategory.MEDICAL_QA,     # 5. Knowledge last
-        ]:
-            result = self._match_patterns(query_lower, intent_category)
-            if result and result.confidence >= 0.70:
-                logger.info(f"Route decision: {result.intent.value} (confidence: {result.confidence})")
-                
-                # P2.2: Cache high-confidence results
-                if result.confidence >= 0.70:
-                    # Limit cache size
-                    if len(self._route_cache) >= self._cache_max_size:
-                        # Remove oldest (first) entry
-                        oldest_key = next(iter(self._route_cache))
-                        del self._route_cache[oldest_key]
-                    
-                    self._route_cache[query_hash] = (
-                        result.intent.value,
-                        result.confidence,
-                        result.target_handler
-                    )
-                
-                return result
+        return replace(result)
+    
+    def _scan(self, query: str) -> Optional[RouteDecision]:
+        """Find the winning regex route with one scanner pass over the query."""
+        for index in self._scanner.candidates(query):
+            intent, confidence, reason, pattern = self._scan_entries[index]
+            if pattern.search(query):
+                return RouteDecision(
+                    intent=intent,
+                    confidence=confidence,
+                    target_handler=self._get_handler_name(intent),
+                    reasoning=reason,
+                    requires_embedding=False,
+                    matched_pattern=pattern.pattern
+                )
+        return None
+    
+    def _embedding_route(self, query: str) -> Optional[RouteDecision]:
+        """
+        Nearest-centroid intent match on the query embedding.
         
-        # PHASE 2: If no high-confidence regex match, fallback to general
+        Centroids are the normalized mean embeddings of INTENT_EXEMPLARS, so
+        classification is a single matrix-vector product.
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        try:
+            centroids = self._get_centroids()
+            if centroids is None:
+                return None
+            intents, matrix = centroids
+            
+            vector = np.asarray(self.embedding_service.embed_text(query), dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            if norm == 0.0:
+                return None
+            scores = matrix @ (vector / norm)
+        except Exception as e:
+            logger.warning(f"Embedding route fallback failed: {e}")
+            return None
+        
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        if similarity < ROUTER_EMBEDDING_THRESHOLD:
+            return None
+        
+        intent = intents[best]
         return RouteDecision(
-            intent=IntentCategory.GENERAL,
-            confidence=0.0,
-            target_handler="general_chat",
-            reasoning="No specific intent detected, routing to general chat",
-            requires_embedding=False
+            intent=intent,
+            confidence=round(min(similarity, ROUTER_EMBEDDING_MAX_CONFIDENCE), 3),
+            target_handler=self._get_handler_name(intent),
+            reasoning=f"Nearest intent centroid (similarity {similarity:.2f})",
+            requires_embedding=True
         )
     
+    def _get_centroids(self) -> Optional[Tuple[List[IntentCategory], "np.ndarray"]]:
+        """Embed the intent exemplars once and cache the centroid matrix."""
+        if self._centroids is not None:
+            return self._centroids
+        with self._centroid_lock:
+            if self._centroids is None:
+                intents = list(self.INTENT_EXEMPLARS)
+                texts = [text for intent in intents for text in self.INTENT_EXEMPLARS[intent]]
+                vectors = np.asarray(self.embedding_service.embed_batch(texts), dtype=np.float32)
+                vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+                
+                rows, start = [], 0
+                for intent in intents:
+                    count = len(self.INTENT_EXEMPLARS[intent])
+                    rows.append(vectors[start:start + count].mean(axis=0))
+                    start += count
+                matrix = np.vstack(rows)
+                matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+                self._centroids = (intents, matrix)
+                logger.info(f"Router intent centroids built ({len(texts)} exemplars)")
+        return self._centroids
+    
     def _match_patterns(
         self,
         query: str,